@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import threading
+from typing import Any, Type
+
+from opensearchpy.connection_pool import ConnectionPool, SnapshotConnectionPool
+
+NODE_COUNT = 60
+REQUEST_COUNT = 200000
+
+
+def select(pool: Any, request_count: int) -> None:
+    """pick a connection and mark it live, like the transport does per request"""
+    for i in range(request_count):
+        connection = pool.get_connection()
+        if i % 10000 == 0:
+            # an occasional failure, with resurrection after the timeout
+            pool.mark_dead(connection)
+        else:
+            pool.mark_live(connection)
+
+
+def test(pool_class: Type[ConnectionPool], thread_count: int) -> None:
+    """share a pool between thread_count threads sending REQUEST_COUNT requests"""
+    pool = pool_class([(object(), {}) for _ in range(NODE_COUNT)], dead_timeout=0.01)
+    threads = [
+        threading.Thread(target=select, args=(pool, REQUEST_COUNT // thread_count))
+        for _ in range(thread_count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_pool_1() -> None:
+    """ConnectionPool, 1 thread"""
+    test(ConnectionPool, 1)
+
+
+def test_snapshot_pool_1() -> None:
+    """SnapshotConnectionPool, 1 thread"""
+    test(SnapshotConnectionPool, 1)
+
+
+def test_pool_64() -> None:
+    """ConnectionPool, 64 threads"""
+    test(ConnectionPool, 64)
+
+
+def test_snapshot_pool_64() -> None:
+    """SnapshotConnectionPool, 64 threads"""
+    test(SnapshotConnectionPool, 64)
+
+
+__benchmarks__ = [
+    (test_pool_1, test_snapshot_pool_1, "ConnectionPool vs. snapshot (1 thread)"),
+    (test_pool_64, test_snapshot_pool_64, "ConnectionPool vs. snapshot (64 threads)"),
+]
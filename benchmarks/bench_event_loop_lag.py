@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import asyncio
+import json
+import time
+from typing import Any, Optional
+
+from opensearchpy import AsyncTransport
+from opensearchpy._async.http_aiohttp import AsyncConnection
+
+HIT_COUNT = 5000
+TICK_COUNT = 50
+TICK_INTERVAL = 0.001
+# bodies from 64KB are processed in the default executor of the event loop
+OFFLOAD_THRESHOLD = 64 * 1024
+
+RESPONSE = json.dumps(
+    {
+        "took": 12,
+        "hits": {
+            "total": {"value": HIT_COUNT, "relation": "eq"},
+            "hits": [
+                {
+                    "_index": "movies",
+                    "_id": str(i),
+                    "_source": {"title": "The Dark Knight %d" % i, "year": 2008},
+                }
+                for i in range(HIT_COUNT)
+            ],
+        },
+    }
+).encode("utf-8")
+
+
+class LocalConnection(AsyncConnection):
+    """answers every request with a large search response without any I/O"""
+
+    async def perform_request(self, *args: Any, **kwargs: Any) -> Any:
+        await asyncio.sleep(0)
+        return 200, {"content-type": "application/json"}, RESPONSE
+
+    async def close(self) -> None:
+        pass
+
+
+async def search(transport: Any) -> None:
+    """send large searches in a loop until cancelled"""
+    while True:
+        await transport.perform_request("POST", "/movies/_search", body={"size": 1})
+
+
+async def measure_lag(offload_threshold: Optional[int]) -> float:
+    """
+    run 4 tasks sending large searches along with a task ticking every
+    TICK_INTERVAL, return the worst delay of a tick (the event loop lag)
+    """
+    transport = AsyncTransport(
+        [{}], connection_class=LocalConnection, offload_threshold=offload_threshold
+    )
+    searches = [asyncio.ensure_future(search(transport)) for _ in range(4)]
+    lag = 0.0
+    for _ in range(TICK_COUNT):
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_INTERVAL)
+        lag = max(lag, time.perf_counter() - start - TICK_INTERVAL)
+    for task in searches:
+        task.cancel()
+    await asyncio.gather(*searches, return_exceptions=True)
+    await transport.close()
+    return lag
+
+
+def test(offload_threshold: Optional[int]) -> None:
+    """the time taken is TICK_COUNT ticks plus their delays"""
+    lag = asyncio.run(measure_lag(offload_threshold))
+    print("max event loop lag: %.1fms" % (lag * 1000))
+
+
+def test_inline() -> None:
+    """deserializing large responses on the event loop"""
+    test(None)
+
+
+def test_offloaded() -> None:
+    """deserializing large responses in an executor"""
+    test(OFFLOAD_THRESHOLD)
+
+
+__benchmarks__ = [(test_inline, test_offloaded, "event loop lag, inline vs. offloaded")]
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from opensearchpy.serializer import JSONSerializer
+
+DOC_COUNT = 5000
+HIT_COUNT = 10000
+
+STDLIB = JSONSerializer(backend="json")
+# the fastest JSON library installed, e.g. orjson (pip install orjson)
+FAST = JSONSerializer(backend="auto")
+
+
+def bulk_docs(count: int) -> Any:
+    """generate bulk action/source pairs resembling a log ingest workload"""
+    start = datetime(2024, 1, 1)
+    docs: List[Dict[str, Any]] = []
+    for i in range(count):
+        docs.append({"index": {"_index": "logs-2024.01.01", "_id": str(uuid.uuid4())}})
+        docs.append(
+            {
+                "@timestamp": start + timedelta(seconds=i),
+                "trace_id": uuid.uuid4(),
+                "host": {"name": "host-%d" % (i % 50), "ip": "10.0.0.%d" % (i % 255)},
+                "message": "GET /api/v1/items/%d HTTP/1.1 200 - élevé" % i,
+                "latency_ms": i * 0.37,
+                "tags": ["web", "prod", "eu-west-1"],
+            }
+        )
+    return docs
+
+
+def search_response(count: int) -> str:
+    """generate the raw body of a large search response"""
+    hits = []
+    for i in range(count):
+        hits.append(
+            {
+                "_index": "logs-2024.01.01",
+                "_id": str(i),
+                "_score": 1.0,
+                "_source": {
+                    "@timestamp": "2024-01-01T00:00:%02d" % (i % 60),
+                    "message": "GET /api/v1/items/%d HTTP/1.1 200" % i,
+                    "latency_ms": i * 0.37,
+                    "tags": ["web", "prod"],
+                },
+            }
+        )
+    response = {
+        "took": 42,
+        "timed_out": False,
+        "_shards": {"total": 5, "successful": 5, "skipped": 0, "failed": 0},
+        "hits": {
+            "total": {"value": count, "relation": "eq"},
+            "max_score": 1.0,
+            "hits": hits,
+        },
+    }
+    return str(STDLIB.dumps(response))
+
+
+BULK_DOCS = bulk_docs(DOC_COUNT)
+SEARCH_RESPONSE = search_response(HIT_COUNT)
+
+
+def dumps(serializer: Any) -> None:
+    """serialize a bulk body line by line, like the bulk helpers do"""
+    for _ in range(10):
+        for doc in BULK_DOCS:
+            serializer.dumps(doc)
+
+
+def loads(serializer: Any) -> None:
+    """deserialize a large search response"""
+    for _ in range(10):
+        serializer.loads(SEARCH_RESPONSE)
+
+
+def test_dumps_stdlib() -> None:
+    """serializing bulk bodies with simplejson/json"""
+    dumps(STDLIB)
+
+
+def test_dumps_fast() -> None:
+    """serializing bulk bodies with the fastest installed backend"""
+    dumps(FAST)
+
+
+def test_loads_stdlib() -> None:
+    """deserializing search responses with simplejson/json"""
+    loads(STDLIB)
+
+
+def test_loads_fast() -> None:
+    """deserializing search responses with the fastest installed backend"""
+    loads(FAST)
+
+
+__benchmarks__ = [
+    (
+        test_dumps_stdlib,
+        test_dumps_fast,
+        "json vs. %s bulk serialization" % FAST.backend.name,
+    ),
+    (
+        test_loads_stdlib,
+        test_loads_fast,
+        "json vs. %s search response parsing" % FAST.backend.name,
+    ),
+]
@@ -43,14 +43,23 @@ VERSION = __version__ = (_major, _minor, _patch)
 logger = logging.getLogger("opensearch")
 logger.addHandler(logging.NullHandler())
 
+from .cache import SearchCache
 from .client import OpenSearch
 from .connection import (
+    Compression,
     Connection,
     RequestsHttpConnection,
     Urllib3HttpConnection,
     connections,
 )
-from .connection_pool import ConnectionPool, ConnectionSelector, RoundRobinSelector
+from .connection_pool import (
+    CircuitBreaker,
+    ConnectionPool,
+    ConnectionSelector,
+    LatencyAwareSelector,
+    RoundRobinSelector,
+    SnapshotConnectionPool,
+)
 from .exceptions import (
     AuthenticationException,
     AuthorizationException,
@@ -134,7 +143,9 @@ from .helpers.update_by_query import UpdateByQuery
 from .helpers.utils import AttrDict, AttrList, DslBase
 from .helpers.wrappers import Range
 from .metrics import Metrics, MetricsEvents, MetricsNone
+from .retry import RetryPolicy
 from .serializer import JSONSerializer
+from .streaming import StreamingResponse
 from .transport import Transport
 
 # Only raise one warning per deprecation message so as not
@@ -144,11 +155,18 @@ warnings.simplefilter("default", category=OpenSearchDeprecationWarning, append=T
 __all__ = [
     "OpenSearch",
     "Transport",
+    "StreamingResponse",
+    "SearchCache",
+    "RetryPolicy",
     "ConnectionPool",
+    "SnapshotConnectionPool",
     "ConnectionSelector",
     "RoundRobinSelector",
+    "LatencyAwareSelector",
+    "CircuitBreaker",
     "JSONSerializer",
     "Connection",
+    "Compression",
     "RequestsHttpConnection",
     "Urllib3HttpConnection",
     "ImproperlyConfigured",
@@ -249,6 +267,7 @@ __all__ = [
 try:
     from ._async.client import AsyncOpenSearch
     from ._async.http_aiohttp import AIOHttpConnection, AsyncConnection
+    from ._async.streaming import AsyncStreamingResponse
     from ._async.transport import AsyncTransport
     from .connection import AsyncHttpConnection
     from .helpers import AWSV4SignerAsyncAuth
@@ -257,6 +276,7 @@ try:
         "AIOHttpConnection",
         "AsyncConnection",
         "AsyncTransport",
+        "AsyncStreamingResponse",
         "AsyncOpenSearch",
         "AsyncHttpConnection",
         "AWSV4SignerAsyncAuth",
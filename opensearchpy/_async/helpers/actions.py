@@ -31,6 +31,7 @@
 
 import asyncio
 import logging
+import time
 from typing import (
     Any,
     AsyncGenerator,
@@ -44,28 +45,40 @@ from typing import (
     Union,
 )
 
-from ...compat import map
 from ...exceptions import TransportError
 from ...helpers.actions import (
     _ActionChunker,
+    _bulk_body,
+    _check_shards,
+    _page_bytes,
+    _pit_body,
     _process_bulk_chunk_error,
     _process_bulk_chunk_success,
+    _record_bulk_error,
+    _transport_kwargs,
     expand_action,
 )
-from ...helpers.errors import ScanError
+from ...helpers.adaptive import AdaptiveChunkController
 
 logger: logging.Logger = logging.getLogger("opensearchpy.helpers")
 
 
 async def _chunk_actions(
-    actions: Any, chunk_size: int, max_chunk_bytes: int, serializer: Any
+    actions: Any,
+    chunk_size: int,
+    max_chunk_bytes: int,
+    serializer: Any,
+    chunk_controller: Any = None,
 ) -> AsyncGenerator[Any, None]:
     """
-    Split actions into chunks by number or size, serialize them into strings in
+    Split actions into chunks by number or size, serialize them into bytes in
     the process.
     """
     chunker = _ActionChunker(
-        chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes, serializer=serializer
+        chunk_size=chunk_size,
+        max_chunk_bytes=max_chunk_bytes,
+        serializer=serializer,
+        chunk_controller=chunk_controller,
     )
     async for action, data in actions:
         ret = chunker.feed(action, data)
@@ -84,7 +97,8 @@ async def _process_bulk_chunk(
     raise_on_error: bool = True,
     ignore_status: Any = (),
     *args: Any,
-    **kwargs: Any
+    chunk_controller: Any = None,
+    **kwargs: Any,
 ) -> AsyncGenerator[Tuple[bool, Any], None]:
     """
     Send a bulk request to opensearch and process the output.
@@ -94,7 +108,16 @@ async def _process_bulk_chunk(
 
     try:
         # send the actual request
-        resp = await client.bulk("\n".join(bulk_actions) + "\n", *args, **kwargs)
+        if chunk_controller is None:
+            resp = await client.bulk(_bulk_body(bulk_actions), *args, **kwargs)
+        else:
+            started = time.monotonic()
+            try:
+                resp = await client.bulk(_bulk_body(bulk_actions), *args, **kwargs)
+            except TransportError as e:
+                _record_bulk_error(chunk_controller, started, len(bulk_data), e)
+                raise
+            chunk_controller.record_response(started, len(bulk_data), resp)
     except TransportError as e:
         gen = _process_bulk_chunk_error(
             error=e,
@@ -159,7 +182,8 @@ async def async_streaming_bulk(
     yield_ok: bool = True,
     ignore_status: Any = (),
     *args: Any,
-    **kwargs: Any
+    chunk_controller: Optional[AdaptiveChunkController] = None,
+    **kwargs: Any,
 ) -> AsyncGenerator[Tuple[bool, Any], None]:
     """
     Streaming bulk consumes actions from the iterable passed in and yields
@@ -193,66 +217,242 @@ async def async_streaming_bulk(
     :arg max_backoff: maximum number of seconds a retry will wait
     :arg yield_ok: if set to False will skip successful documents in the output
     :arg ignore_status: list of HTTP status code that you want to ignore
+    :arg chunk_controller: :class:`~opensearchpy.helpers.AdaptiveChunkController`
+        adapting the chunk size to the load of the cluster, in place of
+        ``chunk_size``
     """
 
     async def map_actions() -> Any:
         async for item in aiter(actions):
             yield expand_action_callback(item)
 
+    if chunk_controller is not None:
+        kwargs["chunk_controller"] = chunk_controller
+
     async for bulk_data, bulk_actions in _chunk_actions(
-        map_actions(), chunk_size, max_chunk_bytes, client.transport.serializer
+        map_actions(),
+        chunk_size,
+        max_chunk_bytes,
+        client.transport.serializer,
+        chunk_controller,
     ):
-        for attempt in range(max_retries + 1):
-            to_retry: Any = []
-            to_retry_data: Any = []
-            if attempt:
-                await asyncio.sleep(
-                    min(max_backoff, initial_backoff * 2 ** (attempt - 1))
-                )
+        async for item in _process_bulk_chunk_with_retries(
+            client,
+            bulk_actions,
+            bulk_data,
+            max_retries,
+            initial_backoff,
+            max_backoff,
+            yield_ok,
+            raise_on_exception,
+            raise_on_error,
+            ignore_status,
+            *args,
+            **kwargs,
+        ):
+            yield item
 
-            try:
-                async for data, (ok, info) in azip(
+
+async def _process_bulk_chunk_with_retries(
+    client: Any,
+    bulk_actions: Any,
+    bulk_data: Any,
+    max_retries: int,
+    initial_backoff: Union[float, int],
+    max_backoff: Union[float, int],
+    yield_ok: bool,
+    raise_on_exception: bool,
+    raise_on_error: bool,
+    ignore_status: Any,
+    *args: Any,
+    **kwargs: Any,
+) -> AsyncGenerator[Tuple[bool, Any], None]:
+    """
+    Send a chunk and yield its results, sending the documents rejected with
+    ``429`` again after a backoff, up to ``max_retries`` times.
+    """
+    for attempt in range(max_retries + 1):
+        to_retry: Any = []
+        to_retry_data: Any = []
+        # position of the current item's lines within bulk_actions
+        line = 0
+        if attempt:
+            await asyncio.sleep(min(max_backoff, initial_backoff * 2 ** (attempt - 1)))
+
+        try:
+            async for data, (ok, info) in azip(
+                bulk_data,
+                _process_bulk_chunk(
+                    client,
+                    bulk_actions,
                     bulk_data,
-                    _process_bulk_chunk(
-                        client,
-                        bulk_actions,
-                        bulk_data,
-                        raise_on_exception,
-                        raise_on_error,
-                        ignore_status,
-                        *args,
-                        **kwargs,
-                    ),
-                ):
-                    if not ok:
-                        action, info = info.popitem()
-                        # retry if retries enabled, we get 429, and we are not
-                        # in the last attempt
-                        if (
-                            max_retries
-                            and info["status"] == 429
-                            and (attempt + 1) <= max_retries
-                        ):
-                            # _process_bulk_chunk expects strings so we need to
-                            # re-serialize the data
-                            to_retry.extend(
-                                map(client.transport.serializer.dumps, data)
-                            )
-                            to_retry_data.append(data)
-                        else:
-                            yield ok, {action: info}
-                    elif yield_ok:
-                        yield ok, info
+                    raise_on_exception,
+                    raise_on_error,
+                    ignore_status,
+                    *args,
+                    **kwargs,
+                ),
+            ):
+                start, line = line, line + len(data)
+                if not ok:
+                    action, info = info.popitem()
+                    # retry if retries enabled, we get 429, and we are not
+                    # in the last attempt
+                    if (
+                        max_retries
+                        and info["status"] == 429
+                        and (attempt + 1) <= max_retries
+                    ):
+                        # reuse the already serialized lines
+                        to_retry.extend(bulk_actions[start:line])
+                        to_retry_data.append(data)
+                    else:
+                        yield ok, {action: info}
+                elif yield_ok:
+                    yield ok, info
 
-            except TransportError as e:
-                # suppress 429 errors since we will retry them
-                if attempt == max_retries or e.status_code != 429:
-                    raise
-            else:
-                if not to_retry:
-                    break
-                # retry only subset of documents that didn't succeed
-                bulk_actions, bulk_data = to_retry, to_retry_data
+        except TransportError as e:
+            # suppress 429 errors since we will retry them
+            if attempt == max_retries or e.status_code != 429:
+                raise
+        else:
+            if not to_retry:
+                break
+            # retry only subset of documents that didn't succeed
+            bulk_actions, bulk_data = to_retry, to_retry_data
+
+
+async def async_parallel_bulk(
+    client: Any,
+    actions: Any,
+    max_concurrency: int = 4,
+    chunk_size: int = 500,
+    max_chunk_bytes: int = 100 * 1024 * 1024,
+    max_inflight_bytes: int = 100 * 1024 * 1024,
+    expand_action_callback: Any = expand_action,
+    raise_on_exception: bool = True,
+    raise_on_error: bool = True,
+    ignore_status: Any = (),
+    chunk_controller: Optional[AdaptiveChunkController] = None,
+    max_retries: int = 0,
+    initial_backoff: Union[float, int] = 2,
+    max_backoff: Union[float, int] = 600,
+    *args: Any,
+    **kwargs: Any,
+) -> AsyncGenerator[Tuple[bool, Any], None]:
+    """
+    Parallel version of :func:`~opensearchpy.helpers.async_streaming_bulk`,
+    keeping up to ``max_concurrency`` bulk requests in flight on the event
+    loop. The results of a chunk are yielded once all of it has been
+    processed, in the order the chunks complete rather than the order of the
+    actions.
+
+    If you specify ``max_retries`` the documents of a chunk rejected with a
+    ``429`` status code are sent again after waiting ``initial_backoff``
+    seconds, doubling with every attempt up to ``max_backoff`` seconds, like
+    with ``async_streaming_bulk``. The other chunks keep being sent
+    meanwhile.
+
+    :arg client: instance of :class:`~opensearchpy.AsyncOpenSearch` to use
+    :arg actions: iterable or async iterable containing the actions to be executed
+    :arg max_concurrency: maximum number of bulk requests in flight
+    :arg chunk_size: number of docs in one chunk sent to client (default: 500)
+    :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
+    :arg max_inflight_bytes: maximum size of the chunks in flight (and waiting
+        to be retried) above which no new chunk is sent until one completes;
+        a single chunk is always sent (default: 100MB)
+    :arg raise_on_error: raise ``BulkIndexError`` containing errors (as `.errors`)
+        from the execution of the last chunk when some occur. By default we raise.
+    :arg raise_on_exception: if ``False`` then don't propagate exceptions from
+        call to ``bulk`` and just report the items that failed as failed.
+    :arg expand_action_callback: callback executed on each action passed in,
+        should return a tuple containing the action line and the data line
+        (`None` if data line should be omitted).
+    :arg ignore_status: list of HTTP status code that you want to ignore
+    :arg chunk_controller: :class:`~opensearchpy.helpers.AdaptiveChunkController`
+        adapting the chunk size and the number of requests in flight (up to
+        ``max_concurrency``) to the load of the cluster, in place of
+        ``chunk_size``
+    :arg max_retries: maximum number of times a document will be retried when
+        ``429`` is received, set to 0 (default) for no retries on ``429``
+    :arg initial_backoff: number of seconds we should wait before the first
+        retry. Any subsequent retries will be powers of ``initial_backoff *
+        2**retry_number``
+    :arg max_backoff: maximum number of seconds a retry will wait
+    """
+
+    async def map_actions() -> Any:
+        async for item in aiter(actions):
+            yield expand_action_callback(item)
+
+    if chunk_controller is not None:
+        # no more requests than max_concurrency can be in flight
+        chunk_controller.limit_concurrency(max_concurrency)
+        kwargs["chunk_controller"] = chunk_controller
+
+    async def process_chunk(bulk_data: Any, bulk_actions: Any) -> Any:
+        return [
+            item
+            async for item in _process_bulk_chunk_with_retries(
+                client,
+                bulk_actions,
+                bulk_data,
+                max_retries,
+                initial_backoff,
+                max_backoff,
+                True,
+                raise_on_exception,
+                raise_on_error,
+                ignore_status,
+                *args,
+                **kwargs,
+            )
+        ]
+
+    def concurrency() -> int:
+        if chunk_controller is None:
+            return max_concurrency
+        return chunk_controller.concurrency
+
+    # in flight tasks and the size of their chunk
+    pending: Any = {}
+    inflight_bytes = 0
+    try:
+        async for bulk_data, bulk_actions in _chunk_actions(
+            map_actions(),
+            chunk_size,
+            max_chunk_bytes,
+            client.transport.serializer,
+            chunk_controller,
+        ):
+            size = sum(len(line) + 1 for line in bulk_actions)
+            while pending and (
+                len(pending) >= concurrency()
+                or inflight_bytes + size > max_inflight_bytes
+            ):
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    inflight_bytes -= pending.pop(task)
+                    for item in task.result():
+                        yield item
+
+            task = asyncio.ensure_future(process_chunk(bulk_data, bulk_actions))
+            pending[task] = size
+            inflight_bytes += size
+
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                inflight_bytes -= pending.pop(task)
+                for item in task.result():
+                    yield item
+
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
 
 
 async def async_bulk(
@@ -261,7 +461,7 @@ async def async_bulk(
     stats_only: bool = False,
     ignore_status: Optional[Union[int, Collection[int]]] = (),
     *args: Any,
-    **kwargs: Any
+    **kwargs: Any,
 ) -> Tuple[int, Union[int, List[Any]]]:
     """
     Helper for the :meth:`~opensearchpy.AsyncOpenSearch.bulk` api that provides
@@ -322,7 +522,10 @@ async def async_scan(
     request_timeout: Any = None,
     clear_scroll: bool = True,
     scroll_kwargs: Any = None,
-    **kwargs: Any
+    prefetch: int = 0,
+    max_prefetch_bytes: Optional[int] = 100 * 1024 * 1024,
+    stream: bool = False,
+    **kwargs: Any,
 ) -> Any:
     """
     Simple abstraction on top of the
@@ -335,6 +538,15 @@ async def async_scan(
     may be an expensive operation and will negate the performance benefits of
     using ``scan``.
 
+    With ``prefetch`` set, the next pages are scrolled in a background task
+    while the hits of the current one are being consumed, overlapping the
+    round trips to the cluster with the processing of the hits.
+
+    With ``stream`` the hits are parsed one at a time as each page is read
+    from the connection, instead of parsing whole pages, so that the memory
+    used doesn't grow with the size of the pages. It can't be combined with
+    ``prefetch``.
+
     :arg client: instance of :class:`~opensearchpy.AsyncOpenSearch` to use
     :arg query: body for the :meth:`~opensearchpy.AsyncOpenSearch.search` api
     :arg scroll: Specify how long a consistent view of the index should be
@@ -352,6 +564,12 @@ async def async_scan(
         to true.
     :arg scroll_kwargs: additional kwargs to be passed to
         :meth:`~opensearchpy.AsyncOpenSearch.scroll`
+    :arg prefetch: number of pages fetched ahead, defaults to 0 which only
+        fetches a page once the previous one has been consumed
+    :arg max_prefetch_bytes: approximate upper bound of the size of the pages
+        fetched ahead, ``None`` to only bound them by ``prefetch``
+    :arg stream: parse the hits incrementally as they are read, see
+        :class:`~opensearchpy._async.streaming.AsyncStreamingResponse`
 
     Any additional keyword arguments will be passed to the initial
     :meth:`~opensearchpy.AsyncOpenSearch.search` call::
@@ -362,6 +580,59 @@ async def async_scan(
             doc_type="books"
         )
 
+    """
+    if stream and prefetch:
+        raise ValueError("stream and prefetch can't be combined")
+
+    pages = _async_prefetched(
+        _async_scroll_pages(
+            client,
+            query,
+            scroll,
+            raise_on_error,
+            preserve_order,
+            size,
+            request_timeout,
+            clear_scroll,
+            scroll_kwargs,
+            stream,
+            **kwargs,
+        ),
+        prefetch,
+        max_prefetch_bytes,
+    )
+    try:
+        async for hits in pages:
+            if stream:
+                async for hit in hits:
+                    yield hit
+            else:
+                for hit in hits:
+                    yield hit
+    finally:
+        await pages.aclose()
+
+
+async def _async_scroll_pages(
+    client: Any,
+    query: Any = None,
+    scroll: str = "5m",
+    raise_on_error: bool = True,
+    preserve_order: bool = False,
+    size: int = 1000,
+    request_timeout: Optional[float] = None,
+    clear_scroll: bool = True,
+    scroll_kwargs: Optional[Any] = None,
+    stream: bool = False,
+    **kwargs: Any,
+) -> Any:
+    """
+    Scroll through the hits of a search, yielding them page by page. The
+    scroll is cleared once done or when the generator is closed.
+
+    With ``stream`` the pages are async iterators over the hits parsed as
+    they are read from the connection, which must be consumed before the
+    next page.
     """
     scroll_kwargs = scroll_kwargs or {}
 
@@ -369,12 +640,7 @@ async def async_scan(
         query = query.copy() if query else {}
         query["sort"] = "_doc"
 
-    # Grab options that should be propagated to every
-    # API call within this helper instead of just 'search()'
-    transport_kwargs = {}
-    for key in ("headers", "api_key", "http_auth"):
-        if key in kwargs:
-            transport_kwargs[key] = kwargs[key]
+    transport_kwargs = _transport_kwargs(kwargs)
 
     # If the user is using 'scroll_kwargs' we want
     # to propagate there too, but to not break backwards
@@ -383,50 +649,42 @@ async def async_scan(
         for key, val in transport_kwargs.items():
             scroll_kwargs.setdefault(key, val)
 
+    if stream:
+        kwargs["stream"] = True
+        scroll_kwargs = dict(scroll_kwargs, stream=True)
+
     # initial search
     resp = await client.search(
         body=query, scroll=scroll, size=size, request_timeout=request_timeout, **kwargs
     )
-    scroll_id = resp.get("_scroll_id")
+    scroll_id = await resp.get("_scroll_id") if stream else resp.get("_scroll_id")
 
     try:
-        while scroll_id and resp.get("hits", {}).get("hits"):
-            for hit in resp.get("hits", {}).get("hits", []):
-                yield hit
+        while scroll_id:
+            if stream:
+                hits = await _async_streamed_hits(resp)
+            else:
+                hits = resp.get("hits", {}).get("hits")
+            if not hits:
+                break
+            yield hits
+
+            if stream:
+                # read what follows the hits to release the connection
+                _check_shards(await resp.read(), scroll_id, raise_on_error)
+            else:
+                _check_shards(resp, scroll_id, raise_on_error)
 
-            _shards = resp.get("_shards")
-
-            if _shards:
-                # Default to 0 if the value isn't included in the response
-                shards_successful = _shards.get("successful", 0)
-                shards_skipped = _shards.get("skipped", 0)
-                shards_total = _shards.get("total", 0)
-
-            # check if we have any errors
-            if (shards_successful + shards_skipped) < shards_total:
-                shards_message = "Scroll request has only succeeded on %d (+%d skipped) shards out of %d."
-                logger.warning(
-                    shards_message,
-                    shards_successful,
-                    shards_skipped,
-                    shards_total,
-                )
-                if raise_on_error:
-                    raise ScanError(
-                        scroll_id,
-                        shards_message
-                        % (
-                            shards_successful,
-                            shards_skipped,
-                            shards_total,
-                        ),
-                    )
             resp = await client.scroll(
                 body={"scroll_id": scroll_id, "scroll": scroll}, **scroll_kwargs
             )
-            scroll_id = resp.get("_scroll_id")
+            scroll_id = (
+                await resp.get("_scroll_id") if stream else resp.get("_scroll_id")
+            )
 
     finally:
+        if stream:
+            await resp.close()
         if scroll_id and clear_scroll:
             await client.clear_scroll(
                 body={"scroll_id": [scroll_id]},
@@ -435,6 +693,363 @@ async def async_scan(
             )
 
 
+async def _async_streamed_hits(resp: Any) -> Any:
+    """
+    Async iterator over the hits of a streamed response, or ``None`` when it
+    has none.
+    """
+    hits = resp.hits()
+    async for hit in hits:
+        return _async_prepend(hit, hits)
+    return None
+
+
+async def _async_prepend(first: Any, rest: Any) -> Any:
+    yield first
+    async for item in rest:
+        yield item
+
+
+async def _async_pit_pages(
+    client: Any,
+    pit_id: Any,
+    keep_alive: str = "5m",
+    query: Any = None,
+    size: Optional[int] = 1000,
+    raise_on_error: bool = True,
+    request_timeout: Optional[float] = None,
+    tiebreaker: Optional[str] = "_id",
+    **kwargs: Any,
+) -> Any:
+    """
+    Page through the hits of a search on a point in time with
+    ``search_after``, yielding them page by page.
+    """
+    body = _pit_body(query, tiebreaker)
+    search_after = body.pop("search_after", None)
+    while True:
+        body["pit"] = {"id": pit_id, "keep_alive": keep_alive}
+        if search_after is not None:
+            body["search_after"] = search_after
+
+        resp = await client.search(
+            body=body, size=size, request_timeout=request_timeout, **kwargs
+        )
+        # the id of a point in time may change between searches
+        pit_id = resp.get("pit_id", pit_id)
+        hits = resp.get("hits", {}).get("hits")
+        if not hits:
+            return
+
+        yield hits
+
+        _check_shards(resp, pit_id, raise_on_error, "Search")
+        if size is not None and len(hits) < size:
+            return
+        search_after = hits[-1]["sort"]
+
+
+async def _task_pages(
+    pages_list: Any,
+    queue_size: int,
+    on_error: Any = None,
+    max_bytes: Optional[int] = None,
+) -> Any:
+    """
+    Consume async generators of pages, each in its own task, and yield
+    ``(index, page)`` through a bounded queue as the pages come in.
+
+    When ``max_bytes`` is given the queue is also bounded by the approximate
+    size of the pages it holds; a page larger than ``max_bytes`` is still
+    queued once the queue is empty.
+
+    An exception raised by one of the generators is re-raised, unless
+    ``on_error`` is given in which case it is called with the index of the
+    generator and the exception, and the other generators keep going. Once
+    done, or when closed, all tasks are cancelled and the generators are
+    closed, clearing their cursors.
+    """
+    queue: Any = asyncio.Queue(queue_size)
+    buffered = asyncio.Condition()
+    buffered_bytes = [0]
+
+    async def reserve(size: int, limit: int) -> None:
+        async with buffered:
+            await buffered.wait_for(
+                lambda: not buffered_bytes[0] or buffered_bytes[0] + size <= limit
+            )
+            buffered_bytes[0] += size
+
+    async def run(index: int, pages: Any) -> None:
+        try:
+            try:
+                async for page in pages:
+                    size = 0
+                    if max_bytes is not None:
+                        size = _page_bytes(page)
+                        await reserve(size, max_bytes)
+                    await queue.put((index, page, None, size))
+            finally:
+                await pages.aclose()
+        except Exception as e:
+            await queue.put((index, None, e, 0))
+        await queue.put((index, None, None, 0))
+
+    tasks = [
+        asyncio.ensure_future(run(index, pages))
+        for index, pages in enumerate(pages_list)
+    ]
+
+    remaining = len(tasks)
+    try:
+        while remaining:
+            index, page, error, size = await queue.get()
+            if size:
+                async with buffered:
+                    buffered_bytes[0] -= size
+                    buffered.notify_all()
+            if error is not None:
+                if on_error is None:
+                    raise error
+                on_error(index, error)
+            elif page is None:
+                remaining -= 1
+            else:
+                yield index, page
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def async_parallel_scan(
+    client: Any,
+    query: Any = None,
+    slices: int = 4,
+    pit: bool = False,
+    scroll: str = "5m",
+    keep_alive: str = "5m",
+    raise_on_error: bool = True,
+    size: int = 1000,
+    request_timeout: Optional[float] = None,
+    clear_scroll: bool = True,
+    scroll_kwargs: Optional[Any] = None,
+    tiebreaker: Optional[str] = "_id",
+    queue_size: Optional[int] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Parallel version of :func:`~opensearchpy.helpers.async_scan`: the search
+    is split into ``slices`` slices, each scrolled through in its own task,
+    and the hits are yielded as they come in from any of the slices, in no
+    particular order.
+
+    By default each slice uses a sliced scroll. With ``pit=True`` a single
+    point in time is created instead, and each slice pages through it with
+    ``search_after``, sorting on ``tiebreaker`` (a field with unique values)
+    on top of the sort of the query.
+
+    Every scroll and the point in time are cleared once done, on error or
+    when the generator is closed.
+
+    :arg client: instance of :class:`~opensearchpy.AsyncOpenSearch` to use
+    :arg query: body for the :meth:`~opensearchpy.AsyncOpenSearch.search` api
+    :arg slices: number of slices scanned concurrently
+    :arg pit: use a point in time and ``search_after`` instead of scrolls
+    :arg scroll: Specify how long a consistent view of the index should be
+        maintained for scrolled search
+    :arg keep_alive: how long the point in time is kept alive between
+        searches, when ``pit`` is set
+    :arg raise_on_error: raises an exception (``ScanError``) if an error is
+        encountered (some shards fail to execute) and re-raises the exception
+        of a failing slice, stopping the others. If ``False`` a failing slice
+        is logged and the remaining slices keep going. By default we raise.
+    :arg size: size (per shard for scrolls) of the batch send at each
+        iteration.
+    :arg request_timeout: explicit timeout for each search call
+    :arg clear_scroll: explicitly calls delete on the scroll ids via the clear
+        scroll API at the end of the method on completion or error, defaults
+        to true.
+    :arg scroll_kwargs: additional kwargs to be passed to
+        :meth:`~opensearchpy.AsyncOpenSearch.scroll`
+    :arg tiebreaker: field sorted on last to page through a point in time
+    :arg queue_size: maximum number of pages buffered between the slices and
+        the consumer (default: twice the number of slices)
+
+    Any additional keyword arguments will be passed to the
+    :meth:`~opensearchpy.AsyncOpenSearch.search` calls, ``index`` to
+    :meth:`~opensearchpy.AsyncOpenSearch.create_pit` when ``pit`` is set.
+    """
+    transport_kwargs = _transport_kwargs(kwargs)
+
+    pit_id = None
+    if pit:
+        pit_id = (
+            await client.create_pit(
+                index=kwargs.pop("index", None),
+                keep_alive=keep_alive,
+                **transport_kwargs,
+            )
+        )["pit_id"]
+
+    def on_error(index: int, error: Exception) -> None:
+        logger.warning("Slice %d of the scan failed: %s", index, error)
+
+    slice_pages = None
+    try:
+        pages_list = []
+        for slice_id in range(slices):
+            body = query.copy() if query else {}
+            if slices > 1:
+                body["slice"] = {"id": slice_id, "max": slices}
+            if pit:
+                pages = _async_pit_pages(
+                    client,
+                    pit_id,
+                    keep_alive,
+                    body,
+                    size,
+                    raise_on_error,
+                    request_timeout,
+                    tiebreaker,
+                    **kwargs,
+                )
+            else:
+                pages = _async_scroll_pages(
+                    client,
+                    body,
+                    scroll,
+                    raise_on_error,
+                    False,
+                    size,
+                    request_timeout,
+                    clear_scroll,
+                    dict(scroll_kwargs or {}),
+                    **kwargs,
+                )
+            pages_list.append(pages)
+
+        slice_pages = _task_pages(
+            pages_list,
+            queue_size or 2 * slices,
+            None if raise_on_error else on_error,
+        )
+        async for _, hits in slice_pages:
+            for hit in hits:
+                yield hit
+
+    finally:
+        # stop all slices before deleting the point in time they are using
+        if slice_pages is not None:
+            await slice_pages.aclose()
+        if pit_id is not None:
+            await client.delete_pit(
+                body={"pit_id": [pit_id]}, ignore=(404,), **transport_kwargs
+            )
+
+
+async def _async_prefetched(
+    pages: Any, prefetch: int, max_prefetch_bytes: Optional[int] = None
+) -> Any:
+    """
+    Fetch up to ``prefetch`` pages of ``pages``, and up to approximately
+    ``max_prefetch_bytes`` of hits, ahead in a background task while the
+    current one is being consumed.
+    """
+    if not prefetch:
+        try:
+            async for page in pages:
+                yield page
+        finally:
+            await pages.aclose()
+        return
+
+    prefetched = _task_pages([pages], prefetch, max_bytes=max_prefetch_bytes)
+    try:
+        async for _, page in prefetched:
+            yield page
+    finally:
+        await prefetched.aclose()
+
+
+async def async_pit_scan(
+    client: Any,
+    query: Any = None,
+    index: Any = None,
+    keep_alive: str = "5m",
+    raise_on_error: bool = True,
+    size: Optional[int] = 1000,
+    request_timeout: Optional[float] = None,
+    tiebreaker: Optional[str] = "_id",
+    prefetch: int = 1,
+    max_prefetch_bytes: Optional[int] = 100 * 1024 * 1024,
+    **kwargs: Any,
+) -> Any:
+    """
+    Iterator over all hits of a search, like
+    :func:`~opensearchpy.helpers.async_scan` but paging with ``search_after``
+    through a point in time created with
+    :meth:`~opensearchpy.AsyncOpenSearch.create_pit` instead of scrolling.
+    Hits are yielded in the order of the ``sort`` of the query, with
+    ``tiebreaker`` (a field with unique values) appended to it so that every
+    page resumes exactly where the previous one ended.
+
+    While the hits of a page are being consumed the next ``prefetch`` pages
+    are fetched in a background task. The point in time is deleted once
+    done, on error or when the generator is closed.
+
+    :arg client: instance of :class:`~opensearchpy.AsyncOpenSearch` to use
+    :arg query: body for the :meth:`~opensearchpy.AsyncOpenSearch.search` api
+    :arg index: index(es) to create the point in time on
+    :arg keep_alive: how long the point in time is kept alive between
+        searches
+    :arg raise_on_error: raises an exception (``ScanError``) if an error is
+        encountered (some shards fail to execute). By default we raise.
+    :arg size: number of hits per page
+    :arg request_timeout: explicit timeout for each search call
+    :arg tiebreaker: field sorted on last to page through the point in time
+    :arg prefetch: number of pages fetched ahead, 0 to only fetch a page once
+        the previous one has been consumed
+    :arg max_prefetch_bytes: approximate upper bound of the size of the pages
+        fetched ahead, ``None`` to only bound them by ``prefetch``
+
+    Any additional keyword arguments will be passed to the
+    :meth:`~opensearchpy.AsyncOpenSearch.search` calls.
+    """
+    transport_kwargs = _transport_kwargs(kwargs)
+    pit_id = (
+        await client.create_pit(index=index, keep_alive=keep_alive, **transport_kwargs)
+    )["pit_id"]
+
+    pages = None
+    try:
+        pages = _async_prefetched(
+            _async_pit_pages(
+                client,
+                pit_id,
+                keep_alive,
+                query,
+                size,
+                raise_on_error,
+                request_timeout,
+                tiebreaker,
+                **kwargs,
+            ),
+            prefetch,
+            max_prefetch_bytes,
+        )
+        async for hits in pages:
+            for hit in hits:
+                yield hit
+
+    finally:
+        if pages is not None:
+            await pages.aclose()
+        await client.delete_pit(
+            body={"pit_id": [pit_id]}, ignore=(404,), **transport_kwargs
+        )
+
+
 async def async_reindex(
     client: Any,
     source_index: Union[str, Collection[str]],
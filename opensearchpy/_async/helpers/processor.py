@@ -0,0 +1,199 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import asyncio
+from typing import Any, Callable, Optional, Set
+
+from ...helpers.actions import expand_action
+from ...helpers.processor import _BulkProcessorBase, _failed_actions
+from .actions import _process_bulk_chunk
+
+
+class AsyncBulkProcessor(_BulkProcessorBase):
+    """
+    Async counterpart of :class:`~opensearchpy.helpers.BulkProcessor`, send
+    actions added one at a time by any number of tasks to the
+    :meth:`~opensearchpy.AsyncOpenSearch.bulk` api in the background::
+
+        async with AsyncBulkProcessor(client, on_failure=log_failure) as processor:
+            async for message in queue:
+                await processor.add({"_index": "events", "_source": message})
+
+    Chunks are sent from up to ``max_concurrency`` tasks, :meth:`add` waits
+    for one of them to complete when they are all in flight and the buffer
+    is full. ``on_success`` and ``on_failure`` are called on the event loop
+    and must not block. The processor must be used from a single event loop.
+
+    :arg client: instance of :class:`~opensearchpy.AsyncOpenSearch` to use
+    :arg chunk_size: number of docs in one chunk sent to client (default: 500)
+    :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
+    :arg flush_interval: maximum number of seconds an action is buffered
+        for, ``None`` to only send full chunks (default: 5)
+    :arg max_concurrency: maximum number of bulk requests in flight
+    :arg expand_action_callback: callback executed on each action passed in,
+        should return a tuple containing the action line and the data line
+        (`None` if data line should be omitted).
+    :arg on_success: callback called with the ``info`` of each successful action
+    :arg on_failure: callback called with the ``info`` of each failed action
+    :arg max_retries: maximum number of times a document will be retried when
+        ``429`` is received, set to 0 (default) for no retries on ``429``
+    :arg initial_backoff: number of seconds we should wait before the first
+        retry. Any subsequent retries will be powers of ``initial_backoff *
+        2**retry_number``
+    :arg max_backoff: maximum number of seconds a retry will wait
+
+    Any additional keyword arguments will be passed to
+    :meth:`~opensearchpy.AsyncOpenSearch.bulk`.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        chunk_size: int = 500,
+        max_chunk_bytes: int = 100 * 1024 * 1024,
+        flush_interval: Optional[float] = 5.0,
+        max_concurrency: int = 1,
+        expand_action_callback: Any = expand_action,
+        on_success: Optional[Callable[[Any], Any]] = None,
+        on_failure: Optional[Callable[[Any], Any]] = None,
+        max_retries: int = 0,
+        initial_backoff: float = 2,
+        max_backoff: float = 600,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(
+            client,
+            chunk_size,
+            max_chunk_bytes,
+            flush_interval,
+            max_concurrency,
+            expand_action_callback,
+            on_success,
+            on_failure,
+            max_retries,
+            initial_backoff,
+            max_backoff,
+            kwargs,
+        )
+        # created on first use, to be bound to the running loop
+        self._condition: Any = None
+        self._flusher: Any = None
+        self._tasks: Set[Any] = set()
+
+    async def __aenter__(self) -> "AsyncBulkProcessor":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.close()
+
+    def _start(self) -> Any:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+            if self.flush_interval is not None:
+                self._flusher = asyncio.ensure_future(self._flush_periodically())
+        return self._condition
+
+    async def add(self, action: Any) -> None:
+        """
+        Buffer an action, a document or action definition as accepted by
+        :func:`~opensearchpy.helpers.async_streaming_bulk`. Waits while the
+        buffer is full and ``max_concurrency`` requests are in flight.
+        """
+        action, data = self.expand_action_callback(action)
+        async with self._start():
+            chunk = self._buffer(action, data)
+            # wake up the flusher for the deadline of a new buffer
+            self._condition.notify_all()
+            if chunk is not None:
+                await self._send(chunk)
+
+    async def flush(self) -> None:
+        """Send the buffered actions and wait for the requests in flight."""
+        async with self._start():
+            await self._send(self._take_buffer())
+            await self._condition.wait_for(lambda: not self._in_flight)
+
+    async def close(self) -> None:
+        """
+        Send the buffered actions, wait for the requests in flight and stop
+        the processor. Adding actions afterwards raises.
+        """
+        async with self._start():
+            if self._closed:
+                return
+            self._closed = True
+            await self._send(self._take_buffer())
+            await self._condition.wait_for(
+                lambda: not self._in_flight and not self._waiting
+            )
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _send(self, chunk: Any) -> None:
+        """Send a chunk from a new task, with the condition held."""
+        if chunk is None:
+            return
+        self._waiting += 1
+        try:
+            await self._condition.wait_for(
+                lambda: self._in_flight < self.max_concurrency
+            )
+        finally:
+            self._waiting -= 1
+        self._in_flight += 1
+        task = asyncio.ensure_future(self._process_chunk(*chunk))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process_chunk(self, bulk_data: Any, bulk_actions: Any) -> None:
+        try:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    await asyncio.sleep(self._backoff(attempt))
+                try:
+                    results = [
+                        item
+                        async for item in _process_bulk_chunk(
+                            self.client,
+                            bulk_actions,
+                            bulk_data,
+                            False,
+                            False,
+                            **self.kwargs,
+                        )
+                    ]
+                except Exception as e:
+                    results = list(_failed_actions(bulk_data, e))
+                bulk_data, bulk_actions = self._collect(
+                    bulk_data, bulk_actions, results, attempt
+                )
+                if not bulk_data:
+                    break
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(
+                    lambda: self._closed or self._buffered_since is not None
+                )
+                if self._closed:
+                    return
+                delay = self._flush_delay()
+                if delay is not None and delay <= 0:
+                    await self._send(self._take_buffer())
+                    continue
+            # sleep with the condition released, a buffer flushed meanwhile
+            # gets a new deadline
+            await asyncio.sleep(delay or 0)
@@ -8,11 +8,11 @@
 # GitHub history for details.
 
 import copy
-from typing import Any, Sequence
+from typing import Any, Optional, Sequence
 
 from six import iteritems, string_types
 
-from opensearchpy._async.helpers.actions import aiter, async_scan
+from opensearchpy._async.helpers.actions import aiter, async_pit_scan, async_scan
 from opensearchpy.connection.async_connections import get_connection
 from opensearchpy.exceptions import IllegalOperation, TransportError
 from opensearchpy.helpers.aggs import A
@@ -431,7 +431,7 @@ class AsyncSearch(Request):
             )
         return self._response
 
-    async def scan(self) -> Any:
+    async def scan(self, prefetch: Optional[int] = None) -> Any:
         """
         Turn the search into a scan search and return a generator that will
         iterate over all the documents matching the query.
@@ -439,13 +439,48 @@ class AsyncSearch(Request):
         Use ``params`` method to specify any additional arguments you with to
         pass to the underlying ``async_scan`` helper from ``opensearchpy``
 
+        :arg prefetch: number of pages scrolled ahead in a background task
+            while the current one is being consumed
         """
         opensearch = await get_connection(self._using)
 
+        params = dict(self._params)
+        if prefetch is not None:
+            params["prefetch"] = prefetch
+
         async for hit in aiter(
-            async_scan(
-                opensearch, query=self.to_dict(), index=self._index, **self._params
-            )
+            async_scan(opensearch, query=self.to_dict(), index=self._index, **params)
+        ):
+            yield self._get_result(hit)
+
+    async def iterate(
+        self, keep_alive: str = "5m", tiebreaker: str = "_id", prefetch: int = 1
+    ) -> Any:
+        """
+        Return a generator that will iterate over all the documents matching
+        the query, in the order of its sort, paging with ``search_after``
+        through a point in time rather than scrolling. The next page is
+        fetched while the current one is being consumed, and the point in
+        time is deleted once done or when the generator is closed.
+
+        Use ``params`` method to specify any additional arguments you with to
+        pass to the underlying ``async_pit_scan`` helper from ``opensearchpy``
+
+        :arg keep_alive: how long the point in time is kept alive between
+            searches
+        :arg tiebreaker: field with unique values sorted on last
+        :arg prefetch: number of pages fetched ahead
+        """
+        opensearch = await get_connection(self._using)
+
+        async for hit in async_pit_scan(
+            opensearch,
+            query=self.to_dict(),
+            index=self._index,
+            keep_alive=keep_alive,
+            tiebreaker=tiebreaker,
+            prefetch=prefetch,
+            **self._params,
         ):
             yield self._get_result(hit)
 
@@ -28,13 +28,20 @@
 import asyncio
 import os
 import ssl
+import time
 import warnings
-from typing import Any, Collection, Mapping, Optional, Union
+from concurrent.futures import Executor
+from typing import Any, Collection, Dict, Mapping, Optional, Union
 
 import urllib3
 
 from ..compat import reraise_exceptions, urlencode
-from ..connection.base import Connection
+from ..connection.base import (
+    STREAM_CHUNK_SIZE,
+    Connection,
+    _is_streaming_body,
+    _iter_body,
+)
 from ..exceptions import (
     ConnectionError,
     ConnectionTimeout,
@@ -51,6 +58,12 @@ SSL_SHOW_WARN_DEFAULT = object()
 class AsyncConnection(Connection):
     """Base class for Async HTTP connection implementations"""
 
+    # request bodies at least this large are compressed in offload_executor
+    # (the default executor of the event loop if None) rather than on the
+    # event loop, see AsyncTransport
+    offload_threshold: Optional[int] = None
+    offload_executor: Optional[Executor] = None
+
     async def perform_request(
         self,
         method: str,
@@ -60,12 +73,87 @@ class AsyncConnection(Connection):
         timeout: Optional[Union[int, float]] = None,
         ignore: Collection[int] = (),
         headers: Optional[Mapping[str, str]] = None,
+        stream: bool = False,
     ) -> Any:
         raise NotImplementedError()
 
     async def close(self) -> None:
         raise NotImplementedError()
 
+    async def _compress_async(self, body: Any, headers: Dict[str, str]) -> Any:
+        """
+        Compress a request body like :meth:`_compress`, in the offload
+        executor if it is at least ``offload_threshold`` bytes.
+        """
+        if self.compression is not None and _is_streaming_body(body):
+            headers["content-encoding"] = self.compression.content_encoding
+            return self._compress_chunks_async(_aiter_body(body))
+        if (
+            self.compression is None
+            or not body
+            or self.offload_threshold is None
+            or len(body) < self.offload_threshold
+        ):
+            return self._compress(body, headers)
+        return await get_running_loop().run_in_executor(
+            self.offload_executor, self._compress, body, headers
+        )
+
+    async def _compress_chunks_async(self, chunks: Any) -> Any:
+        """Compress the chunks of a streamed request body like :meth:`_compress_chunks`."""
+        assert self.compression is not None
+        compressor = self.compression.compressobj()
+        size = compressed_size = 0
+        duration = 0.0
+        async for chunk in chunks:
+            start = time.perf_counter()
+            compressed = compressor.compress(chunk)
+            duration += time.perf_counter() - start
+            size += len(chunk)
+            compressed_size += len(compressed)
+            if compressed:
+                yield compressed
+        compressed = compressor.flush()
+        compressed_size += len(compressed)
+        self.metrics.request_compressed(size, compressed_size, duration)
+        yield compressed
+
+    async def _iter_chunks(self, response: Any) -> Any:
+        """Yield the body of a streamed response, then release the connection."""
+        try:
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                yield chunk
+        except reraise_exceptions:
+            raise
+        except Exception as e:
+            if isinstance(
+                e, (asyncio.TimeoutError, aiohttp_exceptions.ServerTimeoutError)
+            ):
+                raise ConnectionTimeout("TIMEOUT", str(e), e)
+            raise ConnectionError("N/A", str(e), e)
+        finally:
+            response.release()
+
+
+async def _single_chunk(data: bytes) -> Any:
+    yield data
+
+
+async def _aiter_body(body: Any) -> Any:
+    """
+    Yield the chunks of a streamed request body as ``bytes``. File objects
+    are read on the event loop, ``STREAM_CHUNK_SIZE`` bytes at a time.
+    """
+    if not hasattr(body, "__aiter__"):
+        for chunk in _iter_body(body):
+            yield chunk
+        return
+    async for chunk in body:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8", "surrogatepass")
+        if chunk:
+            yield chunk
+
 
 class AIOHttpConnection(AsyncConnection):
     session: aiohttp.ClientSession
@@ -89,10 +177,12 @@ class AIOHttpConnection(AsyncConnection):
         maxsize: Optional[int] = 10,
         headers: Any = None,
         ssl_context: Any = None,
-        http_compress: Optional[bool] = None,
+        http_compress: Any = None,
         opaque_id: Optional[str] = None,
         loop: Any = None,
         trust_env: Optional[bool] = False,
+        offload_threshold: Optional[int] = None,
+        offload_executor: Optional[Executor] = None,
         **kwargs: Any
     ) -> None:
         """
@@ -123,10 +213,16 @@ class AIOHttpConnection(AsyncConnection):
             host. See https://urllib3.readthedocs.io/en/1.4/pools.html#api for more
             information.
         :arg headers: any custom http headers to be add to requests
-        :arg http_compress: Use gzip compression
+        :arg http_compress: Use gzip compression, or a
+            :class:`~opensearchpy.Compression` policy
         :arg opaque_id: Send this value in the 'X-Opaque-Id' HTTP header
             For tracing all requests made by this transport.
         :arg loop: asyncio Event Loop to use with aiohttp. This is set by default to the currently running loop.
+        :arg offload_threshold: size in bytes from which request bodies are
+            compressed in ``offload_executor`` instead of on the event loop
+        :arg offload_executor: :class:`concurrent.futures.Executor` to
+            compress large bodies in, the default executor of the event loop
+            if ``None``
         """
 
         self.headers = {}
@@ -225,6 +321,9 @@ class AIOHttpConnection(AsyncConnection):
         self._ssl_context = ssl_context
         self._trust_env = trust_env
 
+        self.offload_threshold = offload_threshold
+        self.offload_executor = offload_executor
+
     async def perform_request(
         self,
         method: str,
@@ -234,6 +333,7 @@ class AIOHttpConnection(AsyncConnection):
         timeout: Optional[Union[int, float]] = None,
         ignore: Collection[int] = (),
         headers: Optional[Mapping[str, str]] = None,
+        stream: bool = False,
     ) -> Any:
         if self.session is None:
             await self._create_aiohttp_session()
@@ -287,26 +387,37 @@ class AIOHttpConnection(AsyncConnection):
         if headers:
             req_headers.update(headers)
 
-        if self.http_compress and body:
-            body = self._gzip_compress(body)
-            req_headers["content-encoding"] = "gzip"
+        body = await self._compress_async(body, req_headers)
+        if _is_streaming_body(body):
+            # aiohttp sends async iterables with chunked transfer encoding
+            body = _aiter_body(body)
 
         start = self.loop.time()
         try:
-            async with self.session.request(
+            request = self.session.request(
                 method,
                 url,
                 data=body,
                 headers=req_headers,
                 timeout=timeout,
                 fingerprint=self.ssl_assert_fingerprint,
-            ) as response:
-                if is_head:  # We actually called 'GET' so throw away the data.
-                    await response.release()
-                    raw_data = ""
+            )
+            if stream and not is_head:
+                # the connection is released once the body has been read
+                response = await request
+                if 200 <= response.status < 300:
+                    raw_data = None
                 else:
-                    raw_data = await response.text()
-                duration = self.loop.time() - start
+                    async with response:
+                        raw_data = await response.read()
+            else:
+                async with request as response:
+                    if is_head:  # We actually called 'GET' so throw away the data.
+                        await response.release()
+                        raw_data = b""
+                    else:
+                        raw_data = await response.read()
+            duration = self.loop.time() - start
 
         # We want to reraise a cancellation or recursion error.
         except reraise_exceptions:
@@ -353,6 +464,14 @@ class AIOHttpConnection(AsyncConnection):
             method, url, url_path, orig_body, response.status, raw_data, duration
         )
 
+        if raw_data is None:
+            return response.status, response.headers, self._iter_chunks(response)
+        if stream:
+            return (
+                response.status,
+                response.headers,
+                _single_chunk(raw_data),
+            )
         return response.status, response.headers, raw_data
 
     async def close(self) -> Any:
@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Tuple
+
+from ..streaming import HitsParser
+
+
+class AsyncStreamingResponse:
+    """
+    Async counterpart of :class:`~opensearchpy.streaming.StreamingResponse`,
+    returned for requests sent with ``stream=True`` through
+    :class:`~opensearchpy.AsyncOpenSearch`::
+
+        resp = await client.search(index="logs", body=query, stream=True)
+        async with resp:
+            async for hit in resp.hits():
+                ...
+
+    Fields other than ``hits.hits`` are available in :attr:`body` and through
+    ``await resp.get("_scroll_id")``. Fields that come after ``hits.hits``
+    in the body are only read once the hits have been consumed.
+    """
+
+    def __init__(self, chunks: AsyncIterable[bytes]) -> None:
+        self.body: Dict[str, Any] = {}
+        self._chunks = chunks.__aiter__()
+        self._parser = HitsParser()
+        self._at_hits = False
+        self._hits_started = False
+        self._done = False
+
+    async def __aenter__(self) -> Any:
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.close()
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Return the top level field ``key`` of the response."""
+        if key not in self.body:
+            await self._read_fields()
+        return self.body.get(key, default)
+
+    async def hits(self) -> AsyncIterator[Any]:
+        """Yield the hits of ``hits.hits`` as they are parsed."""
+        if self._hits_started:
+            raise ValueError("The hits of a streamed response can only be read once")
+        await self._read_fields()
+        self._hits_started = True
+        while self._at_hits and not self._done:
+            event = await self._next_event()
+            if event[0] == "hit":
+                yield event[1]
+            else:
+                await self._handle(event)
+
+    async def read(self) -> Any:
+        """Parse the rest of the response and return it as a ``dict``."""
+        hits = None
+        if not self._hits_started:
+            hits = [hit async for hit in self.hits()]
+        await self._read_fields()
+        if hits is not None and isinstance(self.body.get("hits"), dict):
+            self.body["hits"]["hits"] = hits
+        return self.body
+
+    async def close(self) -> None:
+        """Release the connection without reading the rest of the body."""
+        self._done = True
+        aclose = getattr(self._chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    async def _read_fields(self) -> None:
+        # parse up to the hits, or past them once they are being iterated
+        while not self._done and not (self._at_hits and not self._hits_started):
+            event = await self._next_event()
+            if event[0] != "hit":
+                await self._handle(event)
+
+    async def _handle(self, event: Tuple[Any, ...]) -> None:
+        kind = event[0]
+        if kind == "field":
+            self.body[event[1]] = event[2]
+        elif kind == "hits_field":
+            self.body.setdefault("hits", {})[event[1]] = event[2]
+        elif kind == "hits_start":
+            self.body.setdefault("hits", {})
+            self._at_hits = True
+        elif kind == "hits_end":
+            self._at_hits = False
+        elif kind == "end":
+            await self.close()
+
+    async def _next_event(self) -> Tuple[Any, ...]:
+        while True:
+            event = self._parser.next_event()
+            if event is not None:
+                return event
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self._parser.feed_eof()
+            else:
+                self._parser.feed(chunk)
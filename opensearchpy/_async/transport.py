@@ -27,10 +27,12 @@
 
 import asyncio
 import logging
+import time
+from concurrent.futures import Executor
 from itertools import chain
-from typing import Any, Collection, Mapping, Optional, Type, Union
+from typing import Any, Collection, Dict, Mapping, Optional, Set, Type, Union
 
-from opensearchpy.connection.base import Connection
+from opensearchpy.connection.base import Connection, _is_streaming_body, _tell
 from opensearchpy.serializer import Serializer
 
 from ..connection_pool import ConnectionPool
@@ -41,13 +43,60 @@ from ..exceptions import (
     TransportError,
 )
 from ..serializer import JSONSerializer
-from ..transport import Transport, get_host_info
+from ..transport import (
+    Transport,
+    _attempt_timeout,
+    _breaker_pool,
+    _coalescing_key,
+    _Hedging,
+    _is_idempotent_read,
+    _is_json,
+    _is_node_failure,
+    get_host_info,
+)
 from .compat import get_running_loop
 from .http_aiohttp import AIOHttpConnection
+from .streaming import AsyncStreamingResponse
 
 logger = logging.getLogger("opensearch")
 
 
+# values of a request body looked at to estimate its size, bodies with more
+# values are assumed to be large
+_MAX_SIZED_VALUES = 1000
+
+
+def _is_large(body: Any, threshold: int) -> bool:
+    """
+    Estimate whether a request body serializes to at least ``threshold``
+    bytes from the length of its strings, looking at a bounded number of its
+    values so that the estimate stays cheap next to the serialization.
+    """
+    size = 0
+    count = 1
+    values = [body]
+    while values:
+        value = values.pop()
+        if isinstance(value, (str, bytes)):
+            size += len(value) + 2
+        elif isinstance(value, dict):
+            count += 2 * len(value)
+            if count > _MAX_SIZED_VALUES:
+                return True
+            values.extend(value.keys())
+            values.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            count += len(value)
+            if count > _MAX_SIZED_VALUES:
+                return True
+            values.extend(value)
+        else:
+            size += 8
+        if size >= threshold:
+            return True
+    return False
+
+
 class AsyncTransport(Transport):
     """
     Encapsulation of transport-related to logic. Handles instantiation of the
@@ -59,6 +108,8 @@ class AsyncTransport(Transport):
     DEFAULT_CONNECTION_CLASS = AIOHttpConnection
 
     sniffing_task: Any = None
+    _sniffer_task: Any = None
+    _sniffer_wakeup: Any
 
     def __init__(
         self,
@@ -76,7 +127,15 @@ class AsyncTransport(Transport):
         max_retries: int = 3,
         retry_on_status: Any = (502, 503, 504),
         retry_on_timeout: bool = False,
+        retry_policy: Any = None,
+        deadline: Optional[float] = None,
         send_get_body_as: str = "GET",
+        hedge_after: Any = None,
+        hedge_budget: float = 0.1,
+        coalesce_requests: bool = False,
+        search_cache: Any = None,
+        offload_threshold: Optional[int] = None,
+        offload_executor: Optional[Executor] = None,
         **kwargs: Any
     ) -> None:
         """
@@ -89,7 +148,8 @@ class AsyncTransport(Transport):
             producing a list of arguments (same as `hosts` parameter)
         :arg sniff_on_start: flag indicating whether to obtain a list of nodes
             from the cluster at startup time
-        :arg sniffer_timeout: number of seconds between automatic sniffs
+        :arg sniffer_timeout: number of seconds between automatic sniffs,
+            done by a background task
         :arg sniff_on_connection_fail: flag controlling if connection failure triggers a sniff
         :arg sniff_timeout: timeout used for the sniff request - it should be a
             fast api call and we are talking potentially to more nodes so we want
@@ -106,11 +166,46 @@ class AsyncTransport(Transport):
             on a different node. defaults to ``(502, 503, 504)``
         :arg retry_on_timeout: should timeout trigger a retry on different
             node? (default `False`)
+        :arg retry_policy: :class:`~opensearchpy.RetryPolicy` instance adding
+            a jittered exponential backoff before retries and limiting them to
+            a ratio of the requests. Retries are sent right away by default
+        :arg deadline: default number of seconds a request may take in total,
+            including waiting for the initial sniff, its retries and the
+            backoff between them. The request in flight is cancelled when it
+            passes. Can be overridden per request with the ``deadline``
+            parameter. Requests are only bound by their timeout and retries
+            by default
         :arg send_get_body_as: for GET requests with body this option allows
             you to specify an alternate way of execution for environments that
             don't support passing bodies with GET requests. If you set this to
             'POST' a POST method will be used instead, if to 'source' then the body
             will be serialized and passed as a query parameter `source`.
+        :arg hedge_after: send a second copy of idempotent reads (``search``,
+            ``get``, ``mget``, ``msearch`` and ``count``) to another node when
+            the first node hasn't answered after this many seconds, or after
+            a percentile of the observed latencies such as ``"p95"``; the first
+            response wins and the other request is cancelled. Disabled by
+            default.
+        :arg hedge_budget: maximum ratio of hedged requests to the requests
+            that could be hedged, defaults to ``0.1``
+        :arg coalesce_requests: share the response of identical idempotent
+            reads sent concurrently, so that only one of them reaches the
+            cluster. Every caller deserializes its own copy of the response
+            and the requests saved are reported to
+            :meth:`~opensearchpy.Metrics.request_coalesced`. Defaults to
+            ``False``
+        :arg search_cache: :class:`~opensearchpy.SearchCache` instance to
+            answer identical searches from, until they expire or the indices
+            they target are written to through this client
+        :arg offload_threshold: size in bytes from which request bodies are
+            serialized and compressed, and response bodies deserialized, in
+            ``offload_executor`` instead of on the event loop, so that large
+            bodies don't hold up the other tasks. The size of request bodies
+            that aren't serialized yet is estimated from their strings.
+            Disabled by default
+        :arg offload_executor: :class:`concurrent.futures.Executor` to run
+            the work on large bodies in, the default executor of the event
+            loop if ``None``
 
         Any extra keyword arguments will be passed to the `connection_class`
         when creating and instance unless overridden by that connection's
@@ -119,8 +214,16 @@ class AsyncTransport(Transport):
         self.sniffing_task = None
         self.loop: Any = None
         self._async_init_called = False
+        self._probe_tasks: Set[Any] = set()
         self._sniff_on_start_event: Optional[asyncio.Event] = None
 
+        self.offload_threshold = offload_threshold
+        self.offload_executor = offload_executor
+        if offload_threshold is not None:
+            # the connections compress the request bodies
+            kwargs["offload_threshold"] = offload_threshold
+            kwargs["offload_executor"] = offload_executor
+
         super(AsyncTransport, self).__init__(
             hosts=[],
             connection_class=connection_class,
@@ -136,8 +239,12 @@ class AsyncTransport(Transport):
             max_retries=max_retries,
             retry_on_status=retry_on_status,
             retry_on_timeout=retry_on_timeout,
+            retry_policy=retry_policy,
+            deadline=deadline,
             send_get_body_as=send_get_body_as,
-            **kwargs
+            coalesce_requests=coalesce_requests,
+            search_cache=search_cache,
+            **kwargs,
         )
 
         # Since we defer connections / sniffing to not occur
@@ -146,6 +253,10 @@ class AsyncTransport(Transport):
         self.hosts = hosts
         self.sniff_on_start = sniff_on_start
 
+        # hedged requests are tasks on the event loop, not threads
+        if hedge_after is not None:
+            self._hedging = _Hedging(hedge_after, hedge_budget)
+
     async def _async_init(self) -> None:
         """This is our stand-in for an async constructor. Everything
         that was deferred within __init__() should be done here now.
@@ -188,6 +299,12 @@ class AsyncTransport(Transport):
             finally:
                 self._sniff_on_start_event.set()
 
+        if self.sniffer_timeout:
+            self._sniffer_wakeup = asyncio.Event()
+            self._sniffer_task = self.loop.create_task(
+                self._sniff_periodically(self.sniffer_timeout)
+            )
+
     async def _async_call(self) -> None:
         """This method is called within any async method of AsyncTransport
         where the transport is not closing. This will check to see if we should
@@ -205,10 +322,6 @@ class AsyncTransport(Transport):
             # avoid an 'await' by checking 'not event.is_set()' above first.
             await self._sniff_on_start_event.wait()
 
-        if self.sniffer_timeout:
-            if self.loop.time() >= self.last_sniff + self.sniffer_timeout:
-                self.create_sniff_task()
-
     async def _get_node_info(self, conn: Any, initial: Any) -> Any:
         try:
             # use small timeout for the sniffing request, should be a fast api call
@@ -222,7 +335,9 @@ class AsyncTransport(Transport):
             pass
         return None
 
-    async def _get_sniff_data(self, initial: Any = False) -> Any:
+    async def _get_sniff_data(
+        self, initial: Any = False, deadline: Optional[float] = None
+    ) -> Any:
         previous_sniff = self.last_sniff
 
         # reset last_sniff timestamp
@@ -284,9 +399,12 @@ class AsyncTransport(Transport):
             for task in chain(done, tasks):
                 task.cancel()
 
-    async def sniff_hosts(self, initial: bool = False) -> Any:
+    async def sniff_hosts(
+        self, initial: bool = False, deadline: Optional[float] = None
+    ) -> Any:
         """Either spawns a sniffing_task which does regular sniffing
         over time or does a single sniffing session and awaits the results.
+        ``deadline`` is unused, requests never wait for a sniff to complete.
         """
         # Without a loop we can't do anything.
         if not self.loop:
@@ -312,6 +430,30 @@ class AsyncTransport(Transport):
             if c not in self.connection_pool.connections:
                 await c.close()
 
+    async def _sniff_periodically(self, sniffer_timeout: float) -> None:
+        """
+        Background task sniffing every ``sniffer_timeout`` seconds until the
+        transport is closed, so that requests never wait for a sniff.
+        """
+        while True:
+            delay = self.last_sniff + sniffer_timeout - self.loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._sniffer_wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._sniffer_wakeup.clear()
+                continue
+            try:
+                self.create_sniff_task()
+                await self.sniffing_task
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Sniffing the cluster failed: %s", e)
+                # try again once sniffer_timeout is over
+                self.last_sniff = self.loop.time()
+
     def create_sniff_task(self, initial: bool = False) -> None:
         """
         Initiate a sniffing task. Make sure we only have one sniff request
@@ -328,26 +470,155 @@ class AsyncTransport(Transport):
         if self.sniffing_task is None:
             self.sniffing_task = self.loop.create_task(self.sniff_hosts(initial))
 
-    def mark_dead(self, connection: Connection) -> None:
+    def mark_dead(
+        self, connection: Connection, deadline: Optional[float] = None
+    ) -> None:
         """
         Mark a connection as dead (failed) in the connection pool. If sniffing
-        on failure is enabled this will initiate the sniffing process.
+        on failure is enabled this will initiate the sniffing process, in a
+        task that the request doesn't wait for.
 
         :arg connection: instance of :class:`~opensearchpy.Connection` that failed
+        :arg deadline: unused, the sniffing is not bound by the request deadline
         """
         self.connection_pool.mark_dead(connection)
         if self.sniff_on_connection_fail:
             self.create_sniff_task()
 
     def get_connection(self) -> Any:
-        return self.connection_pool.get_connection()
+        pool = self.connection_pool
+        for connection in pool.connections_to_probe():
+            self._start_probe(pool, connection)
+        return pool.get_connection()
+
+    def _start_probe(self, pool: Any, connection: Any) -> None:
+        """Probe ``connection`` of ``pool`` in a background task"""
+        task = self.loop.create_task(self._probe(pool, connection))
+        self._probe_tasks.add(task)
+        task.add_done_callback(self._probe_tasks.discard)
+
+    async def _probe(self, pool: Any, connection: Any) -> None:  # type: ignore
+        """
+        Send the probes of a half-open circuit breaker, lightweight ``HEAD /``
+        requests, and report whether they all succeeded to the connection
+        pool holding the breaker: ``pool``, or the pool that took it over if
+        sniffing replaced ``pool`` since.
+        """
+        breaker = pool.breakers[connection]
+        success = True
+        for _ in range(breaker.probes):
+            try:
+                await connection.perform_request(
+                    "HEAD", "/", timeout=breaker.probe_timeout
+                )
+            except Exception:
+                success = False
+                break
+        _breaker_pool(self.connection_pool, pool, connection).probe_finished(
+            connection, success
+        )
+
+    async def _send(self, connection: Any, *args: Any, **kwargs: Any) -> Any:
+        """Send a request on ``connection``, tracking it in the connection pool"""
+        self.connection_pool.request_started(connection)
+        start = time.monotonic()
+        failed = False
+        try:
+            return await connection.perform_request(*args, **kwargs)
+        except TransportError as e:
+            failed = _is_node_failure(e)
+            raise
+        finally:
+            self.connection_pool.request_finished(
+                connection, time.monotonic() - start, failed
+            )
+
+    async def _send_hedged(self, connection: Any, *args: Any, **kwargs: Any) -> Any:
+        """
+        Send an idempotent read on ``connection`` and, if it hasn't answered
+        within the hedging delay, a copy of it on another connection. Return
+        the connection that answered first along with its response, the other
+        request is cancelled. If both fail the error of ``connection`` is
+        raised.
+        """
+        hedging: Any = self._hedging
+        delay = hedging.start()
+
+        async def send() -> Any:
+            start = time.monotonic()
+            response = await self._send(connection, *args, **kwargs)
+            hedging.record(time.monotonic() - start)
+            return response
+
+        if delay is None:
+            return connection, await send()
+
+        first = self.loop.create_task(send())
+        tasks = {first: connection}
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            if not done:
+                other = self._get_hedge_connection(connection)
+                if other is not None and hedging.acquire():
+                    second = self.loop.create_task(self._send(other, *args, **kwargs))
+                    tasks[second] = other
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return tasks[task], task.result()
+            return connection, first.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+                if task.done() and not task.cancelled():
+                    # don't log the error of a discarded request
+                    task.exception()
+
+    async def _send_coalesced(
+        self, key: Any, connection: Any, hedge: bool, *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Send an idempotent read, or wait for the response of an identical
+        read already in flight. Return the connection the response came from
+        along with the response, or raise the error the request failed with.
+        When the read waited for failed its error is returned along with
+        ``None`` instead: the connection that failed is not the one passed
+        in, and the caller that sent the read handles its failure.
+        The shared request is a task of its own so that cancelling one of the
+        callers doesn't cancel it for the others.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            if hedge:
+                send = self._send_hedged(connection, *args, **kwargs)
+            else:
+                send = self._send_with_connection(connection, *args, **kwargs)
+            task = self._in_flight[key] = self.loop.create_task(send)
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            return await asyncio.shield(task)
+
+        self.metrics.request_coalesced()
+        try:
+            return await asyncio.shield(task)
+        except Exception as e:
+            return None, e
+
+    async def _send_with_connection(
+        self, connection: Any, *args: Any, **kwargs: Any
+    ) -> Any:
+        return connection, await self._send(connection, *args, **kwargs)
 
     async def perform_request(
         self,
         method: str,
         url: str,
         params: Optional[Mapping[str, Any]] = None,
-        body: Optional[bytes] = None,
+        body: Any = None,
         timeout: Optional[Union[int, float]] = None,
         ignore: Collection[int] = (),
         headers: Optional[Mapping[str, str]] = None,
@@ -371,26 +642,100 @@ class AsyncTransport(Transport):
             underlying :class:`~opensearchpy.Connection` class for serialization
         :arg body: body of the request, will be serialized using serializer and
             passed to the connection
-        """
-        await self._async_call()
 
+        A file object, an iterator (e.g. a generator) or an async iterable of
+        ``bytes`` or ``str`` chunks as ``body`` is not serialized but streamed
+        with chunked transfer encoding as it is read, e.g. to send a large
+        bulk file without loading it in memory. It is only retried if it can
+        be rewound (a seekable file) and its responses are not cached.
+
+        With ``stream=True`` in ``params`` a JSON response is returned as an
+        :class:`~opensearchpy._async.streaming.AsyncStreamingResponse` parsing
+        the body as it is read from the connection. Failures while reading the
+        body are not retried.
+
+        With ``deadline`` in ``params`` (or the transport's ``deadline``) the
+        whole call, retries included, takes at most that many seconds; each
+        attempt gets the time left as its timeout and is cancelled when it
+        passes, raising :class:`~opensearchpy.ConnectionTimeout`.
+        """
+        deadline = self._resolve_deadline(params)
+        if deadline is None:
+            await self._async_call()
+        else:
+            # don't cancel the initialization for the other requests waiting on it
+            await self._within_deadline(asyncio.shield(self._async_call()), deadline)
+
+        stream = self._resolve_stream(method, params)
+        search_body = body
+        if (
+            self.offload_threshold is not None
+            and body is not None
+            and not isinstance(body, (str, bytes))
+            and not _is_streaming_body(body)
+            and _is_large(body, self.offload_threshold)
+        ):
+            body = await self.loop.run_in_executor(
+                self.offload_executor, self.serializer.dumps_bytes, body
+            )
         method, params, body, ignore, timeout = self._resolve_request_args(
             method, params, body
         )
 
+        streamed = _is_streaming_body(body)
+        position = _tell(body) if streamed else None
+
+        cache_key, generation = None, 0
+        if self.search_cache is not None and not stream and not streamed:
+            cache_key = self.search_cache.key(method, url, params, search_body, headers)
+            if cache_key is not None:
+                generation = self.search_cache.generation
+                cached = self.search_cache.get(cache_key)
+                if cached is not None:
+                    return await self._deserialize_async(*cached)
+        request = (method, url, params, body)
+        options: Dict[str, Any] = {
+            "headers": headers,
+            "ignore": ignore,
+            "timeout": timeout,
+        }
+        if stream:
+            options["stream"] = True
+
+        read = not stream and not streamed and _is_idempotent_read(method, url)
+        hedge = read and self._hedging is not None
+        key = None
+        if read and self.coalesce_requests:
+            key = _coalescing_key(request, options)
+
+        if self.retry_policy is not None:
+            self.retry_policy.request_started()
+
         for attempt in range(self.max_retries + 1):
             connection = self.get_connection()
+            if deadline is not None:
+                options["timeout"] = _attempt_timeout(connection, timeout, deadline)
 
             try:
-                status, headers_response, data = await connection.perform_request(
-                    method,
-                    url,
-                    params,
-                    body,
-                    headers=headers,
-                    ignore=ignore,
-                    timeout=timeout,
-                )
+                if key is not None:
+                    connection, response = await self._within_deadline(
+                        self._send_coalesced(
+                            key, connection, hedge, *request, **options
+                        ),
+                        deadline,
+                    )
+                    if connection is None:
+                        raise response
+                elif hedge:
+                    connection, response = await self._within_deadline(
+                        self._send_hedged(connection, *request, **options),
+                        deadline,
+                    )
+                else:
+                    response = await self._within_deadline(
+                        self._send(connection, *request, **options), deadline
+                    )
+                status, headers_response, data = response
 
                 # Lowercase all the header names for consistency in accessing them.
                 headers_response = {
@@ -399,6 +744,12 @@ class AsyncTransport(Transport):
             except TransportError as e:
                 if method == "HEAD" and e.status_code == 404:
                     return False
+                if self.search_cache is not None and cache_key is None:
+                    # a write that failed may still have been applied
+                    self.search_cache.request_completed(method, url)
+                if deadline is not None and time.monotonic() >= deadline:
+                    # out of time, not necessarily a failure of the node
+                    raise e
 
                 retry = False
                 if isinstance(e, ConnectionTimeout):
@@ -410,15 +761,30 @@ class AsyncTransport(Transport):
 
                 if retry:
                     try:
-                        # only mark as dead if we are retrying
-                        self.mark_dead(connection)
+                        # only mark as dead if we are retrying, and if the
+                        # request failed on this connection rather than on
+                        # the one of a coalesced read
+                        if connection is not None:
+                            self.mark_dead(connection)
                     except TransportError:
                         # If sniffing on failure, it could fail too. Catch the
                         # exception not to interrupt the retries.
                         pass
-                    # raise exception on last retry
-                    if attempt == self.max_retries:
+                    # raise exception on last retry, or if the body is gone
+                    if attempt == self.max_retries or (streamed and position is None):
+                        raise e
+                    backoff = 0.0
+                    if self.retry_policy is not None:
+                        if not self.retry_policy.acquire():
+                            raise e
+                        backoff = self.retry_policy.backoff_time(attempt)
+                    # or once there is no time left to retry
+                    if deadline is not None and time.monotonic() + backoff >= deadline:
                         raise e
+                    if backoff:
+                        await asyncio.sleep(backoff)
+                    if position is not None:
+                        body.seek(position)
                 else:
                     raise e
 
@@ -426,19 +792,68 @@ class AsyncTransport(Transport):
                 # connection didn't fail, confirm its live status
                 self.connection_pool.mark_live(connection)
 
+                if self.search_cache is not None:
+                    if cache_key is None:
+                        self.search_cache.request_completed(method, url)
+                    elif 200 <= status < 300:
+                        self.search_cache.put(
+                            cache_key, generation, headers_response, data
+                        )
+
                 if method == "HEAD":
                     return 200 <= status < 300
 
-                if data:
-                    data = self.deserializer.loads(
-                        data, headers_response.get("content-type")
-                    )
-                return data
+                if stream:
+                    if _is_json(headers_response.get("content-type")):
+                        return AsyncStreamingResponse(data)
+                    data = b"".join([chunk async for chunk in data])
+
+                return await self._deserialize_async(headers_response, data)
+
+    async def _deserialize_async(
+        self, headers_response: Mapping[str, str], data: Any
+    ) -> Any:
+        """
+        Deserializes a response body like :meth:`_deserialize`, in the offload
+        executor if it is at least ``offload_threshold`` bytes
+        """
+        if (
+            self.offload_threshold is None
+            or not isinstance(data, bytes)
+            or len(data) < self.offload_threshold
+        ):
+            return self._deserialize(headers_response, data)
+        return await self.loop.run_in_executor(
+            self.offload_executor, self._deserialize, headers_response, data
+        )
+
+    async def _within_deadline(self, aw: Any, deadline: Optional[float]) -> Any:
+        """
+        Await ``aw``, cancelling it and raising
+        :class:`~opensearchpy.ConnectionTimeout` once ``deadline`` has passed
+        """
+        if deadline is None:
+            return await aw
+        try:
+            return await asyncio.wait_for(aw, max(deadline - time.monotonic(), 0))
+        except asyncio.TimeoutError as e:
+            raise ConnectionTimeout("TIMEOUT", "Request deadline exceeded", e)
 
     async def close(self) -> None:
         """
         Explicitly closes connections
         """
+        if self._sniffer_task:
+            try:
+                self._sniffer_task.cancel()
+                await self._sniffer_task
+            except asyncio.CancelledError:
+                pass
+            self._sniffer_task = None
+
+        for task in list(self._probe_tasks):
+            task.cancel()
+
         if self.sniffing_task:
             try:
                 self.sniffing_task.cancel()
@@ -0,0 +1,244 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Collection, Dict, FrozenSet, Mapping, Optional, Tuple
+
+# endpoints of the responses that are cached
+_CACHED_ENDPOINTS = frozenset(("_search", "_msearch"))
+# endpoints sent with POST that don't write to the indices
+_READ_ENDPOINTS = frozenset(
+    (
+        "_analyze",
+        "_count",
+        "_explain",
+        "_field_caps",
+        "_mget",
+        "_msearch",
+        "_mtermvectors",
+        "_rank_eval",
+        "_search",
+        "_search_shards",
+        "_termvectors",
+        "_validate",
+    )
+)
+# endpoints that can write to other indices than the ones in their URL
+_CROSS_INDEX_WRITES = frozenset(
+    ("_bulk", "_delete_by_query", "_reindex", "_update_by_query")
+)
+
+
+class SearchCache(object):
+    """
+    Client side cache of search responses, to be passed to the client as
+    ``search_cache``. Responses of ``search`` and ``msearch`` requests,
+    including the ones sent by :meth:`~opensearchpy.Search.execute` and
+    :meth:`~opensearchpy.MultiSearch.execute`, are kept for ``ttl`` seconds
+    and identical requests are answered from the cache in the meantime::
+
+        client = OpenSearch(hosts, search_cache=SearchCache(ttl=10))
+
+    Requests are identical when they target the same indices (in any order)
+    with the same parameters, headers and body (with keys in any order).
+    Scroll requests are never cached.
+
+    The cache keeps the raw response bodies, every hit deserializes its own
+    copy. It is bounded by ``max_entries`` and ``max_bytes``, evicting the
+    least recently used responses first.
+
+    Requests that write to the cluster through the same client drop the
+    cached responses of the indices they target, or all of them if they
+    don't target specific indices or can write to other indices than the
+    ones in their URL (``bulk``, ``reindex``, ``update_by_query`` and
+    ``delete_by_query``). Responses of searches targeting all indices or
+    index patterns are dropped by any write, aliases are not resolved
+    though. With ``invalidate_on_write=False`` only refreshing the indices
+    does, which matches when writes become visible to searches, up to the
+    ``refresh_interval``. Writes done by other clients are only picked up
+    once the responses expire.
+
+    The number of hits, misses and evictions are available as
+    :attr:`hits`, :attr:`misses` and :attr:`evictions`. Subclass it and
+    override :meth:`key`, :meth:`get`, :meth:`put` and :meth:`invalidate`
+    to plug another storage.
+
+    :arg max_entries: maximum number of responses kept
+    :arg max_bytes: maximum size of the response bodies kept, in bytes
+    :arg ttl: seconds after which a response expires
+    :arg invalidate_on_write: whether writes invalidate cached responses,
+        not only refreshes
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 60.0,
+        invalidate_on_write: bool = True,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.invalidate_on_write = invalidate_on_write
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        # bumped by every invalidation, so that the responses of searches in
+        # flight during a write are not stored
+        self.generation = 0
+
+        # key -> (expires, size, indices, response), least recently used first
+        self._entries: Any = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        body: Any,
+        headers: Optional[Mapping[str, str]],
+    ) -> Any:
+        """
+        Return the key of the response of a request, ``None`` if the response
+        must not be cached. The key is a tuple starting with the indices the
+        request targets, separated by commas.
+        """
+        path = url.partition("?")[0].strip("/").split("/")
+        if method not in ("GET", "POST") or path[-1] not in _CACHED_ENDPOINTS:
+            return None
+        if params and "scroll" in params:
+            return None
+
+        target = ""
+        if not path[0].startswith("_"):
+            target = ",".join(sorted(path.pop(0).split(",")))
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, sort_keys=True, default=str)
+        key = (
+            target,
+            "/".join(path),
+            tuple(sorted(params.items())) if params else (),
+            body,
+            tuple(sorted(headers.items())) if headers else (),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key: Any) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """
+        Return the headers and raw body of the response stored for ``key``,
+        ``None`` if there is none or it expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[3]  # type: ignore
+
+    def put(
+        self,
+        key: Any,
+        generation: int,
+        headers: Dict[str, str],
+        body: bytes,
+    ) -> None:
+        """
+        Store the headers and raw body of a response, unless cached responses
+        were invalidated since the request was sent (``generation``).
+        """
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (
+                time.monotonic() + self.ttl,
+                size,
+                _indices(key[0]),
+                (headers, body),
+            )
+            self.size += size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, indices: Optional[Collection[str]] = None) -> None:
+        """
+        Drop the cached responses of searches targeting any of ``indices``,
+        all of them if ``indices`` is ``None``. Searches that target index
+        patterns or all indices are dropped with any index.
+        """
+        with self._lock:
+            self.generation += 1
+            for key, entry in list(self._entries.items()):
+                if (
+                    indices is None
+                    or entry[2] is None
+                    or not entry[2].isdisjoint(indices)
+                ):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all the cached responses."""
+        self.invalidate()
+
+    def request_completed(self, method: str, url: str) -> None:
+        """
+        Called by the transport for every request that wasn't a cached
+        search, to invalidate the responses of the indices written to or
+        refreshed. Also called for requests that failed, as a write can be
+        applied even though its response was lost or was an error.
+        """
+        if method in ("GET", "HEAD"):
+            return
+        path = url.partition("?")[0].strip("/").split("/")
+        if "_refresh" not in path and (
+            not self.invalidate_on_write or not _READ_ENDPOINTS.isdisjoint(path)
+        ):
+            return
+        if path[0].startswith("_") or not _CROSS_INDEX_WRITES.isdisjoint(path):
+            self.invalidate()
+        else:
+            self.invalidate(_indices(path[0]))
+
+    def _remove(self, key: Any) -> None:
+        entry = self._entries.pop(key)
+        self.size -= entry[1]
+
+
+def _indices(target: str) -> Optional[FrozenSet[str]]:
+    """
+    Return the indices of a comma separated list, ``None`` if it's empty (all
+    indices) or contains patterns that could match any index.
+    """
+    if not target or "*" in target:
+        return None
+    return frozenset(target.split(","))
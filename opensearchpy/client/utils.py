@@ -166,8 +166,8 @@ def query_params(*opensearch_query_params: Any) -> Callable:  # type: ignore
             elif api_key is not None:
                 headers["authorization"] = "ApiKey %s" % (_base64_auth_header(api_key),)
 
-            # don't escape ignore, request_timeout, or timeout
-            for p in ("ignore", "request_timeout", "timeout"):
+            # don't escape ignore, request_timeout, timeout, deadline or stream
+            for p in ("ignore", "request_timeout", "timeout", "deadline", "stream"):
                 if p in kwargs:
                     params[p] = kwargs.pop(p)
 
@@ -185,6 +185,11 @@ def query_params(*opensearch_query_params: Any) -> Callable:  # type: ignore
 
 
 def _bulk_body(serializer: Optional[Serializer], body: Any) -> Any:
+    # file objects and async iterables are streamed as they are read, they
+    # must end with a newline
+    if hasattr(body, "read") or hasattr(body, "__aiter__"):
+        return body
+
     # if not passed in a string, serialize items and join by newline
     if not isinstance(body, string_types):
         body = "\n".join(map(serializer.dumps, body))  # type: ignore
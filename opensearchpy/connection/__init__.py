@@ -26,10 +26,12 @@
 
 
 from .base import Connection
+from .compression import Compression
 from .http_requests import RequestsHttpConnection
 from .http_urllib3 import Urllib3HttpConnection, create_ssl_context
 
 __all__ = [
+    "Compression",
     "Connection",
     "RequestsHttpConnection",
     "Urllib3HttpConnection",
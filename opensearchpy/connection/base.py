@@ -24,14 +24,13 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
-import gzip
-import io
 import logging
 import os
 import re
+import time
 import warnings
 from platform import python_version
-from typing import Any, Collection, Dict, Mapping, Optional, Union
+from typing import Any, Collection, Dict, Iterator, Mapping, Optional, Union
 
 try:
     import simplejson as json
@@ -40,6 +39,8 @@ except ImportError:
 
 from .._version import __versionstr__
 from ..exceptions import HTTP_EXCEPTIONS, OpenSearchWarning, TransportError
+from ..metrics import Metrics, MetricsNone
+from .compression import Compression, get_compression
 
 logger = logging.getLogger("opensearch")
 
@@ -52,6 +53,11 @@ if not TRACER_ALREADY_CONFIGURED:
 
 _WARNING_RE = re.compile(r"\"([^\"]*)\"")
 
+# size of the chunks of the body yielded for requests sent with ``stream=True``
+STREAM_CHUNK_SIZE = 64 * 1024
+# logged in place of streamed request bodies, which can only be read once
+_STREAMED_BODY = "<streamed body>"
+
 
 class Connection(object):
     """
@@ -66,11 +72,19 @@ class Connection(object):
     :arg use_ssl: use ssl for the connection if `True`
     :arg url_prefix: optional url prefix for opensearch
     :arg timeout: default timeout in seconds (float, default: 10)
-    :arg http_compress: Use gzip compression
+    :arg http_compress: Use gzip compression, or a
+        :class:`~opensearchpy.Compression` policy (or the name of its
+        algorithm) to choose the algorithm, level and minimum size of the
+        compressed request bodies
     :arg opaque_id: Send this value in the 'X-Opaque-Id' HTTP header
         For tracing all requests made by this transport.
+    :arg metrics: :class:`~opensearchpy.Metrics` instance the compression of
+        request bodies is reported to, unless set by the subclass
     """
 
+    # connections that don't collect metrics report to this instance
+    metrics: Metrics = MetricsNone()
+
     def __init__(
         self,
         host: str = "localhost",
@@ -79,12 +93,15 @@ class Connection(object):
         url_prefix: str = "",
         timeout: int = 10,
         headers: Optional[Dict[str, str]] = None,
-        http_compress: Optional[bool] = None,
+        http_compress: Union[bool, str, Compression, None] = None,
         opaque_id: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
         **kwargs: Any
     ) -> None:
         if port is None:
             port = 9200
+        if metrics is not None:
+            self.metrics = metrics
 
         # Work-around if the implementing class doesn't
         # define the headers property before calling super().__init__()
@@ -113,7 +130,8 @@ class Connection(object):
             scheme = "https"
             use_ssl = True
         self.use_ssl = use_ssl
-        self.http_compress = http_compress or False
+        self.compression: Optional[Compression] = get_compression(http_compress)
+        self.http_compress = self.compression is not None
 
         self.scheme = scheme
         self.hostname = host
@@ -145,11 +163,48 @@ class Connection(object):
     def __hash__(self) -> int:
         return id(self)
 
-    def _gzip_compress(self, body: Any) -> bytes:
-        buf = io.BytesIO()
-        with gzip.GzipFile(fileobj=buf, mode="wb") as f:
-            f.write(body)
-        return buf.getvalue()
+    def _compress(self, body: Any, headers: Dict[str, str]) -> Any:
+        """
+        Compress a request body according to the compression policy of the
+        connection, setting the ``content-encoding`` header if it was.
+        """
+        if self.compression is None or not body:
+            return body
+        if _is_streaming_body(body):
+            # the size of the body is unknown, min_size doesn't apply
+            headers["content-encoding"] = self.compression.content_encoding
+            return self._compress_chunks(_iter_body(body))
+        start = time.perf_counter()
+        compressed = self.compression.compress(body)
+        if compressed is None:
+            return body
+        self.metrics.request_compressed(
+            len(body), len(compressed), time.perf_counter() - start
+        )
+        headers["content-encoding"] = self.compression.content_encoding
+        return compressed
+
+    def _compress_chunks(self, chunks: Any) -> Any:
+        """
+        Compress the chunks of a streamed request body as they are sent,
+        reporting the compression once the whole body has been.
+        """
+        assert self.compression is not None
+        compressor = self.compression.compressobj()
+        size = compressed_size = 0
+        duration = 0.0
+        for chunk in chunks:
+            start = time.perf_counter()
+            compressed = compressor.compress(chunk)
+            duration += time.perf_counter() - start
+            size += len(chunk)
+            compressed_size += len(compressed)
+            if compressed:
+                yield compressed
+        compressed = compressor.flush()
+        compressed_size += len(compressed)
+        self.metrics.request_compressed(size, compressed_size, duration)
+        yield compressed
 
     def _raise_warnings(self, warning_headers: Any) -> None:
         """If 'headers' contains a 'Warning' header raise
@@ -186,17 +241,21 @@ class Connection(object):
             ).replace("'", r"\u0027")
         except (ValueError, TypeError):
             # non-json data or a bulk request
-            return data  # type: ignore
+            return _to_str(data)
 
     def _log_request_response(
-        self, body: Optional[Union[str, bytes]], response: Optional[str]
+        self,
+        body: Optional[Union[str, bytes]],
+        response: Optional[Union[str, bytes]],
     ) -> None:
         if logger.isEnabledFor(logging.DEBUG):
-            if body and isinstance(body, bytes):
+            if _is_streaming_body(body):
+                body = _STREAMED_BODY
+            elif body and isinstance(body, bytes):
                 body = body.decode("utf-8", "ignore")
             logger.debug("> %s", body)
             if response is not None:
-                logger.debug("< %s", response)
+                logger.debug("< %s", _to_str(response))
 
     def _log_trace(
         self,
@@ -204,11 +263,13 @@ class Connection(object):
         path: str,
         body: Optional[Union[str, bytes]],
         status_code: Optional[int],
-        response: Optional[str],
+        response: Optional[Union[str, bytes]],
         duration: Optional[float],
     ) -> None:
         if not tracer.isEnabledFor(logging.INFO) or not tracer.handlers:
             return
+        if _is_streaming_body(body):
+            body = _STREAMED_BODY
 
         # include pretty in trace curls
         path = path.replace("?", "?pretty&", 1) if "?" in path else path + "?pretty"
@@ -239,7 +300,14 @@ class Connection(object):
         timeout: Optional[Union[int, float]] = None,
         ignore: Collection[int] = (),
         headers: Optional[Mapping[str, str]] = None,
+        stream: bool = False,
     ) -> Any:
+        """
+        Send the request and return its status, headers and raw body as
+        ``bytes``, left for the transport to deserialize. With ``stream`` the
+        body of a successful response is returned as an iterable of ``bytes``
+        chunks releasing the connection once exhausted or closed.
+        """
         raise NotImplementedError()
 
     def log_request_success(
@@ -249,7 +317,7 @@ class Connection(object):
         path: str,
         body: Any,
         status_code: int,
-        response: str,
+        response: Optional[Union[str, bytes]],
         duration: float,
     ) -> None:
         """Log a successful API call."""
@@ -270,7 +338,7 @@ class Connection(object):
         body: Any,
         duration: float,
         status_code: Optional[int] = None,
-        response: Optional[str] = None,
+        response: Optional[Union[str, bytes]] = None,
         exception: Optional[Exception] = None,
     ) -> None:
         """Log an unsuccessful API call."""
@@ -292,11 +360,11 @@ class Connection(object):
     def _raise_error(
         self,
         status_code: int,
-        raw_data: Union[str, bytes],
+        raw_data: Optional[Union[str, bytes]],
         content_type: Optional[str] = None,
     ) -> None:
         """Locate appropriate exception and raise it."""
-        error_message = raw_data
+        error_message: Any = None if raw_data is None else _to_str(raw_data)
         additional_info = None
         try:
             content_type = (
@@ -337,3 +405,58 @@ class Connection(object):
                 pass
 
         return ca_certs
+
+
+def _to_str(data: Union[str, bytes]) -> str:
+    """
+    Decode a raw response body for logs and error messages, only once they
+    are actually needed.
+    """
+    if isinstance(data, bytes):
+        try:
+            return data.decode("utf-8", "surrogatepass")
+        except UnicodeDecodeError:
+            return data.decode("utf-8", "replace")
+    return data
+
+
+def _is_streaming_body(body: Any) -> bool:
+    """
+    Whether a request body is sent in chunks as it is read instead of as a
+    whole: a file object, an iterator (e.g. a generator) or an async iterable
+    of ``bytes`` or ``str`` chunks.
+    """
+    if body is None or isinstance(body, (str, bytes)):
+        return False
+    return (
+        hasattr(body, "read")
+        or isinstance(body, Iterator)
+        or hasattr(body, "__aiter__")
+    )
+
+
+def _iter_body(body: Any) -> Any:
+    """Yield the chunks of a streamed request body as ``bytes``."""
+    if hasattr(body, "read"):
+        chunks: Any = iter(lambda: body.read(STREAM_CHUNK_SIZE), body.read(0))
+    else:
+        chunks = body
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8", "surrogatepass")
+        # an empty chunk would end a chunked body
+        if chunk:
+            yield chunk
+
+
+def _tell(body: Any) -> Optional[int]:
+    """
+    Return the position of a streamed request body to rewind it to before
+    retrying the request, ``None`` if it can't be rewound.
+    """
+    try:
+        if body.seekable():
+            return body.tell()  # type: ignore
+    except (AttributeError, OSError, ValueError):
+        pass
+    return None
@@ -0,0 +1,128 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import gzip
+import zlib
+from typing import Any, Optional, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from ..exceptions import ImproperlyConfigured
+
+# default level of every algorithm, the one of gzip is the level request
+# bodies were always compressed at
+_DEFAULT_LEVELS = {"gzip": 9, "deflate": 6, "zstd": 3}
+
+
+class Compression(object):
+    """
+    Compression of request bodies, to be passed to the connections as
+    ``http_compress`` instead of ``True``::
+
+        client = OpenSearch(hosts, http_compress=Compression(level=1, min_size=1024))
+
+    ``gzip`` and ``deflate`` are accepted by every OpenSearch node. ``zstd``
+    requires the `zstandard <https://pypi.org/project/zstandard/>`_ package
+    (``pip install opensearch-py[zstd]``) and nodes that accept zstd encoded
+    requests; check it with your cluster before enabling it.
+
+    Lower levels trade a slightly larger body for much less CPU time: gzip
+    at level 1 compresses a typical bulk request about ten times faster than
+    at level 9, to a body about a third larger. Bodies smaller than
+    ``min_size`` are sent as is, compressing a few hundred bytes saves next
+    to nothing and tiny bodies even grow. ``http_compress=True`` is the same
+    as ``Compression()``: every body is compressed with gzip at level 9.
+    Streamed bodies are compressed chunk by chunk whatever ``min_size``, as
+    their size is only known once they have been sent.
+
+    The size of the bodies before and after compression and the time spent
+    compressing them are reported to
+    :meth:`~opensearchpy.Metrics.request_compressed`.
+
+    :arg algorithm: ``"gzip"`` (default), ``"deflate"`` or ``"zstd"``
+    :arg level: compression level, defaults to 9 for gzip, 6 for deflate and
+        3 for zstd
+    :arg min_size: size in bytes under which bodies are not compressed,
+        defaults to ``0``
+    """
+
+    def __init__(
+        self,
+        algorithm: str = "gzip",
+        level: Optional[int] = None,
+        min_size: int = 0,
+    ) -> None:
+        if algorithm not in _DEFAULT_LEVELS:
+            raise ImproperlyConfigured(
+                "Unknown compression algorithm %r, use one of %s"
+                % (algorithm, ", ".join(sorted(_DEFAULT_LEVELS)))
+            )
+        if algorithm == "zstd" and zstandard is None:
+            raise ImproperlyConfigured(
+                "zstd compression requires the 'zstandard' package to be installed"
+            )
+        self.algorithm = algorithm
+        self.level = _DEFAULT_LEVELS[algorithm] if level is None else level
+        self.min_size = min_size
+
+    def __repr__(self) -> str:
+        return "Compression(algorithm=%r, level=%r, min_size=%r)" % (
+            self.algorithm,
+            self.level,
+            self.min_size,
+        )
+
+    @property
+    def content_encoding(self) -> str:
+        """Value of the ``Content-Encoding`` header of compressed bodies"""
+        return self.algorithm
+
+    def compress(self, body: bytes) -> Optional[bytes]:
+        """
+        Return the compressed body, ``None`` if it is too small to be
+        compressed.
+        """
+        if len(body) < self.min_size:
+            return None
+        if self.algorithm == "gzip":
+            return gzip.compress(body, compresslevel=self.level)
+        if self.algorithm == "deflate":
+            return zlib.compress(body, self.level)
+        # compressors are not thread safe, connections are shared by threads
+        return zstandard.ZstdCompressor(level=self.level).compress(body)  # type: ignore
+
+    def compressobj(self) -> Any:
+        """
+        Return an object compressing a streamed body chunk by chunk with
+        ``compress(chunk)``, and ``flush()`` for the end of the body.
+        """
+        if self.algorithm == "gzip":
+            return zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        if self.algorithm == "deflate":
+            return zlib.compressobj(self.level)
+        return zstandard.ZstdCompressor(level=self.level).compressobj()
+
+
+def get_compression(http_compress: Union[bool, str, Compression, None]) -> Any:
+    """
+    Resolve the ``http_compress`` argument of a connection: ``True`` is the
+    default :class:`Compression`, a string the name of its algorithm and a
+    :class:`Compression` instance is returned as is. ``None`` if bodies
+    must not be compressed.
+    """
+    if isinstance(http_compress, Compression):
+        return http_compress
+    if isinstance(http_compress, str):
+        return Compression(http_compress)
+    if http_compress:
+        return Compression()
+    return None
@@ -13,11 +13,12 @@ import asyncio
 import os
 import ssl
 import warnings
+from concurrent.futures import Executor
 from typing import Any, Collection, Mapping, Optional, Union
 
 from .._async._extra_imports import aiohttp, aiohttp_exceptions  # type: ignore
 from .._async.compat import get_running_loop
-from .._async.http_aiohttp import AIOHttpConnection
+from .._async.http_aiohttp import AIOHttpConnection, _aiter_body, _single_chunk
 from ..compat import reraise_exceptions, string_types, urlencode
 from ..exceptions import (
     ConnectionError,
@@ -25,6 +26,7 @@ from ..exceptions import (
     ImproperlyConfigured,
     SSLError,
 )
+from .base import _is_streaming_body
 
 VERIFY_CERTS_DEFAULT = object()
 SSL_SHOW_WARN_DEFAULT = object()
@@ -49,9 +51,11 @@ class AsyncHttpConnection(AIOHttpConnection):
         maxsize: Optional[int] = 10,
         headers: Optional[Mapping[str, str]] = None,
         ssl_context: Any = None,
-        http_compress: Optional[bool] = None,
+        http_compress: Any = None,
         opaque_id: Optional[str] = None,
         loop: Any = None,
+        offload_threshold: Optional[int] = None,
+        offload_executor: Optional[Executor] = None,
         **kwargs: Any
     ) -> None:
         self.headers = {}
@@ -147,6 +151,9 @@ class AsyncHttpConnection(AIOHttpConnection):
         self._http_auth = http_auth
         self._ssl_context = ssl_context
 
+        self.offload_threshold = offload_threshold
+        self.offload_executor = offload_executor
+
     async def perform_request(
         self,
         method: str,
@@ -156,6 +163,7 @@ class AsyncHttpConnection(AIOHttpConnection):
         timeout: Optional[Union[int, float]] = None,
         ignore: Collection[int] = (),
         headers: Optional[Mapping[str, str]] = None,
+        stream: bool = False,
     ) -> Any:
         if self.session is None:
             await self._create_aiohttp_session()
@@ -197,9 +205,7 @@ class AsyncHttpConnection(AIOHttpConnection):
         if headers:
             req_headers.update(headers)
 
-        if self.http_compress and body:
-            body = self._gzip_compress(body)
-            req_headers["content-encoding"] = "gzip"
+        body = await self._compress_async(body, req_headers)
 
         auth = (
             self._http_auth if isinstance(self._http_auth, aiohttp.BasicAuth) else None
@@ -209,10 +215,13 @@ class AsyncHttpConnection(AIOHttpConnection):
                 **req_headers,
                 **self._http_auth(method, url, query_string, body),
             }
+        if _is_streaming_body(body):
+            # aiohttp sends async iterables with chunked transfer encoding
+            body = _aiter_body(body)
 
         start = self.loop.time()
         try:
-            async with self.session.request(
+            request = self.session.request(
                 method,
                 url,
                 data=body,
@@ -220,13 +229,23 @@ class AsyncHttpConnection(AIOHttpConnection):
                 headers=req_headers,
                 timeout=timeout,
                 fingerprint=self.ssl_assert_fingerprint,
-            ) as response:
-                if is_head:  # We actually called 'GET' so throw away the data.
-                    await response.release()
-                    raw_data = ""
+            )
+            if stream and not is_head:
+                # the connection is released once the body has been read
+                response = await request
+                if 200 <= response.status < 300:
+                    raw_data = None
                 else:
-                    raw_data = await response.text()
-                duration = self.loop.time() - start
+                    async with response:
+                        raw_data = await response.read()
+            else:
+                async with request as response:
+                    if is_head:  # We actually called 'GET' so throw away the data.
+                        await response.release()
+                        raw_data = b""
+                    else:
+                        raw_data = await response.read()
+            duration = self.loop.time() - start
 
         # We want to reraise a cancellation or recursion error.
         except reraise_exceptions:
@@ -269,6 +288,14 @@ class AsyncHttpConnection(AIOHttpConnection):
             method, str(url), url_path, orig_body, response.status, raw_data, duration
         )
 
+        if raw_data is None:
+            return response.status, response.headers, self._iter_chunks(response)
+        if stream:
+            return (
+                response.status,
+                response.headers,
+                _single_chunk(raw_data),
+            )
         return response.status, response.headers, raw_data
 
     async def close(self) -> Any:
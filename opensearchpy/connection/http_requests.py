@@ -45,7 +45,7 @@ from ..exceptions import (
     ImproperlyConfigured,
     SSLError,
 )
-from .base import Connection
+from .base import STREAM_CHUNK_SIZE, Connection, _is_streaming_body, _iter_body
 
 
 class RequestsHttpConnection(Connection):
@@ -66,7 +66,8 @@ class RequestsHttpConnection(Connection):
     :arg client_key: path to the file containing the private key if using
         separate cert and key files (client_cert will contain only the cert)
     :arg headers: any custom http headers to be add to requests
-    :arg http_compress: Use gzip compression
+    :arg http_compress: Use gzip compression, or a
+        :class:`~opensearchpy.Compression` policy
     :arg opaque_id: Send this value in the 'X-Opaque-Id' HTTP header
         For tracing all requests made by this transport.
     :arg pool_maxsize: Maximum connection pool size used by pool-manager
@@ -172,6 +173,7 @@ class RequestsHttpConnection(Connection):
         allow_redirects: Optional[bool] = True,
         ignore: Collection[int] = (),
         headers: Optional[Mapping[str, str]] = None,
+        stream: bool = False,
     ) -> Any:
         url = self.base_url + url
         headers = headers or {}
@@ -179,9 +181,10 @@ class RequestsHttpConnection(Connection):
             url = "%s?%s" % (url, urlencode(params or {}))
 
         orig_body = body
-        if self.http_compress and body:
-            body = self._gzip_compress(body)
-            headers["content-encoding"] = "gzip"  # type: ignore
+        body = self._compress(body, headers)  # type: ignore
+        if _is_streaming_body(body):
+            # requests sends iterators with chunked transfer encoding
+            body = _iter_body(body)
 
         start = time.time()
         request = requests.Request(method=method, headers=headers, url=url, data=body)
@@ -192,13 +195,17 @@ class RequestsHttpConnection(Connection):
         send_kwargs: Any = {
             "timeout": timeout or self.timeout,
             "allow_redirects": allow_redirects,
+            "stream": stream,
         }
         send_kwargs.update(settings)
         try:
             self.metrics.request_start()
             response = self.session.send(prepared_request, **send_kwargs)
             duration = time.time() - start
-            raw_data = response.content.decode("utf-8", "surrogatepass")
+            if stream and 200 <= response.status_code < 300:
+                raw_data = None
+            else:
+                raw_data = response.content
         except reraise_exceptions:
             raise
         except Exception as e:
@@ -254,8 +261,30 @@ class RequestsHttpConnection(Connection):
             duration,
         )
 
+        if raw_data is None:
+            return response.status_code, response.headers, self._iter_chunks(response)
+        if stream:
+            return (
+                response.status_code,
+                response.headers,
+                (raw_data,),
+            )
         return response.status_code, response.headers, raw_data
 
+    def _iter_chunks(self, response: Any) -> Any:
+        """Yield the body of a streamed response, then release the connection."""
+        try:
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                yield chunk
+        except reraise_exceptions:
+            raise
+        except Exception as e:
+            if isinstance(e, requests.Timeout):
+                raise ConnectionTimeout("TIMEOUT", str(e), e)
+            raise ConnectionError("N/A", str(e), e)
+        finally:
+            response.close()
+
     @property
     def headers(self) -> Any:  # type: ignore
         return self.session.headers
@@ -43,7 +43,7 @@ from ..exceptions import (
     ImproperlyConfigured,
     SSLError,
 )
-from .base import Connection
+from .base import STREAM_CHUNK_SIZE, Connection, _is_streaming_body, _iter_body
 
 # sentinel value for `verify_certs` and `ssl_show_warn`.
 # This is used to detect if a user is passing in a value
@@ -93,7 +93,8 @@ class Urllib3HttpConnection(Connection):
         host. See https://urllib3.readthedocs.io/en/1.4/pools.html#api for more
         information.
     :arg headers: any custom http headers to be add to requests
-    :arg http_compress: Use gzip compression
+    :arg http_compress: Use gzip compression, or a
+        :class:`~opensearchpy.Compression` policy
     :arg opaque_id: Send this value in the 'X-Opaque-Id' HTTP header
         For tracing all requests made by this transport.
     :arg metrics: metrics is an instance of a subclass of the
@@ -238,6 +239,7 @@ class Urllib3HttpConnection(Connection):
         timeout: Optional[Union[int, float]] = None,
         ignore: Collection[int] = (),
         headers: Optional[Mapping[str, str]] = None,
+        stream: bool = False,
     ) -> Any:
         if self.pool is None:
             self._create_urllib3_pool()
@@ -267,21 +269,31 @@ class Urllib3HttpConnection(Connection):
             request_headers = self.headers.copy()
             request_headers.update(headers or ())
 
-            if self.http_compress and body:
-                body = self._gzip_compress(body)
-                request_headers["content-encoding"] = "gzip"
+            body = self._compress(body, request_headers)
 
             if self.http_auth is not None:
                 if isinstance(self.http_auth, Callable):  # type: ignore
                     request_headers.update(self.http_auth(method, full_url, body))
+            if _is_streaming_body(body):
+                body = _iter_body(body)
+                kw["chunked"] = True
 
             self.metrics.request_start()
 
             response = self.pool.urlopen(
-                method, url, body, retries=Retry(False), headers=request_headers, **kw
+                method,
+                url,
+                body,
+                retries=Retry(False),
+                headers=request_headers,
+                preload_content=not stream,
+                **kw
             )
             duration = time.time() - start
-            raw_data = response.data.decode("utf-8", "surrogatepass")
+            if stream and 200 <= response.status < 300:
+                raw_data = None
+            else:
+                raw_data = response.data
         except reraise_exceptions:
             raise
         except Exception as e:
@@ -315,8 +327,37 @@ class Urllib3HttpConnection(Connection):
             method, full_url, url, orig_body, response.status, raw_data, duration
         )
 
+        if raw_data is None:
+            return response.status, response.headers, self._iter_chunks(response)
+        if stream:
+            return (
+                response.status,
+                response.headers,
+                (raw_data,),
+            )
         return response.status, response.headers, raw_data
 
+    def _iter_chunks(self, response: Any) -> Any:
+        """
+        Yield the body of a streamed response, closing the connection instead
+        of returning it to the pool when not read until the end.
+        """
+        complete = False
+        try:
+            for chunk in response.stream(STREAM_CHUNK_SIZE):
+                yield chunk
+            complete = True
+        except reraise_exceptions:
+            raise
+        except Exception as e:
+            if isinstance(e, ReadTimeoutError):
+                raise ConnectionTimeout("TIMEOUT", str(e), e)
+            raise ConnectionError("N/A", str(e), e)
+        finally:
+            if not complete:
+                response.close()
+            response.release_conn()
+
     def get_response_headers(self, response: Any) -> Any:
         return {header.lower(): value for header, value in response.headers.items()}
 
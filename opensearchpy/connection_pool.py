@@ -25,12 +25,16 @@
 #  under the License.
 
 
+import heapq
 import logging
+import math
 import random
 import threading
 import time
+from collections import deque
+from itertools import count
 from queue import Empty, PriorityQueue
-from typing import Any, Dict, Optional, Sequence, Tuple, Type
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
 
 from .connection import Connection
 from .exceptions import ImproperlyConfigured
@@ -71,6 +75,30 @@ class ConnectionSelector(object):
         """
         pass
 
+    def request_started(self, connection: Connection) -> None:
+        """
+        Called by the transport before a request is sent to ``connection``.
+        """
+        pass
+
+    def request_finished(
+        self, connection: Connection, duration: float, failed: bool = False
+    ) -> None:
+        """
+        Called by the transport once a request sent to ``connection`` got a
+        response or failed, after ``duration`` seconds. ``failed`` tells
+        whether the node failed to answer it, with a connection error, a
+        timeout or a 5xx status.
+        """
+        pass
+
+    def take_over(self, previous: "ConnectionSelector") -> None:
+        """
+        Called when the selector replaces ``previous`` after sniffing, to
+        carry over the state it keeps about the connections both have.
+        """
+        pass
+
 
 class RandomSelector(ConnectionSelector):
     """
@@ -96,6 +124,225 @@ class RoundRobinSelector(ConnectionSelector):
         return connections[self.data.rr]
 
 
+class LatencyAwareSelector(ConnectionSelector):
+    """
+    Selector sending requests to the connections that answer the fastest,
+    so that a slow node (e.g. one pausing for garbage collection) gets less
+    traffic before it fails outright.
+
+    It keeps, per connection, an exponentially weighted moving average of the
+    latency of its requests and the number of its requests in flight. The
+    cost of a connection is its average latency times its requests in flight
+    plus one. ``choices`` connections are picked at random and the cheapest
+    one is selected (power of two choices); with ``choices = None`` all live
+    connections are compared (least loaded).
+
+    The average of a connection that isn't selected anymore decays over
+    ``decay_time`` seconds, so a node that recovered is eventually tried
+    again. Connections without any request yet are tried first. Failed
+    requests count for at least ``failure_latency`` seconds, so that a node
+    answering with errors right away doesn't draw more traffic.
+
+    Works with both :class:`~opensearchpy.Transport` and
+    :class:`~opensearchpy.AsyncTransport`; subclass it to change the class
+    attributes::
+
+        class LeastLoadedSelector(LatencyAwareSelector):
+            choices = None
+
+        client = OpenSearch(hosts, selector_class=LeastLoadedSelector)
+    """
+
+    #: number of connections picked at random to choose from, all if ``None``
+    choices: Optional[int] = 2
+    #: weight of the latest request in the moving average of the latency
+    alpha: float = 0.3
+    #: number of seconds over which the average latency of an idle connection
+    #: decays
+    decay_time: float = 10.0
+    #: latency, in seconds, a failed request counts for at least
+    failure_latency: float = 1.0
+
+    def __init__(self, opts: Sequence[Tuple[Connection, Any]]) -> None:
+        super(LatencyAwareSelector, self).__init__(opts)
+        self._lock = threading.Lock()
+        # connection -> [average latency, requests in flight, last update]
+        self._stats: Dict[Any, Any] = {}
+
+    def select(self, connections: Sequence[Connection]) -> Any:
+        if self.choices is not None and len(connections) > self.choices:
+            connections = random.sample(connections, self.choices)
+        now = time.monotonic()
+        with self._lock:
+            return min(connections, key=lambda c: self._cost(c, now))
+
+    def request_started(self, connection: Connection) -> None:
+        with self._lock:
+            stats = self._stats.get(connection)
+            if stats is None:
+                stats = self._stats[connection] = [None, 0, time.monotonic()]
+            stats[1] += 1
+
+    def request_finished(
+        self, connection: Connection, duration: float, failed: bool = False
+    ) -> None:
+        if failed:
+            # a node failing fast must not look like a fast node
+            duration = max(duration, self.failure_latency)
+        with self._lock:
+            stats = self._stats.get(connection)
+            if stats is None:
+                return
+            latency = stats[0]
+            if latency is None:
+                stats[0] = duration
+            else:
+                stats[0] = latency + self.alpha * (duration - latency)
+            stats[1] = max(0, stats[1] - 1)
+            stats[2] = time.monotonic()
+
+    def take_over(self, previous: ConnectionSelector) -> None:
+        if not isinstance(previous, LatencyAwareSelector):
+            return
+        with previous._lock:
+            stats = {
+                c: list(s)
+                for c, s in previous._stats.items()
+                if c in self.connection_opts
+            }
+        with self._lock:
+            self._stats.update(stats)
+
+    def _cost(self, connection: Connection, now: float) -> Tuple[float, int]:
+        stats = self._stats.get(connection)
+        if stats is None:
+            return 0.0, 0
+        latency, in_flight, last = stats
+        if latency is None:
+            # no latency known yet, try it unless it is busy
+            return 0.0, in_flight
+        if self.decay_time and not in_flight:
+            latency *= math.exp(-(now - last) / self.decay_time)
+        return latency * (in_flight + 1), in_flight
+
+
+class CircuitBreaker(object):
+    """
+    Circuit breaker of a connection, taking a node that answers with errors
+    or slowly out of the live pool before it fails outright, instead of
+    sending it its full share of the traffic and of the retries.
+
+    The outcome of the last ``window`` requests sent to the connection is
+    kept. Once there are at least ``min_requests`` of them, the breaker opens
+    when the ratio of failures (connection errors, timeouts and 5xx
+    responses) reaches ``failure_ratio``, or the ratio of requests that took
+    ``slow_request_time`` seconds or more reaches ``slow_ratio``.
+
+    ``open_timeout`` seconds after opening the breaker is half-open: the
+    transport sends ``probes`` lightweight ``HEAD /`` requests to the node in
+    the background, and closes the breaker, putting the connection back in
+    the live pool, only if they all succeed. Otherwise the breaker opens for
+    another ``open_timeout`` seconds.
+
+    Enable it by passing the class to the client, subclass it to change the
+    class attributes::
+
+        class SlowNodeBreaker(CircuitBreaker):
+            slow_request_time = 2.0
+
+        client = OpenSearch(hosts, circuit_breaker_class=SlowNodeBreaker)
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    #: number of requests over which the ratios are computed
+    window: int = 20
+    #: number of requests needed before the breaker can open
+    min_requests: int = 10
+    #: ratio of failed requests opening the breaker
+    failure_ratio: float = 0.5
+    #: number of seconds after which a request counts as slow, ``None`` to
+    #: ignore latencies
+    slow_request_time: Optional[float] = None
+    #: ratio of slow requests opening the breaker
+    slow_ratio: float = 0.5
+    #: number of seconds the breaker stays open before probing the node
+    open_timeout: float = 30.0
+    #: number of successful probes needed to close the breaker
+    probes: int = 1
+    #: timeout of the probe requests, in seconds
+    probe_timeout: float = 1.0
+
+    def __init__(self) -> None:
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        # (failed, slow) outcomes of the last requests
+        self._outcomes: Any = deque()
+        self._failures = 0
+        self._slow = 0
+        self._lock = threading.Lock()
+
+    @property
+    def probe_at(self) -> float:
+        """Monotonic time at which an open breaker gets probed"""
+        return self.opened_at + self.open_timeout
+
+    def record(self, duration: float, failed: bool) -> bool:
+        """
+        Record the outcome of a request, returning ``True`` if it opened the
+        breaker.
+        """
+        slow = self.slow_request_time is not None and duration >= self.slow_request_time
+        with self._lock:
+            if self.state != self.CLOSED:
+                return False
+            if len(self._outcomes) >= self.window:
+                old_failed, old_slow = self._outcomes.popleft()
+                self._failures -= old_failed
+                self._slow -= old_slow
+            self._outcomes.append((failed, slow))
+            self._failures += failed
+            self._slow += slow
+
+            requests = len(self._outcomes)
+            if requests < self.min_requests:
+                return False
+            if self._failures < self.failure_ratio * requests and (
+                self.slow_request_time is None
+                or self._slow < self.slow_ratio * requests
+            ):
+                return False
+            self._open()
+            return True
+
+    def start_probing(self, now: float) -> bool:
+        """
+        Switch an open breaker to half-open once its timeout is over,
+        returning ``True`` if the caller should probe the node.
+        """
+        with self._lock:
+            if self.state != self.OPEN or now < self.probe_at:
+                return False
+            self.state = self.HALF_OPEN
+            return True
+
+    def probed(self, success: bool) -> None:
+        """Close a half-open breaker after successful probes, open it otherwise."""
+        with self._lock:
+            if not success:
+                self._open()
+                return
+            self.state = self.CLOSED
+            self._outcomes.clear()
+            self._failures = self._slow = 0
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+
+
 class ConnectionPool(object):
     """
     Container holding the :class:`~opensearchpy.Connection` instances,
@@ -135,6 +382,7 @@ class ConnectionPool(object):
         timeout_cutoff: int = 5,
         selector_class: Type[ConnectionSelector] = RoundRobinSelector,
         randomize_hosts: bool = True,
+        circuit_breaker_class: Optional[Type[CircuitBreaker]] = None,
         **kwargs: Any
     ) -> None:
         """
@@ -148,6 +396,9 @@ class ConnectionPool(object):
             subclass to use if more than one connection is live
         :arg randomize_hosts: shuffle the list of connections upon arrival to
             avoid dog piling effect across processes
+        :arg circuit_breaker_class: :class:`~opensearchpy.CircuitBreaker`
+            subclass to give every connection a circuit breaker, disabled by
+            default
         """
         if not connections:
             raise ImproperlyConfigured(
@@ -172,6 +423,13 @@ class ConnectionPool(object):
 
         self.selector = selector_class(dict(connections))  # type: ignore
 
+        # circuit breakers of the connections, and the earliest time one of
+        # them is due for probing
+        self.breakers: Dict[Any, CircuitBreaker] = {}
+        if circuit_breaker_class is not None:
+            self.breakers = {c: circuit_breaker_class() for c in self.connections}
+        self._next_probe = float("inf")
+
     def mark_dead(self, connection: Any, now: Optional[float] = None) -> None:
         """
         Mark the connection as dead (failed). Remove it from the live pool and
@@ -252,6 +510,10 @@ class ConnectionPool(object):
             self.dead.put((timeout, connection))
             return
 
+        if not force and self._is_broken(connection):
+            # it will be put back once its circuit breaker closes
+            return
+
         # either we were forced or the connection is eligible to be retried
         self.connections.append(connection)
         logger.info("Resurrecting connection %r (force=%s).", connection, force)
@@ -282,6 +544,100 @@ class ConnectionPool(object):
         # only one connection, no need for a selector
         return connections[0]
 
+    def request_started(self, connection: Any) -> None:
+        """
+        Notify the selector that a request is sent to ``connection``.
+        """
+        self.selector.request_started(connection)
+
+    def request_finished(
+        self, connection: Any, duration: float, failed: bool = False
+    ) -> None:
+        """
+        Notify the selector that a request to ``connection`` took
+        ``duration`` seconds, and record it in the circuit breaker of the
+        connection.
+
+        :arg failed: whether the node failed to answer the request, with a
+            connection error, a timeout or a 5xx status
+        """
+        self.selector.request_finished(connection, duration, failed)
+        breaker = self.breakers.get(connection)
+        if breaker is not None and breaker.record(duration, failed):
+            self._next_probe = min(self._next_probe, breaker.probe_at)
+            self._remove_live(connection)
+            logger.warning(
+                "Circuit breaker of connection %r opened, probing it again in %i seconds.",
+                connection,
+                breaker.open_timeout,
+            )
+
+    def take_over(self, previous: "ConnectionPool") -> None:
+        """
+        Carry over the state of ``previous``, the pool this one replaces after
+        sniffing, for the connections both hold: their circuit breakers, so
+        that a broken node stays out until its probes succeed, and the
+        statistics of the selector.
+        """
+        for connection, breaker in getattr(previous, "breakers", {}).items():
+            if connection in self.breakers:
+                self.breakers[connection] = breaker
+                if breaker.state != breaker.CLOSED:
+                    self._remove_live(connection)
+        self._update_next_probe()
+        selector = getattr(previous, "selector", None)
+        if selector is not None:
+            self.selector.take_over(selector)
+
+    def connections_to_probe(self) -> List[Any]:
+        """
+        Return the connections whose circuit breaker is due for probing,
+        switching their breakers to half-open. The caller must report the
+        outcome of the probes with :meth:`probe_finished`.
+        """
+        now = time.monotonic()
+        if self._next_probe > now:
+            return []
+        due = [c for c, b in self.breakers.items() if b.start_probing(now)]
+        self._update_next_probe()
+        return due
+
+    def probe_finished(self, connection: Any, success: bool) -> None:
+        """
+        Close the circuit breaker of ``connection`` and put it back in the
+        live pool if the probes succeeded, open it again otherwise.
+        Connections without a breaker in this pool are ignored.
+        """
+        breaker = self.breakers.get(connection)
+        if breaker is None:
+            return
+        breaker.probed(success)
+        if success:
+            logger.info("Circuit breaker of connection %r closed.", connection)
+            self._add_live(connection)
+        self._update_next_probe()
+
+    def _update_next_probe(self) -> None:
+        self._next_probe = min(
+            (b.probe_at for b in self.breakers.values() if b.state == b.OPEN),
+            default=float("inf"),
+        )
+
+    def _is_broken(self, connection: Any) -> bool:
+        breaker = self.breakers.get(connection)
+        return breaker is not None and breaker.state != breaker.CLOSED
+
+    def _remove_live(self, connection: Any) -> None:
+        try:
+            self.connections.remove(connection)
+        except ValueError:
+            # already marked dead
+            pass
+
+    def _add_live(self, connection: Any) -> None:
+        if connection not in self.connections:
+            self.connections.append(connection)
+
     def close(self) -> Any:
         """
         Explicitly closes connections
@@ -293,6 +649,129 @@ class ConnectionPool(object):
         return "<%s: %r>" % (type(self).__name__, self.connections)
 
 
+class SnapshotConnectionPool(ConnectionPool):
+    """
+    :class:`ConnectionPool` for clients shared by many threads, keeping
+    :meth:`get_connection` free of locks and copies.
+
+    The live connections are kept in an immutable tuple, replaced as a whole
+    when a connection is marked dead or resurrected, so that
+    :meth:`get_connection` only reads the current snapshot. It checks for
+    connections to resurrect by comparing the time with the earliest timeout
+    of the dead connections. State changes are serialized by a lock, only
+    taken when a connection fails or is resurrected.
+
+    Use it with ``OpenSearch(hosts, connection_pool_class=SnapshotConnectionPool)``;
+    it takes the same arguments as :class:`ConnectionPool`.
+    """
+
+    def __init__(self, connections: Any, **kwargs: Any) -> None:
+        super(SnapshotConnectionPool, self).__init__(connections, **kwargs)
+        self.connections = tuple(self.connections)
+        # heap of (timeout, sequence number, connection)
+        self.dead = []
+        self._seq = count()
+        # earliest timeout of the dead connections
+        self._next_resurrect = float("inf")
+        self._lock = threading.Lock()
+
+    def mark_dead(self, connection: Any, now: Optional[float] = None) -> None:
+        """
+        Mark the connection as dead (failed). Remove it from the live pool and
+        put it on a timeout.
+
+        :arg connection: the failed instance
+        """
+        now = now if now else time.time()
+        with self._lock:
+            if connection not in self.connections:
+                logger.info(
+                    "Attempted to remove %r, but it does not exist in the connection pool.",
+                    connection,
+                )
+                return
+            self.connections = tuple(c for c in self.connections if c != connection)
+            dead_count = self.dead_count.get(connection, 0) + 1
+            self.dead_count[connection] = dead_count
+            timeout = self.dead_timeout * 2 ** min(dead_count - 1, self.timeout_cutoff)
+            heapq.heappush(self.dead, (now + timeout, next(self._seq), connection))
+            self._next_resurrect = self.dead[0][0]
+        logger.warning(
+            "Connection %r has failed for %i times in a row, putting on %i second timeout.",
+            connection,
+            dead_count,
+            timeout,
+        )
+
+    def mark_live(self, connection: Any) -> None:
+        """
+        Mark connection as healthy after a resurrection. Resets the fail
+        counter for the connection.
+
+        :arg connection: the connection to redeem
+        """
+        # called after every successful request, only lock after a failure
+        if connection in self.dead_count:
+            with self._lock:
+                self.dead_count.pop(connection, None)
+
+    def resurrect(self, force: bool = False) -> Any:
+        """
+        Attempt to resurrect a connection from the dead pool. It will try to
+        locate one (not all) eligible (its timeout is over) connection to
+        return to the live pool. Any resurrected connection is also returned.
+
+        :arg force: resurrect a connection even if there is none eligible (used
+            when we have no live connections). If force is specified resurrect
+            always returns a connection.
+        """
+        with self._lock:
+            if not self.dead or (not force and self.dead[0][0] > time.time()):
+                if force:
+                    # another thread resurrected all the connections
+                    return random.choice(self.orig_connections)
+                return None
+
+            _, _, connection = heapq.heappop(self.dead)
+            self._next_resurrect = self.dead[0][0] if self.dead else float("inf")
+            if not force and self._is_broken(connection):
+                # it will be put back once its circuit breaker closes
+                return None
+            self.connections = self.connections + (connection,)
+        logger.info("Resurrecting connection %r (force=%s).", connection, force)
+        return connection
+
+    def get_connection(self) -> Any:
+        """
+        Return a connection from the current snapshot of live connections
+        using the `ConnectionSelector` instance, resurrecting a connection
+        first if one is due.
+        """
+        if self._next_resurrect <= time.time():
+            self.resurrect()
+        connections = self.connections
+
+        # no live nodes, resurrect one by force and return it
+        if not connections:
+            return self.resurrect(True)
+
+        # only call selector if we have a selection
+        if len(connections) > 1:
+            return self.selector.select(connections)
+
+        # only one connection, no need for a selector
+        return connections[0]
+
+    def _remove_live(self, connection: Any) -> None:
+        with self._lock:
+            self.connections = tuple(c for c in self.connections if c != connection)
+
+    def _add_live(self, connection: Any) -> None:
+        with self._lock:
+            if connection not in self.connections:
+                self.connections = self.connections + (connection,)
+
+
 class DummyConnectionPool(ConnectionPool):
     def __init__(self, connections: Any, **kwargs: Any) -> None:
         if len(connections) != 1:
@@ -313,10 +792,14 @@ class DummyConnectionPool(ConnectionPool):
         """
         self.connection.close()
 
+    def connections_to_probe(self) -> List[Any]:
+        return []
+
     def _noop(self, *args: Any, **kwargs: Any) -> Any:
         pass
 
-    mark_dead = mark_live = resurrect = _noop
+    mark_dead = mark_live = resurrect = request_started = request_finished = _noop
+    take_over = _noop
 
 
 class EmptyConnectionPool(ConnectionPool):
@@ -329,7 +812,11 @@ class EmptyConnectionPool(ConnectionPool):
     def get_connection(self) -> Connection:
         raise ImproperlyConfigured("No connections were configured")
 
+    def connections_to_probe(self) -> List[Any]:
+        return []
+
     def _noop(self, *args: Any, **kwargs: Any) -> Any:
         pass
 
     close = mark_dead = mark_live = resurrect = _noop
+    request_started = request_finished = take_over = _noop
@@ -27,32 +27,49 @@
 
 from .._async.helpers.actions import (
     async_bulk,
+    async_parallel_bulk,
+    async_parallel_scan,
+    async_pit_scan,
     async_reindex,
     async_scan,
     async_streaming_bulk,
 )
+from .._async.helpers.processor import AsyncBulkProcessor
 from .actions import (
     _chunk_actions,
     _process_bulk_chunk,
     bulk,
     expand_action,
     parallel_bulk,
+    parallel_scan,
+    pit_scan,
+    process_parallel_bulk,
     reindex,
     scan,
     streaming_bulk,
 )
+from .adaptive import AdaptiveChunkController
 from .asyncsigner import AWSV4SignerAsyncAuth
+from .bulkload import bulk_load
 from .errors import BulkIndexError, ScanError
+from .processor import BulkProcessor
 from .signer import AWSV4SignerAuth, RequestsAWSV4SignerAuth, Urllib3AWSV4SignerAuth
 
 __all__ = [
+    "AdaptiveChunkController",
+    "AsyncBulkProcessor",
+    "BulkProcessor",
     "BulkIndexError",
     "ScanError",
     "expand_action",
     "streaming_bulk",
     "bulk",
     "parallel_bulk",
+    "process_parallel_bulk",
+    "bulk_load",
     "scan",
+    "parallel_scan",
+    "pit_scan",
     "reindex",
     "_chunk_actions",
     "_process_bulk_chunk",
@@ -61,7 +78,10 @@ __all__ = [
     "RequestsAWSV4SignerAuth",
     "Urllib3AWSV4SignerAuth",
     "async_scan",
+    "async_parallel_scan",
+    "async_pit_scan",
     "async_bulk",
+    "async_parallel_bulk",
     "async_reindex",
     "async_streaming_bulk",
 ]
@@ -25,13 +25,22 @@
 #  under the License.
 
 
+import heapq
+import json
 import logging
+import os
+import threading
 import time
+from collections import deque
+from functools import partial
+from itertools import chain, count, islice
 from operator import methodcaller
-from typing import Any, Optional
+from queue import Full
+from typing import Any, List, Optional, Tuple
 
 from ..compat import Mapping, Queue, map, string_types
-from ..exceptions import TransportError
+from ..exceptions import ConnectionTimeout, TransportError
+from .adaptive import AdaptiveChunkController
 from .errors import BulkIndexError, ScanError
 
 logger = logging.getLogger("opensearchpy.helpers")
@@ -104,11 +113,54 @@ def expand_action(data: Any) -> Any:
     return action, data.get("_source", data)
 
 
+def _bytes_dumps(serializer: Any) -> Any:
+    """
+    Return a callable serializing a bulk line straight to UTF-8 encoded bytes,
+    so that the payload never has to be re-encoded further down the line.
+    """
+    dumps_bytes = getattr(serializer, "dumps_bytes", None)
+    if dumps_bytes is not None:
+        return dumps_bytes
+
+    def dumps(data: Any) -> bytes:
+        data = serializer.dumps(data)
+        if isinstance(data, str):
+            data = data.encode("utf-8", "surrogatepass")
+        return data  # type: ignore
+
+    return dumps
+
+
+def _bulk_body(bulk_actions: Any) -> bytes:
+    """
+    Join serialized bulk lines into the newline delimited request body with a
+    single copy. Lines serialized as strings (e.g. by custom code) are encoded,
+    an already joined body is passed through as is.
+    """
+    if isinstance(bulk_actions, bytes):
+        return bulk_actions
+    return b"\n".join(
+        [
+            line if isinstance(line, bytes) else line.encode("utf-8", "surrogatepass")
+            for line in bulk_actions
+        ]
+        + [b""]
+    )
+
+
 class _ActionChunker:
-    def __init__(self, chunk_size: int, max_chunk_bytes: int, serializer: Any) -> None:
+    def __init__(
+        self,
+        chunk_size: int,
+        max_chunk_bytes: int,
+        serializer: Any,
+        chunk_controller: Any = None,
+    ) -> None:
         self.chunk_size = chunk_size
         self.max_chunk_bytes = max_chunk_bytes
         self.serializer = serializer
+        self.chunk_controller = chunk_controller
+        self.dumps = _bytes_dumps(serializer)
 
         self.size = 0
         self.action_count = 0
@@ -118,18 +170,22 @@ class _ActionChunker:
     def feed(self, action: Any, data: Any) -> Any:
         ret = None
         raw_data, raw_action = data, action
-        action = self.serializer.dumps(action)
+        action = self.dumps(action)
         # +1 to account for the trailing new line character
-        cur_size = len(action.encode("utf-8")) + 1
+        cur_size = len(action) + 1
 
         if data is not None:
-            data = self.serializer.dumps(data)
-            cur_size += len(data.encode("utf-8")) + 1
+            data = self.dumps(data)
+            cur_size += len(data) + 1
+
+        chunk_size = self.chunk_size
+        if self.chunk_controller is not None:
+            chunk_size = self.chunk_controller.chunk_size
 
         # full chunk, send it and start a new one
         if self.bulk_actions and (
             self.size + cur_size > self.max_chunk_bytes
-            or self.action_count == self.chunk_size
+            or self.action_count >= chunk_size
         ):
             ret = (self.bulk_data, self.bulk_actions)
             self.bulk_actions, self.bulk_data = [], []
@@ -151,18 +207,26 @@ class _ActionChunker:
         if self.bulk_actions:
             ret = (self.bulk_data, self.bulk_actions)
             self.bulk_actions, self.bulk_data = [], []
+            self.size, self.action_count = 0, 0
         return ret
 
 
 def _chunk_actions(
-    actions: Any, chunk_size: int, max_chunk_bytes: int, serializer: Any
+    actions: Any,
+    chunk_size: int,
+    max_chunk_bytes: int,
+    serializer: Any,
+    chunk_controller: Any = None,
 ) -> Any:
     """
-    Split actions into chunks by number or size, serialize them into strings in
+    Split actions into chunks by number or size, serialize them into bytes in
     the process.
     """
     chunker = _ActionChunker(
-        chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes, serializer=serializer
+        chunk_size=chunk_size,
+        max_chunk_bytes=max_chunk_bytes,
+        serializer=serializer,
+        chunk_controller=chunk_controller,
     )
     for action, data in actions:
         ret = chunker.feed(action, data)
@@ -235,6 +299,17 @@ def _process_bulk_chunk_error(
             yield False, err
 
 
+def _record_bulk_error(
+    chunk_controller: Any, started: float, items: int, error: TransportError
+) -> None:
+    """
+    Report a failed bulk request to the chunk controller, requests rejected
+    as a whole or timing out count as all of their documents being rejected.
+    """
+    if error.status_code == 429 or isinstance(error, ConnectionTimeout):
+        chunk_controller.record(started, items, rejected=items)
+
+
 def _process_bulk_chunk(
     client: Any,
     bulk_actions: Any,
@@ -243,6 +318,7 @@ def _process_bulk_chunk(
     raise_on_error: bool = True,
     ignore_status: Any = (),
     *args: Any,
+    chunk_controller: Any = None,
     **kwargs: Any
 ) -> Any:
     """
@@ -253,7 +329,18 @@ def _process_bulk_chunk(
 
     try:
         # send the actual request
-        resp = client.bulk("\n".join(bulk_actions) + "\n", *args, **kwargs)
+        if chunk_controller is None:
+            resp = client.bulk(_bulk_body(bulk_actions), *args, **kwargs)
+        else:
+            started = chunk_controller.acquire()
+            try:
+                resp = client.bulk(_bulk_body(bulk_actions), *args, **kwargs)
+            except TransportError as e:
+                _record_bulk_error(chunk_controller, started, len(bulk_data), e)
+                raise
+            finally:
+                chunk_controller.release()
+            chunk_controller.record_response(started, len(bulk_data), resp)
     except TransportError as e:
         gen = _process_bulk_chunk_error(
             error=e,
@@ -287,6 +374,7 @@ def streaming_bulk(
     yield_ok: bool = True,
     ignore_status: Any = (),
     *args: Any,
+    chunk_controller: Optional[AdaptiveChunkController] = None,
     **kwargs: Any
 ) -> Any:
     """
@@ -321,15 +409,26 @@ def streaming_bulk(
     :arg max_backoff: maximum number of seconds a retry will wait
     :arg yield_ok: if set to False will skip successful documents in the output
     :arg ignore_status: list of HTTP status code that you want to ignore
+    :arg chunk_controller: :class:`~opensearchpy.helpers.AdaptiveChunkController`
+        adapting the chunk size to the load of the cluster, in place of
+        ``chunk_size``
     """
     actions = map(expand_action_callback, actions)
+    if chunk_controller is not None:
+        kwargs["chunk_controller"] = chunk_controller
 
     for bulk_data, bulk_actions in _chunk_actions(
-        actions, chunk_size, max_chunk_bytes, client.transport.serializer
+        actions,
+        chunk_size,
+        max_chunk_bytes,
+        client.transport.serializer,
+        chunk_controller,
     ):
         for attempt in range(max_retries + 1):
             to_retry: Any = []
             to_retry_data: Any = []
+            # position of the current item's lines within bulk_actions
+            line = 0
             if attempt:
                 time.sleep(min(max_backoff, initial_backoff * 2 ** (attempt - 1)))
 
@@ -347,6 +446,7 @@ def streaming_bulk(
                         **kwargs
                     ),
                 ):
+                    start, line = line, line + len(data)
                     if not ok:
                         action, info = info.popitem()
                         # retry if retries enabled, we get 429, and we are not
@@ -356,11 +456,8 @@ def streaming_bulk(
                             and info["status"] == 429
                             and (attempt + 1) <= max_retries
                         ):
-                            # _process_bulk_chunk expects strings so we need to
-                            # re-serialize the data
-                            to_retry.extend(
-                                map(client.transport.serializer.dumps, data)
-                            )
+                            # reuse the already serialized lines
+                            to_retry.extend(bulk_actions[start:line])
                             to_retry_data.append(data)
                         else:
                             yield ok, {action: info}
@@ -433,6 +530,199 @@ def bulk(
     return success, failed if stats_only else errors
 
 
+class _BulkRetryQueue:
+    """
+    Documents rejected with ``429`` by :func:`parallel_bulk`, waiting out
+    their backoff before being sent again while fresh chunks keep flowing.
+
+    While more than ``max_retry_bytes`` are buffered no fresh chunks are
+    taken from the input, so that memory stays bounded under sustained
+    back-pressure.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int,
+        max_chunk_bytes: int,
+        max_retry_bytes: int,
+        initial_backoff: float,
+        max_backoff: float,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.max_chunk_bytes = max_chunk_bytes
+        self.max_retry_bytes = max_retry_bytes
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+        # number of bytes of the documents waiting to be retried
+        self.size = 0
+        # (due, sequence, attempt, data, lines, size) of every document
+        self._heap: List[Tuple[float, int, int, Any, Any, int]] = []
+        self._seq = count()
+        self._in_flight = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def chunks(self, bulk_chunks: Any) -> Any:
+        """
+        Generate the chunks to send as ``(bulk_data, bulk_actions, attempts)``,
+        documents due for a retry first, until both the fresh ``bulk_chunks``
+        and the retries are exhausted.
+        """
+        bulk_chunks = iter(bulk_chunks)
+        exhausted = False
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        return
+                    chunk = self._pop_due()
+                    if chunk is not None:
+                        break
+                    if not exhausted and self.size <= self.max_retry_bytes:
+                        break
+                    if exhausted and not self._heap and not self._in_flight:
+                        return
+                    self._condition.wait(self._next_due())
+
+            if chunk is None:
+                try:
+                    bulk_data, bulk_actions = next(bulk_chunks)
+                except StopIteration:
+                    exhausted = True
+                    continue
+                chunk = (bulk_data, bulk_actions, None)
+
+            with self._condition:
+                self._in_flight += 1
+            yield chunk
+
+    def done(self, retries: Any) -> None:
+        """
+        Mark a chunk as processed, scheduling its ``(attempt, data, lines)``
+        retries.
+        """
+        now = time.monotonic()
+        with self._condition:
+            for attempt, data, lines in retries:
+                size = sum(len(line) + 1 for line in lines)
+                due = now + min(
+                    self.max_backoff, self.initial_backoff * 2 ** (attempt - 1)
+                )
+                heapq.heappush(
+                    self._heap, (due, next(self._seq), attempt, data, lines, size)
+                )
+                self.size += size
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _next_due(self) -> Optional[float]:
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def _pop_due(self) -> Any:
+        # merge all due documents into chunks bounded like the fresh ones
+        now = time.monotonic()
+        bulk_data: Any = []
+        bulk_actions: Any = []
+        attempts: Any = []
+        size = 0
+        while self._heap and self._heap[0][0] <= now:
+            if bulk_data and (
+                len(bulk_data) >= self.chunk_size
+                or size + self._heap[0][5] > self.max_chunk_bytes
+            ):
+                break
+            _, _, attempt, data, lines, item_size = heapq.heappop(self._heap)
+            bulk_data.append(data)
+            bulk_actions.extend(lines)
+            attempts.append(attempt)
+            size += item_size
+            self.size -= item_size
+        if not bulk_data:
+            return None
+        return bulk_data, bulk_actions, attempts
+
+
+def _process_bulk_chunk_with_retries(
+    client: Any,
+    chunk: Any,
+    retry_queue: _BulkRetryQueue,
+    max_retries: int,
+    raise_on_exception: bool = True,
+    raise_on_error: bool = True,
+    ignore_status: Any = (),
+    *args: Any,
+    **kwargs: Any
+) -> Any:
+    """
+    Send a chunk of :func:`parallel_bulk` and return its results, handing
+    the documents rejected with ``429`` over to the retry queue instead.
+    """
+    if not isinstance(ignore_status, (list, tuple)):
+        ignore_status = (ignore_status,)
+
+    bulk_data, bulk_actions, attempts = chunk
+    attempts = attempts or [0] * len(bulk_data)
+    results: Any = []
+    retries: Any = []
+    try:
+        errors: Any = []
+        line = 0
+        try:
+            # errors are raised below, once the rejected documents are known
+            for data, attempt, (ok, info) in zip(
+                bulk_data,
+                attempts,
+                _process_bulk_chunk(
+                    client,
+                    bulk_actions,
+                    bulk_data,
+                    raise_on_exception,
+                    False,
+                    ignore_status,
+                    *args,
+                    **kwargs
+                ),
+            ):
+                start, line = line, line + len(data)
+                op_type, item = next(iter(info.items()))
+                status_code = item.get("status", 500)
+                if not ok and status_code == 429 and attempt < max_retries:
+                    retries.append((attempt + 1, data, bulk_actions[start:line]))
+                    continue
+
+                if not ok and raise_on_error and status_code not in ignore_status:
+                    # include original document source
+                    if len(data) > 1:
+                        item["data"] = data[1]
+                    errors.append(info)
+                if ok or not errors:
+                    results.append((ok, info))
+        except TransportError as e:
+            # the whole request was rejected, retry all of it
+            if e.status_code != 429 or max(attempts) >= max_retries:
+                raise
+            line = 0
+            for data, attempt in zip(bulk_data, attempts):
+                start, line = line, line + len(data)
+                retries.append((attempt + 1, data, bulk_actions[start:line]))
+
+        if errors:
+            raise BulkIndexError(
+                "%i document(s) failed to index." % len(errors), errors
+            )
+        return results
+    finally:
+        retry_queue.done(retries)
+
+
 def parallel_bulk(
     client: Any,
     actions: Any,
@@ -445,11 +735,23 @@ def parallel_bulk(
     raise_on_error: bool = True,
     ignore_status: Any = (),
     *args: Any,
+    chunk_controller: Optional[AdaptiveChunkController] = None,
+    max_retries: int = 0,
+    initial_backoff: float = 2,
+    max_backoff: float = 600,
+    max_retry_bytes: int = 100 * 1024 * 1024,
     **kwargs: Any
 ) -> Any:
     """
     Parallel version of the bulk helper run in multiple threads at once.
 
+    If you specify ``max_retries`` it will also retry any documents that were
+    rejected with a ``429`` status code. Rejected documents wait out their
+    backoff, ``initial_backoff`` seconds doubling with every attempt up to
+    ``max_backoff`` seconds, in a retry queue while fresh chunks keep being
+    sent; they are yielded once they succeeded or ran out of retries, so
+    results are not in the order of the actions anymore.
+
     :arg client: instance of :class:`~opensearchpy.OpenSearch` to use
     :arg actions: iterator containing the actions
     :arg thread_count: size of the threadpool to use for the bulk requests
@@ -465,12 +767,28 @@ def parallel_bulk(
     :arg queue_size: size of the task queue between the main thread (producing
         chunks to send) and the processing threads.
     :arg ignore_status: list of HTTP status code that you want to ignore
+    :arg chunk_controller: :class:`~opensearchpy.helpers.AdaptiveChunkController`
+        adapting the chunk size and the number of requests in flight (up to
+        ``thread_count``) to the load of the cluster, in place of
+        ``chunk_size``
+    :arg max_retries: maximum number of times a document will be retried when
+        ``429`` is received, set to 0 (default) for no retries on ``429``
+    :arg initial_backoff: number of seconds a document waits before its first
+        retry. Any subsequent retries will be powers of ``initial_backoff *
+        2**retry_number``
+    :arg max_backoff: maximum number of seconds a retry will wait
+    :arg max_retry_bytes: maximum size of the documents waiting to be retried
+        above which no new chunks are read from ``actions`` (default: 100MB)
     """
     # Avoid importing multiprocessing unless parallel_bulk is used
     # to avoid exceptions on restricted environments like App Engine
     from multiprocessing.pool import ThreadPool
 
     actions = map(expand_action_callback, actions)
+    if chunk_controller is not None:
+        # no more requests than threads can be in flight
+        chunk_controller.limit_concurrency(thread_count)
+        kwargs["chunk_controller"] = chunk_controller
 
     class BlockingPool(ThreadPool):
         def _setup_queues(self) -> None:
@@ -482,32 +800,233 @@ def parallel_bulk(
 
     pool = BlockingPool(thread_count)
 
+    bulk_chunks = _chunk_actions(
+        actions,
+        chunk_size,
+        max_chunk_bytes,
+        client.transport.serializer,
+        chunk_controller,
+    )
+    retry_queue = None
+    if max_retries:
+        retry_queue = _BulkRetryQueue(
+            chunk_size, max_chunk_bytes, max_retry_bytes, initial_backoff, max_backoff
+        )
+        bulk_chunks = retry_queue.chunks(bulk_chunks)
+
+    def process_chunk(bulk_chunk: Any) -> Any:
+        if retry_queue is not None:
+            return _process_bulk_chunk_with_retries(
+                client,
+                bulk_chunk,
+                retry_queue,
+                max_retries,
+                raise_on_exception,
+                raise_on_error,
+                ignore_status,
+                *args,
+                **kwargs
+            )
+        return list(
+            _process_bulk_chunk(
+                client,
+                bulk_chunk[1],
+                bulk_chunk[0],
+                raise_on_exception,
+                raise_on_error,
+                ignore_status,
+                *args,
+                **kwargs
+            )
+        )
+
     try:
-        for result in pool.imap(
-            lambda bulk_chunk: list(
-                _process_bulk_chunk(
-                    client,
-                    bulk_chunk[1],
-                    bulk_chunk[0],
-                    raise_on_exception,
-                    raise_on_error,
-                    ignore_status,
-                    *args,
-                    **kwargs
-                )
-            ),
-            _chunk_actions(
-                actions, chunk_size, max_chunk_bytes, client.transport.serializer
-            ),
-        ):
+        for result in pool.imap(process_chunk, bulk_chunks):
             for item in result:
                 yield item
 
     finally:
+        if retry_queue is not None:
+            retry_queue.close()
         pool.close()
         pool.join()
 
 
+def _serialize_actions(
+    actions: Any,
+    expand_action_callback: Any,
+    chunk_size: int,
+    max_chunk_bytes: int,
+    serializer: Any,
+) -> Any:
+    """
+    Expand and serialize a batch of actions into ready to send bulk bodies.
+    Runs in a worker process of :func:`process_parallel_bulk`: only the
+    encoded bodies and the number of lines of each action are sent back.
+    """
+    chunks = []
+    start = 0
+    for bulk_data, bulk_actions in _chunk_actions(
+        map(expand_action_callback, actions), chunk_size, max_chunk_bytes, serializer
+    ):
+        line_counts = bytes(len(data) for data in bulk_data)
+        chunks.append((start, line_counts, _bulk_body(bulk_actions)))
+        start += len(line_counts)
+    return chunks
+
+
+class _DeferredAction:
+    """
+    Stand-in for an expanded ``(action, data)`` tuple, expanding the original
+    action again only when its content is needed to report a failure.
+    """
+
+    __slots__ = ("action", "line_count", "expand_action_callback", "_expanded")
+
+    def __init__(
+        self, action: Any, line_count: int, expand_action_callback: Any
+    ) -> None:
+        self.action = action
+        self.line_count = line_count
+        self.expand_action_callback = expand_action_callback
+        self._expanded: Any = None
+
+    def __len__(self) -> int:
+        return self.line_count
+
+    def __getitem__(self, index: int) -> Any:
+        if self._expanded is None:
+            action, data = self.expand_action_callback(self.action)
+            self._expanded = (action,) if data is None else (action, data)
+        return self._expanded[index]
+
+
+def _bounded_imap(executor: Any, func: Any, iterable: Any, size: int) -> Any:
+    """
+    Like ``executor.map`` but consumes ``iterable`` lazily, keeping at most
+    ``size`` tasks submitted ahead of the one being yielded.
+    """
+    pending: Any = deque()
+    try:
+        for item in iterable:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= size:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def process_parallel_bulk(
+    client: Any,
+    actions: Any,
+    process_count: Optional[int] = None,
+    thread_count: int = 4,
+    chunk_size: int = 500,
+    max_chunk_bytes: int = 100 * 1024 * 1024,
+    queue_size: int = 4,
+    expand_action_callback: Any = expand_action,
+    raise_on_exception: bool = True,
+    raise_on_error: bool = True,
+    ignore_status: Any = (),
+    *args: Any,
+    **kwargs: Any
+) -> Any:
+    """
+    Version of :func:`~opensearchpy.helpers.parallel_bulk` that expands and
+    serializes the actions in a pool of worker processes, so that CPU bound
+    serialization is not limited by the GIL, while the bulk requests are sent
+    from a pool of threads. Results are yielded in order, in the same
+    ``(ok, info)`` shape as :func:`~opensearchpy.helpers.parallel_bulk`.
+
+    The actions, ``expand_action_callback`` and the client's serializer are
+    sent to the worker processes, so they need to be picklable; in particular
+    ``expand_action_callback`` cannot be a lambda or a local function. When
+    reporting failures the failed actions are expanded again in the calling
+    process, so ``expand_action_callback`` should be deterministic.
+
+    :arg client: instance of :class:`~opensearchpy.OpenSearch` to use
+    :arg actions: iterator containing the actions
+    :arg process_count: number of worker processes serializing the actions
+        (default: number of CPUs)
+    :arg thread_count: size of the threadpool to use for the bulk requests
+    :arg chunk_size: number of docs in one chunk sent to client (default: 500)
+    :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
+    :arg queue_size: number of serialized chunks and bulk requests queued up
+        ahead of the ones being processed.
+    :arg expand_action_callback: callback executed on each action passed in,
+        should return a tuple containing the action line and the data line
+        (`None` if data line should be omitted).
+    :arg raise_on_exception: if ``False`` then don't propagate exceptions from
+        call to ``bulk`` and just report the items that failed as failed.
+    :arg raise_on_error: raise ``BulkIndexError`` containing errors (as `.errors`)
+        from the execution of the last chunk when some occur. By default we raise.
+    :arg ignore_status: list of HTTP status code that you want to ignore
+    """
+    # Avoid importing multiprocessing unless process_parallel_bulk is used
+    # to avoid exceptions on restricted environments like App Engine
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    actions = iter(actions)
+    serialize = partial(
+        _serialize_actions,
+        expand_action_callback=expand_action_callback,
+        chunk_size=chunk_size,
+        max_chunk_bytes=max_chunk_bytes,
+        serializer=client.transport.serializer,
+    )
+
+    def send(bulk_chunk: Any) -> Any:
+        return list(
+            _process_bulk_chunk(
+                client,
+                bulk_chunk[1],
+                bulk_chunk[0],
+                raise_on_exception,
+                raise_on_error,
+                ignore_status,
+                *args,
+                **kwargs
+            )
+        )
+
+    # batches submitted to the worker processes, in order, kept around to
+    # report failures
+    submitted: Any = deque()
+
+    def submit_batches() -> Any:
+        for batch in iter(lambda: list(islice(actions, chunk_size)), []):
+            submitted.append(batch)
+            yield batch
+
+    process_count = process_count or os.cpu_count() or 1
+    with ProcessPoolExecutor(process_count) as processes, ThreadPoolExecutor(
+        thread_count
+    ) as threads:
+
+        def bulk_chunks() -> Any:
+            for chunks in _bounded_imap(
+                processes, serialize, submit_batches(), max(queue_size, process_count)
+            ):
+                batch = submitted.popleft()
+                for start, line_counts, body in chunks:
+                    bulk_data = [
+                        _DeferredAction(action, count, expand_action_callback)
+                        for action, count in zip(
+                            batch[start : start + len(line_counts)], line_counts
+                        )
+                    ]
+                    yield bulk_data, body
+
+        for result in _bounded_imap(
+            threads, send, bulk_chunks(), max(queue_size, thread_count)
+        ):
+            for item in result:
+                yield item
+
+
 def scan(
     client: Any,
     query: Any = None,
@@ -518,6 +1037,9 @@ def scan(
     request_timeout: Optional[float] = None,
     clear_scroll: Optional[bool] = True,
     scroll_kwargs: Any = None,
+    prefetch: int = 0,
+    max_prefetch_bytes: Optional[int] = 100 * 1024 * 1024,
+    stream: bool = False,
     **kwargs: Any
 ) -> Any:
     """
@@ -531,6 +1053,15 @@ def scan(
     may be an expensive operation and will negate the performance benefits of
     using ``scan``.
 
+    With ``prefetch`` set, the next pages are scrolled in a background thread
+    while the hits of the current one are being consumed, overlapping the
+    round trips to the cluster with the processing of the hits.
+
+    With ``stream`` the hits are parsed one at a time as each page is read
+    from the connection, instead of parsing whole pages, so that the memory
+    used doesn't grow with the size of the pages. It can't be combined with
+    ``prefetch``.
+
     :arg client: instance of :class:`~opensearchpy.OpenSearch` to use
     :arg query: body for the :meth:`~opensearchpy.OpenSearch.search` api
     :arg scroll: Specify how long a consistent view of the index should be
@@ -548,6 +1079,12 @@ def scan(
         to true.
     :arg scroll_kwargs: additional kwargs to be passed to
         :meth:`~opensearchpy.OpenSearch.scroll`
+    :arg prefetch: number of pages fetched ahead, defaults to 0 which only
+        fetches a page once the previous one has been consumed
+    :arg max_prefetch_bytes: approximate upper bound of the size of the pages
+        fetched ahead, ``None`` to only bound them by ``prefetch``
+    :arg stream: parse the hits incrementally as they are read, see
+        :class:`~opensearchpy.streaming.StreamingResponse`
 
     Any additional keyword arguments will be passed to the initial
     :meth:`~opensearchpy.OpenSearch.search` call::
@@ -558,6 +1095,103 @@ def scan(
             doc_type="books"
         )
 
+    """
+    if stream and prefetch:
+        raise ValueError("stream and prefetch can't be combined")
+
+    pages = _prefetched(
+        _scroll_pages(
+            client,
+            query,
+            scroll,
+            raise_on_error,
+            preserve_order,
+            size,
+            request_timeout,
+            clear_scroll,
+            scroll_kwargs,
+            stream,
+            **kwargs
+        ),
+        prefetch,
+        max_prefetch_bytes,
+    )
+    try:
+        for hits in pages:
+            for hit in hits:
+                yield hit
+    finally:
+        pages.close()
+
+
+def _transport_kwargs(kwargs: Any) -> Any:
+    """
+    Grab options that should be propagated to every API call within a scan
+    helper instead of just 'search()'
+    """
+    return {
+        key: kwargs[key] for key in ("headers", "api_key", "http_auth") if key in kwargs
+    }
+
+
+def _check_shards(
+    resp: Any, scan_id: Any, raise_on_error: Optional[bool], kind: str = "Scroll"
+) -> None:
+    """
+    Log, and unless ``raise_on_error`` is ``False`` raise a ``ScanError``,
+    when a page of a scan did not succeed on all shards.
+    """
+    _shards = resp.get("_shards")
+    if not _shards:
+        return
+
+    # Default to 0 if the value isn't included in the response
+    shards_successful = _shards.get("successful", 0)
+    shards_skipped = _shards.get("skipped", 0)
+    shards_total = _shards.get("total", 0)
+
+    # check if we have any errors
+    if (shards_successful + shards_skipped) < shards_total:
+        shards_message = (
+            kind + " request has only succeeded on %d (+%d skipped) shards out of %d."
+        )
+        logger.warning(
+            shards_message,
+            shards_successful,
+            shards_skipped,
+            shards_total,
+        )
+        if raise_on_error:
+            raise ScanError(
+                scan_id,
+                shards_message
+                % (
+                    shards_successful,
+                    shards_skipped,
+                    shards_total,
+                ),
+            )
+
+
+def _scroll_pages(
+    client: Any,
+    query: Any = None,
+    scroll: Optional[str] = "5m",
+    raise_on_error: Optional[bool] = True,
+    preserve_order: Optional[bool] = False,
+    size: Optional[int] = 1000,
+    request_timeout: Optional[float] = None,
+    clear_scroll: Optional[bool] = True,
+    scroll_kwargs: Any = None,
+    stream: bool = False,
+    **kwargs: Any
+) -> Any:
+    """
+    Scroll through the hits of a search, yielding them page by page. The
+    scroll is cleared once done or when the generator is closed.
+
+    With ``stream`` the pages are iterators over the hits parsed as they are
+    read from the connection, which must be consumed before the next page.
     """
     scroll_kwargs = scroll_kwargs or {}
 
@@ -565,12 +1199,7 @@ def scan(
         query = query.copy() if query else {}
         query["sort"] = "_doc"
 
-    # Grab options that should be propagated to every
-    # API call within this helper instead of just 'search()'
-    transport_kwargs = {}
-    for key in ("headers", "api_key", "http_auth"):
-        if key in kwargs:
-            transport_kwargs[key] = kwargs[key]
+    transport_kwargs = _transport_kwargs(kwargs)
 
     # If the user is using 'scroll_kwargs' we want
     # to propagate there too, but to not break backwards
@@ -579,6 +1208,10 @@ def scan(
         for key, val in transport_kwargs.items():
             scroll_kwargs.setdefault(key, val)
 
+    if stream:
+        kwargs["stream"] = True
+        scroll_kwargs = dict(scroll_kwargs, stream=True)
+
     # initial search
     resp = client.search(
         body=query, scroll=scroll, size=size, request_timeout=request_timeout, **kwargs
@@ -586,37 +1219,16 @@ def scan(
     scroll_id = resp.get("_scroll_id")
 
     try:
-        while scroll_id and resp.get("hits", {}).get("hits"):
-            for hit in resp.get("hits", {}).get("hits", []):
-                yield hit
-
-            _shards = resp.get("_shards")
+        while scroll_id:
+            hits = _streamed_hits(resp) if stream else resp.get("hits", {}).get("hits")
+            if not hits:
+                break
+            yield hits
 
-            if _shards:
-                # Default to 0 if the value isn't included in the response
-                shards_successful = _shards.get("successful", 0)
-                shards_skipped = _shards.get("skipped", 0)
-                shards_total = _shards.get("total", 0)
-
-            # check if we have any errors
-            if (shards_successful + shards_skipped) < shards_total:
-                shards_message = "Scroll request has only succeeded on %d (+%d skipped) shards out of %d."
-                logger.warning(
-                    shards_message,
-                    shards_successful,
-                    shards_skipped,
-                    shards_total,
-                )
-                if raise_on_error:
-                    raise ScanError(
-                        scroll_id,
-                        shards_message
-                        % (
-                            shards_successful,
-                            shards_skipped,
-                            shards_total,
-                        ),
-                    )
+            _check_shards(resp, scroll_id, raise_on_error)
+            if stream:
+                # read what follows the hits to release the connection
+                resp.read()
 
             resp = client.scroll(
                 body={"scroll_id": scroll_id, "scroll": scroll}, **scroll_kwargs
@@ -624,12 +1236,413 @@ def scan(
             scroll_id = resp.get("_scroll_id")
 
     finally:
+        if stream:
+            resp.close()
         if scroll_id and clear_scroll:
             client.clear_scroll(
                 body={"scroll_id": [scroll_id]}, ignore=(404,), **transport_kwargs
             )
 
 
+def _streamed_hits(resp: Any) -> Any:
+    """
+    Iterator over the hits of a streamed response, or ``None`` when it has
+    none.
+    """
+    hits = resp.hits()
+    for hit in hits:
+        return chain((hit,), hits)
+    return None
+
+
+def _pit_body(query: Any, tiebreaker: Optional[str]) -> Any:
+    """
+    Copy the body of a search to page through a point in time, appending
+    ``tiebreaker`` to its sort unless already part of it, so that every hit
+    has a unique sort value to resume from.
+    """
+    body = query.copy() if query else {}
+    sort = body.get("sort") or []
+    if not isinstance(sort, list):
+        sort = [sort]
+    if tiebreaker and tiebreaker not in (
+        field if isinstance(field, str) else next(iter(field)) for field in sort
+    ):
+        sort = sort + [{tiebreaker: "asc"}]
+    body["sort"] = sort
+    return body
+
+
+def _pit_pages(
+    client: Any,
+    pit_id: Any,
+    keep_alive: str = "5m",
+    query: Any = None,
+    size: Optional[int] = 1000,
+    raise_on_error: Optional[bool] = True,
+    request_timeout: Optional[float] = None,
+    tiebreaker: Optional[str] = "_id",
+    **kwargs: Any
+) -> Any:
+    """
+    Page through the hits of a search on a point in time with
+    ``search_after``, yielding them page by page.
+    """
+    body = _pit_body(query, tiebreaker)
+    search_after = body.pop("search_after", None)
+    while True:
+        body["pit"] = {"id": pit_id, "keep_alive": keep_alive}
+        if search_after is not None:
+            body["search_after"] = search_after
+
+        resp = client.search(
+            body=body, size=size, request_timeout=request_timeout, **kwargs
+        )
+        # the id of a point in time may change between searches
+        pit_id = resp.get("pit_id", pit_id)
+        hits = resp.get("hits", {}).get("hits")
+        if not hits:
+            return
+
+        yield hits
+
+        _check_shards(resp, pit_id, raise_on_error, "Search")
+        if size is not None and len(hits) < size:
+            return
+        search_after = hits[-1]["sort"]
+
+
+def _page_bytes(hits: Any) -> int:
+    """
+    Approximate size of a page of hits, in bytes, extrapolated from the
+    serialized size of a few of them spread over the page.
+    """
+    if not hits:
+        return 0
+    step = max(1, len(hits) // 4)
+    sample = hits[::step][:4]
+    return len(json.dumps(sample, default=str)) * len(hits) // len(sample)
+
+
+def _threaded_pages(
+    pages_list: Any,
+    queue_size: int,
+    on_error: Any = None,
+    max_bytes: Optional[int] = None,
+) -> Any:
+    """
+    Consume generators of pages, each in its own background thread, and
+    yield ``(index, page)`` through a bounded queue as the pages come in.
+
+    When ``max_bytes`` is given the queue is also bounded by the approximate
+    size of the pages it holds; a page larger than ``max_bytes`` is still
+    queued once the queue is empty.
+
+    An exception raised by one of the generators is re-raised, unless
+    ``on_error`` is given in which case it is called with the index of the
+    generator and the exception, and the other generators keep going. Once
+    done, or when closed, all threads are stopped and joined and the
+    generators are closed, clearing their cursors.
+    """
+    queue: Any = Queue(queue_size)
+    stop = threading.Event()
+    buffered = threading.Condition()
+    buffered_bytes = [0]
+
+    def reserve(size: int, limit: int) -> bool:
+        with buffered:
+            while buffered_bytes[0] and buffered_bytes[0] + size > limit:
+                if stop.is_set():
+                    return False
+                buffered.wait(0.1)
+            buffered_bytes[0] += size
+        return True
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def run(index: int, pages: Any) -> None:
+        try:
+            for page in pages:
+                size = 0
+                if max_bytes is not None:
+                    size = _page_bytes(page)
+                    if not reserve(size, max_bytes):
+                        break
+                if not put((index, page, None, size)):
+                    break
+            pages.close()
+        except Exception as e:
+            put((index, None, e, 0))
+        put((index, None, None, 0))
+
+    threads = [
+        threading.Thread(target=run, args=(index, pages), daemon=True)
+        for index, pages in enumerate(pages_list)
+    ]
+    for thread in threads:
+        thread.start()
+
+    remaining = len(threads)
+    try:
+        while remaining:
+            index, page, error, size = queue.get()
+            if size:
+                with buffered:
+                    buffered_bytes[0] -= size
+                    buffered.notify_all()
+            if error is not None:
+                if on_error is None:
+                    raise error
+                on_error(index, error)
+            elif page is None:
+                remaining -= 1
+            else:
+                yield index, page
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def parallel_scan(
+    client: Any,
+    query: Any = None,
+    slices: int = 4,
+    pit: bool = False,
+    scroll: Optional[str] = "5m",
+    keep_alive: str = "5m",
+    raise_on_error: Optional[bool] = True,
+    size: Optional[int] = 1000,
+    request_timeout: Optional[float] = None,
+    clear_scroll: Optional[bool] = True,
+    scroll_kwargs: Any = None,
+    tiebreaker: Optional[str] = "_id",
+    queue_size: Optional[int] = None,
+    **kwargs: Any
+) -> Any:
+    """
+    Parallel version of :func:`~opensearchpy.helpers.scan`: the search is
+    split into ``slices`` slices, each scrolled through in its own thread,
+    and the hits are yielded as they come in from any of the slices, in no
+    particular order.
+
+    By default each slice uses a sliced scroll. With ``pit=True`` a single
+    point in time is created instead, and each slice pages through it with
+    ``search_after``, sorting on ``tiebreaker`` (a field with unique values)
+    on top of the sort of the query.
+
+    Every scroll and the point in time are cleared once done, on error or
+    when the generator is closed.
+
+    :arg client: instance of :class:`~opensearchpy.OpenSearch` to use
+    :arg query: body for the :meth:`~opensearchpy.OpenSearch.search` api
+    :arg slices: number of slices scanned concurrently
+    :arg pit: use a point in time and ``search_after`` instead of scrolls
+    :arg scroll: Specify how long a consistent view of the index should be
+        maintained for scrolled search
+    :arg keep_alive: how long the point in time is kept alive between
+        searches, when ``pit`` is set
+    :arg raise_on_error: raises an exception (``ScanError``) if an error is
+        encountered (some shards fail to execute) and re-raises the exception
+        of a failing slice, stopping the others. If ``False`` a failing slice
+        is logged and the remaining slices keep going. By default we raise.
+    :arg size: size (per shard for scrolls) of the batch send at each
+        iteration.
+    :arg request_timeout: explicit timeout for each search call
+    :arg clear_scroll: explicitly calls delete on the scroll ids via the clear
+        scroll API at the end of the method on completion or error, defaults
+        to true.
+    :arg scroll_kwargs: additional kwargs to be passed to
+        :meth:`~opensearchpy.OpenSearch.scroll`
+    :arg tiebreaker: field sorted on last to page through a point in time
+    :arg queue_size: maximum number of pages buffered between the slices and
+        the consumer (default: twice the number of slices)
+
+    Any additional keyword arguments will be passed to the
+    :meth:`~opensearchpy.OpenSearch.search` calls, ``index`` to
+    :meth:`~opensearchpy.OpenSearch.create_pit` when ``pit`` is set::
+
+        parallel_scan(client,
+            query={"query": {"match": {"title": "python"}}},
+            index="orders-*",
+            slices=8,
+        )
+    """
+    transport_kwargs = _transport_kwargs(kwargs)
+
+    pit_id = None
+    if pit:
+        pit_id = client.create_pit(
+            index=kwargs.pop("index", None), keep_alive=keep_alive, **transport_kwargs
+        )["pit_id"]
+
+    def on_error(index: int, error: Exception) -> None:
+        logger.warning("Slice %d of the scan failed: %s", index, error)
+
+    slice_pages = None
+    try:
+        pages_list = []
+        for slice_id in range(slices):
+            body = query.copy() if query else {}
+            if slices > 1:
+                body["slice"] = {"id": slice_id, "max": slices}
+            if pit:
+                pages = _pit_pages(
+                    client,
+                    pit_id,
+                    keep_alive,
+                    body,
+                    size,
+                    raise_on_error,
+                    request_timeout,
+                    tiebreaker,
+                    **kwargs
+                )
+            else:
+                pages = _scroll_pages(
+                    client,
+                    body,
+                    scroll,
+                    raise_on_error,
+                    False,
+                    size,
+                    request_timeout,
+                    clear_scroll,
+                    dict(scroll_kwargs or {}),
+                    **kwargs
+                )
+            pages_list.append(pages)
+
+        slice_pages = _threaded_pages(
+            pages_list,
+            queue_size or 2 * slices,
+            None if raise_on_error else on_error,
+        )
+        for _, hits in slice_pages:
+            for hit in hits:
+                yield hit
+
+    finally:
+        # stop all slices before deleting the point in time they are using
+        if slice_pages is not None:
+            slice_pages.close()
+        if pit_id is not None:
+            client.delete_pit(
+                body={"pit_id": [pit_id]}, ignore=(404,), **transport_kwargs
+            )
+
+
+def _prefetched(
+    pages: Any, prefetch: int, max_prefetch_bytes: Optional[int] = None
+) -> Any:
+    """
+    Fetch up to ``prefetch`` pages of ``pages``, and up to approximately
+    ``max_prefetch_bytes`` of hits, ahead in a background thread while the
+    current one is being consumed.
+    """
+    if not prefetch:
+        try:
+            for page in pages:
+                yield page
+        finally:
+            pages.close()
+        return
+
+    prefetched = _threaded_pages([pages], prefetch, max_bytes=max_prefetch_bytes)
+    try:
+        for _, page in prefetched:
+            yield page
+    finally:
+        prefetched.close()
+
+
+def pit_scan(
+    client: Any,
+    query: Any = None,
+    index: Any = None,
+    keep_alive: str = "5m",
+    raise_on_error: Optional[bool] = True,
+    size: Optional[int] = 1000,
+    request_timeout: Optional[float] = None,
+    tiebreaker: Optional[str] = "_id",
+    prefetch: int = 1,
+    max_prefetch_bytes: Optional[int] = 100 * 1024 * 1024,
+    **kwargs: Any
+) -> Any:
+    """
+    Iterator over all hits of a search, like :func:`~opensearchpy.helpers.scan`
+    but paging with ``search_after`` through a point in time created with
+    :meth:`~opensearchpy.OpenSearch.create_pit` instead of scrolling. Hits
+    are yielded in the order of the ``sort`` of the query, with
+    ``tiebreaker`` (a field with unique values) appended to it so that every
+    page resumes exactly where the previous one ended.
+
+    While the hits of a page are being consumed the next ``prefetch`` pages
+    are fetched in a background thread. The point in time is deleted once
+    done, on error or when the generator is closed.
+
+    :arg client: instance of :class:`~opensearchpy.OpenSearch` to use
+    :arg query: body for the :meth:`~opensearchpy.OpenSearch.search` api
+    :arg index: index(es) to create the point in time on
+    :arg keep_alive: how long the point in time is kept alive between
+        searches
+    :arg raise_on_error: raises an exception (``ScanError``) if an error is
+        encountered (some shards fail to execute). By default we raise.
+    :arg size: number of hits per page
+    :arg request_timeout: explicit timeout for each search call
+    :arg tiebreaker: field sorted on last to page through the point in time
+    :arg prefetch: number of pages fetched ahead, 0 to only fetch a page once
+        the previous one has been consumed
+    :arg max_prefetch_bytes: approximate upper bound of the size of the pages
+        fetched ahead, ``None`` to only bound them by ``prefetch``
+
+    Any additional keyword arguments will be passed to the
+    :meth:`~opensearchpy.OpenSearch.search` calls::
+
+        pit_scan(client,
+            query={"query": {"match": {"title": "python"}}, "sort": ["date"]},
+            index="orders-*",
+        )
+    """
+    transport_kwargs = _transport_kwargs(kwargs)
+    pit_id = client.create_pit(index=index, keep_alive=keep_alive, **transport_kwargs)[
+        "pit_id"
+    ]
+
+    pages = None
+    try:
+        pages = _prefetched(
+            _pit_pages(
+                client,
+                pit_id,
+                keep_alive,
+                query,
+                size,
+                raise_on_error,
+                request_timeout,
+                tiebreaker,
+                **kwargs
+            ),
+            prefetch,
+            max_prefetch_bytes,
+        )
+        for hits in pages:
+            for hit in hits:
+                yield hit
+
+    finally:
+        if pages is not None:
+            pages.close()
+        client.delete_pit(body={"pit_id": [pit_id]}, ignore=(404,), **transport_kwargs)
+
+
 def reindex(
     client: Any,
     source_index: Any,
@@ -0,0 +1,184 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import threading
+import time
+from typing import Any, Optional
+
+
+class AdaptiveChunkController:
+    """
+    Adapts the number of documents per bulk chunk and the number of bulk
+    requests in flight to what the cluster can take, the way AIMD congestion
+    control does: both grow additively while responses come back in time and
+    without rejections, and are cut multiplicatively when they don't.
+
+    - documents rejected with ``429`` shrink both the chunk size and the
+      concurrency,
+    - a ``took`` above ``target_took`` shrinks the chunk size, as the cluster
+      needs too long to process a single chunk,
+    - a round-trip latency above ``target_latency`` shrinks the concurrency,
+      as requests are queuing up,
+    - otherwise the chunk size grows by ``chunk_size_step`` with every
+      response and the concurrency by one with every round of
+      ``concurrency`` responses.
+
+    Responses to requests sent before the last decrease are not taken into
+    account, so a burst of rejections only cuts the load once.
+
+    Pass an instance as ``chunk_controller`` to
+    :func:`~opensearchpy.helpers.streaming_bulk`,
+    :func:`~opensearchpy.helpers.parallel_bulk`,
+    :func:`~opensearchpy.helpers.async_streaming_bulk` or
+    :func:`~opensearchpy.helpers.async_parallel_bulk`. The concurrency is
+    bounded by the size of the thread pool of ``parallel_bulk`` and by
+    ``max_concurrency`` of ``async_parallel_bulk``, while the other helpers
+    only ever have a single request in flight.
+
+    :arg initial_chunk_size: number of documents in the first chunks
+    :arg min_chunk_size: lower bound of the chunk size
+    :arg max_chunk_size: upper bound of the chunk size; ``max_chunk_bytes``
+        still applies on top of it
+    :arg chunk_size_step: number of documents the chunk size grows by
+    :arg initial_concurrency: number of bulk requests in flight at first
+    :arg max_concurrency: upper bound of the number of requests in flight
+    :arg target_took: server side processing time of a chunk, in seconds,
+        above which the chunk size is decreased
+    :arg target_latency: round-trip time of a bulk request, in seconds, above
+        which the concurrency is decreased
+    :arg decrease_factor: factor applied to the chunk size and concurrency
+        when decreasing them
+    :arg max_rejected_ratio: ratio of documents of a chunk rejected with
+        ``429`` tolerated before decreasing
+    """
+
+    def __init__(
+        self,
+        initial_chunk_size: int = 500,
+        min_chunk_size: int = 10,
+        max_chunk_size: int = 10000,
+        chunk_size_step: int = 100,
+        initial_concurrency: int = 1,
+        max_concurrency: Optional[int] = None,
+        target_took: float = 1.0,
+        target_latency: float = 5.0,
+        decrease_factor: float = 0.5,
+        max_rejected_ratio: float = 0.0,
+    ) -> None:
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+
+        self.min_chunk_size = max(1, min_chunk_size)
+        self.max_chunk_size = max(self.min_chunk_size, max_chunk_size)
+        self.chunk_size_step = chunk_size_step
+        self.max_concurrency = max_concurrency
+        self.target_took = target_took
+        self.target_latency = target_latency
+        self.decrease_factor = decrease_factor
+        self.max_rejected_ratio = max_rejected_ratio
+
+        self.chunk_size = min(
+            self.max_chunk_size, max(self.min_chunk_size, initial_chunk_size)
+        )
+        self.concurrency = max(1, initial_concurrency)
+        if max_concurrency is not None:
+            self.concurrency = min(self.concurrency, max_concurrency)
+
+        # statistics
+        self.requests = 0
+        self.rejected = 0
+
+        self._in_flight = 0
+        self._round = 0
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    def acquire(self) -> float:
+        """
+        Wait until fewer than ``concurrency`` requests are in flight and
+        return the start time of the request to pass to :meth:`release`.
+        """
+        with self._condition:
+            while self._in_flight >= self.concurrency:
+                self._condition.wait()
+            self._in_flight += 1
+        return time.monotonic()
+
+    def release(self) -> None:
+        """Release a request slot taken with :meth:`acquire`."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    def limit_concurrency(self, max_concurrency: int) -> None:
+        """
+        Bound the concurrency by the number of requests the helper using the
+        controller can have in flight, lowering ``max_concurrency`` to it.
+        """
+        with self._condition:
+            if self.max_concurrency is None or self.max_concurrency > max_concurrency:
+                self.max_concurrency = max_concurrency
+            self.concurrency = min(self.concurrency, self.max_concurrency)
+
+    def record(
+        self, started: float, items: int, rejected: int = 0, took: Any = None
+    ) -> None:
+        """
+        Adapt the chunk size and concurrency to the outcome of a bulk request.
+
+        :arg started: :func:`time.monotonic` time the request was sent at
+        :arg items: number of documents in the chunk
+        :arg rejected: number of documents rejected with ``429``
+        :arg took: ``took`` value of the response, in milliseconds
+        """
+        latency = time.monotonic() - started
+        with self._condition:
+            self.requests += 1
+            self.rejected += rejected
+            if started < self._last_decrease:
+                return
+
+            if rejected and rejected > items * self.max_rejected_ratio:
+                self._decrease(chunk_size=True, concurrency=True)
+            elif took is not None and took / 1000.0 > self.target_took:
+                self._decrease(chunk_size=True)
+            elif latency > self.target_latency:
+                self._decrease(concurrency=True)
+            else:
+                self.chunk_size = min(
+                    self.max_chunk_size, self.chunk_size + self.chunk_size_step
+                )
+                self._round += 1
+                if self._round >= self.concurrency and (
+                    self.max_concurrency is None
+                    or self.concurrency < self.max_concurrency
+                ):
+                    self.concurrency += 1
+                    self._round = 0
+                    self._condition.notify()
+
+    def record_response(self, started: float, items: int, resp: Any) -> None:
+        """Call :meth:`record` with the outcome of a bulk response."""
+        rejected = 0
+        if resp.get("errors"):
+            for item in resp["items"]:
+                for result in item.values():
+                    if result.get("status") == 429:
+                        rejected += 1
+        self.record(started, items, rejected, resp.get("took"))
+
+    def _decrease(self, chunk_size: bool = False, concurrency: bool = False) -> None:
+        if chunk_size:
+            self.chunk_size = max(
+                self.min_chunk_size, int(self.chunk_size * self.decrease_factor)
+            )
+        if concurrency:
+            self.concurrency = max(1, int(self.concurrency * self.decrease_factor))
+        self._round = 0
+        self._last_decrease = time.monotonic()
@@ -9,6 +9,8 @@
 
 from typing import Any, Dict, Optional, Union
 
+from ..connection.base import _is_streaming_body
+
 
 class AWSV4SignerAsyncAuth:
     """
@@ -48,17 +50,24 @@ class AWSV4SignerAsyncAuth:
         This method helps in signing the request by injecting the required headers.
         :param prepared_request: unsigned headers
         :return: signed headers
+
+        Streamed bodies are signed as ``UNSIGNED-PAYLOAD``, hashing even a
+        seekable file beforehand would block the event loop reading it.
         """
 
         from botocore.auth import SigV4Auth
         from botocore.awsrequest import AWSRequest
 
+        streamed = _is_streaming_body(body)
+
         # create an AWS request object and sign it using SigV4Auth
         aws_request = AWSRequest(
             method=method,
             url=url,
-            data=body,
+            data=None if streamed else body,
         )
+        if streamed:
+            aws_request.headers["X-Amz-Content-SHA256"] = "UNSIGNED-PAYLOAD"
 
         # credentials objects expose access_key, secret_key and token attributes
         # via @property annotations that call _refresh() on every access,
@@ -76,7 +85,10 @@ class AWSV4SignerAsyncAuth:
 
         sig_v4_auth = SigV4Auth(credentials, self.service, self.region)
         sig_v4_auth.add_auth(aws_request)
-        aws_request.headers["X-Amz-Content-SHA256"] = sig_v4_auth.payload(aws_request)
+        if not streamed:
+            aws_request.headers["X-Amz-Content-SHA256"] = sig_v4_auth.payload(
+                aws_request
+            )
 
         # copy the headers from AWS request object into the prepared_request
         return dict(aws_request.headers.items())
@@ -0,0 +1,295 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+"""
+Load a file of newline delimited bulk actions into OpenSearch::
+
+    python -m opensearchpy.helpers.bulkload movies.ndjson --hosts http://localhost:9200
+
+Run it with ``--help`` for the options. With ``--checkpoint`` the offset of
+the file loaded so far is kept in a file, running the same command again
+after an interruption resumes from there.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from .actions import _bounded_imap, _process_bulk_chunk
+from .errors import BulkIndexError
+
+# operation of an action line, the only key of its JSON object
+_OP_TYPE = re.compile(rb'\s*\{\s*"(index|create|update|delete)"')
+
+
+class _FileAction:
+    """
+    Stand-in for an expanded ``(action, data)`` tuple of an action of a bulk
+    file, decoding its lines only when its content is needed to report a
+    failure.
+    """
+
+    __slots__ = ("buffer", "offset", "ends", "_lines")
+
+    def __init__(self, buffer: Any, offset: int, ends: List[int]) -> None:
+        self.buffer = buffer
+        self.offset = offset
+        # offsets of the end of each of its lines
+        self.ends = ends
+        self._lines: Any = None
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    def __getitem__(self, index: int) -> Any:
+        if self._lines is None:
+            starts = [self.offset] + [end + 1 for end in self.ends[:-1]]
+            self._lines = [
+                json.loads(self.buffer[start:end])
+                for start, end in zip(starts, self.ends)
+            ]
+        return self._lines[index]
+
+
+def _file_chunks(
+    buffer: Any, offset: int, chunk_size: int, max_chunk_bytes: int
+) -> Any:
+    """
+    Split the actions of a bulk file, starting at ``offset``, into chunks of
+    whole actions by number or size without decoding them. Yield the start
+    and end offsets of every chunk with its actions.
+    """
+    size = len(buffer)
+    start = end = pos = offset
+    bulk_data: Any = []
+    while pos < size:
+        line_end = buffer.find(b"\n", pos)
+        if line_end == -1:
+            line_end = size
+        if not buffer[pos:line_end].strip():
+            # blank lines between chunks are not sent
+            pos = line_end + 1
+            if not bulk_data:
+                start = end = pos
+            continue
+
+        match = _OP_TYPE.match(buffer, pos, line_end)
+        if match is None:
+            raise ValueError("Line at offset %d is not a bulk action" % pos)
+        ends = [line_end]
+        if match.group(1) != b"delete":
+            # followed by the document, or the partial document of an update
+            source_end = buffer.find(b"\n", line_end + 1)
+            ends.append(size if source_end == -1 else source_end)
+
+        # full chunk, send it and start a new one
+        if bulk_data and (
+            ends[-1] - start > max_chunk_bytes or len(bulk_data) >= chunk_size
+        ):
+            yield start, end, bulk_data
+            start, bulk_data = pos, []
+
+        bulk_data.append(_FileAction(buffer, pos, ends))
+        end = ends[-1]
+        pos = end + 1
+
+    if bulk_data:
+        yield start, end, bulk_data
+
+
+def bulk_load(
+    client: Any,
+    path: str,
+    thread_count: int = 4,
+    chunk_size: int = 500,
+    max_chunk_bytes: int = 10 * 1024 * 1024,
+    queue_size: int = 4,
+    offset: int = 0,
+    checkpoint: Optional[Callable[[int], Any]] = None,
+    raise_on_exception: bool = True,
+    raise_on_error: bool = True,
+    ignore_status: Any = (),
+    yield_ok: bool = True,
+    *args: Any,
+    **kwargs: Any
+) -> Any:
+    """
+    Load a file of newline delimited bulk actions, pairs of an action line
+    and a document line (a single action line for ``delete``), as sent to the
+    ``bulk`` API. The file is memory mapped and split into chunks on the
+    line boundaries of the actions, sent as they are from a pool of threads:
+    the documents are never decoded, only the bulk responses are. Results
+    are yielded in order, in the same ``(ok, info)`` shape as
+    :func:`~opensearchpy.helpers.parallel_bulk`, with the offset of the
+    action in the file as ``offset`` in the ``info`` of failed actions.
+
+    Once all the actions of a chunk and of the ones before it have been sent
+    ``checkpoint`` is called with the offset the rest of the file starts at,
+    to resume the load from there with ``offset`` after an interruption.
+
+    :arg client: instance of :class:`~opensearchpy.OpenSearch` to use
+    :arg path: path of the file to load
+    :arg thread_count: size of the threadpool to use for the bulk requests
+    :arg chunk_size: number of docs in one chunk sent to client (default: 500)
+    :arg max_chunk_bytes: the maximum size of the request in bytes (default: 10MB)
+    :arg queue_size: number of bulk requests queued up ahead of the ones
+        being processed
+    :arg offset: offset of the file to start from, at the start of an action
+    :arg checkpoint: callback called with the offset the file is loaded up to
+    :arg raise_on_exception: if ``False`` then don't propagate exceptions from
+        call to ``bulk`` and just report the items that failed as failed.
+    :arg raise_on_error: raise ``BulkIndexError`` containing errors (as `.errors`)
+        from the execution of the last chunk when some occur. By default we raise.
+    :arg ignore_status: list of HTTP status code that you want to ignore
+    :arg yield_ok: if set to False will skip successful documents in the output
+    """
+    if not isinstance(ignore_status, (list, tuple)):
+        ignore_status = (ignore_status,)
+
+    def send(chunk: Any) -> Any:
+        start, end, bulk_data = chunk
+        return chunk, list(
+            _process_bulk_chunk(
+                client,
+                # with its trailing newline, unless at the end of the file
+                buffer[start : end + 1],
+                bulk_data,
+                raise_on_exception,
+                False,
+                ignore_status,
+                *args,
+                **kwargs
+            )
+        )
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= offset:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            with ThreadPoolExecutor(thread_count) as threads:
+                for (_, end, bulk_data), results in _bounded_imap(
+                    threads,
+                    send,
+                    _file_chunks(buffer, offset, chunk_size, max_chunk_bytes),
+                    max(queue_size, thread_count),
+                ):
+                    errors = []
+                    for data, (ok, info) in zip(bulk_data, results):
+                        if not ok:
+                            item = next(iter(info.values()))
+                            item["offset"] = data.offset
+                            if len(data) > 1 and "data" not in item:
+                                item["data"] = data[1]
+                            if raise_on_error and item["status"] not in ignore_status:
+                                errors.append(info)
+                                continue
+                        if ok and not yield_ok:
+                            continue
+                        yield ok, info
+
+                    if errors:
+                        raise BulkIndexError(
+                            "%i document(s) failed to index." % len(errors), errors
+                        )
+                    if checkpoint is not None:
+                        checkpoint(end + 1)
+
+
+def _read_checkpoint(path: str) -> int:
+    try:
+        with open(path) as f:
+            return int(f.read().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+
+def _write_checkpoint(path: str, offset: int) -> None:
+    # replaced atomically, an interruption leaves the previous checkpoint
+    with open(path + ".tmp", "w") as f:
+        f.write("%d\n" % offset)
+    os.replace(path + ".tmp", path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from ..client import OpenSearch
+
+    parser = argparse.ArgumentParser(
+        prog="python -m opensearchpy.helpers.bulkload",
+        description="Load a file of newline delimited bulk actions into OpenSearch.",
+    )
+    parser.add_argument("path", help="file of newline delimited bulk actions")
+    parser.add_argument(
+        "--hosts",
+        default="http://localhost:9200",
+        help="comma separated URLs of the nodes (default: %(default)s)",
+    )
+    parser.add_argument("--http-auth", help="user:password for basic authentication")
+    parser.add_argument(
+        "--no-verify-certs", action="store_true", help="don't verify certificates"
+    )
+    parser.add_argument(
+        "--http-compress", action="store_true", help="gzip the bulk requests"
+    )
+    parser.add_argument("--thread-count", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--max-chunk-bytes", type=int, default=10 * 1024 * 1024)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument(
+        "--checkpoint",
+        help="file keeping the offset loaded so far, to resume from it",
+    )
+    args = parser.parse_args(argv)
+
+    client = OpenSearch(
+        args.hosts.split(","),
+        http_auth=args.http_auth,
+        verify_certs=not args.no_verify_certs,
+        http_compress=args.http_compress,
+        timeout=args.timeout,
+    )
+    offset = 0
+    checkpoint = None
+    if args.checkpoint:
+        offset = _read_checkpoint(args.checkpoint)
+        checkpoint = lambda end: _write_checkpoint(args.checkpoint, end)  # noqa: E731
+
+    succeeded = failed = 0
+    try:
+        for ok, info in bulk_load(
+            client,
+            args.path,
+            thread_count=args.thread_count,
+            chunk_size=args.chunk_size,
+            max_chunk_bytes=args.max_chunk_bytes,
+            offset=offset,
+            checkpoint=checkpoint,
+            raise_on_error=False,
+        ):
+            if ok:
+                succeeded += 1
+                continue
+            failed += 1
+            # report the failure without the document
+            item = next(iter(info.values()))
+            item.pop("data", None)
+            item.pop("exception", None)
+            print(json.dumps(info), file=sys.stderr)
+    finally:
+        client.close()
+        print("%d succeeded, %d failed" % (succeeded, failed))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
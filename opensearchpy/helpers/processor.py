@@ -0,0 +1,332 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .actions import _ActionChunker, _process_bulk_chunk, expand_action
+
+logger = logging.getLogger("opensearchpy.helpers")
+
+
+def _failed_actions(bulk_data: Any, error: Exception) -> Any:
+    """
+    Mark all the actions of a chunk as failed by an error other than a
+    ``TransportError``, such as a serialization error of the response.
+    """
+    for data in bulk_data:
+        op_type, action = data[0].copy().popitem()
+        info = {"error": str(error), "exception": error}
+        info.update(action)
+        yield False, {op_type: info}
+
+
+class _BulkProcessorBase:
+    """
+    Buffer and result handling shared by :class:`BulkProcessor` and
+    :class:`~opensearchpy.helpers.AsyncBulkProcessor`.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        chunk_size: int,
+        max_chunk_bytes: int,
+        flush_interval: Optional[float],
+        max_concurrency: int,
+        expand_action_callback: Any,
+        on_success: Optional[Callable[[Any], Any]],
+        on_failure: Optional[Callable[[Any], Any]],
+        max_retries: int,
+        initial_backoff: float,
+        max_backoff: float,
+        kwargs: Any,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if flush_interval is not None and flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+
+        self.client = client
+        self.flush_interval = flush_interval
+        self.max_concurrency = max_concurrency
+        self.expand_action_callback = expand_action_callback
+        self.on_success = on_success
+        self.on_failure = on_failure
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.kwargs = kwargs
+
+        self.succeeded = 0
+        self.failed = 0
+        self._stats_lock = threading.Lock()
+
+        self._chunker = _ActionChunker(
+            chunk_size, max_chunk_bytes, client.transport.serializer
+        )
+        # time the oldest action of the buffer was added at
+        self._buffered_since: Optional[float] = None
+        self._in_flight = 0
+        # callers waiting for a request to complete to send their chunk
+        self._waiting = 0
+        self._closed = False
+
+    def _buffer(self, action: Any, data: Any) -> Any:
+        """
+        Add an expanded action to the buffer, return the chunk to send if
+        the buffer was full.
+        """
+        if self._closed:
+            raise RuntimeError("Cannot add actions to a closed bulk processor")
+        chunk = self._chunker.feed(action, data)
+        if self._chunker.action_count == 1:
+            self._buffered_since = time.monotonic()
+        return chunk
+
+    def _take_buffer(self) -> Any:
+        self._buffered_since = None
+        return self._chunker.flush()
+
+    def _flush_delay(self) -> Optional[float]:
+        """Seconds until the buffer must be flushed, ``None`` if it is empty"""
+        if self._buffered_since is None or self.flush_interval is None:
+            return None
+        return self._buffered_since + self.flush_interval - time.monotonic()
+
+    def _backoff(self, attempt: int) -> float:
+        return float(min(self.max_backoff, self.initial_backoff * 2 ** (attempt - 1)))
+
+    def _collect(
+        self, bulk_data: Any, bulk_actions: Any, results: Any, attempt: int
+    ) -> Any:
+        """
+        Report the results of a chunk to the callbacks, return the documents
+        rejected with ``429`` to retry and their lines.
+        """
+        to_retry: Any = []
+        to_retry_data: Any = []
+        succeeded = failed = 0
+        # position of the current item's lines within bulk_actions
+        line = 0
+        for data, (ok, info) in zip(bulk_data, results):
+            start, line = line, line + len(data)
+            item = next(iter(info.values()))
+            if not ok and item.get("status") == 429 and attempt < self.max_retries:
+                # reuse the already serialized lines
+                to_retry.extend(bulk_actions[start:line])
+                to_retry_data.append(data)
+                continue
+
+            if ok:
+                succeeded += 1
+                callback = self.on_success
+            else:
+                failed += 1
+                # include original document source
+                if len(data) > 1 and "data" not in item:
+                    item["data"] = data[1]
+                callback = self.on_failure
+                if callback is None:
+                    logger.warning("Bulk action failed: %s", item.get("error"))
+
+            if callback is not None:
+                try:
+                    callback(info)
+                except Exception:
+                    logger.exception("Bulk processor callback failed")
+
+        with self._stats_lock:
+            self.succeeded += succeeded
+            self.failed += failed
+        return to_retry_data, to_retry
+
+
+class BulkProcessor(_BulkProcessorBase):
+    """
+    Send actions added one at a time, from any number of threads, to the
+    :meth:`~opensearchpy.OpenSearch.bulk` api in the background. Unlike the
+    other bulk helpers it doesn't consume an iterator, which suits long
+    running services producing documents as they go::
+
+        with BulkProcessor(client, on_failure=log_failure) as processor:
+            for message in queue:
+                processor.add({"_index": "events", "_source": message})
+
+    Actions are buffered until ``chunk_size`` of them or ``max_chunk_bytes``
+    are buffered, or the oldest of them has been buffered for
+    ``flush_interval`` seconds, then sent from a pool of ``max_concurrency``
+    threads. When all of them are busy with a request :meth:`add` blocks
+    until one completes, so that a cluster that can't keep up slows the
+    producers down rather than the buffered actions growing without bounds.
+
+    ``on_success`` and ``on_failure`` are called with the ``info`` of every
+    action, in the same shape as the ones yielded by
+    :func:`~opensearchpy.helpers.streaming_bulk`, from the threads sending
+    the requests. Failures are logged when no ``on_failure`` is given; the
+    processor never raises them. The number of actions that succeeded and
+    failed are available as :attr:`succeeded` and :attr:`failed`.
+
+    :meth:`close` sends the buffered actions and waits for the requests in
+    flight, call it (or use the processor as a context manager) before
+    exiting not to lose any action.
+
+    :arg client: instance of :class:`~opensearchpy.OpenSearch` to use
+    :arg chunk_size: number of docs in one chunk sent to client (default: 500)
+    :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
+    :arg flush_interval: maximum number of seconds an action is buffered
+        for, ``None`` to only send full chunks (default: 5)
+    :arg max_concurrency: maximum number of bulk requests in flight
+    :arg expand_action_callback: callback executed on each action passed in,
+        should return a tuple containing the action line and the data line
+        (`None` if data line should be omitted).
+    :arg on_success: callback called with the ``info`` of each successful action
+    :arg on_failure: callback called with the ``info`` of each failed action
+    :arg max_retries: maximum number of times a document will be retried when
+        ``429`` is received, set to 0 (default) for no retries on ``429``
+    :arg initial_backoff: number of seconds we should wait before the first
+        retry. Any subsequent retries will be powers of ``initial_backoff *
+        2**retry_number``
+    :arg max_backoff: maximum number of seconds a retry will wait
+
+    Any additional keyword arguments will be passed to
+    :meth:`~opensearchpy.OpenSearch.bulk`.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        chunk_size: int = 500,
+        max_chunk_bytes: int = 100 * 1024 * 1024,
+        flush_interval: Optional[float] = 5.0,
+        max_concurrency: int = 1,
+        expand_action_callback: Any = expand_action,
+        on_success: Optional[Callable[[Any], Any]] = None,
+        on_failure: Optional[Callable[[Any], Any]] = None,
+        max_retries: int = 0,
+        initial_backoff: float = 2,
+        max_backoff: float = 600,
+        **kwargs: Any
+    ) -> None:
+        super().__init__(
+            client,
+            chunk_size,
+            max_chunk_bytes,
+            flush_interval,
+            max_concurrency,
+            expand_action_callback,
+            on_success,
+            on_failure,
+            max_retries,
+            initial_backoff,
+            max_backoff,
+            kwargs,
+        )
+        self._condition = threading.Condition()
+        self._threads = ThreadPoolExecutor(max_concurrency)
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval is not None:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name="bulk-processor", daemon=True
+            )
+            self._flusher.start()
+
+    def __enter__(self) -> "BulkProcessor":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def add(self, action: Any) -> None:
+        """
+        Buffer an action, a document or action definition as accepted by
+        :func:`~opensearchpy.helpers.streaming_bulk`. Blocks while the
+        buffer is full and ``max_concurrency`` requests are in flight.
+        """
+        action, data = self.expand_action_callback(action)
+        with self._condition:
+            chunk = self._buffer(action, data)
+            # wake up the flusher for the deadline of a new buffer
+            self._condition.notify_all()
+            if chunk is not None:
+                self._send(chunk)
+
+    def flush(self) -> None:
+        """Send the buffered actions and wait for the requests in flight."""
+        with self._condition:
+            self._send(self._take_buffer())
+            self._condition.wait_for(lambda: not self._in_flight)
+
+    def close(self) -> None:
+        """
+        Send the buffered actions, wait for the requests in flight and stop
+        the threads of the processor. Adding actions afterwards raises.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._send(self._take_buffer())
+            self._condition.wait_for(lambda: not self._in_flight and not self._waiting)
+            self._condition.notify_all()
+        if self._flusher is not None:
+            self._flusher.join()
+        self._threads.shutdown()
+
+    def _send(self, chunk: Any) -> None:
+        """Send a chunk from the pool, with the condition held."""
+        if chunk is None:
+            return
+        self._waiting += 1
+        try:
+            self._condition.wait_for(lambda: self._in_flight < self.max_concurrency)
+        finally:
+            self._waiting -= 1
+        self._in_flight += 1
+        self._threads.submit(self._process_chunk, *chunk)
+
+    def _process_chunk(self, bulk_data: Any, bulk_actions: Any) -> None:
+        try:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    time.sleep(self._backoff(attempt))
+                try:
+                    results = list(
+                        _process_bulk_chunk(
+                            self.client,
+                            bulk_actions,
+                            bulk_data,
+                            False,
+                            False,
+                            **self.kwargs
+                        )
+                    )
+                except Exception as e:
+                    results = list(_failed_actions(bulk_data, e))
+                bulk_data, bulk_actions = self._collect(
+                    bulk_data, bulk_actions, results, attempt
+                )
+                if not bulk_data:
+                    break
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def _flush_periodically(self) -> None:
+        with self._condition:
+            while not self._closed:
+                delay = self._flush_delay()
+                if delay is None or delay > 0:
+                    self._condition.wait(delay)
+                else:
+                    self._send(self._take_buffer())
@@ -26,13 +26,13 @@
 
 import collections.abc as collections_abc
 import copy
-from typing import Any
+from typing import Any, Optional
 
 from six import iteritems, string_types
 
 from opensearchpy.connection.connections import get_connection
 from opensearchpy.exceptions import TransportError
-from opensearchpy.helpers import scan
+from opensearchpy.helpers import pit_scan, scan
 
 from ..exceptions import IllegalOperation
 from ..helpers.query import Bool, Q
@@ -763,7 +763,7 @@ class Search(Request):
             )
         return self._response
 
-    def scan(self) -> Any:
+    def scan(self, prefetch: Optional[int] = None) -> Any:
         """
         Turn the search into a scan search and return a generator that will
         iterate over all the documents matching the query.
@@ -771,11 +771,46 @@ class Search(Request):
         Use ``params`` method to specify any additional arguments you with to
         pass to the underlying ``scan`` helper from ``opensearchpy``
 
+        :arg prefetch: number of pages scrolled ahead in a background thread
+            while the current one is being consumed
         """
         opensearch = get_connection(self._using)
 
-        for hit in scan(
-            opensearch, query=self.to_dict(), index=self._index, **self._params
+        params = dict(self._params)
+        if prefetch is not None:
+            params["prefetch"] = prefetch
+
+        for hit in scan(opensearch, query=self.to_dict(), index=self._index, **params):
+            yield self._get_result(hit)
+
+    def iterate(
+        self, keep_alive: str = "5m", tiebreaker: str = "_id", prefetch: int = 1
+    ) -> Any:
+        """
+        Return a generator that will iterate over all the documents matching
+        the query, in the order of its sort, paging with ``search_after``
+        through a point in time rather than scrolling. The next page is
+        fetched while the current one is being consumed, and the point in
+        time is deleted once done or when the generator is closed.
+
+        Use ``params`` method to specify any additional arguments you with to
+        pass to the underlying ``pit_scan`` helper from ``opensearchpy``
+
+        :arg keep_alive: how long the point in time is kept alive between
+            searches
+        :arg tiebreaker: field with unique values sorted on last
+        :arg prefetch: number of pages fetched ahead
+        """
+        opensearch = get_connection(self._using)
+
+        for hit in pit_scan(
+            opensearch,
+            query=self.to_dict(),
+            index=self._index,
+            keep_alive=keep_alive,
+            tiebreaker=tiebreaker,
+            prefetch=prefetch,
+            **self._params
         ):
             yield self._get_result(hit)
 
@@ -7,11 +7,17 @@
 # Modifications Copyright OpenSearch Contributors. See
 # GitHub history for details.
 
+import hashlib
 from typing import Any, Callable, Dict
 from urllib.parse import parse_qs, urlencode, urlparse
 
 import requests
 
+from ..connection.base import _is_streaming_body, _iter_body, _tell
+
+# payload hash of streamed bodies that can't be hashed before they are sent
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+
 
 class AWSV4Signer:
     """
@@ -38,13 +44,24 @@ class AWSV4Signer:
         :param url: url
         :param body: body
         :return: headers
+
+        Streamed bodies are signed without being held in memory: a seekable
+        file is hashed in chunks and rewound, other streams are signed as
+        ``UNSIGNED-PAYLOAD``.
         """
 
         from botocore.auth import SigV4Auth
         from botocore.awsrequest import AWSRequest
 
+        payload = None
+        if _is_streaming_body(body):
+            payload = _payload_hash(body)
+            body = None
+
         # create an AWS request object and sign it using SigV4Auth
         aws_request = AWSRequest(method=method.upper(), url=url, data=body)
+        if payload is not None:
+            aws_request.headers["X-Amz-Content-SHA256"] = payload
 
         # credentials objects expose access_key, secret_key and token attributes
         # via @property annotations that call _refresh() on every access,
@@ -65,11 +82,26 @@ class AWSV4Signer:
 
         # copy the headers from AWS request object into the prepared_request
         headers = dict(aws_request.headers.items())
-        headers["X-Amz-Content-SHA256"] = sig_v4_auth.payload(aws_request)
+        headers["X-Amz-Content-SHA256"] = payload or sig_v4_auth.payload(aws_request)
 
         return headers
 
 
+def _payload_hash(body: Any) -> str:
+    """
+    Return the SHA256 of a streamed body that can be rewound, reading it in
+    chunks, ``UNSIGNED-PAYLOAD`` for other streams.
+    """
+    position = _tell(body)
+    if position is None:
+        return UNSIGNED_PAYLOAD
+    sha256 = hashlib.sha256()
+    for chunk in _iter_body(body):
+        sha256.update(chunk)
+    body.seek(position)
+    return sha256.hexdigest()
+
+
 class RequestsAWSV4SignerAuth(requests.auth.AuthBase):
     """
     AWS V4 Request Signer for Requests.
@@ -26,6 +26,21 @@ class Metrics(ABC):
     def request_end(self) -> None:
         pass
 
+    def request_coalesced(self) -> None:
+        """
+        Called for every request answered with the response of an identical
+        request already in flight, see ``coalesce_requests``.
+        """
+
+    def request_compressed(
+        self, size: int, compressed_size: int, duration: float
+    ) -> None:
+        """
+        Called for every request body compressed by a connection, with its
+        size in bytes before and after compression and the seconds spent
+        compressing it, see :class:`~opensearchpy.Compression`.
+        """
+
     @property
     @abstractmethod
     def start_time(self) -> Optional[float]:
@@ -19,7 +19,8 @@ class MetricsEvents(Metrics):
     """
     The MetricsEvents class implements the Metrics abstract base class
     and tracks metrics such as start time, end time, and service time
-    during request processing.
+    during request processing, as well as the number of coalesced requests
+    and the compression of request bodies.
     """
 
     @property
@@ -34,15 +35,50 @@ class MetricsEvents(Metrics):
     def service_time(self) -> Optional[float]:
         return self._service_time
 
+    @property
+    def coalesced_requests(self) -> int:
+        return self._coalesced_requests
+
+    @property
+    def compressed_requests(self) -> int:
+        return self._compressed_requests
+
+    @property
+    def uncompressed_bytes(self) -> int:
+        return self._uncompressed_bytes
+
+    @property
+    def compressed_bytes(self) -> int:
+        return self._compressed_bytes
+
+    @property
+    def compression_time(self) -> float:
+        return self._compression_time
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        """Size of the compressed bodies relative to their original size"""
+        if not self._uncompressed_bytes:
+            return None
+        return self._compressed_bytes / self._uncompressed_bytes
+
     def __init__(self) -> None:
         self.events = Events()
         self._start_time: Optional[float] = None
         self._end_time: Optional[float] = None
         self._service_time: Optional[float] = None
+        self._coalesced_requests = 0
+        self._compressed_requests = 0
+        self._uncompressed_bytes = 0
+        self._compressed_bytes = 0
+        self._compression_time = 0.0
 
-        # Subscribe to the request_start and request_end events
+        # Subscribe to the request_start, request_end, request_coalesced and
+        # request_compressed events
         self.events.request_start += self._on_request_start
         self.events.request_end += self._on_request_end
+        self.events.request_coalesced += self._on_request_coalesced
+        self.events.request_compressed += self._on_request_compressed
 
     def request_start(self) -> None:
         self.events.request_start()
@@ -59,3 +95,22 @@ class MetricsEvents(Metrics):
         self._end_time = time.perf_counter()
         if self._start_time is not None:
             self._service_time = self._end_time - self._start_time
+
+    def request_coalesced(self) -> None:
+        self.events.request_coalesced()
+
+    def _on_request_coalesced(self) -> None:
+        self._coalesced_requests += 1
+
+    def request_compressed(
+        self, size: int, compressed_size: int, duration: float
+    ) -> None:
+        self.events.request_compressed(size, compressed_size, duration)
+
+    def _on_request_compressed(
+        self, size: int, compressed_size: int, duration: float
+    ) -> None:
+        self._compressed_requests += 1
+        self._uncompressed_bytes += size
+        self._compressed_bytes += compressed_size
+        self._compression_time += duration
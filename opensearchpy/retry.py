@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import random
+import threading
+from typing import Optional
+
+
+class RetryPolicy(object):
+    """
+    Backoff and budget of the retries of a client, to be passed to the client
+    as ``retry_policy``. Which failures are retried, and how many times, is
+    still decided by ``max_retries``, ``retry_on_status`` and
+    ``retry_on_timeout``; without a policy retries are sent right away::
+
+        client = OpenSearch(hosts, retry_policy=RetryPolicy(budget=0.2))
+
+    Before the ``n``-th retry of a request (starting at 0) the transport waits
+    for a random time between 0 and ``backoff * 2 ** n`` seconds, capped at
+    ``max_backoff`` ("full jitter"), so that clients retrying the same
+    failures don't retry in lockstep.
+
+    Every request adds ``budget`` tokens to a bucket, holding at most
+    :attr:`max_tokens`, and every retry takes a whole token out of it. Once
+    the bucket is empty failures are raised without being retried, so that
+    retries add at most that ratio of requests to the load of a struggling
+    cluster. With ``budget=None`` retries are not limited. A single policy
+    can be shared by several clients to apply the budget to all of them.
+
+    The number of requests, retries and retries denied by the budget are
+    available as :attr:`requests`, :attr:`retries` and :attr:`throttled`.
+
+    :arg backoff: seconds the backoff starts from, doubled for every retry
+    :arg max_backoff: maximum seconds to wait before a retry
+    :arg budget: maximum ratio of retries to requests, ``None`` for no limit
+    """
+
+    # retries that can be sent in a burst
+    max_tokens = 10.0
+
+    def __init__(
+        self,
+        backoff: float = 0.1,
+        max_backoff: float = 10.0,
+        budget: Optional[float] = 0.1,
+    ) -> None:
+        if backoff < 0 or max_backoff < 0:
+            raise ValueError("backoff and max_backoff must not be negative")
+        if budget is not None and budget < 0:
+            raise ValueError("budget must not be negative")
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget = budget
+
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.tokens = self.max_tokens
+        self._lock = threading.Lock()
+
+    def request_started(self) -> None:
+        """Called by the transport for every request, before its first attempt"""
+        with self._lock:
+            self.requests += 1
+            if self.budget is not None:
+                self.tokens = min(self.tokens + self.budget, self.max_tokens)
+
+    def acquire(self) -> bool:
+        """
+        Take a token out of the budget to retry a failed request, ``False``
+        if the failure must be raised instead.
+        """
+        with self._lock:
+            if self.budget is not None:
+                if self.tokens < 1:
+                    self.throttled += 1
+                    return False
+                self.tokens -= 1
+            self.retries += 1
+            return True
+
+    def backoff_time(self, retry: int) -> float:
+        """Return the seconds to wait before the ``retry``-th retry of a request"""
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** min(retry, 32))
+        )
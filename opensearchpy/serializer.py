@@ -25,13 +25,18 @@
 #  under the License.
 
 
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Type, Union
 
 try:
     import simplejson as json
 except ImportError:
     import json  # type: ignore
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
 import uuid
 from datetime import date, datetime
 from decimal import Decimal
@@ -54,6 +59,23 @@ class Serializer(object):
     def dumps(self, data: Any) -> Any:
         raise NotImplementedError()
 
+    def dumps_bytes(self, data: Any) -> bytes:
+        """
+        Serialize ``data`` like :meth:`dumps` but return UTF-8 encoded bytes,
+        ready to be sent over the wire.
+        """
+        data = self.dumps(data)
+        if isinstance(data, str):
+            data = data.encode("utf-8", "surrogatepass")
+        return data  # type: ignore
+
+    def loads_bytes(self, data: bytes) -> Any:
+        """
+        Deserialize a UTF-8 encoded response body like :meth:`loads`, as
+        returned by the connections.
+        """
+        return self.loads(data.decode("utf-8", "surrogatepass"))
+
 
 class TextSerializer(Serializer):
     mimetype: str = "text/plain"
@@ -68,8 +90,168 @@ class TextSerializer(Serializer):
         raise SerializationError("Cannot serialize %r into text." % data)
 
 
+class JSONBackend(object):
+    """
+    Encoder/decoder used by :class:`~opensearchpy.JSONSerializer` to produce
+    and parse JSON. Backends are registered by name in ``JSON_BACKENDS`` (see
+    :func:`register_json_backend`) so a faster implementation can be plugged in
+    without changing the serializer itself.
+
+    ``dumps`` must produce compact JSON (no whitespace, non-ASCII characters
+    left unescaped) and call ``default`` for every object it cannot encode
+    natively, so that the serializer's type handling is preserved.
+    """
+
+    name: str = ""
+
+    def dumps(self, data: Any, default: Callable[[Any], Any]) -> str:
+        raise NotImplementedError()
+
+    def dumps_bytes(self, data: Any, default: Callable[[Any], Any]) -> bytes:
+        return self.dumps(data, default).encode("utf-8", "surrogatepass")
+
+    def loads(self, s: Union[str, bytes]) -> Any:
+        raise NotImplementedError()
+
+
+class StdlibJSONBackend(JSONBackend):
+    """
+    Backend using ``simplejson`` when installed, the standard library ``json``
+    module otherwise.
+    """
+
+    name: str = "json"
+
+    def dumps(self, data: Any, default: Callable[[Any], Any]) -> str:
+        s: str = json.dumps(
+            data, default=default, ensure_ascii=False, separators=(",", ":")
+        )
+        return s
+
+    def loads(self, s: Union[str, bytes]) -> Any:
+        return json.loads(s)
+
+
+class OrjsonBackend(JSONBackend):
+    """
+    Backend using `orjson <https://github.com/ijl/orjson>`_.
+
+    Dates, times and dataclasses are passed through to ``default`` so they are
+    formatted exactly like with the standard library backend. Anything orjson
+    refuses to handle (integers wider than 64 bits, lone surrogates, ``NaN``
+    literals in responses...) is retried with :class:`StdlibJSONBackend`.
+
+    Unlike the standard library, orjson encodes ``NaN`` and infinite floats as
+    ``null`` and decodes integers wider than 64 bits as floats. Exponents are
+    written without sign or padding (``1e16`` and ``1e-7`` instead of
+    ``1e+16`` and ``1e-07``), which parses to the same floats, and ``Enum``
+    members are encoded as their value where the standard library backend
+    raises :class:`~opensearchpy.exceptions.SerializationError`.
+    """
+
+    name: str = "orjson"
+    _fallback: JSONBackend = StdlibJSONBackend()
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+    def dumps(self, data: Any, default: Callable[[Any], Any]) -> str:
+        return self.dumps_bytes(data, default).decode("utf-8", "surrogatepass")
+
+    def dumps_bytes(self, data: Any, default: Callable[[Any], Any]) -> bytes:
+        try:
+            return orjson.dumps(
+                data,
+                default=default,
+                option=orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except TypeError:
+            return self._fallback.dumps_bytes(data, default)
+
+    def loads(self, s: Union[str, bytes]) -> Any:
+        try:
+            return orjson.loads(s)
+        except ValueError:
+            return self._fallback.loads(s)
+
+
+# JSON backends by name, in order of preference for backend="auto"
+JSON_BACKENDS: Dict[str, Type[JSONBackend]] = {
+    OrjsonBackend.name: OrjsonBackend,
+    StdlibJSONBackend.name: StdlibJSONBackend,
+}
+
+
+def register_json_backend(
+    name: str, backend_class: Type[JSONBackend], preferred: bool = False
+) -> None:
+    """
+    Make a :class:`JSONBackend` subclass available by name to
+    :class:`~opensearchpy.JSONSerializer`.
+
+    :arg name: name used to select the backend (``JSONSerializer(backend=name)``)
+    :arg backend_class: the :class:`JSONBackend` subclass; its constructor
+        should raise ``ImportError`` when the underlying library is missing
+    :arg preferred: try this backend first when ``backend="auto"``
+    """
+    if preferred:
+        backends = dict(JSON_BACKENDS)
+        JSON_BACKENDS.clear()
+        JSON_BACKENDS[name] = backend_class
+        JSON_BACKENDS.update((k, v) for k, v in backends.items() if k != name)
+    else:
+        JSON_BACKENDS[name] = backend_class
+
+
+def get_json_backend(backend: Union[str, JSONBackend] = "json") -> JSONBackend:
+    """
+    Resolve a JSON backend. ``"auto"`` picks the first registered backend whose
+    library is installed, any other string selects a registered backend by
+    name and a :class:`JSONBackend` instance is returned as is.
+    """
+    if isinstance(backend, JSONBackend):
+        return backend
+
+    if backend == "auto":
+        for backend_class in JSON_BACKENDS.values():
+            try:
+                return backend_class()
+            except ImportError:
+                continue
+        return StdlibJSONBackend()
+
+    try:
+        backend_class = JSON_BACKENDS[backend]
+    except KeyError:
+        raise ImproperlyConfigured("Unknown JSON backend %r" % backend)
+    try:
+        return backend_class()
+    except ImportError as e:
+        raise ImproperlyConfigured(
+            "JSON backend %r is not available: %s" % (backend, e)
+        )
+
+
 class JSONSerializer(Serializer):
+    """
+    Serializer for ``application/json``.
+
+    :arg backend: JSON library to use, either the name of a registered
+        :class:`~opensearchpy.serializer.JSONBackend` (``"json"``,
+        ``"orjson"``), ``"auto"`` to use the fastest one installed or a
+        :class:`~opensearchpy.serializer.JSONBackend` instance. Defaults to
+        ``simplejson``/``json``.
+    """
+
     mimetype: str = "application/json"
+    # used by subclasses overriding __init__ without calling super()
+    backend: JSONBackend = StdlibJSONBackend()
+
+    def __init__(self, backend: Union[str, JSONBackend] = "json") -> None:
+        self.backend = get_json_backend(backend)
 
     def default(self, data: Any) -> Any:
         if isinstance(data, TIME_TYPES):
@@ -145,19 +327,40 @@ class JSONSerializer(Serializer):
 
     def loads(self, s: str) -> Any:
         try:
-            return json.loads(s)
+            return self.backend.loads(s)
         except (ValueError, TypeError) as e:
             raise SerializationError(s, e)
 
+    def loads_bytes(self, data: bytes) -> Any:
+        # respect subclasses customizing loads()
+        if type(self).loads is not JSONSerializer.loads:
+            return super(JSONSerializer, self).loads_bytes(data)
+
+        # the backends parse UTF-8 directly, without decoding to str first
+        try:
+            return self.backend.loads(data)
+        except (ValueError, TypeError) as e:
+            raise SerializationError(data.decode("utf-8", "replace"), e)
+
     def dumps(self, data: Any) -> Any:
         # don't serialize strings
         if isinstance(data, string_types):
             return data
 
         try:
-            return json.dumps(
-                data, default=self.default, ensure_ascii=False, separators=(",", ":")
-            )
+            return self.backend.dumps(data, self.default)
+        except (ValueError, TypeError) as e:
+            raise SerializationError(data, e)
+
+    def dumps_bytes(self, data: Any) -> bytes:
+        # respect subclasses customizing dumps()
+        if isinstance(data, string_types) or type(self).dumps is not (
+            JSONSerializer.dumps
+        ):
+            return super(JSONSerializer, self).dumps_bytes(data)
+
+        try:
+            return self.backend.dumps_bytes(data, self.default)
         except (ValueError, TypeError) as e:
             raise SerializationError(data, e)
 
@@ -182,7 +385,7 @@ class Deserializer(object):
             )
         self.serializers = serializers
 
-    def loads(self, s: str, mimetype: Optional[str] = None) -> Any:
+    def loads(self, s: Union[str, bytes], mimetype: Optional[str] = None) -> Any:
         if not mimetype:
             deserializer = self.default
         else:
@@ -200,6 +403,8 @@ class Deserializer(object):
                     "Unknown mimetype, unable to deserialize: %s" % mimetype
                 )
 
+        if isinstance(s, bytes):
+            return deserializer.loads_bytes(s)
         return deserializer.loads(s)
 
 
@@ -0,0 +1,325 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import codecs
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from .exceptions import SerializationError
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+# parser states
+_START = "start"
+_KEY = "key"
+_VALUE = "value"
+_SEPARATOR = "separator"
+_FIRST_HIT = "first_hit"
+_HIT = "hit"
+_END = "end"
+
+# containers the parser descends into
+_TOP = "top"
+_HITS = "hits"
+_HITS_ARRAY = "hits_array"
+
+
+class HitsParser:
+    """
+    Push parser for search responses that decodes the hits of ``hits.hits``
+    one at a time as the body comes in, instead of the whole body at once.
+
+    Feed it the body with :meth:`feed` and :meth:`feed_eof` and pull events
+    with :meth:`next_event`, which returns ``None`` when it needs more data:
+
+    - ``("field", key, value)`` for a top level field other than ``hits``,
+    - ``("hits_field", key, value)`` for a field of ``hits`` other than
+      ``hits.hits``, e.g. ``total``,
+    - ``("hits_start",)``, ``("hit", hit)`` for every hit and ``("hits_end",)``,
+    - ``("end",)`` once the whole body has been parsed.
+
+    Values are decoded with :func:`json.JSONDecoder.raw_decode` once they are
+    complete in the buffer, so only a hit (or a top level field) at a time is
+    held in memory on top of the raw bytes not parsed yet.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")("surrogatepass")
+        self._buffer = ""
+        self._pos = 0
+        # don't retry a value that couldn't be decoded before the buffer has
+        # grown enough, to keep the parsing of large values linear
+        self._wanted = 0
+        self._eof = False
+        self._state = _START
+        self._stack: Any = []
+        self._key: Optional[str] = None
+
+    def feed(self, data: bytes) -> None:
+        """Append a chunk of the raw body."""
+        if self._pos > 65536 and self._pos * 2 > len(self._buffer):
+            self._buffer = self._buffer[self._pos :]
+            self._wanted -= self._pos
+            self._pos = 0
+        self._buffer += self._decoder.decode(data)
+
+    def feed_eof(self) -> None:
+        """Mark the end of the body."""
+        self._buffer += self._decoder.decode(b"", True)
+        self._eof = True
+
+    def next_event(self) -> Optional[Tuple[Any, ...]]:
+        """Return the next event, or ``None`` if more data is needed."""
+        if not self._eof and len(self._buffer) < self._wanted:
+            return None
+
+        while True:
+            if not self._skip_whitespace():
+                return None
+            state = self._state
+
+            if state == _END:
+                if self._pos < len(self._buffer):
+                    self._error("Extra data")
+                return (_END,)
+
+            char = self._buffer[self._pos]
+            if state == _START:
+                if char != "{":
+                    self._error("Expecting '{'")
+                self._pos += 1
+                self._stack.append(_TOP)
+                self._state = _KEY
+
+            elif state == _KEY:
+                if char == "}":
+                    self._close()
+                    continue
+                decoded = self._decode()
+                if decoded is None:
+                    return None
+                key, end = decoded
+                match = _WHITESPACE.match(self._buffer, end)
+                colon = match.end() if match else end
+                if colon >= len(self._buffer):
+                    if self._eof:
+                        self._error("Expecting ':'")
+                    self._wanted = len(self._buffer) + 1
+                    return None
+                if not isinstance(key, str) or self._buffer[colon] != ":":
+                    self._error("Expecting property name and ':'")
+                self._key = key
+                self._pos = colon + 1
+                self._state = _VALUE
+
+            elif state == _VALUE:
+                container = self._stack[-1]
+                if self._key == "hits" and container == _TOP and char == "{":
+                    self._pos += 1
+                    self._stack.append(_HITS)
+                    self._state = _KEY
+                    continue
+                if self._key == "hits" and container == _HITS and char == "[":
+                    self._pos += 1
+                    self._stack.append(_HITS_ARRAY)
+                    self._state = _FIRST_HIT
+                    return ("hits_start",)
+                decoded = self._decode()
+                if decoded is None:
+                    return None
+                value, self._pos = decoded
+                self._state = _SEPARATOR
+                return (
+                    "field" if container == _TOP else "hits_field",
+                    self._key,
+                    value,
+                )
+
+            elif state == _FIRST_HIT and char == "]":
+                self._close()
+                return ("hits_end",)
+
+            elif state in (_FIRST_HIT, _HIT):
+                decoded = self._decode()
+                if decoded is None:
+                    return None
+                hit, self._pos = decoded
+                self._state = _SEPARATOR
+                return ("hit", hit)
+
+            elif state == _SEPARATOR:
+                container = self._stack[-1]
+                if char == ",":
+                    self._pos += 1
+                    self._state = _HIT if container == _HITS_ARRAY else _KEY
+                elif char == ("]" if container == _HITS_ARRAY else "}"):
+                    self._close()
+                    if container == _HITS_ARRAY:
+                        return ("hits_end",)
+                else:
+                    self._error("Expecting ',' delimiter")
+
+    def _close(self) -> None:
+        self._pos += 1
+        self._stack.pop()
+        self._state = _SEPARATOR if self._stack else _END
+
+    def _skip_whitespace(self) -> bool:
+        match = _WHITESPACE.match(self._buffer, self._pos)
+        if match:
+            self._pos = match.end()
+        if self._pos < len(self._buffer):
+            return True
+        if not self._eof:
+            self._wanted = len(self._buffer) + 1
+            return False
+        if self._state == _START:
+            # empty body
+            self._state = _END
+        elif self._state != _END:
+            self._error("Unexpected end of data")
+        return True
+
+    def _decode(self) -> Optional[Tuple[Any, int]]:
+        try:
+            value, end = _DECODER.raw_decode(self._buffer, self._pos)
+        except ValueError as e:
+            if self._eof:
+                raise SerializationError(self._buffer[self._pos : self._pos + 100], e)
+            # most likely incomplete, wait until there is more of it
+            self._wanted = 2 * len(self._buffer) - self._pos
+            return None
+        # a number could go on in the next chunk
+        if not self._eof and (
+            end == len(self._buffer) or self._buffer[end] in _NUMBER_CHARS
+        ):
+            self._wanted = len(self._buffer) + 1
+            return None
+        return value, end
+
+    def _error(self, message: str) -> None:
+        raise SerializationError(
+            self._buffer[self._pos : self._pos + 100],
+            ValueError("%s at position %d" % (message, self._pos)),
+        )
+
+
+class StreamingResponse:
+    """
+    Search response returned instead of a ``dict`` for requests sent with
+    ``stream=True``, parsing the body incrementally as it is read from the
+    connection. Iterate over :meth:`hits` to get the hits of ``hits.hits``
+    one at a time, so that the memory used doesn't grow with the size of the
+    page::
+
+        resp = client.search(index="logs", body=query, stream=True)
+        with resp:
+            for hit in resp.hits():
+                ...
+
+    The other fields of the response are available in :attr:`body` and
+    through ``resp["_scroll_id"]`` / ``resp.get("took")``. Fields that come
+    after ``hits.hits`` in the body (e.g. ``aggregations``) are only read
+    once the hits have been consumed; looking them up beforehand doesn't skip
+    the hits. Use :meth:`read` to parse the whole response into a ``dict``.
+
+    The connection is released once the body has been read, or when the
+    response is closed.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self.body: Dict[str, Any] = {}
+        self._chunks = iter(chunks)
+        self._parser = HitsParser()
+        self._at_hits = False
+        self._hits_started = False
+        self._done = False
+
+    def __enter__(self) -> Any:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.body:
+            self._read_fields()
+        return self.body[key]
+
+    def __contains__(self, key: str) -> bool:
+        if key not in self.body:
+            self._read_fields()
+        return key in self.body
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the top level field ``key`` of the response."""
+        return self[key] if key in self else default
+
+    def hits(self) -> Iterator[Any]:
+        """Yield the hits of ``hits.hits`` as they are parsed."""
+        if self._hits_started:
+            raise ValueError("The hits of a streamed response can only be read once")
+        self._read_fields()
+        self._hits_started = True
+        while self._at_hits and not self._done:
+            event = self._next_event()
+            if event[0] == "hit":
+                yield event[1]
+            else:
+                self._handle(event)
+
+    def read(self) -> Any:
+        """Parse the rest of the response and return it as a ``dict``."""
+        hits = None if self._hits_started else list(self.hits())
+        self._read_fields()
+        if hits is not None and isinstance(self.body.get("hits"), dict):
+            self.body["hits"]["hits"] = hits
+        return self.body
+
+    def close(self) -> None:
+        """Release the connection without reading the rest of the body."""
+        self._done = True
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
+
+    def _read_fields(self) -> None:
+        # parse up to the hits, or past them once they are being iterated
+        while not self._done and not (self._at_hits and not self._hits_started):
+            event = self._next_event()
+            if event[0] != "hit":
+                self._handle(event)
+
+    def _handle(self, event: Tuple[Any, ...]) -> None:
+        kind = event[0]
+        if kind == "field":
+            self.body[event[1]] = event[2]
+        elif kind == "hits_field":
+            self.body.setdefault("hits", {})[event[1]] = event[2]
+        elif kind == "hits_start":
+            self.body.setdefault("hits", {})
+            self._at_hits = True
+        elif kind == "hits_end":
+            self._at_hits = False
+        elif kind == "end":
+            self.close()
+
+    def _next_event(self) -> Tuple[Any, ...]:
+        while True:
+            event = self._parser.next_event()
+            if event is not None:
+                return event
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._parser.feed_eof()
+            else:
+                self._parser.feed(chunk)
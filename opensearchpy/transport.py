@@ -25,13 +25,22 @@
 #  under the License.
 
 
+import logging
+import threading
 import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import as_completed
 from itertools import chain
 from typing import Any, Callable, Collection, Dict, List, Mapping, Optional, Type, Union
 
 from opensearchpy.metrics import Metrics, MetricsNone
 
+from .cache import SearchCache
 from .connection import Connection, Urllib3HttpConnection
+from .connection.base import _is_streaming_body, _tell
 from .connection_pool import ConnectionPool, DummyConnectionPool, EmptyConnectionPool
 from .exceptions import (
     ConnectionError,
@@ -39,7 +48,14 @@ from .exceptions import (
     SerializationError,
     TransportError,
 )
+from .retry import RetryPolicy
 from .serializer import DEFAULT_SERIALIZERS, Deserializer, JSONSerializer, Serializer
+from .streaming import StreamingResponse
+
+logger: logging.Logger = logging.getLogger("opensearch")
+
+# endpoints of the idempotent reads that can be hedged
+_HEDGED_ENDPOINTS = frozenset(("_search", "_msearch", "_mget", "_count"))
 
 
 def get_host_info(
@@ -80,6 +96,8 @@ class Transport(object):
     max_retries: int
     retry_on_timeout: bool
     retry_on_status: Collection[int]
+    retry_policy: Optional[RetryPolicy]
+    deadline: Optional[float]
     send_get_body_as: str
     serializer: Serializer
     connection_pool_class: Any
@@ -114,7 +132,13 @@ class Transport(object):
         pool_maxsize: Optional[int] = None,
         retry_on_status: Collection[int] = (502, 503, 504),
         retry_on_timeout: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        deadline: Optional[float] = None,
         send_get_body_as: str = "GET",
+        hedge_after: Optional[Union[float, str]] = None,
+        hedge_budget: float = 0.1,
+        coalesce_requests: bool = False,
+        search_cache: Optional[SearchCache] = None,
         metrics: Metrics = MetricsNone(),
         **kwargs: Any
     ) -> None:
@@ -128,7 +152,8 @@ class Transport(object):
             producing a list of arguments (same as `hosts` parameter)
         :arg sniff_on_start: flag indicating whether to obtain a list of nodes
             from the cluster at startup time
-        :arg sniffer_timeout: number of seconds between automatic sniffs
+        :arg sniffer_timeout: number of seconds between automatic sniffs,
+            done by a background daemon thread
         :arg sniff_on_connection_fail: flag controlling if connection failure triggers a sniff
         :arg sniff_timeout: timeout used for the sniff request - it should be a
             fast api call and we are talking potentially to more nodes so we want
@@ -145,6 +170,14 @@ class Transport(object):
             on a different node. defaults to ``(502, 503, 504)``
         :arg retry_on_timeout: should timeout trigger a retry on different
             node? (default `False`)
+        :arg retry_policy: :class:`~opensearchpy.RetryPolicy` instance adding
+            a jittered exponential backoff before retries and limiting them to
+            a ratio of the requests. Retries are sent right away by default
+        :arg deadline: default number of seconds a request may take in total,
+            including its retries, the backoff between them and the sniffing
+            they trigger. Every attempt is sent with at most the time left.
+            Can be overridden per request with the ``deadline`` parameter.
+            Requests are only bound by their timeout and retries by default
         :arg send_get_body_as: for GET requests with body this option allows
             you to specify an alternate way of execution for environments that
             don't support passing bodies with GET requests. If you set this to
@@ -152,6 +185,22 @@ class Transport(object):
             will be serialized and passed as a query parameter `source`.
         :arg pool_maxsize: Maximum connection pool size used by pool-manager
             For custom connection-pooling on current session
+        :arg hedge_after: send a second copy of idempotent reads (``search``,
+            ``get``, ``mget``, ``msearch`` and ``count``) to another node when
+            the first node hasn't answered after this many seconds, or after
+            a percentile of the observed latencies such as ``"p95"``; the first
+            response wins. Disabled by default.
+        :arg hedge_budget: maximum ratio of hedged requests to the requests
+            that could be hedged, defaults to ``0.1``
+        :arg coalesce_requests: share the response of identical idempotent
+            reads sent concurrently, so that only one of them reaches the
+            cluster. Every caller deserializes its own copy of the response
+            and the requests saved are reported to
+            :meth:`~opensearchpy.Metrics.request_coalesced`. Defaults to
+            ``False``
+        :arg search_cache: :class:`~opensearchpy.SearchCache` instance to
+            answer identical searches from, until they expire or the indices
+            they target are written to through this client
         :arg metrics: metrics is an instance of a subclass of the
             :class:`~opensearchpy.Metrics` class, used for collecting
             and reporting metrics related to the client's operations;
@@ -178,8 +227,30 @@ class Transport(object):
         self.pool_maxsize = pool_maxsize
         self.retry_on_timeout = retry_on_timeout
         self.retry_on_status = retry_on_status
+        self.retry_policy = retry_policy
+        self.deadline = deadline
         self.send_get_body_as = send_get_body_as
 
+        # hedging of idempotent reads
+        self._hedging: Optional[_Hedging] = None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        if hedge_after is not None:
+            self._hedging = _Hedging(hedge_after, hedge_budget)
+            # threads are only started once requests are hedged
+            self._hedge_executor = ThreadPoolExecutor(
+                max_workers=_HEDGE_MAX_WORKERS, thread_name_prefix="opensearch-hedge"
+            )
+        # free threads of the executor, requests are only handed over to it
+        # when one is free so that they never wait in its queue
+        self._hedge_slots = threading.BoundedSemaphore(_HEDGE_MAX_WORKERS)
+
+        # identical reads in flight, shared when coalescing requests
+        self.coalesce_requests = coalesce_requests
+        self._in_flight: Dict[Any, Any] = {}
+        self._in_flight_lock = threading.Lock()
+
+        self.search_cache = search_cache
+
         # data serializer
         self.serializer = serializer
 
@@ -217,6 +288,19 @@ class Transport(object):
         if sniff_on_start:
             self.sniff_hosts(True)
 
+        # AsyncTransport defers the hosts and sniffs from a task once its
+        # event loop is running
+        self._sniffer: Optional[threading.Thread] = None
+        self._sniffer_wakeup = threading.Event()
+        if sniffer_timeout and hosts:
+            self._sniffer = threading.Thread(
+                target=_sniff_periodically,
+                args=(weakref.ref(self), self._sniffer_wakeup),
+                name="opensearch-sniffer",
+                daemon=True,
+            )
+            self._sniffer.start()
+
     def add_connection(self, host: Any) -> None:
         """
         Create a new :class:`~opensearchpy.Connection` instance and add it to the pool.
@@ -230,7 +314,8 @@ class Transport(object):
         """
         Instantiate all the connections and create new connection pool to hold them.
         Tries to identify unchanged hosts and re-use existing
-        :class:`~opensearchpy.Connection` instances.
+        :class:`~opensearchpy.Connection` instances, along with their circuit
+        breakers and selector statistics.
 
         :arg hosts: same as `__init__`
         """
@@ -253,31 +338,67 @@ class Transport(object):
             return self.connection_class(metrics=self.metrics, **kwargs)
 
         connections = list(zip(map(_create_connection, hosts), hosts))
+        pool: Any
         if len(connections) == 1:
-            self.connection_pool = DummyConnectionPool(connections)
+            pool = DummyConnectionPool(connections)
         else:
             # pass the hosts dicts to the connection pool to optionally extract parameters from
-            self.connection_pool = self.connection_pool_class(
-                connections, **self.kwargs
-            )
+            pool = self.connection_pool_class(connections, **self.kwargs)
+        # keep the circuit breakers and selector statistics of unchanged hosts
+        if hasattr(self, "connection_pool"):
+            pool.take_over(self.connection_pool)
+        self.connection_pool = pool
 
     def get_connection(self) -> Any:
         """
         Retrieve a :class:`~opensearchpy.Connection` instance from the
-        :class:`~opensearchpy.ConnectionPool` instance.
+        :class:`~opensearchpy.ConnectionPool` instance, starting the probes
+        of the circuit breakers that are due first.
+        """
+        pool = self.connection_pool
+        for connection in pool.connections_to_probe():
+            self._start_probe(pool, connection)
+        return pool.get_connection()
+
+    def _start_probe(self, pool: Any, connection: Connection) -> None:
+        """Probe ``connection`` of ``pool`` in a background thread"""
+        threading.Thread(
+            target=self._probe,
+            args=(pool, connection),
+            name="opensearch-probe",
+            daemon=True,
+        ).start()
+
+    def _probe(self, pool: Any, connection: Connection) -> None:
         """
-        if self.sniffer_timeout:
-            if time.time() >= self.last_sniff + self.sniffer_timeout:
-                self.sniff_hosts()
-        return self.connection_pool.get_connection()
+        Send the probes of a half-open circuit breaker, lightweight ``HEAD /``
+        requests, and report whether they all succeeded to the connection
+        pool holding the breaker: ``pool``, or the pool that took it over if
+        sniffing replaced ``pool`` since.
+        """
+        breaker = pool.breakers[connection]
+        success = True
+        for _ in range(breaker.probes):
+            try:
+                connection.perform_request("HEAD", "/", timeout=breaker.probe_timeout)
+            except Exception:
+                success = False
+                break
+        _breaker_pool(self.connection_pool, pool, connection).probe_finished(
+            connection, success
+        )
 
-    def _get_sniff_data(self, initial: bool = False) -> Any:
+    def _get_sniff_data(
+        self, initial: bool = False, deadline: Optional[float] = None
+    ) -> Any:
         """
         Perform the request to get sniffing information. Returns a list of
         dictionaries (one per node) containing all the information from the
         cluster.
 
         It also sets the last_sniff attribute in case of a successful attempt.
+        Connections are not tried anymore once ``deadline``, a
+        :func:`time.monotonic` time, has passed.
 
         In rare cases it might be possible to override this method in your
         custom Transport class to serve data from alternative source like
@@ -291,12 +412,16 @@ class Transport(object):
             # go through all current connections as well as the
             # seed_connections for good measure
             for c in chain(self.connection_pool.connections, self.seed_connections):
+                # use small timeout for the sniffing request, should be a fast api call
+                timeout = self.sniff_timeout if not initial else None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TransportError("N/A", "Unable to sniff hosts in time.")
+                    timeout = min(timeout, remaining) if timeout else remaining
                 try:
-                    # use small timeout for the sniffing request, should be a fast api call
                     _, headers, node_info = c.perform_request(
-                        "GET",
-                        "/_nodes/_all/http",
-                        timeout=self.sniff_timeout if not initial else None,
+                        "GET", "/_nodes/_all/http", timeout=timeout
                     )
 
                     # Lowercase all the header names for consistency in accessing them.
@@ -340,7 +465,9 @@ class Transport(object):
 
         return self.host_info_callback(host_info, host)
 
-    def sniff_hosts(self, initial: bool = False) -> Any:
+    def sniff_hosts(
+        self, initial: bool = False, deadline: Optional[float] = None
+    ) -> Any:
         """
         Obtain a list of nodes from the cluster and create a new connection
         pool using the information retrieved.
@@ -349,8 +476,10 @@ class Transport(object):
 
         :arg initial: flag indicating if this is during startup
             (``sniff_on_start``), ignore the ``sniff_timeout`` if ``True``
+        :arg deadline: :func:`time.monotonic` time after which no more nodes
+            are asked
         """
-        node_info = self._get_sniff_data(initial)
+        node_info = self._get_sniff_data(initial, deadline)
 
         hosts: Any = list(filter(None, (self._get_host_info(n) for n in node_info)))
 
@@ -363,17 +492,165 @@ class Transport(object):
 
         self.set_connections(hosts)
 
-    def mark_dead(self, connection: Connection) -> None:
+    def mark_dead(
+        self, connection: Connection, deadline: Optional[float] = None
+    ) -> None:
         """
         Mark a connection as dead (failed) in the connection pool. If sniffing
         on failure is enabled this will initiate the sniffing process.
 
         :arg connection: instance of :class:`~opensearchpy.Connection` that failed
+        :arg deadline: :func:`time.monotonic` time the sniffing must complete by
         """
         # mark as dead even when sniffing to avoid hitting this host during the sniff process
         self.connection_pool.mark_dead(connection)
         if self.sniff_on_connection_fail:
-            self.sniff_hosts()
+            self.sniff_hosts(deadline=deadline)
+
+    def _get_hedge_connection(self, connection: Connection) -> Optional[Connection]:
+        """
+        Retrieve a connection other than ``connection`` to send a hedged
+        request to, or ``None`` if the pool doesn't offer one.
+        """
+        for _ in range(3):
+            other: Connection = self.connection_pool.get_connection()
+            if other is not connection:
+                return other
+        return None
+
+    def _send(self, connection: Connection, *args: Any, **kwargs: Any) -> Any:
+        """Send a request on ``connection``, tracking it in the connection pool"""
+        self.connection_pool.request_started(connection)
+        start = time.monotonic()
+        failed = False
+        try:
+            return connection.perform_request(*args, **kwargs)
+        except TransportError as e:
+            failed = _is_node_failure(e)
+            raise
+        finally:
+            self.connection_pool.request_finished(
+                connection, time.monotonic() - start, failed
+            )
+
+    def _send_hedged(self, connection: Connection, *args: Any, **kwargs: Any) -> Any:
+        """
+        Send an idempotent read on ``connection`` and, if it hasn't answered
+        within the hedging delay, a copy of it on another connection. Return
+        the connection that answered first along with its response, the other
+        response is discarded. If both fail the error of ``connection`` is
+        raised.
+
+        The copies are sent from the hedge executor, only when one of its
+        threads is free: otherwise the read is sent on the calling thread
+        without being hedged, rather than waiting in the queue of the
+        executor and being hedged because of that wait.
+        """
+        hedging: Any = self._hedging
+        delay = hedging.start()
+
+        def send() -> Any:
+            start = time.monotonic()
+            response = self._send(connection, *args, **kwargs)
+            hedging.record(time.monotonic() - start)
+            return response
+
+        if delay is None or not self._hedge_slots.acquire(blocking=False):
+            return connection, send()
+
+        executor: Any = self._hedge_executor
+        try:
+            first = executor.submit(self._run_hedge_slot, send)
+        except RuntimeError:
+            # the executor was shut down by close()
+            self._hedge_slots.release()
+            return connection, send()
+        try:
+            return connection, first.result(delay)
+        except FutureTimeoutError:
+            pass
+
+        other = self._get_hedge_connection(connection)
+        if other is None or not self._hedge_slots.acquire(blocking=False):
+            return connection, first.result()
+        if not hedging.acquire():
+            self._hedge_slots.release()
+            return connection, first.result()
+
+        try:
+            hedge = executor.submit(
+                self._run_hedge_slot, self._send, other, *args, **kwargs
+            )
+        except RuntimeError:
+            self._hedge_slots.release()
+            return connection, first.result()
+
+        futures = {first: connection, hedge: other}
+        for future in as_completed(futures):
+            if future.exception() is None:
+                return futures[future], future.result()
+        return connection, first.result()
+
+    def _run_hedge_slot(self, func: Any, *args: Any, **kwargs: Any) -> Any:
+        """Run ``func`` in the hedge executor, freeing its slot once done"""
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._hedge_slots.release()
+
+    def _send_coalesced(
+        self,
+        key: Any,
+        connection: Connection,
+        hedge: bool,
+        deadline: Optional[float],
+        *args: Any,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Send an idempotent read, or wait for the response of an identical
+        read already in flight. Return the connection the response came from
+        along with the response, or raise the error the request failed with.
+        When the read waited for failed its error is returned along with
+        ``None`` instead: the connection that failed is not the one passed
+        in, and the caller that sent the read handles its failure. So is a
+        :class:`~opensearchpy.ConnectionTimeout` when ``deadline`` passes
+        before the read waited for completes.
+        """
+        with self._in_flight_lock:
+            shared = self._in_flight.get(key)
+            if shared is None:
+                shared = self._in_flight[key] = _SharedResponse()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            timeout = None
+            if deadline is not None:
+                timeout = max(deadline - time.monotonic(), 0)
+            if not shared.done.wait(timeout):
+                return None, ConnectionTimeout(
+                    "TIMEOUT", "Request deadline exceeded", None
+                )
+            self.metrics.request_coalesced()
+            if shared.error is not None:
+                return None, shared.error
+            return shared.result
+
+        try:
+            if hedge:
+                shared.result = self._send_hedged(connection, *args, **kwargs)
+            else:
+                shared.result = connection, self._send(connection, *args, **kwargs)
+            return shared.result
+        except Exception as e:
+            shared.error = e
+            raise
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+            shared.done.set()
 
     def perform_request(
         self,
@@ -404,24 +681,78 @@ class Transport(object):
             underlying :class:`~opensearchpy.Connection` class for serialization
         :arg body: body of the request, will be serialized using serializer and
             passed to the connection
+
+        A file object or an iterator (e.g. a generator) of ``bytes`` or
+        ``str`` chunks as ``body`` is not serialized but streamed with chunked
+        transfer encoding as it is read, e.g. to send a large bulk file
+        without loading it in memory. It is only retried if it can be rewound
+        (a seekable file) and its responses are not cached.
+
+        With ``stream=True`` in ``params`` a JSON response is returned as a
+        :class:`~opensearchpy.streaming.StreamingResponse` parsing the body
+        as it is read from the connection. Failures while reading the body
+        are not retried.
+
+        With ``deadline`` in ``params`` (or the transport's ``deadline``) the
+        whole call, retries included, takes at most that many seconds; each
+        attempt gets the time left as its timeout and failures are raised
+        without being retried once it has passed.
         """
+        stream = self._resolve_stream(method, params)
+        deadline = self._resolve_deadline(params)
+        search_body = body
         method, params, body, ignore, timeout = self._resolve_request_args(
             method, params, body
         )
 
+        streamed = _is_streaming_body(body)
+        position = _tell(body) if streamed else None
+
+        cache_key, generation = None, 0
+        if self.search_cache is not None and not stream and not streamed:
+            cache_key = self.search_cache.key(method, url, params, search_body, headers)
+            if cache_key is not None:
+                generation = self.search_cache.generation
+                cached = self.search_cache.get(cache_key)
+                if cached is not None:
+                    return self._deserialize(*cached)
+        request = (method, url, params, body)
+        options: Dict[str, Any] = {
+            "headers": headers,
+            "ignore": ignore,
+            "timeout": timeout,
+        }
+        if stream:
+            options["stream"] = True
+
+        read = not stream and not streamed and _is_idempotent_read(method, url)
+        hedge = read and self._hedging is not None
+        key = None
+        if read and self.coalesce_requests:
+            key = _coalescing_key(request, options)
+
+        if self.retry_policy is not None:
+            self.retry_policy.request_started()
+
         for attempt in range(self.max_retries + 1):
             connection = self.get_connection()
+            if deadline is not None:
+                options["timeout"] = _attempt_timeout(connection, timeout, deadline)
 
             try:
-                status, headers_response, data = connection.perform_request(
-                    method,
-                    url,
-                    params,
-                    body,
-                    headers=headers,
-                    ignore=ignore,
-                    timeout=timeout,
-                )
+                if key is not None:
+                    connection, response = self._send_coalesced(
+                        key, connection, hedge, deadline, *request, **options
+                    )
+                    if connection is None:
+                        raise response
+                elif hedge:
+                    connection, response = self._send_hedged(
+                        connection, *request, **options
+                    )
+                else:
+                    response = self._send(connection, *request, **options)
+                status, headers_response, data = response
 
                 # Lowercase all the header names for consistency in accessing them.
                 headers_response = {
@@ -431,6 +762,12 @@ class Transport(object):
             except TransportError as e:
                 if method == "HEAD" and e.status_code == 404:
                     return False
+                if self.search_cache is not None and cache_key is None:
+                    # a write that failed may still have been applied
+                    self.search_cache.request_completed(method, url)
+                if deadline is not None and time.monotonic() >= deadline:
+                    # out of time, not necessarily a failure of the node
+                    raise e
 
                 retry = False
                 if isinstance(e, ConnectionTimeout):
@@ -442,15 +779,30 @@ class Transport(object):
 
                 if retry:
                     try:
-                        # only mark as dead if we are retrying
-                        self.mark_dead(connection)
+                        # only mark as dead if we are retrying, and if the
+                        # request failed on this connection rather than on
+                        # the one of a coalesced read
+                        if connection is not None:
+                            self.mark_dead(connection, deadline=deadline)
                     except TransportError:
                         # If sniffing on failure, it could fail too. Catch the
                         # exception not to interrupt the retries.
                         pass
-                    # raise exception on last retry
-                    if attempt == self.max_retries:
+                    # raise exception on last retry, or if the body is gone
+                    if attempt == self.max_retries or (streamed and position is None):
+                        raise e
+                    backoff = 0.0
+                    if self.retry_policy is not None:
+                        if not self.retry_policy.acquire():
+                            raise e
+                        backoff = self.retry_policy.backoff_time(attempt)
+                    # or once there is no time left to retry
+                    if deadline is not None and time.monotonic() + backoff >= deadline:
                         raise e
+                    if backoff:
+                        time.sleep(backoff)
+                    if position is not None:
+                        body.seek(position)
                 else:
                     raise e
 
@@ -458,30 +810,70 @@ class Transport(object):
                 # connection didn't fail, confirm its live status
                 self.connection_pool.mark_live(connection)
 
+                if self.search_cache is not None:
+                    if cache_key is None:
+                        self.search_cache.request_completed(method, url)
+                    elif 200 <= status < 300:
+                        self.search_cache.put(
+                            cache_key, generation, headers_response, data
+                        )
+
                 if method == "HEAD":
                     return 200 <= status < 300
 
-                if data:
-                    data = self.deserializer.loads(
-                        data, headers_response.get("content-type")
-                    )
-                return data
+                if stream:
+                    if _is_json(headers_response.get("content-type")):
+                        return StreamingResponse(data)
+                    data = b"".join(data)
+
+                return self._deserialize(headers_response, data)
 
     def close(self) -> Any:
         """
         Explicitly closes connections
         """
+        if self._sniffer is not None:
+            self._sniffer = None
+            self._sniffer_wakeup.set()
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
         return self.connection_pool.close()
 
+    def _deserialize(self, headers_response: Mapping[str, str], data: Any) -> Any:
+        """Deserializes a response body according to its content type"""
+        if data:
+            return self.deserializer.loads(data, headers_response.get("content-type"))
+        if isinstance(data, bytes):
+            # empty body
+            return ""
+        return data
+
+    def _resolve_stream(self, method: str, params: Any) -> bool:
+        """Pops the ``stream`` parameter, ignored for HEAD requests"""
+        stream = params.pop("stream", False) if params else False
+        return bool(stream) and method != "HEAD"
+
+    def _resolve_deadline(self, params: Any) -> Optional[float]:
+        """
+        Pops the ``deadline`` parameter and returns the :func:`time.monotonic`
+        time the request must complete by, ``None`` if it has no deadline
+        """
+        deadline = params.pop("deadline", None) if params else None
+        if deadline is None:
+            deadline = self.deadline
+        return None if deadline is None else time.monotonic() + deadline
+
     def _resolve_request_args(self, method: str, params: Any, body: Any) -> Any:
         """Resolves parameters for .perform_request()"""
         if body is not None:
-            body = self.serializer.dumps(body)
+            streamed = _is_streaming_body(body)
+            if not streamed:
+                body = self.serializer.dumps(body)
 
             # some clients or environments don't support sending GET with body
             if method in ("HEAD", "GET") and self.send_get_body_as != "GET":
-                # send it as post instead
-                if self.send_get_body_as == "POST":
+                # send it as post instead, a streamed body can't be a parameter
+                if self.send_get_body_as == "POST" or streamed:
                     method = "POST"
 
                 # or as source parameter
@@ -511,4 +903,183 @@ class Transport(object):
         return method, params, body, ignore, timeout
 
 
+def _breaker_pool(current: Any, pool: Any, connection: Connection) -> Any:
+    """
+    Return ``current``, the connection pool of the transport, if it took over
+    the circuit breaker of ``connection`` from ``pool`` when sniffing,
+    ``pool`` otherwise.
+    """
+    breaker = pool.breakers[connection]
+    if getattr(current, "breakers", {}).get(connection) is breaker:
+        return current
+    return pool
+
+
+def _sniff_periodically(transport_ref: Any, wakeup: threading.Event) -> None:
+    """
+    Body of the background sniffer thread of a :class:`Transport`, sniffing
+    every ``sniffer_timeout`` seconds until the transport is closed or garbage
+    collected. :meth:`Transport.set_connections` swaps the new pool in with a
+    single assignment and reuses the connections of unchanged hosts, so
+    requests in flight are not disturbed.
+    """
+    while True:
+        transport = transport_ref()
+        if transport is None or transport._sniffer is None:
+            return
+        delay = transport.last_sniff + transport.sniffer_timeout - time.time()
+        if delay <= 0:
+            try:
+                transport.sniff_hosts()
+            except Exception as e:
+                logger.warning("Sniffing the cluster failed: %s", e)
+                # try again once sniffer_timeout is over
+                transport.last_sniff = time.time()
+            continue
+        # don't keep the transport alive while waiting
+        del transport
+        wakeup.wait(delay)
+        wakeup.clear()
+
+
+# maximum number of threads sending hedged requests and the requests they hedge
+_HEDGE_MAX_WORKERS = 64
+
+
+class _Hedging(object):
+    """
+    Delay and budget of the hedged requests of a transport. The delay is
+    either fixed or a percentile of the latencies recorded for the reads that
+    could be hedged. Every such read adds ``budget`` to a token bucket and
+    every hedged request takes a whole token out of it, so that at most that
+    ratio of reads is sent twice.
+    """
+
+    # latencies the percentile is computed over
+    window = 1000
+    # latencies to record before hedging at a percentile, and between updates
+    # of the delay
+    min_samples = 20
+    # hedged requests that can be sent in a burst
+    max_tokens = 10.0
+
+    def __init__(self, after: Union[float, str], budget: float) -> None:
+        self.percentile: Optional[float] = None
+        self.delay: Optional[float] = None
+        if isinstance(after, str):
+            try:
+                if not after.startswith("p"):
+                    raise ValueError
+                self.percentile = float(after[1:])
+            except ValueError:
+                raise ValueError(
+                    "hedge_after must be a number of seconds or a percentile "
+                    "such as 'p95', got %r" % (after,)
+                )
+            if not 0 < self.percentile < 100:
+                raise ValueError("hedge_after percentile must be between 0 and 100")
+        else:
+            self.delay = float(after)
+        self.budget = budget
+        self.tokens = self.max_tokens
+        self._latencies: Any = deque(maxlen=self.window)
+        self._since_update = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> Optional[float]:
+        """
+        Account for a read that can be hedged and return the seconds to wait
+        before hedging it, ``None`` while there are too few latencies yet.
+        """
+        with self._lock:
+            self.tokens = min(self.tokens + self.budget, self.max_tokens)
+        return self.delay
+
+    def acquire(self) -> bool:
+        """Take a token out of the budget to send a hedged request"""
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def record(self, duration: float) -> None:
+        """Record the latency of the first copy of a read"""
+        if self.percentile is None:
+            return
+        with self._lock:
+            self._latencies.append(duration)
+            self._since_update += 1
+            if self._since_update >= self.min_samples:
+                self._since_update = 0
+                latencies = sorted(self._latencies)
+                index = int(len(latencies) * self.percentile / 100)
+                self.delay = latencies[min(index, len(latencies) - 1)]
+
+
+class _SharedResponse(object):
+    """Response of a read in flight, shared by the identical reads waiting for it"""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[Exception] = None
+
+
+def _coalescing_key(request: Any, options: Any) -> Any:
+    """
+    Key identifying identical requests, ``None`` if the request can't be
+    coalesced because its parameters or headers can't be hashed.
+    """
+    method, url, params, body = request
+    key = (
+        method,
+        url,
+        tuple(sorted(params.items())) if params else (),
+        body,
+        tuple(sorted(options["headers"].items())) if options["headers"] else (),
+        tuple(options["ignore"]),
+        options["timeout"],
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _attempt_timeout(
+    connection: Connection, timeout: Optional[float], deadline: float
+) -> float:
+    """
+    Return the timeout of an attempt sent on ``connection``, its timeout
+    capped to the time left before ``deadline``
+    """
+    remaining = max(deadline - time.monotonic(), 0.001)
+    if timeout is None:
+        timeout = getattr(connection, "timeout", None)
+    return min(timeout, remaining) if timeout else remaining
+
+
+def _is_node_failure(e: TransportError) -> bool:
+    """Whether an error is the node's fault: connection errors and 5xx statuses"""
+    return not isinstance(e.status_code, int) or e.status_code >= 500
+
+
+def _is_idempotent_read(method: str, url: str) -> bool:
+    """Whether a request is a ``search``, ``get``, ``mget``, ``msearch`` or ``count``"""
+    path = url.partition("?")[0].rstrip("/").split("/")
+    if path[-1] in _HEDGED_ENDPOINTS:
+        return method in ("GET", "POST")
+    return method == "GET" and len(path) > 2 and path[-2] in ("_doc", "_source")
+
+
+def _is_json(mimetype: Optional[str]) -> bool:
+    """Whether a response of this content type can be parsed as it streams in"""
+    if not mimetype:
+        return True
+    mimetype = mimetype.partition(";")[0].strip()
+    return mimetype in ("application/json", "application/vnd.elasticsearch+json")
+
+
 __all__ = ["TransportError"]
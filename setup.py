@@ -123,5 +123,7 @@ setup(
         "docs": docs_require + async_require,
         "async": async_require,
         "kerberos": ["requests_kerberos"],
+        "orjson": ["orjson>=3.7"],
+        "zstd": ["zstandard"],
     },
 )
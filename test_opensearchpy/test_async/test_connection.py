@@ -30,19 +30,20 @@ import io
 import json
 import ssl
 import warnings
+import zlib
 from platform import python_version
 from typing import Any
 
 import aiohttp
 import pytest
 from _pytest.mark.structures import MarkDecorator
-from mock import MagicMock, patch
+from mock import ANY, MagicMock, patch
 from multidict import CIMultiDict
 from pytest import raises
 
 from opensearchpy import AIOHttpConnection, AsyncOpenSearch, __versionstr__, serializer
 from opensearchpy.compat import reraise_exceptions
-from opensearchpy.connection import Connection, async_connections
+from opensearchpy.connection import Compression, Connection, async_connections
 from opensearchpy.exceptions import ConnectionError, NotFoundError, TransportError
 from test_opensearchpy.test_http_server import TestHTTPServer
 
@@ -68,8 +69,8 @@ class TestAIOHttpConnection:
                 async def __aexit__(self, *_: Any, **__: Any) -> None:
                     pass
 
-                async def text(self) -> Any:
-                    return response_body.decode("utf-8", "surrogatepass")
+                async def read(self) -> Any:
+                    return response_body
 
             dummy_response: Any = DummyResponse()
             dummy_response.headers = CIMultiDict(**response_headers)
@@ -140,6 +141,42 @@ class TestAIOHttpConnection:
         assert kwargs["headers"]["accept-encoding"] == "gzip,deflate"
         assert "content-encoding" not in kwargs["headers"]
 
+    async def test_compression_policy(self) -> None:
+        con = await self._get_mock_connection(
+            {"http_compress": Compression("deflate", min_size=100)}
+        )
+
+        await con.perform_request("POST", "/_bulk", body=b"{}")
+        _, kwargs = con.session.request.call_args
+        assert b"{}" == kwargs["data"]
+        assert "content-encoding" not in kwargs["headers"]
+
+        await con.perform_request("POST", "/_bulk", body=b"{}\n" * 100)
+        _, kwargs = con.session.request.call_args
+        assert b"{}\n" * 100 == zlib.decompress(kwargs["data"])
+        assert "deflate" == kwargs["headers"]["content-encoding"]
+
+    async def test_large_bodies_are_compressed_in_the_offload_executor(
+        self,
+    ) -> None:
+        con = await self._get_mock_connection(
+            {"http_compress": True, "offload_threshold": 100}
+        )
+
+        with patch.object(
+            con.loop, "run_in_executor", wraps=con.loop.run_in_executor
+        ) as run_in_executor:
+            await con.perform_request("POST", "/_bulk", body=b"{}")
+            run_in_executor.assert_not_called()
+
+            await con.perform_request("POST", "/_bulk", body=b"{}\n" * 100)
+            run_in_executor.assert_called_once_with(
+                None, con._compress, b"{}\n" * 100, ANY
+            )
+        _, kwargs = con.session.request.call_args
+        assert b"{}\n" * 100 == gzip.decompress(kwargs["data"])
+        assert "gzip" == kwargs["headers"]["content-encoding"]
+
     async def test_url_prefix(self) -> None:
         con = await self._get_mock_connection(
             connection_params={"url_prefix": "/_search/"}
@@ -338,11 +375,11 @@ class TestAIOHttpConnection:
         assert logger.isEnabledFor.call_count == 1
         assert logger.debug.call_count == 0
 
-    async def test_surrogatepass_into_bytes(self) -> None:
+    async def test_body_returned_as_bytes(self) -> None:
         buf = b"\xe4\xbd\xa0\xe5\xa5\xbd\xed\xa9\xaa"
         con = await self._get_mock_connection(response_body=buf)
         _, _, data = await con.perform_request("GET", "/")
-        assert u"你好\uda6a" == data  # fmt: skip
+        assert buf == data
 
     @pytest.mark.parametrize("exception_cls", reraise_exceptions)  # type: ignore
     async def test_recursion_error_reraised(self, exception_cls: Any) -> None:
@@ -458,6 +495,30 @@ class TestConnectionHttpServer:
             "User-Agent": user_agent,
         }
 
+    async def test_aiohttp_connection_stream(self) -> None:
+        conn = AIOHttpConnection("localhost", port=8081, use_ssl=False)
+        status, _, chunks = await conn.perform_request("GET", "/", stream=True)
+
+        assert status == 200
+        assert "GET" == json.loads(b"".join([c async for c in chunks]))["method"]
+        await conn.close()
+
+    async def test_aiohttp_connection_streamed_body(self) -> None:
+        async def lines() -> Any:
+            yield b'{"index": {}}\n'
+            yield '{"title": "a"}\n'
+
+        conn = AIOHttpConnection(
+            "localhost", port=8081, use_ssl=False, http_compress=True
+        )
+        _, _, data = await conn.perform_request("POST", "/_bulk", body=lines())
+        data = json.loads(data)
+
+        assert data["headers"]["Transfer-Encoding"] == "chunked"
+        assert data["headers"]["Content-Encoding"] == "gzip"
+        assert data["body"] == '{"index": {}}\n{"title": "a"}\n'
+        await conn.close()
+
     async def test_aiohttp_connection_error(self) -> None:
         conn = AIOHttpConnection("not.a.host.name")
         with pytest.raises(ConnectionError):
@@ -0,0 +1,425 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+from _pytest.mark.structures import MarkDecorator
+from mock import AsyncMock, patch
+
+from opensearchpy import AsyncOpenSearch, TransportError, helpers
+from opensearchpy._async.helpers.actions import _task_pages
+from opensearchpy._async.streaming import AsyncStreamingResponse
+from opensearchpy.helpers.actions import _page_bytes
+
+from ...test_helpers.test_actions import (
+    mock_pit_search,
+    mock_slice_scroll,
+    mock_slice_search,
+)
+
+pytestmark: MarkDecorator = pytest.mark.asyncio
+
+
+async def test_chunk_controller_adapts_chunk_size() -> None:
+    calls = []
+
+    async def bulk(body: Any, *args: Any, **kwargs: Any) -> Any:
+        count = body.count(b"\n") // 2
+        calls.append(count)
+        # reject everything in the first chunk
+        status = 429 if len(calls) == 1 else 201
+        return {
+            "took": 1,
+            "errors": status != 201,
+            "items": [{"index": {"status": status}} for _ in range(count)],
+        }
+
+    controller = helpers.AdaptiveChunkController(
+        initial_chunk_size=8, min_chunk_size=1, chunk_size_step=2
+    )
+    with patch.object(AsyncOpenSearch, "bulk", AsyncMock(side_effect=bulk)):
+        results = [
+            result
+            async for result in helpers.async_streaming_bulk(
+                AsyncOpenSearch(),
+                ({"x": i} for i in range(20)),
+                raise_on_error=False,
+                chunk_controller=controller,
+            )
+        ]
+
+    assert 20 == len(results)
+    assert [8, 4, 6, 2] == calls
+    assert 8 == controller.rejected
+
+
+async def test_extra_positional_arguments_are_passed_to_bulk() -> None:
+    bulk = AsyncMock(
+        return_value={"errors": False, "items": [{"index": {"status": 201}}]}
+    )
+    with patch.object(AsyncOpenSearch, "bulk", bulk):
+        results = [
+            result
+            async for result in helpers.async_streaming_bulk(
+                AsyncOpenSearch(),
+                [{"x": 1}],
+                500,
+                100 * 1024 * 1024,
+                True,
+                helpers.expand_action,
+                True,
+                0,
+                2,
+                600,
+                True,
+                (),
+                "logs",
+            )
+        ]
+
+    assert [True] == [ok for ok, _ in results]
+    bulk.assert_called_with(b'{"index":{}}\n{"x":1}\n', "logs")
+
+
+class InFlightBulk:
+    """Mock bulk api recording the number of requests in flight."""
+
+    def __init__(self, rejected: Any = ()) -> None:
+        self.rejected = set(rejected)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls: Any = []
+
+    async def bulk(self, body: Any, *args: Any, **kwargs: Any) -> Any:
+        docs = [json.loads(line) for line in body.splitlines()[1::2]]
+        self.calls.append([doc["x"] for doc in docs])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # complete out of order
+            await asyncio.sleep(0.01 * (len(self.calls) % 3))
+        finally:
+            self.in_flight -= 1
+
+        items = []
+        for doc in docs:
+            status = 201
+            if doc["x"] in self.rejected:
+                # rejected once
+                self.rejected.remove(doc["x"])
+                status = 429
+            items.append({"index": {"status": status, "_id": str(doc["x"])}})
+        return {"took": 1, "errors": False, "items": items}
+
+
+async def test_parallel_bulk_keeps_chunks_in_flight() -> None:
+    bulk = InFlightBulk()
+    with patch.object(AsyncOpenSearch, "bulk", AsyncMock(side_effect=bulk.bulk)):
+        results = [
+            result
+            async for result in helpers.async_parallel_bulk(
+                AsyncOpenSearch(),
+                ({"x": i} for i in range(20)),
+                max_concurrency=3,
+                chunk_size=2,
+            )
+        ]
+
+    assert 10 == len(bulk.calls)
+    assert 3 == bulk.max_in_flight
+    assert list(range(20)) == sorted(int(info["index"]["_id"]) for _, info in results)
+    assert all(ok for ok, _ in results)
+
+
+async def test_parallel_bulk_bounds_the_chunk_controller() -> None:
+    status = 201
+
+    async def bulk(body: Any, *args: Any, **kwargs: Any) -> Any:
+        count = body.count(b"\n") // 2
+        return {
+            "took": 1,
+            "errors": status != 201,
+            "items": [{"index": {"status": status}} for _ in range(count)],
+        }
+
+    controller = helpers.AdaptiveChunkController(
+        initial_chunk_size=1, min_chunk_size=1, max_chunk_size=1
+    )
+    with patch.object(AsyncOpenSearch, "bulk", AsyncMock(side_effect=bulk)):
+        async for _ in helpers.async_parallel_bulk(
+            AsyncOpenSearch(),
+            ({"x": i} for i in range(100)),
+            max_concurrency=2,
+            chunk_controller=controller,
+        ):
+            pass
+        assert (2, 2) == (controller.max_concurrency, controller.concurrency)
+
+        # rejections cut the requests in flight, instead of an unbounded value
+        status = 429
+        async for _ in helpers.async_parallel_bulk(
+            AsyncOpenSearch(),
+            [{"x": 0}],
+            max_concurrency=2,
+            raise_on_error=False,
+            chunk_controller=controller,
+        ):
+            pass
+    assert 1 == controller.concurrency
+
+
+async def test_parallel_bulk_is_bounded_by_inflight_bytes() -> None:
+    bulk = InFlightBulk()
+    with patch.object(AsyncOpenSearch, "bulk", AsyncMock(side_effect=bulk.bulk)):
+        results = [
+            result
+            async for result in helpers.async_parallel_bulk(
+                AsyncOpenSearch(),
+                ({"x": i} for i in range(10)),
+                max_concurrency=4,
+                chunk_size=2,
+                max_inflight_bytes=50,
+            )
+        ]
+
+    assert 10 == len(results)
+    assert 1 == bulk.max_in_flight
+
+
+async def test_parallel_bulk_retries_rejected_documents_of_a_chunk() -> None:
+    bulk = InFlightBulk(rejected=[1, 6])
+    with patch.object(AsyncOpenSearch, "bulk", AsyncMock(side_effect=bulk.bulk)):
+        results = [
+            result
+            async for result in helpers.async_parallel_bulk(
+                AsyncOpenSearch(),
+                ({"x": i} for i in range(8)),
+                chunk_size=4,
+                raise_on_error=False,
+                max_retries=1,
+                initial_backoff=0,
+            )
+        ]
+
+    assert 8 == len(results)
+    assert all(ok for ok, _ in results)
+    assert [1] in bulk.calls and [6] in bulk.calls
+
+
+async def test_parallel_bulk_error_cancels_chunks_in_flight() -> None:
+    bulk = InFlightBulk()
+
+    async def failing_bulk(body: Any, *args: Any, **kwargs: Any) -> Any:
+        if b'"x":0' in body:
+            raise TransportError(500, "boom")
+        return await bulk.bulk(body, *args, **kwargs)
+
+    with patch.object(AsyncOpenSearch, "bulk", AsyncMock(side_effect=failing_bulk)):
+        with pytest.raises(TransportError):
+            async for _ in helpers.async_parallel_bulk(
+                AsyncOpenSearch(), ({"x": i} for i in range(20)), chunk_size=2
+            ):
+                pass
+
+    assert 0 == bulk.in_flight
+
+
+async def test_parallel_scan_slices_are_scrolled_concurrently() -> None:
+    clear_scroll = AsyncMock()
+    with patch.object(
+        AsyncOpenSearch, "search", AsyncMock(side_effect=mock_slice_search)
+    ), patch.object(
+        AsyncOpenSearch, "scroll", AsyncMock(side_effect=mock_slice_scroll)
+    ), patch.object(
+        AsyncOpenSearch, "clear_scroll", clear_scroll
+    ):
+        hits = [
+            hit
+            async for hit in helpers.async_parallel_scan(
+                AsyncOpenSearch(), slices=3, index="i"
+            )
+        ]
+
+    assert sorted("%d-%d" % (s, i) for s in range(3) for i in range(4)) == sorted(
+        hit["_id"] for hit in hits
+    )
+    assert sorted([["scroll-%d-2" % s] for s in range(3)]) == sorted(
+        c[1]["body"]["scroll_id"] for c in clear_scroll.call_args_list
+    )
+
+
+async def test_parallel_scan_pages_through_a_point_in_time() -> None:
+    create_pit = AsyncMock(return_value={"pit_id": "pit"})
+    delete_pit = AsyncMock()
+    with patch.object(
+        AsyncOpenSearch, "search", AsyncMock(side_effect=mock_slice_search)
+    ), patch.object(AsyncOpenSearch, "create_pit", create_pit), patch.object(
+        AsyncOpenSearch, "delete_pit", delete_pit
+    ):
+        hits = [
+            hit
+            async for hit in helpers.async_parallel_scan(
+                AsyncOpenSearch(), slices=2, pit=True, size=2, index="i"
+            )
+        ]
+
+    assert 8 == len(hits)
+    create_pit.assert_called_once_with(index="i", keep_alive="5m")
+    delete_pit.assert_called_once_with(body={"pit_id": ["pit"]}, ignore=(404,))
+
+
+async def test_parallel_scan_failing_slice() -> None:
+    def scroll(body: Any, **kwargs: Any) -> Any:
+        if body["scroll_id"] == "scroll-1":
+            raise TransportError(500, "boom")
+        return mock_slice_scroll(body, **kwargs)
+
+    clear_scroll = AsyncMock()
+    with patch.object(
+        AsyncOpenSearch, "search", AsyncMock(side_effect=mock_slice_search)
+    ), patch.object(
+        AsyncOpenSearch, "scroll", AsyncMock(side_effect=scroll)
+    ), patch.object(
+        AsyncOpenSearch, "clear_scroll", clear_scroll
+    ):
+        with pytest.raises(TransportError):
+            async for _ in helpers.async_parallel_scan(AsyncOpenSearch(), slices=2):
+                pass
+
+        hits = [
+            hit
+            async for hit in helpers.async_parallel_scan(
+                AsyncOpenSearch(), slices=2, raise_on_error=False
+            )
+        ]
+
+    assert ["0-0", "0-1", "0-2", "0-3", "1-0", "1-1"] == sorted(
+        hit["_id"] for hit in hits
+    )
+
+
+async def test_parallel_scan_cursors_are_cleared_when_closed_early() -> None:
+    clear_scroll = AsyncMock()
+    with patch.object(
+        AsyncOpenSearch, "search", AsyncMock(side_effect=mock_slice_search)
+    ), patch.object(
+        AsyncOpenSearch, "scroll", AsyncMock(side_effect=mock_slice_scroll)
+    ), patch.object(
+        AsyncOpenSearch, "clear_scroll", clear_scroll
+    ):
+        hits = helpers.async_parallel_scan(AsyncOpenSearch(), slices=4, queue_size=1)
+        await hits.__anext__()
+        await hits.aclose()
+
+    assert 4 == clear_scroll.call_count
+
+
+async def test_pit_scan_pages_through_the_point_in_time() -> None:
+    search = AsyncMock(side_effect=mock_pit_search)
+    delete_pit = AsyncMock()
+    with patch.object(AsyncOpenSearch, "search", search), patch.object(
+        AsyncOpenSearch, "create_pit", AsyncMock(return_value={"pit_id": "pit"})
+    ), patch.object(AsyncOpenSearch, "delete_pit", delete_pit):
+        hits = [
+            hit
+            async for hit in helpers.async_pit_scan(
+                AsyncOpenSearch(), {"sort": ["date"]}, index="i", size=2
+            )
+        ]
+
+    assert ["1", "2", "3", "4", "5", "6"] == [hit["_id"] for hit in hits]
+    assert 4 == search.call_count
+    assert ["date", {"_id": "asc"}] == search.call_args[1]["body"]["sort"]
+    delete_pit.assert_called_once_with(body={"pit_id": ["pit"]}, ignore=(404,))
+
+
+async def test_pit_scan_deletes_the_point_in_time_when_closed_early() -> None:
+    delete_pit = AsyncMock()
+    with patch.object(
+        AsyncOpenSearch, "search", AsyncMock(side_effect=mock_pit_search)
+    ), patch.object(
+        AsyncOpenSearch, "create_pit", AsyncMock(return_value={"pit_id": "pit"})
+    ), patch.object(
+        AsyncOpenSearch, "delete_pit", delete_pit
+    ):
+        hits = helpers.async_pit_scan(AsyncOpenSearch(), index="i", size=2)
+        await hits.__anext__()
+        await hits.aclose()
+
+    delete_pit.assert_called_once_with(body={"pit_id": ["pit"]}, ignore=(404,))
+
+
+async def test_scan_prefetch() -> None:
+    clear_scroll = AsyncMock()
+    with patch.object(
+        AsyncOpenSearch, "search", AsyncMock(side_effect=mock_slice_search)
+    ), patch.object(
+        AsyncOpenSearch, "scroll", AsyncMock(side_effect=mock_slice_scroll)
+    ), patch.object(
+        AsyncOpenSearch, "clear_scroll", clear_scroll
+    ):
+        hits = [
+            hit
+            async for hit in helpers.async_scan(
+                AsyncOpenSearch(), {"slice": {"id": 0, "max": 1}}, prefetch=2
+            )
+        ]
+
+    assert ["0-0", "0-1", "0-2", "0-3"] == [hit["_id"] for hit in hits]
+    clear_scroll.assert_called_once_with(
+        body={"scroll_id": ["scroll-0-2"]}, ignore=(404,)
+    )
+
+
+async def test_prefetched_pages_are_bounded_by_bytes() -> None:
+    produced = []
+    page = [{"_id": str(i), "_source": {"text": "x" * 100}} for i in range(10)]
+
+    async def pages() -> Any:
+        for i in range(20):
+            produced.append(i)
+            yield page
+
+    prefetched = _task_pages([pages()], 20, max_bytes=_page_bytes(page) * 2)
+    await prefetched.__anext__()
+    await asyncio.sleep(0.1)
+    # two pages buffered and a third one waiting for room
+    assert len(produced) <= 4
+
+    assert 19 == len([p async for p in prefetched])
+
+
+async def test_scan_stream() -> None:
+    def streamed(mock_response: Any) -> Any:
+        async def respond(body: Any, stream: bool, **kwargs: Any) -> Any:
+            async def chunks() -> Any:
+                yield json.dumps(mock_response(body, **kwargs)).encode("utf-8")
+
+            return AsyncStreamingResponse(chunks())
+
+        return respond
+
+    with patch.object(
+        AsyncOpenSearch, "search", AsyncMock(side_effect=streamed(mock_slice_search))
+    ), patch.object(
+        AsyncOpenSearch, "scroll", AsyncMock(side_effect=streamed(mock_slice_scroll))
+    ), patch.object(
+        AsyncOpenSearch, "clear_scroll", AsyncMock()
+    ):
+        hits = [
+            hit
+            async for hit in helpers.async_scan(
+                AsyncOpenSearch(), {"slice": {"id": 0, "max": 1}}, stream=True
+            )
+        ]
+
+    assert ["0-0", "0-1", "0-2", "0-3"] == [hit["_id"] for hit in hits]
@@ -0,0 +1,137 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+from _pytest.mark.structures import MarkDecorator
+from mock import AsyncMock, patch
+
+from opensearchpy import AsyncOpenSearch, TransportError, helpers
+
+pytestmark: MarkDecorator = pytest.mark.asyncio
+
+
+class RecordingBulk:
+    """Mock bulk api recording the documents of every request."""
+
+    def __init__(self, status: Any = lambda doc: 201) -> None:
+        self.status = status
+        self.calls: Any = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def bulk(self, body: Any, *args: Any, **kwargs: Any) -> Any:
+        docs = [json.loads(line) for line in body.splitlines()[1::2]]
+        self.calls.append([doc["x"] for doc in docs])
+        await self.release.wait()
+        return {
+            "errors": any(self.status(doc) != 201 for doc in docs),
+            "items": [{"index": {"status": self.status(doc)}} for doc in docs],
+        }
+
+
+async def test_flushes_on_count() -> None:
+    recorder = RecordingBulk()
+    succeeded: Any = []
+    with patch.object(AsyncOpenSearch, "bulk", AsyncMock(side_effect=recorder.bulk)):
+        async with helpers.AsyncBulkProcessor(
+            AsyncOpenSearch(),
+            chunk_size=2,
+            flush_interval=None,
+            on_success=succeeded.append,
+        ) as processor:
+            for x in range(5):
+                await processor.add({"x": x})
+            await processor.flush()
+            assert [[0, 1], [2, 3], [4]] == sorted(recorder.calls)
+
+    assert 5 == len(succeeded)
+    assert (5, 0) == (processor.succeeded, processor.failed)
+    with pytest.raises(RuntimeError):
+        await processor.add({"x": 5})
+
+
+async def test_flushes_on_interval() -> None:
+    recorder = RecordingBulk()
+    with patch.object(AsyncOpenSearch, "bulk", AsyncMock(side_effect=recorder.bulk)):
+        async with helpers.AsyncBulkProcessor(
+            AsyncOpenSearch(), flush_interval=0.05
+        ) as processor:
+            await processor.add({"x": 0})
+            await processor.add({"x": 1})
+            for _ in range(500):
+                if recorder.calls:
+                    break
+                await asyncio.sleep(0.01)
+            assert [[0, 1]] == recorder.calls
+
+
+async def test_failures_are_reported() -> None:
+    rejected: Any = set()
+
+    def status(doc: Any) -> int:
+        if doc["x"] == 0:
+            return 400
+        if doc["x"] % 2 and doc["x"] not in rejected:
+            rejected.add(doc["x"])
+            return 429
+        return 201
+
+    recorder = RecordingBulk(status)
+    failed: Any = []
+    with patch.object(AsyncOpenSearch, "bulk", AsyncMock(side_effect=recorder.bulk)):
+        async with helpers.AsyncBulkProcessor(
+            AsyncOpenSearch(),
+            flush_interval=None,
+            on_failure=failed.append,
+            max_retries=1,
+            initial_backoff=0,
+        ) as processor:
+            for x in range(4):
+                await processor.add({"x": x})
+
+    assert [[0, 1, 2, 3], [1, 3]] == recorder.calls
+    assert [{"index": {"status": 400, "data": {"x": 0}}}] == failed
+    assert (3, 1) == (processor.succeeded, processor.failed)
+
+    failed = []
+    with patch.object(
+        AsyncOpenSearch, "bulk", AsyncMock(side_effect=TransportError(500, "Error"))
+    ):
+        async with helpers.AsyncBulkProcessor(
+            AsyncOpenSearch(), flush_interval=None, on_failure=failed.append
+        ) as processor:
+            await processor.add({"x": 0})
+    assert 1 == len(failed)
+    assert isinstance(failed[0]["index"]["exception"], TransportError)
+
+
+async def test_add_waits_while_requests_are_in_flight() -> None:
+    recorder = RecordingBulk()
+    recorder.release.clear()
+    with patch.object(AsyncOpenSearch, "bulk", AsyncMock(side_effect=recorder.bulk)):
+        processor = helpers.AsyncBulkProcessor(
+            AsyncOpenSearch(), chunk_size=1, flush_interval=None, max_concurrency=1
+        )
+        await processor.add({"x": 0})
+        # sends the first chunk
+        await processor.add({"x": 1})
+        # waits for the first chunk to send the second one
+        adding = asyncio.ensure_future(processor.add({"x": 2}))
+        await asyncio.sleep(0.05)
+        assert not adding.done()
+        assert [[0]] == recorder.calls
+
+        recorder.release.set()
+        await adding
+        await processor.close()
+    assert [[0], [1], [2]] == recorder.calls
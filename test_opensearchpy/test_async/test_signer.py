@@ -41,6 +41,14 @@ class TestAsyncSigner:
         assert "X-Amz-Date" in headers
         assert "X-Amz-Security-Token" in headers
 
+    async def test_aws_signer_async_signs_streamed_bodies_as_unsigned(self) -> None:
+        from opensearchpy.helpers.asyncsigner import AWSV4SignerAsyncAuth
+
+        auth = AWSV4SignerAsyncAuth(self.mock_session(), "us-west-2")
+        headers = auth("POST", "http://localhost", body=iter([b"{}"]))
+        assert headers["X-Amz-Content-SHA256"] == "UNSIGNED-PAYLOAD"
+        assert "Authorization" in headers
+
     async def test_aws_signer_async_when_region_is_null(self) -> None:
         session = self.mock_session()
 
@@ -29,16 +29,27 @@ from __future__ import unicode_literals
 
 import asyncio
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import pytest
 from _pytest.mark.structures import MarkDecorator
-from mock import patch
+from mock import ANY, patch
 
 from opensearchpy import AIOHttpConnection, AsyncTransport
+from opensearchpy._async.streaming import AsyncStreamingResponse
+from opensearchpy._async.transport import _is_large
+from opensearchpy.cache import SearchCache
 from opensearchpy.connection import Connection
-from opensearchpy.connection_pool import DummyConnectionPool
-from opensearchpy.exceptions import ConnectionError, TransportError
+from opensearchpy.connection_pool import (
+    CircuitBreaker,
+    DummyConnectionPool,
+    LatencyAwareSelector,
+)
+from opensearchpy.exceptions import ConnectionError, ConnectionTimeout, TransportError
+from opensearchpy.metrics import MetricsEvents
+from opensearchpy.retry import RetryPolicy
 
 pytestmark: MarkDecorator = pytest.mark.asyncio
 
@@ -228,6 +239,50 @@ class TestTransport:
         assert 1 == len(t.get_connection().calls)
         assert ("GET", "/", None, body) == t.get_connection().calls[0][0]
 
+    async def test_streamed_body_is_passed_untouched_and_not_retried(self) -> None:
+        async def lines() -> Any:
+            yield b'{"index": {}}\n'
+
+        t: Any = AsyncTransport(
+            [{"exception": ConnectionError(None, "abandon ship", Exception())}],
+            connection_class=DummyConnection,
+            max_retries=2,
+        )
+        body = lines()
+        with pytest.raises(ConnectionError):
+            await t.perform_request("POST", "/_bulk", body=body)
+        assert [(("POST", "/_bulk", None, body), ANY)] == t.get_connection().calls
+
+    async def test_stream_returns_streaming_response(self) -> None:
+        async def chunks() -> Any:
+            yield b'{"_scroll_id": "s", "hits": {"hits": [{"_id"'
+            yield b': "1"}]}}'
+
+        t: Any = AsyncTransport([{"data": chunks()}], connection_class=DummyConnection)
+
+        resp = await t.perform_request("GET", "/_search", params={"stream": True})
+        assert isinstance(resp, AsyncStreamingResponse)
+        assert "s" == await resp.get("_scroll_id")
+        assert [{"_id": "1"}] == [hit async for hit in resp.hits()]
+        assert t.get_connection().calls[0][1]["stream"] is True
+
+    async def test_latency_aware_selector_avoids_slow_connection(self) -> None:
+        t: Any = AsyncTransport(
+            [{"delay": 0.05}, {}, {}],
+            connection_class=DummyConnection,
+            selector_class=LatencyAwareSelector,
+            randomize_hosts=False,
+        )
+        for _ in range(5):
+            await asyncio.gather(*(t.perform_request("GET", "/") for _ in range(6)))
+
+        slow = t.connection_pool.connections[0]
+        assert 0.05 == slow.delay
+        assert len(slow.calls) < 10
+        assert all(
+            stats[1] == 0 for stats in t.connection_pool.selector._stats.values()
+        )
+
     async def test_body_surrogates_replaced_encoded_into_bytes(self) -> None:
         t: Any = AsyncTransport([{}], connection_class=DummyConnection)
 
@@ -441,13 +496,24 @@ class TestTransport:
         assert isinstance(t.get_connection(), DummyConnection)
         t.last_sniff = event_loop.time() - 5.1
 
+        # requests don't sniff, the background task does
         await t.perform_request("GET", "/")
+        assert t.sniffing_task is None
+        t._sniffer_wakeup.set()
+        for _ in range(100):
+            if t.sniffing_task is not None:
+                break
+            await asyncio.sleep(0)
         await t.sniffing_task  # Need to wait for the sniffing task to complete
 
         assert 1 == len(t.connection_pool.connections)
         assert "http://1.1.1.1:123" == t.get_connection().host
         assert event_loop.time() - 1 < t.last_sniff < event_loop.time() + 0.01
 
+        sniffer_task = t._sniffer_task
+        await t.close()
+        assert sniffer_task.cancelled()
+
     async def test_sniff_7x_publish_host(self) -> None:
         """
         Test the response shaped when a 7.x node has publish_host set
@@ -606,3 +672,233 @@ class TestTransport:
             t.connection_pool.connections[0],
             AIOHttpConnection,
         )
+
+    async def test_slow_read_is_hedged_and_the_slow_request_cancelled(
+        self,
+    ) -> None:
+        t: Any = AsyncTransport(
+            [{"delay": 5, "data": '{"node": 1}'}, {"data": '{"node": 2}'}],
+            connection_class=DummyConnection,
+            randomize_hosts=False,
+            hedge_after=0.01,
+        )
+        await t._async_call()
+        slow, fast = t.connection_pool.connections
+
+        response = await asyncio.wait_for(t.perform_request("GET", "/_search"), 1)
+        assert {"node": 2} == response
+        assert 1 == len(fast.calls)
+        # the request to the slow connection was cancelled
+        await asyncio.sleep(0)
+        assert [asyncio.current_task()] == list(asyncio.all_tasks())
+        assert 0 == len(slow.calls)
+
+    async def test_writes_are_not_hedged(self) -> None:
+        t: Any = AsyncTransport(
+            [{"delay": 0.1, "data": '{"node": 1}'}, {"data": '{"node": 2}'}],
+            connection_class=DummyConnection,
+            randomize_hosts=False,
+            hedge_after=0.01,
+        )
+        await t._async_call()
+        slow, fast = t.connection_pool.connections
+
+        assert {"node": 1} == await t.perform_request("PUT", "/logs/_doc/1")
+        assert 0 == len(fast.calls)
+
+    async def test_identical_reads_share_one_request(self) -> None:
+        metrics = MetricsEvents()
+        t: Any = AsyncTransport(
+            [{"delay": 0.1, "data": '{"hits": {"hits": []}}'}],
+            connection_class=DummyConnection,
+            coalesce_requests=True,
+            metrics=metrics,
+        )
+        await t._async_call()
+
+        results = await asyncio.gather(
+            *[t.perform_request("GET", "/logs/_search") for _ in range(5)]
+        )
+
+        assert 1 == len(t.get_connection().calls)
+        assert 4 == metrics.coalesced_requests
+        assert [{"hits": {"hits": []}}] * 5 == results
+        assert results[0] is not results[1]
+        assert {} == t._in_flight
+
+    async def test_cancelled_caller_does_not_cancel_the_shared_request(
+        self,
+    ) -> None:
+        t: Any = AsyncTransport(
+            [{"delay": 0.1, "data": '{"node": 1}'}],
+            connection_class=DummyConnection,
+            coalesce_requests=True,
+        )
+        await t._async_call()
+
+        first = asyncio.ensure_future(t.perform_request("GET", "/logs/_doc/1"))
+        second = asyncio.ensure_future(t.perform_request("GET", "/logs/_doc/1"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert {"node": 1} == await second
+        assert 1 == len(t.get_connection().calls)
+
+    async def test_only_the_connection_that_failed_is_marked_dead(self) -> None:
+        t: Any = AsyncTransport(
+            [{"delay": 0.1, "exception": ConnectionError("N/A", "down")}, {}, {}, {}],
+            connection_class=DummyConnection,
+            randomize_hosts=False,
+            coalesce_requests=True,
+            max_retries=0,
+        )
+        await t._async_call()
+        failing = t.connection_pool.connections[0]
+
+        # every caller gets a connection of its own, the first one sends the
+        # read on the failing connection and the others wait for it
+        results = await asyncio.gather(
+            *[t.perform_request("GET", "/_search") for _ in range(4)],
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, ConnectionError) for result in results)
+        assert 1 == len(failing.calls)
+        assert 3 == len(t.connection_pool.connections)
+        assert failing not in t.connection_pool.connections
+
+    async def test_identical_searches_are_answered_from_the_cache(self) -> None:
+        cache = SearchCache()
+        t: Any = AsyncTransport(
+            [{"data": '{"hits": {"hits": []}}'}],
+            connection_class=DummyConnection,
+            search_cache=cache,
+        )
+        first = await t.perform_request("POST", "/logs/_search", body={"size": 1})
+        second = await t.perform_request("POST", "/logs/_search", body={"size": 1})
+        await t.perform_request("POST", "/logs/_doc", body={})
+        await t.perform_request("POST", "/logs/_search", body={"size": 1})
+
+        assert 3 == len(t.get_connection().calls)
+        assert first == second
+        assert first is not second
+        assert (1, 2) == (cache.hits, cache.misses)
+
+    async def test_failed_writes_invalidate_the_cache(self) -> None:
+        t: Any = AsyncTransport(
+            [{"data": "{}"}],
+            connection_class=DummyConnection,
+            search_cache=SearchCache(),
+            max_retries=0,
+        )
+        await t._async_call()
+        connection = t.get_connection()
+        await t.perform_request("GET", "/logs/_search")
+        # the write may have been applied even though it timed out
+        connection.exception = ConnectionTimeout("TIMEOUT", "timed out", None)
+        with pytest.raises(ConnectionTimeout):
+            await t.perform_request("PUT", "/logs/_doc/1", body={})
+        connection.exception = None
+        await t.perform_request("GET", "/logs/_search")
+
+        assert 3 == len(connection.calls)
+
+    async def test_circuit_breaker_is_probed_in_a_task(self) -> None:
+        class QuickBreaker(CircuitBreaker):
+            window = min_requests = 2
+            open_timeout = 0.05
+
+        t: Any = AsyncTransport(
+            [{"exception": TransportError(500, "internal error")}, {}],
+            connection_class=DummyConnection,
+            circuit_breaker_class=QuickBreaker,
+            randomize_hosts=False,
+            max_retries=0,
+        )
+        await t._async_call()
+        sick, healthy = t.connection_pool.connections
+        for _ in range(4):
+            try:
+                await t.perform_request("GET", "/")
+            except TransportError:
+                pass
+        assert [healthy] == t.connection_pool.connections
+
+        sick.exception = None
+        await asyncio.sleep(0.06)
+        await t.perform_request("GET", "/")
+        await asyncio.gather(*t._probe_tasks)
+
+        assert sick in t.connection_pool.connections
+        assert ("HEAD", "/") == sick.calls[-1][0]
+
+    @patch("opensearchpy._async.transport.asyncio.sleep")
+    async def test_retry_policy_backs_off_within_its_budget(self, sleep: Any) -> None:
+        policy = RetryPolicy(backoff=1, budget=0.1)
+        policy.tokens = 2.5
+        t: Any = AsyncTransport(
+            [{"exception": ConnectionError("N/A", "abandon ship", Exception())}],
+            connection_class=DummyConnection,
+            connection_pool_class=DummyConnectionPool,
+            max_retries=3,
+            retry_policy=policy,
+        )
+
+        with pytest.raises(ConnectionError):
+            await t.perform_request("GET", "/")
+        assert 3 == len(t.get_connection().calls)
+        assert 2 == sleep.call_count
+        assert (1, 2, 1) == (policy.requests, policy.retries, policy.throttled)
+
+    async def test_request_in_flight_is_cancelled_at_the_deadline(self) -> None:
+        t: Any = AsyncTransport(
+            [{"delay": 1}],
+            connection_class=DummyConnection,
+            connection_pool_class=DummyConnectionPool,
+            retry_on_timeout=True,
+        )
+
+        start = time.monotonic()
+        with pytest.raises(ConnectionTimeout):
+            await t.perform_request("GET", "/", params={"deadline": 0.05})
+        assert time.monotonic() - start < 0.5
+        # cancelled before it completed, and not retried
+        assert [] == t.get_connection().calls
+
+    async def test_large_bodies_are_processed_in_the_offload_executor(self) -> None:
+        class RecordingExecutor(ThreadPoolExecutor):
+            def submit(self, fn: Any, *args: Any, **kwargs: Any) -> Any:
+                calls.append(fn.__name__)
+                return super().submit(fn, *args, **kwargs)
+
+        calls: Any = []
+        executor = RecordingExecutor(max_workers=1)
+        t: Any = AsyncTransport(
+            [{"data": b"{}"}],
+            connection_class=DummyConnection,
+            offload_threshold=1000,
+            offload_executor=executor,
+        )
+        # the connections compress large bodies in the same executor
+        assert executor is t.kwargs["offload_executor"]
+
+        await t.perform_request("POST", "/_search", body={"size": 1})
+        assert [] == calls
+
+        body = {"query": {"terms": {"id": ["x" * 100] * 20}}}
+        await t.perform_request("POST", "/_search", body=body)
+        assert ["dumps_bytes"] == calls
+        args, _ = t.get_connection().calls[-1]
+        assert json.dumps(body, separators=(",", ":")).encode() == args[3]
+
+        large = {"hits": ["x" * 100] * 20}
+        t.get_connection().data = json.dumps(large).encode()
+        assert large == await t.perform_request("GET", "/_search")
+        assert ["dumps_bytes", "_deserialize"] == calls
+        executor.shutdown()
+
+    async def test_size_of_large_bodies_is_estimated(self) -> None:
+        assert not _is_large({"query": {"match": {"title": "x" * 10}}}, 100)
+        assert _is_large({"query": {"match": {"title": "x" * 100}}}, 100)
+        assert _is_large([{"a": 1}] * 2000, 10**9)
+        assert not _is_large([1, 2.5, None, True], 100)
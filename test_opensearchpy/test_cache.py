@@ -0,0 +1,139 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import time
+from typing import Any
+
+from opensearchpy.cache import SearchCache
+
+from .test_cases import TestCase
+
+HEADERS = {"content-type": "application/json"}
+
+
+class TestSearchCache(TestCase):
+    def put(self, cache: Any, key: Any, body: bytes = b"{}") -> None:
+        cache.put(key, cache.generation, HEADERS, body)
+
+    def test_key_is_canonical(self) -> None:
+        cache = SearchCache()
+        self.assertEqual(
+            cache.key("POST", "/a,b/_search", {"size": 1}, {"x": 1, "y": 2}, None),
+            cache.key("POST", "/b,a/_search", {"size": 1}, {"y": 2, "x": 1}, None),
+        )
+        self.assertNotEqual(
+            cache.key("POST", "/a/_search", None, {"x": 1}, None),
+            cache.key("POST", "/a/_search", None, {"x": 1}, {"authorization": "x"}),
+        )
+
+    def test_only_searches_are_cached(self) -> None:
+        cache = SearchCache()
+        self.assertIsNotNone(cache.key("GET", "/_search", None, None, None))
+        self.assertIsNotNone(cache.key("POST", "/_msearch", None, "{}\n{}\n", None))
+        self.assertIsNone(cache.key("POST", "/a/_doc", None, {}, None))
+        self.assertIsNone(cache.key("POST", "/a/_count", None, {}, None))
+        self.assertIsNone(cache.key("POST", "/a/_search", {"scroll": "1m"}, {}, None))
+
+    def test_hits_and_misses(self) -> None:
+        cache = SearchCache()
+        key = cache.key("GET", "/a/_search", None, None, None)
+        self.assertIsNone(cache.get(key))
+
+        self.put(cache, key, b'{"took": 1}')
+        self.assertEqual((HEADERS, b'{"took": 1}'), cache.get(key))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_responses_expire(self) -> None:
+        cache = SearchCache(ttl=0.01)
+        key = cache.key("GET", "/a/_search", None, None, None)
+        self.put(cache, key)
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(0, len(cache))
+
+    def test_least_recently_used_are_evicted(self) -> None:
+        cache = SearchCache(max_entries=2, max_bytes=10)
+        keys = [cache.key("GET", "/%d/_search" % i, None, None, None) for i in range(3)]
+        self.put(cache, keys[0])
+        self.put(cache, keys[1])
+        cache.get(keys[0])
+        self.put(cache, keys[2])
+        self.assertEqual(None, cache.get(keys[1]))
+
+        self.put(cache, keys[1], b"x" * 9)
+        self.assertEqual(1, len(cache))
+        self.assertEqual(9, cache.size)
+        self.assertEqual(3, cache.evictions)
+
+        # too large to be cached at all
+        self.put(cache, keys[2], b"x" * 11)
+        self.assertIsNone(cache.get(keys[2]))
+
+    def test_writes_invalidate_the_indices_they_target(self) -> None:
+        cache = SearchCache()
+        a = cache.key("GET", "/a/_search", None, None, None)
+        b = cache.key("GET", "/b/_search", None, None, None)
+        a_or_c = cache.key("GET", "/c,a/_search", None, None, None)
+        pattern = cache.key("GET", "/a*/_search", None, None, None)
+        for key in (a, b, a_or_c, pattern):
+            self.put(cache, key)
+
+        cache.request_completed("PUT", "/a/_doc/1")
+        self.assertEqual([b], list(cache._entries))
+
+        cache.request_completed("POST", "/_bulk")
+        self.assertEqual(0, len(cache))
+
+    def test_writes_to_other_indices_invalidate_everything(self) -> None:
+        cache = SearchCache()
+        a = cache.key("GET", "/a/_search", None, None, None)
+        b = cache.key("GET", "/b/_search", None, None, None)
+        for url in (
+            "/a/_bulk",
+            "/a/_update_by_query",
+            "/a/_delete_by_query",
+            "/_reindex",
+        ):
+            for key in (a, b):
+                self.put(cache, key)
+            # e.g. bulk actions with an _index other than a
+            cache.request_completed("POST", url)
+            self.assertEqual(0, len(cache), url)
+
+    def test_reads_do_not_invalidate(self) -> None:
+        cache = SearchCache()
+        key = cache.key("GET", "/a/_search", None, None, None)
+        self.put(cache, key)
+
+        cache.request_completed("GET", "/a/_doc/1")
+        cache.request_completed("POST", "/a/_count")
+        cache.request_completed("DELETE", "/_search/scroll")
+        self.assertEqual(1, len(cache))
+
+    def test_only_refreshes_invalidate_without_invalidate_on_write(self) -> None:
+        cache = SearchCache(invalidate_on_write=False)
+        key = cache.key("GET", "/a/_search", None, None, None)
+        self.put(cache, key)
+
+        cache.request_completed("PUT", "/a/_doc/1")
+        self.assertEqual(1, len(cache))
+        cache.request_completed("POST", "/a/_refresh")
+        self.assertEqual(0, len(cache))
+
+    def test_responses_of_searches_in_flight_during_a_write_are_not_stored(
+        self,
+    ) -> None:
+        cache = SearchCache()
+        key = cache.key("GET", "/a/_search", None, None, None)
+        generation = cache.generation
+        cache.request_completed("PUT", "/a/_doc/1")
+
+        cache.put(key, generation, HEADERS, b"{}")
+        self.assertEqual(0, len(cache))
@@ -27,6 +27,7 @@
 
 from __future__ import unicode_literals
 
+from io import BytesIO
 from typing import Any
 
 from opensearchpy.client.utils import _bulk_body, _escape, _make_path, query_params
@@ -93,7 +94,9 @@ class TestQueryParams(TestCase):
             ((), {"params": {"simple_param": b"x", "timeout": "4s"}, "headers": {}}),
         )
 
-        self.func_to_wrap(simple_param="x", timeout=4, ignore=5, request_timeout=6)
+        self.func_to_wrap(
+            simple_param="x", timeout=4, ignore=5, request_timeout=6, deadline=7
+        )
         self.assertEqual(
             self.calls[-1],
             (
@@ -104,6 +107,7 @@ class TestQueryParams(TestCase):
                         "timeout": 4,
                         "ignore": 5,
                         "request_timeout": 6,
+                        "deadline": 7,
                     },
                     "headers": {},
                 },
@@ -198,3 +202,7 @@ class TestBulkBody(TestCase):
             b'"{"index":{ "_index" : "test"}}\n{"field1": "value1"}"\n',
             _bulk_body(None, bytestring_body),
         )
+
+    def test_bulk_body_as_file_is_streamed(self) -> None:
+        file_body = BytesIO(b'{"index":{ "_index" : "test"}}\n{"field1": "value1"}\n')
+        self.assertIs(file_body, _bulk_body(None, file_body))
@@ -25,11 +25,16 @@
 #  under the License.
 
 
+import gzip
 import os
 import sys
 import warnings
+import zlib
 
-from opensearchpy.connection import Connection
+from opensearchpy.connection import Compression, Connection
+from opensearchpy.connection.compression import get_compression
+from opensearchpy.exceptions import ImproperlyConfigured
+from opensearchpy.metrics import MetricsEvents
 
 from ..test_cases import TestCase
 
@@ -211,3 +216,57 @@ class TestBaseConnection(TestCase):
         c.create_connection("testing", hosts=["opensearch.com"])
 
         assert c.get_connection("testing").transport.serializer is serializer.serializer
+
+
+class TestCompression(TestCase):
+    def test_algorithms(self) -> None:
+        body = b'{"index": {}}\n' * 100
+        self.assertEqual(body, gzip.decompress(Compression().compress(body)))  # type: ignore
+        self.assertEqual(
+            body, zlib.decompress(Compression("deflate").compress(body))  # type: ignore
+        )
+        self.assertEqual(9, Compression().level)
+        self.assertEqual(1, Compression("deflate", level=1).level)
+
+    def test_small_bodies_are_not_compressed(self) -> None:
+        compression = Compression(min_size=10)
+        self.assertIsNone(compression.compress(b"{}"))
+        self.assertIsNotNone(compression.compress(b"{}" * 5))
+
+    def test_invalid_algorithms(self) -> None:
+        with raises(ImproperlyConfigured):
+            Compression("brotli")
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            with raises(ImproperlyConfigured):
+                Compression("zstd")
+
+    def test_http_compress_values(self) -> None:
+        compression = Compression(level=1)
+        self.assertIsNone(get_compression(None))
+        self.assertIsNone(get_compression(False))
+        self.assertEqual("gzip", get_compression(True).algorithm)
+        self.assertEqual("deflate", get_compression("deflate").algorithm)
+        self.assertIs(compression, get_compression(compression))
+
+    def test_connection_compresses_bodies_and_reports_metrics(self) -> None:
+        metrics = MetricsEvents()
+        con = Connection(
+            http_compress=Compression("deflate", min_size=10), metrics=metrics
+        )
+        self.assertTrue(con.http_compress)
+
+        headers: dict = {}  # type: ignore
+        self.assertEqual(b"{}", con._compress(b"{}", headers))
+        self.assertEqual({}, headers)
+
+        body = b"{}" * 100
+        compressed = con._compress(body, headers)
+        self.assertEqual(body, zlib.decompress(compressed))
+        self.assertEqual({"content-encoding": "deflate"}, headers)
+        self.assertEqual(1, metrics.compressed_requests)
+        self.assertEqual(200, metrics.uncompressed_bytes)
+        self.assertEqual(len(compressed), metrics.compressed_bytes)
+        self.assertEqual(len(compressed) / 200, metrics.compression_ratio)
+        self.assertGreater(metrics.compression_time, 0)
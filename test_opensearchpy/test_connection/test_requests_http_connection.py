@@ -29,13 +29,14 @@ import json
 import re
 import uuid
 import warnings
+import zlib
 from typing import Any
 
 import pytest
 from mock import MagicMock, Mock, patch
 from requests.auth import AuthBase
 
-from opensearchpy.connection import Connection, RequestsHttpConnection
+from opensearchpy.connection import Compression, Connection, RequestsHttpConnection
 from opensearchpy.exceptions import (
     ConflictError,
     NotFoundError,
@@ -75,7 +76,7 @@ class TestRequestsHttpConnection(TestCase):
 
         status, _, data = connection.perform_request(*args, **kwargs)
         self.assertEqual(200, status)
-        self.assertEqual("{}", data)
+        self.assertEqual(b"{}", data)
 
         timeout = kwargs.pop("timeout", connection.timeout)
         args, kwargs = connection.session.send.call_args
@@ -132,6 +133,20 @@ class TestRequestsHttpConnection(TestCase):
         self.assertNotIn("content-encoding", req.headers)
         self.assertEqual(req.headers["accept-encoding"], "gzip,deflate")
 
+    def test_compression_policy(self) -> None:
+        con = self._get_mock_connection(
+            {"http_compress": Compression("deflate", min_size=100)}
+        )
+
+        con.perform_request("POST", "/_bulk", body=b"{}")
+        req = con.session.send.call_args[0][0]
+        self.assertNotIn("content-encoding", req.headers)
+
+        con.perform_request("POST", "/_bulk", body=b"{}\n" * 100)
+        req = con.session.send.call_args[0][0]
+        self.assertEqual(b"{}\n" * 100, zlib.decompress(req.body))
+        self.assertEqual("deflate", req.headers["content-encoding"])
+
     def test_uses_https_if_verify_certs_is_off(self) -> None:
         with warnings.catch_warnings(record=True) as w:
             con = self._get_mock_connection(
@@ -427,11 +442,11 @@ class TestRequestsHttpConnection(TestCase):
             tracer.info.call_args[0][0] % tracer.info.call_args[0][1:],
         )
 
-    def test_surrogatepass_into_bytes(self) -> None:
+    def test_body_returned_as_bytes(self) -> None:
         buf = b"\xe4\xbd\xa0\xe5\xa5\xbd\xed\xa9\xaa"
         con = self._get_mock_connection(response_body=buf)
         _, _, data = con.perform_request("GET", "/")
-        self.assertEqual(u"你好\uda6a", data)  # fmt: skip
+        self.assertEqual(buf, data)
 
     def test_recursion_error_reraised(self) -> None:
         conn = RequestsHttpConnection()
@@ -554,6 +569,38 @@ class TestRequestsConnectionRedirect(TestCase):
         self.assertEqual(data["headers"], expected_headers)
 
 
+class TestRequestsConnectionStream(TestCase):
+    server: TestHTTPServer
+
+    @classmethod
+    def setup_class(cls) -> None:
+        """Start server"""
+        cls.server = TestHTTPServer(port=8083)
+        cls.server.start()
+
+    @classmethod
+    def teardown_class(cls) -> None:
+        """Stop server"""
+        cls.server.stop()
+
+    def test_stream_yields_the_body_in_chunks(self) -> None:
+        conn = RequestsHttpConnection("localhost", port=8083)
+        status, _, chunks = conn.perform_request("GET", "/", stream=True)
+
+        self.assertEqual(200, status)
+        self.assertEqual("GET", json.loads(b"".join(chunks))["method"])
+
+    def test_streamed_body_is_sent_chunked(self) -> None:
+        conn = RequestsHttpConnection("localhost", port=8083, http_compress=True)
+        body = (line for line in (b'{"index": {}}\n', '{"title": "a"}\n'))
+        _, _, data = conn.perform_request("POST", "/_bulk", body=body)
+
+        data = json.loads(data)
+        self.assertEqual("chunked", data["headers"]["Transfer-Encoding"])
+        self.assertEqual("gzip", data["headers"]["Content-Encoding"])
+        self.assertEqual('{"index": {}}\n{"title": "a"}\n', data["body"])
+
+
 class TestSignerWithFrozenCredentials(TestRequestsHttpConnection):
     def mock_session(self) -> Any:
         access_key = uuid.uuid4().hex
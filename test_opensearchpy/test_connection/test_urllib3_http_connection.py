@@ -25,9 +25,12 @@
 #  under the License.
 
 
+import hashlib
+import json
 import ssl
 import uuid
 import warnings
+import zlib
 from gzip import GzipFile
 from io import BytesIO
 from platform import python_version
@@ -39,10 +42,11 @@ from mock import MagicMock, Mock, patch
 from urllib3._collections import HTTPHeaderDict
 
 from opensearchpy import __versionstr__
-from opensearchpy.connection import Connection, Urllib3HttpConnection
+from opensearchpy.connection import Compression, Connection, Urllib3HttpConnection
 from opensearchpy.exceptions import NotFoundError
 
 from ..test_cases import SkipTest, TestCase
+from ..test_http_server import TestHTTPServer
 
 
 class TestUrllib3HttpConnection(TestCase):
@@ -126,6 +130,22 @@ class TestUrllib3HttpConnection(TestCase):
         self.assertEqual(kwargs["headers"]["accept-encoding"], "gzip,deflate")
         self.assertNotIn("content-encoding", kwargs["headers"])
 
+    def test_compression_policy(self) -> None:
+        con = self._get_mock_connection(
+            {"http_compress": Compression("deflate", level=1, min_size=100)}
+        )
+
+        con.perform_request("POST", "/_bulk", body=b"{}")
+        (_, _, req_body), kwargs = con.pool.urlopen.call_args
+        self.assertEqual(b"{}", req_body)
+        self.assertNotIn("content-encoding", kwargs["headers"])
+
+        con.perform_request("POST", "/_bulk", body=b"{}\n" * 100)
+        (_, _, req_body), kwargs = con.pool.urlopen.call_args
+        self.assertEqual(b"{}\n" * 100, zlib.decompress(req_body))
+        self.assertEqual("deflate", kwargs["headers"]["content-encoding"])
+        self.assertEqual("gzip,deflate", kwargs["headers"]["accept-encoding"])
+
     def test_default_user_agent(self) -> None:
         con = Urllib3HttpConnection()
         self.assertEqual(
@@ -217,6 +237,20 @@ class TestUrllib3HttpConnection(TestCase):
         self.assertIn("X-Amz-Security-Token", headers)
         self.assertIn("X-Amz-Content-SHA256", headers)
 
+    def test_aws_signer_hashes_streamed_bodies_that_can_be_rewound(self) -> None:
+        from opensearchpy.helpers.signer import Urllib3AWSV4SignerAuth
+
+        auth = Urllib3AWSV4SignerAuth(self.mock_session(), "us-west-2")
+        body = BytesIO(b'{"a": 1}')
+        headers = auth("POST", "http://localhost", body)
+        self.assertEqual(
+            hashlib.sha256(b'{"a": 1}').hexdigest(), headers["X-Amz-Content-SHA256"]
+        )
+        self.assertEqual(0, body.tell())
+
+        headers = auth("POST", "http://localhost", iter([b'{"a": 1}']))
+        self.assertEqual("UNSIGNED-PAYLOAD", headers["X-Amz-Content-SHA256"])
+
     def test_aws_signer_when_region_is_null(self) -> None:
         session = self.mock_session()
 
@@ -381,11 +415,11 @@ class TestUrllib3HttpConnection(TestCase):
         self.assertEqual(logger.isEnabledFor.call_count, 1)
         self.assertEqual(logger.debug.call_count, 0)
 
-    def test_surrogatepass_into_bytes(self) -> None:
+    def test_body_returned_as_bytes(self) -> None:
         buf = b"\xe4\xbd\xa0\xe5\xa5\xbd\xed\xa9\xaa"
         con = self._get_mock_connection(response_body=buf)
         _, _, data = con.perform_request("GET", "/")
-        self.assertEqual(u"你好\uda6a", data)  # fmt: skip
+        self.assertEqual(buf, data)
 
     def test_recursion_error_reraised(self) -> None:
         conn = Urllib3HttpConnection()
@@ -400,6 +434,56 @@ class TestUrllib3HttpConnection(TestCase):
         self.assertEqual(str(e.value), "Wasn't modified!")
 
 
+class TestUrllib3ConnectionStream(TestCase):
+    server: TestHTTPServer
+
+    @classmethod
+    def setup_class(cls) -> None:
+        """Start server"""
+        cls.server = TestHTTPServer(port=8082)
+        cls.server.start()
+
+    @classmethod
+    def teardown_class(cls) -> None:
+        """Stop server"""
+        cls.server.stop()
+
+    def test_stream_yields_the_body_in_chunks(self) -> None:
+        conn = Urllib3HttpConnection("localhost", port=8082)
+        status, _, chunks = conn.perform_request("GET", "/", stream=True)
+
+        self.assertEqual(200, status)
+        self.assertEqual("GET", json.loads(b"".join(chunks))["method"])
+        self.assertEqual(1, conn.pool.num_connections)
+
+    def test_streamed_body_is_sent_chunked(self) -> None:
+        conn = Urllib3HttpConnection("localhost", port=8082)
+        body = (line for line in (b'{"index": {}}\n', '{"title": "a"}\n'))
+        _, _, data = conn.perform_request("POST", "/_bulk", body=body)
+
+        data = json.loads(data)
+        self.assertEqual("chunked", data["headers"]["Transfer-Encoding"])
+        self.assertEqual('{"index": {}}\n{"title": "a"}\n', data["body"])
+
+    def test_streamed_body_is_compressed(self) -> None:
+        conn = Urllib3HttpConnection("localhost", port=8082, http_compress=True)
+        body = BytesIO(b"a" * 200000)
+        _, _, data = conn.perform_request("POST", "/_bulk", body=body)
+
+        data = json.loads(data)
+        self.assertEqual("gzip", data["headers"]["Content-Encoding"])
+        self.assertEqual("a" * 200000, data["body"])
+
+    def test_stream_closed_early_doesnt_reuse_the_connection(self) -> None:
+        conn = Urllib3HttpConnection("localhost", port=8082)
+        _, _, chunks = conn.perform_request("GET", "/", stream=True)
+        chunks.close()
+
+        status, _, data = conn.perform_request("GET", "/")
+        self.assertEqual(200, status)
+        self.assertEqual("GET", json.loads(data)["method"])
+
+
 class TestSignerWithFrozenCredentials(TestUrllib3HttpConnection):
     def mock_session(self) -> Any:
         access_key = uuid.uuid4().hex
@@ -25,18 +25,24 @@
 #  under the License.
 
 
+import threading
 import time
 from typing import Any
 
 from opensearchpy.connection import Connection
 from opensearchpy.connection_pool import (
+    CircuitBreaker,
     ConnectionPool,
     DummyConnectionPool,
+    LatencyAwareSelector,
     RoundRobinSelector,
+    SnapshotConnectionPool,
 )
-from opensearchpy.exceptions import ImproperlyConfigured
+from opensearchpy.exceptions import ImproperlyConfigured, TransportError
+from opensearchpy.transport import Transport
 
 from .test_cases import TestCase
+from .test_transport import DummyConnection
 
 
 class TestConnectionPool(TestCase):
@@ -168,3 +174,328 @@ class TestConnectionPool(TestCase):
         self.assertEqual(3, pool.dead_count[42])
         pool.mark_live(42)
         self.assertNotIn(42, pool.dead_count)
+
+
+class TestSnapshotConnectionPool(TestCase):
+    def test_dead_nodes_are_removed_from_the_snapshot(self) -> None:
+        pool = SnapshotConnectionPool([(x, {}) for x in range(100)])
+        snapshot = pool.connections
+
+        now = time.time()
+        pool.mark_dead(42, now=now)
+        self.assertEqual(99, len(pool.connections))
+        self.assertNotIn(42, pool.connections)
+        self.assertEqual(100, len(snapshot))
+        self.assertEqual(now + 60, pool._next_resurrect)
+        self.assertEqual(1, pool.dead_count[42])
+
+    def test_connection_is_resurrected_after_its_timeout(self) -> None:
+        pool = SnapshotConnectionPool([(x, {}) for x in range(100)])
+
+        pool.mark_dead(42, now=time.time() - 61)
+        pool.get_connection()
+        self.assertEqual(42, pool.connections[-1])
+        self.assertEqual(100, len(pool.connections))
+        self.assertEqual(float("inf"), pool._next_resurrect)
+
+        # the fail count is only reset once it succeeds
+        pool.mark_live(42)
+        self.assertEqual({}, pool.dead_count)
+
+    def test_connection_is_forcibly_resurrected_when_no_live_ones_are_available(
+        self,
+    ) -> None:
+        pool = SnapshotConnectionPool([(x, {}) for x in range(2)])
+        pool.dead_count[0] = 1
+        pool.mark_dead(0)  # failed twice, longer timeout
+        pool.mark_dead(1)  # failed the first time, first to be resurrected
+
+        self.assertEqual((), pool.connections)
+        self.assertEqual(1, pool.get_connection())
+        self.assertEqual((1,), pool.connections)
+
+    def test_unknown_connection_is_not_marked_dead(self) -> None:
+        pool = SnapshotConnectionPool([(x, {}) for x in range(10)])
+        pool.mark_dead(42)
+        self.assertEqual(10, len(pool.connections))
+        self.assertEqual({}, pool.dead_count)
+
+    def test_concurrent_failures_and_resurrections(self) -> None:
+        pool = SnapshotConnectionPool([(x, {}) for x in range(10)], dead_timeout=0.001)
+
+        def run() -> None:
+            for i in range(2000):
+                connection = pool.get_connection()
+                if i % 7 == 0:
+                    pool.mark_dead(connection)
+                else:
+                    pool.mark_live(connection)
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        time.sleep(0.1)
+        while pool.resurrect() is not None:
+            pass
+        self.assertEqual(list(range(10)), sorted(pool.connections))
+
+
+class TestLatencyAwareSelector(TestCase):
+    def test_untried_connections_are_selected_first(self) -> None:
+        selector = LatencyAwareSelector({})
+        selector.request_started(1)
+        selector.request_finished(1, 0.01)
+
+        self.assertEqual(2, selector.select([1, 2]))
+
+    def test_slow_connection_gets_less_traffic(self) -> None:
+        pool = ConnectionPool(
+            [(x, {}) for x in range(3)], selector_class=LatencyAwareSelector
+        )
+        counts = {0: 0, 1: 0, 2: 0}
+        for _ in range(300):
+            connection = pool.get_connection()
+            counts[connection] += 1
+            pool.request_started(connection)
+            pool.request_finished(connection, 1.0 if connection == 0 else 0.01)
+
+        self.assertLess(counts[0], 10)
+
+    def test_connection_failing_fast_gets_less_traffic(self) -> None:
+        pool = ConnectionPool(
+            [(x, {}) for x in range(3)], selector_class=LatencyAwareSelector
+        )
+        counts = {0: 0, 1: 0, 2: 0}
+        for _ in range(300):
+            connection = pool.get_connection()
+            counts[connection] += 1
+            pool.request_started(connection)
+            if connection == 0:
+                pool.request_finished(connection, 0.001, True)
+            else:
+                pool.request_finished(connection, 0.01)
+
+        self.assertLess(counts[0], 10)
+
+    def test_requests_in_flight_add_to_the_cost(self) -> None:
+        selector = LatencyAwareSelector({})
+        for connection in (1, 2):
+            selector.request_started(connection)
+            selector.request_finished(connection, 0.1)
+        for _ in range(3):
+            selector.request_started(1)
+
+        self.assertEqual(2, selector.select([1, 2]))
+
+    def test_latency_of_idle_connection_decays(self) -> None:
+        class Selector(LatencyAwareSelector):
+            decay_time = 1.0
+
+        selector = Selector({})
+        for connection, latency in ((1, 1.0), (2, 0.1)):
+            selector.request_started(connection)
+            selector.request_finished(connection, latency)
+        self.assertEqual(2, selector.select([1, 2]))
+
+        now = time.monotonic()
+        selector._stats[1][2] = now - 5
+        selector._stats[2][2] = now
+        self.assertEqual(1, selector.select([1, 2]))
+
+    def test_statistics_of_unchanged_connections_are_taken_over(self) -> None:
+        previous = LatencyAwareSelector({})
+        for connection, latency in ((1, 1.0), (2, 0.1)):
+            previous.request_started(connection)
+            previous.request_finished(connection, latency)
+
+        selector = LatencyAwareSelector({2: {}, 3: {}})
+        selector.take_over(previous)
+        self.assertEqual([2], list(selector._stats))
+        self.assertEqual(0.1, selector._stats[2][0])
+        self.assertIsNot(previous._stats[2], selector._stats[2])
+
+    def test_transport_reports_requests(self) -> None:
+        t: Any = Transport(
+            [{}, {}],
+            connection_class=DummyConnection,
+            selector_class=LatencyAwareSelector,
+        )
+        t.perform_request("GET", "/")
+
+        stats = t.connection_pool.selector._stats
+        self.assertEqual(1, len(stats))
+        latency, in_flight, _ = list(stats.values())[0]
+        self.assertEqual(0, in_flight)
+        self.assertIsNotNone(latency)
+
+
+class QuickBreaker(CircuitBreaker):
+    window = 4
+    min_requests = 4
+    open_timeout = 0.05
+
+
+class TestCircuitBreaker(TestCase):
+    def test_opens_on_failure_ratio(self) -> None:
+        breaker = QuickBreaker()
+        for failed in (False, True, False):
+            self.assertFalse(breaker.record(0.01, failed))
+        self.assertTrue(breaker.record(0.01, True))
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+
+    def test_old_outcomes_leave_the_window(self) -> None:
+        breaker = QuickBreaker()
+        for failed in (True, False, False, False, True, False):
+            self.assertFalse(breaker.record(0.01, failed))
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+
+    def test_opens_on_slow_ratio(self) -> None:
+        class SlowBreaker(QuickBreaker):
+            slow_request_time = 1.0
+
+        breaker = SlowBreaker()
+        for duration in (0.1, 2.0, 0.1):
+            self.assertFalse(breaker.record(duration, False))
+        self.assertTrue(breaker.record(2.0, False))
+
+    def test_half_open_after_timeout(self) -> None:
+        breaker = QuickBreaker()
+        for _ in range(4):
+            breaker.record(0.01, True)
+
+        self.assertFalse(breaker.start_probing(time.monotonic()))
+        self.assertTrue(breaker.start_probing(time.monotonic() + 0.1))
+        self.assertEqual(CircuitBreaker.HALF_OPEN, breaker.state)
+        # only one caller probes
+        self.assertFalse(breaker.start_probing(time.monotonic() + 0.1))
+
+        breaker.probed(False)
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+        self.assertTrue(breaker.start_probing(time.monotonic() + 0.1))
+        breaker.probed(True)
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+        self.assertFalse(breaker.record(0.01, True))
+
+    def test_pool_takes_broken_connections_out(self) -> None:
+        for pool_class in (ConnectionPool, SnapshotConnectionPool):
+            pool = pool_class(
+                [(x, {}) for x in range(2)],
+                circuit_breaker_class=QuickBreaker,
+                randomize_hosts=False,
+            )
+            for _ in range(4):
+                pool.request_finished(0, 0.01, True)
+
+            self.assertEqual([1], list(pool.connections))
+            self.assertEqual([], pool.connections_to_probe())
+            time.sleep(0.06)
+            self.assertEqual([0], pool.connections_to_probe())
+
+            pool.probe_finished(0, True)
+            self.assertEqual([1, 0], list(pool.connections))
+
+    def test_probe_of_a_replaced_connection_is_ignored(self) -> None:
+        pool = ConnectionPool(
+            [(x, {}) for x in range(2)], circuit_breaker_class=QuickBreaker
+        )
+        # the probed connection was sniffed away and is not in this pool
+        pool.probe_finished(2, True)
+        self.assertEqual([0, 1], sorted(pool.connections))
+
+    def test_breakers_of_unchanged_connections_are_taken_over(self) -> None:
+        for pool_class in (ConnectionPool, SnapshotConnectionPool):
+            previous = pool_class(
+                [(x, {}) for x in range(2)], circuit_breaker_class=QuickBreaker
+            )
+            for _ in range(4):
+                previous.request_finished(0, 0.01, True)
+
+            pool = pool_class(
+                [(x, {}) for x in (0, 2)], circuit_breaker_class=QuickBreaker
+            )
+            pool.take_over(previous)
+            self.assertEqual([2], list(pool.connections))
+            self.assertIs(previous.breakers[0], pool.breakers[0])
+            time.sleep(0.06)
+            self.assertEqual([0], pool.connections_to_probe())
+
+    def test_sniffing_keeps_broken_connections_out(self) -> None:
+        t: Any = Transport(
+            [
+                {"exception": TransportError(500, "internal error")},
+                {"data": "{}"},
+            ],
+            connection_class=DummyConnection,
+            circuit_breaker_class=QuickBreaker,
+            randomize_hosts=False,
+            max_retries=0,
+        )
+        sick, healthy = t.connection_pool.connections
+        for _ in range(8):
+            try:
+                t.perform_request("GET", "/")
+            except TransportError:
+                pass
+        self.assertEqual([healthy], t.connection_pool.connections)
+
+        # a sniff finding the same nodes
+        previous = t.connection_pool
+        t.set_connections(t.hosts)
+        self.assertIsNot(previous, t.connection_pool)
+        self.assertEqual([healthy], t.connection_pool.connections)
+
+        # the probe started by the new pool closes the breaker
+        sick.exception = None
+        time.sleep(0.06)
+        t.perform_request("GET", "/")
+        for _ in range(100):
+            if sick in t.connection_pool.connections:
+                break
+            time.sleep(0.01)
+        self.assertIn(sick, t.connection_pool.connections)
+
+    def test_broken_connection_is_not_resurrected(self) -> None:
+        pool = ConnectionPool(
+            [(x, {}) for x in range(2)], circuit_breaker_class=QuickBreaker
+        )
+        pool.mark_dead(0, now=time.time() - 3600)
+        for _ in range(4):
+            pool.request_finished(0, 0.01, True)
+
+        self.assertIsNone(pool.resurrect())
+        self.assertEqual([1], list(pool.connections))
+
+    def test_transport_probes_broken_connections(self) -> None:
+        t: Any = Transport(
+            [
+                {"exception": TransportError(500, "internal error")},
+                {"data": "{}"},
+            ],
+            connection_class=DummyConnection,
+            circuit_breaker_class=QuickBreaker,
+            randomize_hosts=False,
+            max_retries=0,
+        )
+        sick, healthy = t.connection_pool.connections
+        for _ in range(8):
+            try:
+                t.perform_request("GET", "/")
+            except TransportError:
+                pass
+        self.assertEqual([healthy], t.connection_pool.connections)
+        self.assertEqual(4, len(sick.calls))
+
+        # the node recovers, the probe closes the breaker
+        sick.exception = None
+        time.sleep(0.06)
+        t.perform_request("GET", "/")
+        for _ in range(100):
+            if sick in t.connection_pool.connections:
+                break
+            time.sleep(0.01)
+
+        self.assertIn(sick, t.connection_pool.connections)
+        self.assertIn(("HEAD", "/"), [args for args, _ in sick.calls])
@@ -25,6 +25,7 @@
 #  under the License.
 
 
+import json
 import threading
 import time
 from typing import Any
@@ -33,8 +34,10 @@ from unittest.mock import Mock
 import mock
 import pytest
 
-from opensearchpy import OpenSearch, helpers
+from opensearchpy import OpenSearch, TransportError, helpers
+from opensearchpy.helpers.actions import _BulkRetryQueue, _page_bytes, _threaded_pages
 from opensearchpy.serializer import JSONSerializer
+from opensearchpy.streaming import StreamingResponse
 
 from ..test_cases import TestCase
 
@@ -85,9 +88,31 @@ class TestParallelBulk(TestCase):
 
         self.assertEqual(50, _bulk.call_count)
         _bulk.assert_called_with(
-            '{"index":{}}\n{"x":98}\n{"index":{}}\n{"x":99}\n', request_timeout=160
+            b'{"index":{}}\n{"x":98}\n{"index":{}}\n{"x":99}\n', request_timeout=160
         )
 
+    @mock.patch("opensearchpy.OpenSearch.bulk")
+    def test_extra_positional_arguments_are_passed_to_bulk(self, _bulk: Any) -> None:
+        _bulk.return_value = {"errors": False, "items": [{"index": {"status": 201}}]}
+        results = list(
+            helpers.parallel_bulk(
+                OpenSearch(),
+                [{"x": 1}],
+                4,
+                500,
+                100 * 1024 * 1024,
+                4,
+                helpers.expand_action,
+                True,
+                True,
+                (),
+                "logs",
+            )
+        )
+
+        self.assertEqual([True], [ok for ok, _ in results])
+        _bulk.assert_called_with(b'{"index":{}}\n{"x":1}\n', "logs")
+
     @mock.patch("opensearchpy.helpers.actions._process_bulk_chunk")
     def test_process_bulk_chunk_with_all_options(
         self, _process_bulk_chunk: Any
@@ -110,7 +135,7 @@ class TestParallelBulk(TestCase):
         self.assertEqual(50, _process_bulk_chunk.call_count)
         _process_bulk_chunk.assert_called_with(
             client,
-            ['{"index":{}}', '{"x":98}', '{"index":{}}', '{"x":99}'],
+            [b'{"index":{}}', b'{"x":98}', b'{"index":{}}', b'{"x":99}'],
             [({"index": {}}, {"x": 98}), ({"index": {}}, {"x": 99})],
             True,
             True,
@@ -133,6 +158,157 @@ class TestParallelBulk(TestCase):
         )
         self.assertTrue(len(set([r[1] for r in results])) > 1)
 
+    @mock.patch("opensearchpy.OpenSearch.bulk")
+    def test_rejected_documents_are_retried_after_fresh_chunks(
+        self, _bulk: Any
+    ) -> None:
+        sent = []
+
+        def bulk(body: Any, *args: Any, **kwargs: Any) -> Any:
+            docs = [json.loads(line)["x"] for line in body.splitlines()[1::2]]
+            sent.append(docs)
+            # reject the first document the first time only
+            status = 429 if docs == [0] and len(sent) == 1 else 201
+            return {
+                "errors": status != 201,
+                "items": [{"index": {"status": status}} for _ in docs],
+            }
+
+        _bulk.side_effect = bulk
+        results = list(
+            helpers.parallel_bulk(
+                OpenSearch(),
+                ({"x": i} for i in range(4)),
+                thread_count=1,
+                chunk_size=1,
+                max_retries=2,
+                initial_backoff=0.5,
+            )
+        )
+
+        self.assertEqual([[0], [1], [2], [3], [0]], sent)
+        self.assertEqual([True] * 4, [ok for ok, _ in results])
+
+    @mock.patch(
+        "opensearchpy.OpenSearch.bulk",
+        side_effect=lambda *args, **kwargs: {
+            "errors": True,
+            "items": [{"index": {"status": 429}}],
+        },
+    )
+    def test_documents_are_reported_once_out_of_retries(self, _bulk: Any) -> None:
+        results = list(
+            helpers.parallel_bulk(
+                OpenSearch(),
+                [{"x": 1}],
+                max_retries=2,
+                initial_backoff=0,
+                raise_on_error=False,
+            )
+        )
+
+        self.assertEqual(3, _bulk.call_count)
+        self.assertEqual([(False, {"index": {"status": 429}})], results)
+
+        with self.assertRaises(helpers.BulkIndexError) as e:
+            list(
+                helpers.parallel_bulk(
+                    OpenSearch(), [{"x": 1}], max_retries=1, initial_backoff=0
+                )
+            )
+        self.assertEqual(
+            [{"index": {"status": 429, "data": {"x": 1}}}], e.exception.errors
+        )
+
+    @mock.patch("opensearchpy.OpenSearch.bulk")
+    def test_rejected_requests_are_retried(self, _bulk: Any) -> None:
+        _bulk.side_effect = [
+            TransportError(429, "rejected"),
+            {
+                "errors": False,
+                "items": [{"index": {"status": 201}}, {"index": {"status": 201}}],
+            },
+        ]
+        results = list(
+            helpers.parallel_bulk(
+                OpenSearch(), [{"x": 1}, {"x": 2}], max_retries=1, initial_backoff=0
+            )
+        )
+
+        self.assertEqual(2, _bulk.call_count)
+        self.assertEqual([True, True], [ok for ok, _ in results])
+
+    def test_retry_queue_holds_fresh_chunks_above_max_retry_bytes(self) -> None:
+        retry_queue = _BulkRetryQueue(
+            10, 1000, max_retry_bytes=0, initial_backoff=0.1, max_backoff=1
+        )
+        chunks = retry_queue.chunks([([(1,)], [b"a"]), ([(2,)], [b"b"])])
+
+        self.assertEqual(([(1,)], [b"a"], None), next(chunks))
+        retry_queue.done([(1, (1,), [b"a"])])
+        self.assertEqual(2, retry_queue.size)
+
+        # the retry is due before the next fresh chunk is read
+        start = time.monotonic()
+        self.assertEqual(([(1,)], [b"a"], [1]), next(chunks))
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+        self.assertEqual(0, retry_queue.size)
+
+        retry_queue.done([])
+        self.assertEqual(([(2,)], [b"b"], None), next(chunks))
+        retry_queue.done([])
+        self.assertEqual([], list(chunks))
+
+
+def mock_process_bulk_response(body: Any, *args: Any, **kwargs: Any) -> Any:
+    # fail every document with an odd id
+    items = []
+    for line in body.splitlines()[::2]:
+        _id = int(json.loads(line)["index"]["_id"])
+        status = 400 if _id % 2 else 201
+        items.append({"index": {"_id": str(_id), "status": status}})
+    return {"errors": True, "items": items}
+
+
+class TestProcessParallelBulk(TestCase):
+    @mock.patch("opensearchpy.OpenSearch.bulk", side_effect=mock_process_bulk_response)
+    def test_results_are_reported_in_order(self, _bulk: Any) -> None:
+        actions = ({"_id": i, "x": i} for i in range(20))
+        results = list(
+            helpers.process_parallel_bulk(
+                OpenSearch(),
+                actions,
+                process_count=2,
+                chunk_size=3,
+                raise_on_error=False,
+                request_timeout=160,
+            )
+        )
+
+        self.assertEqual(7, _bulk.call_count)
+        _bulk.assert_called_with(
+            b'{"index":{"_id":18}}\n{"x":18}\n{"index":{"_id":19}}\n{"x":19}\n',
+            request_timeout=160,
+        )
+        self.assertEqual([i % 2 == 0 for i in range(20)], [ok for ok, _ in results])
+        self.assertEqual(
+            [str(i) for i in range(20)], [info["index"]["_id"] for _, info in results]
+        )
+
+    @mock.patch("opensearchpy.OpenSearch.bulk", side_effect=mock_process_bulk_response)
+    def test_failed_actions_are_expanded_for_errors(self, _bulk: Any) -> None:
+        actions = [{"_id": i, "x": i} for i in range(4)]
+        with self.assertRaises(helpers.BulkIndexError) as e:
+            list(helpers.process_parallel_bulk(OpenSearch(), actions, process_count=1))
+
+        self.assertEqual(
+            [
+                {"index": {"_id": "1", "status": 400, "data": {"x": 1}}},
+                {"index": {"_id": "3", "status": 400, "data": {"x": 3}}},
+            ],
+            e.exception.errors,
+        )
+
 
 class TestChunkActions(TestCase):
     def setup_method(self, _: Any) -> None:
@@ -266,10 +442,153 @@ class TestChunkActions(TestCase):
         )
         self.assertEqual(25, len(chunks))
         for _, chunk_actions in chunks:
-            chunk = u"".join(chunk_actions)  # fmt: skip
-            chunk = chunk if isinstance(chunk, str) else chunk.encode("utf-8")
+            chunk = b"\n".join(chunk_actions) + b"\n"
             self.assertLessEqual(len(chunk), max_byte_size)
 
+    def test_chunks_are_serialized_to_bytes(self) -> None:
+        actions = [({"index": {}}, {"name": "élevé"}), ('{"delete":{}}', None)]
+        ((_, chunk_actions),) = list(
+            helpers._chunk_actions(actions, 100, 99999999, JSONSerializer())
+        )
+        self.assertEqual(
+            [b'{"index":{}}', '{"name":"élevé"}'.encode("utf-8"), b'{"delete":{}}'],
+            chunk_actions,
+        )
+
+    def test_byte_size_accounts_for_multibyte_characters(self) -> None:
+        # each item is 30 characters but 38 bytes long, newlines included
+        actions = [({"index": {}}, {"x": "é" * 8}) for _ in range(4)]
+        chunks = list(helpers._chunk_actions(actions, 100, 64, JSONSerializer()))
+        self.assertEqual([1, 1, 1, 1], [len(data) for data, _ in chunks])
+
+
+class TestStreamingBulk(TestCase):
+    @mock.patch("opensearchpy.OpenSearch.bulk")
+    def test_retried_documents_are_not_serialized_again(self, _bulk: Any) -> None:
+        _bulk.side_effect = [
+            {
+                "errors": True,
+                "items": [
+                    {"index": {"status": 201}},
+                    {"index": {"status": 429, "error": "rejected"}},
+                ],
+            },
+            {"errors": False, "items": [{"index": {"status": 201}}]},
+        ]
+        serializer = Mock(wraps=JSONSerializer())
+        client = OpenSearch(serializer=serializer)
+        results = list(
+            helpers.streaming_bulk(
+                client,
+                [{"x": 1}, {"x": 2}],
+                max_retries=1,
+                initial_backoff=0,
+                raise_on_error=False,
+            )
+        )
+
+        self.assertEqual([True, True], [ok for ok, _ in results])
+        self.assertEqual(4, serializer.dumps_bytes.call_count)
+        _bulk.assert_called_with(b'{"index":{}}\n{"x":2}\n')
+
+    @mock.patch("opensearchpy.OpenSearch.bulk")
+    def test_extra_positional_arguments_are_passed_to_bulk(self, _bulk: Any) -> None:
+        _bulk.return_value = {"errors": False, "items": [{"index": {"status": 201}}]}
+        results = list(
+            helpers.streaming_bulk(
+                OpenSearch(),
+                [{"x": 1}],
+                500,
+                100 * 1024 * 1024,
+                True,
+                helpers.expand_action,
+                True,
+                0,
+                2,
+                600,
+                True,
+                (),
+                "logs",
+            )
+        )
+
+        self.assertEqual([True], [ok for ok, _ in results])
+        _bulk.assert_called_with(b'{"index":{}}\n{"x":1}\n', "logs")
+
+    @mock.patch("opensearchpy.OpenSearch.bulk")
+    def test_chunk_controller_adapts_chunk_size(self, _bulk: Any) -> None:
+        def bulk(body: Any, *args: Any, **kwargs: Any) -> Any:
+            count = body.count(b"\n") // 2
+            # reject everything in the first chunk
+            status = 429 if _bulk.call_count == 1 else 201
+            return {
+                "took": 1,
+                "errors": status != 201,
+                "items": [{"index": {"status": status}} for _ in range(count)],
+            }
+
+        _bulk.side_effect = bulk
+        controller = helpers.AdaptiveChunkController(
+            initial_chunk_size=8, min_chunk_size=1, chunk_size_step=2
+        )
+        results = list(
+            helpers.streaming_bulk(
+                OpenSearch(),
+                ({"x": i} for i in range(20)),
+                raise_on_error=False,
+                chunk_controller=controller,
+            )
+        )
+
+        self.assertEqual(20, len(results))
+        # 8 rejected, then chunks of 4, 6 and 2
+        self.assertEqual(
+            [8, 4, 6, 2],
+            [call[0][0].count(b"\n") // 2 for call in _bulk.call_args_list],
+        )
+        self.assertEqual(8, controller.rejected)
+
+    @mock.patch("opensearchpy.OpenSearch.bulk")
+    def test_chunk_controller_concurrency_is_bounded_by_threads(
+        self, _bulk: Any
+    ) -> None:
+        status = 201
+
+        def bulk(body: Any, *args: Any, **kwargs: Any) -> Any:
+            count = body.count(b"\n") // 2
+            return {
+                "took": 1,
+                "errors": status != 201,
+                "items": [{"index": {"status": status}} for _ in range(count)],
+            }
+
+        _bulk.side_effect = bulk
+        controller = helpers.AdaptiveChunkController(
+            initial_chunk_size=1, min_chunk_size=1, max_chunk_size=1
+        )
+        list(
+            helpers.parallel_bulk(
+                OpenSearch(),
+                ({"x": i} for i in range(100)),
+                thread_count=2,
+                chunk_controller=controller,
+            )
+        )
+        self.assertEqual((2, 2), (controller.max_concurrency, controller.concurrency))
+
+        # rejections cut the requests in flight, instead of an unbounded value
+        status = 429
+        list(
+            helpers.parallel_bulk(
+                OpenSearch(),
+                [{"x": 0}],
+                thread_count=2,
+                raise_on_error=False,
+                chunk_controller=controller,
+            )
+        )
+        self.assertEqual(1, controller.concurrency)
+
 
 class TestExpandActions(TestCase):
     def test_string_actions_are_marked_as_simple_inserts(self) -> None:
@@ -278,6 +597,31 @@ class TestExpandActions(TestCase):
         )
 
 
+def mock_slice_search(body: Any, **kwargs: Any) -> Any:
+    # two pages of two hits for every slice
+    slice_id = body["slice"]["id"]
+    if "pit" in body:
+        after = body.get("search_after", [0])[0]
+        if after == 4:
+            return {"hits": {"hits": []}}
+        hits = [
+            {"_id": "%d-%d" % (slice_id, after + i), "sort": [after + i + 1]}
+            for i in range(2)
+        ]
+        return {"pit_id": "pit", "hits": {"hits": hits}}
+    hits = [{"_id": "%d-%d" % (slice_id, i)} for i in range(2)]
+    return {"_scroll_id": "scroll-%d" % slice_id, "hits": {"hits": hits}}
+
+
+def mock_slice_scroll(body: Any, **kwargs: Any) -> Any:
+    scroll_id = body["scroll_id"]
+    slice_id = int(scroll_id.split("-")[1])
+    if scroll_id.count("-") == 2:
+        return {"_scroll_id": scroll_id, "hits": {"hits": []}}
+    hits = [{"_id": "%d-%d" % (slice_id, i)} for i in range(2, 4)]
+    return {"_scroll_id": scroll_id + "-2", "hits": {"hits": hits}}
+
+
 class TestScanFunction(TestCase):
     @mock.patch("opensearchpy.OpenSearch.clear_scroll")
     @mock.patch("opensearchpy.OpenSearch.scroll")
@@ -299,3 +643,245 @@ class TestScanFunction(TestCase):
         # The test should pass without raising a KeyError
         scan_result = list(helpers.scan(client, query={"query": {"match_all": {}}}))
         assert scan_result == [], "Expected empty results when 'hits' key is missing"
+
+    @mock.patch("opensearchpy.OpenSearch.clear_scroll")
+    @mock.patch("opensearchpy.OpenSearch.scroll", side_effect=mock_slice_scroll)
+    @mock.patch("opensearchpy.OpenSearch.search", side_effect=mock_slice_search)
+    def test_prefetch(
+        self, mock_search: Mock, mock_scroll: Mock, mock_clear_scroll: Mock
+    ) -> None:
+        hits = helpers.scan(OpenSearch(), {"slice": {"id": 0, "max": 1}}, prefetch=2)
+
+        self.assertEqual(["0-0", "0-1", "0-2", "0-3"], [hit["_id"] for hit in hits])
+        self.assertEqual(2, mock_scroll.call_count)
+        mock_clear_scroll.assert_called_once_with(
+            body={"scroll_id": ["scroll-0-2"]}, ignore=(404,)
+        )
+
+    @mock.patch("opensearchpy.OpenSearch.clear_scroll")
+    @mock.patch("opensearchpy.OpenSearch.scroll", side_effect=mock_slice_scroll)
+    @mock.patch("opensearchpy.OpenSearch.search", side_effect=mock_slice_search)
+    def test_prefetch_clears_scroll_when_closed_early(
+        self, mock_search: Mock, mock_scroll: Mock, mock_clear_scroll: Mock
+    ) -> None:
+        hits = helpers.scan(OpenSearch(), {"slice": {"id": 0, "max": 1}}, prefetch=1)
+        next(hits)
+        hits.close()
+
+        self.assertEqual(1, mock_clear_scroll.call_count)
+
+    @mock.patch("opensearchpy.OpenSearch.clear_scroll")
+    @mock.patch("opensearchpy.OpenSearch.scroll")
+    @mock.patch("opensearchpy.OpenSearch.search")
+    def test_stream(
+        self, mock_search: Mock, mock_scroll: Mock, mock_clear_scroll: Mock
+    ) -> None:
+        def streamed(mock_response: Any) -> Any:
+            def respond(body: Any, stream: bool, **kwargs: Any) -> Any:
+                resp = mock_response(body, **kwargs)
+                return StreamingResponse([json.dumps(resp).encode("utf-8")])
+
+            return respond
+
+        mock_search.side_effect = streamed(mock_slice_search)
+        mock_scroll.side_effect = streamed(mock_slice_scroll)
+
+        hits = helpers.scan(OpenSearch(), {"slice": {"id": 0, "max": 1}}, stream=True)
+
+        self.assertEqual(["0-0", "0-1", "0-2", "0-3"], [hit["_id"] for hit in hits])
+        self.assertTrue(mock_search.call_args[1]["stream"])
+        self.assertTrue(mock_scroll.call_args[1]["stream"])
+        mock_clear_scroll.assert_called_once_with(
+            body={"scroll_id": ["scroll-0-2"]}, ignore=(404,)
+        )
+
+        with self.assertRaises(ValueError):
+            next(helpers.scan(OpenSearch(), stream=True, prefetch=1))
+
+    def test_prefetched_pages_are_bounded_by_bytes(self) -> None:
+        produced = []
+        page = [{"_id": str(i), "_source": {"text": "x" * 100}} for i in range(10)]
+
+        def pages() -> Any:
+            for i in range(20):
+                produced.append(i)
+                yield page
+
+        max_bytes = _page_bytes(page) * 2
+        prefetched = _threaded_pages([pages()], 20, max_bytes=max_bytes)
+        next(prefetched)
+        time.sleep(0.2)
+        # two pages buffered and a third one waiting for room
+        self.assertLessEqual(len(produced), 4)
+
+        self.assertEqual(19, len(list(prefetched)))
+
+    def test_page_bytes(self) -> None:
+        page = [{"_id": str(i)} for i in range(100)]
+        # an approximation extrapolated from a sample of the hits
+        self.assertAlmostEqual(len(json.dumps(page)), _page_bytes(page), delta=50)
+        self.assertEqual(0, _page_bytes([]))
+
+
+class TestParallelScan(TestCase):
+    @mock.patch("opensearchpy.OpenSearch.clear_scroll")
+    @mock.patch("opensearchpy.OpenSearch.scroll", side_effect=mock_slice_scroll)
+    @mock.patch("opensearchpy.OpenSearch.search", side_effect=mock_slice_search)
+    def test_slices_are_scrolled_concurrently(
+        self, mock_search: Mock, mock_scroll: Mock, mock_clear_scroll: Mock
+    ) -> None:
+        hits = list(
+            helpers.parallel_scan(
+                OpenSearch(), {"query": {"match_all": {}}}, slices=3, index="i"
+            )
+        )
+
+        self.assertEqual(
+            sorted("%d-%d" % (s, i) for s in range(3) for i in range(4)),
+            sorted(hit["_id"] for hit in hits),
+        )
+        self.assertEqual(
+            [{"id": s, "max": 3} for s in range(3)],
+            sorted(
+                (c[1]["body"]["slice"] for c in mock_search.call_args_list),
+                key=lambda s: s["id"],
+            ),
+        )
+        self.assertEqual(
+            sorted([["scroll-%d-2" % s] for s in range(3)]),
+            sorted(c[1]["body"]["scroll_id"] for c in mock_clear_scroll.call_args_list),
+        )
+
+    @mock.patch("opensearchpy.OpenSearch.delete_pit")
+    @mock.patch("opensearchpy.OpenSearch.create_pit", return_value={"pit_id": "pit"})
+    @mock.patch("opensearchpy.OpenSearch.search", side_effect=mock_slice_search)
+    def test_slices_page_through_a_point_in_time(
+        self, mock_search: Mock, mock_create_pit: Mock, mock_delete_pit: Mock
+    ) -> None:
+        hits = list(
+            helpers.parallel_scan(
+                OpenSearch(),
+                {"sort": ["timestamp"]},
+                slices=2,
+                pit=True,
+                size=2,
+                index="i",
+            )
+        )
+
+        self.assertEqual(8, len(hits))
+        mock_create_pit.assert_called_once_with(index="i", keep_alive="5m")
+        mock_delete_pit.assert_called_once_with(body={"pit_id": ["pit"]}, ignore=(404,))
+        body = mock_search.call_args[1]["body"]
+        self.assertEqual(["timestamp", {"_id": "asc"}], body["sort"])
+        self.assertEqual({"id": "pit", "keep_alive": "5m"}, body["pit"])
+        self.assertNotIn("index", mock_search.call_args[1])
+
+    @mock.patch("opensearchpy.OpenSearch.clear_scroll")
+    @mock.patch("opensearchpy.OpenSearch.scroll")
+    @mock.patch("opensearchpy.OpenSearch.search", side_effect=mock_slice_search)
+    def test_failing_slice(
+        self, mock_search: Mock, mock_scroll: Mock, mock_clear_scroll: Mock
+    ) -> None:
+        def scroll(body: Any, **kwargs: Any) -> Any:
+            if body["scroll_id"] == "scroll-1":
+                raise TransportError(500, "boom")
+            return mock_slice_scroll(body, **kwargs)
+
+        mock_scroll.side_effect = scroll
+
+        with self.assertRaises(TransportError):
+            list(helpers.parallel_scan(OpenSearch(), slices=2))
+
+        mock_clear_scroll.reset_mock()
+        hits = list(helpers.parallel_scan(OpenSearch(), slices=2, raise_on_error=False))
+        self.assertEqual(
+            ["0-0", "0-1", "0-2", "0-3", "1-0", "1-1"],
+            sorted(hit["_id"] for hit in hits),
+        )
+        # the failed scroll is cleared as well
+        self.assertEqual(2, mock_clear_scroll.call_count)
+
+    @mock.patch("opensearchpy.OpenSearch.clear_scroll")
+    @mock.patch("opensearchpy.OpenSearch.scroll", side_effect=mock_slice_scroll)
+    @mock.patch("opensearchpy.OpenSearch.search", side_effect=mock_slice_search)
+    def test_cursors_are_cleared_when_closed_early(
+        self, mock_search: Mock, mock_scroll: Mock, mock_clear_scroll: Mock
+    ) -> None:
+        hits = helpers.parallel_scan(OpenSearch(), slices=4, queue_size=1)
+        next(hits)
+        hits.close()
+
+        self.assertEqual(4, mock_clear_scroll.call_count)
+
+
+def mock_pit_search(body: Any, **kwargs: Any) -> Any:
+    # three pages of two hits
+    after = body.get("search_after", [0])[0]
+    hits = [{"_id": str(i), "sort": [i]} for i in range(after + 1, min(after + 3, 7))]
+    return {"pit_id": "pit", "hits": {"hits": hits}}
+
+
+class TestPitScan(TestCase):
+    @mock.patch("opensearchpy.OpenSearch.delete_pit")
+    @mock.patch("opensearchpy.OpenSearch.create_pit", return_value={"pit_id": "pit"})
+    @mock.patch("opensearchpy.OpenSearch.search", side_effect=mock_pit_search)
+    def test_pages_through_the_point_in_time(
+        self, mock_search: Mock, mock_create_pit: Mock, mock_delete_pit: Mock
+    ) -> None:
+        hits = list(
+            helpers.pit_scan(
+                OpenSearch(),
+                {"query": {"match_all": {}}, "sort": [{"date": "desc"}]},
+                index="i",
+                size=2,
+                keep_alive="1m",
+            )
+        )
+
+        self.assertEqual(["1", "2", "3", "4", "5", "6"], [hit["_id"] for hit in hits])
+        mock_create_pit.assert_called_once_with(index="i", keep_alive="1m")
+        mock_delete_pit.assert_called_once_with(body={"pit_id": ["pit"]}, ignore=(404,))
+        self.assertEqual(4, mock_search.call_count)
+        mock_search.assert_called_with(
+            body={
+                "query": {"match_all": {}},
+                "sort": [{"date": "desc"}, {"_id": "asc"}],
+                "pit": {"id": "pit", "keep_alive": "1m"},
+                "search_after": [6],
+            },
+            size=2,
+            request_timeout=None,
+        )
+
+    @mock.patch("opensearchpy.OpenSearch.delete_pit")
+    @mock.patch("opensearchpy.OpenSearch.create_pit", return_value={"pit_id": "pit"})
+    @mock.patch("opensearchpy.OpenSearch.search", side_effect=mock_pit_search)
+    def test_next_page_is_prefetched(
+        self, mock_search: Mock, mock_create_pit: Mock, mock_delete_pit: Mock
+    ) -> None:
+        hits = helpers.pit_scan(OpenSearch(), index="i", size=2, prefetch=1)
+        next(hits)
+        # the second page is fetched while the first one is being consumed
+        for _ in range(50):
+            if mock_search.call_count >= 2:
+                break
+            time.sleep(0.01)
+        self.assertGreaterEqual(mock_search.call_count, 2)
+
+        hits.close()
+        mock_delete_pit.assert_called_once_with(body={"pit_id": ["pit"]}, ignore=(404,))
+
+    @mock.patch("opensearchpy.OpenSearch.delete_pit")
+    @mock.patch("opensearchpy.OpenSearch.create_pit", return_value={"pit_id": "pit"})
+    @mock.patch("opensearchpy.OpenSearch.search", side_effect=mock_pit_search)
+    def test_no_prefetch(
+        self, mock_search: Mock, mock_create_pit: Mock, mock_delete_pit: Mock
+    ) -> None:
+        hits = helpers.pit_scan(OpenSearch(), index="i", size=2, prefetch=0)
+        next(hits)
+        time.sleep(0.05)
+        self.assertEqual(1, mock_search.call_count)
+
+        hits.close()
+        mock_delete_pit.assert_called_once_with(body={"pit_id": ["pit"]}, ignore=(404,))
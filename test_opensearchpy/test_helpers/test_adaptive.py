@@ -0,0 +1,151 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import threading
+import time
+
+import pytest
+
+from opensearchpy.helpers import AdaptiveChunkController
+from opensearchpy.helpers.actions import _ActionChunker
+from opensearchpy.serializer import JSONSerializer
+
+
+def test_grows_additively_on_fast_responses() -> None:
+    controller = AdaptiveChunkController(
+        initial_chunk_size=100, chunk_size_step=50, max_concurrency=3
+    )
+    for _ in range(4):
+        controller.record(time.monotonic(), 100, took=10)
+
+    assert 300 == controller.chunk_size
+    # one more per round of `concurrency` responses: 1, then 2
+    assert 3 == controller.concurrency
+
+    for _ in range(10):
+        controller.record(time.monotonic(), 100, took=10)
+    assert 3 == controller.concurrency
+
+
+def test_rejections_shrink_chunk_size_and_concurrency() -> None:
+    controller = AdaptiveChunkController(initial_chunk_size=1000, initial_concurrency=4)
+    controller.record(time.monotonic(), 1000, rejected=5, took=10)
+
+    assert 500 == controller.chunk_size
+    assert 2 == controller.concurrency
+    assert 5 == controller.rejected
+
+
+def test_slow_took_only_shrinks_chunk_size() -> None:
+    controller = AdaptiveChunkController(
+        initial_chunk_size=1000, initial_concurrency=4, target_took=1.0
+    )
+    controller.record(time.monotonic(), 1000, took=1500)
+
+    assert 500 == controller.chunk_size
+    assert 4 == controller.concurrency
+
+
+def test_slow_round_trip_only_shrinks_concurrency() -> None:
+    controller = AdaptiveChunkController(
+        initial_chunk_size=1000, initial_concurrency=4, target_latency=5.0
+    )
+    controller.record(time.monotonic() - 6, 1000, took=10)
+
+    assert 1000 == controller.chunk_size
+    assert 2 == controller.concurrency
+
+
+def test_requests_sent_before_a_decrease_are_ignored() -> None:
+    controller = AdaptiveChunkController(initial_chunk_size=1000)
+    started = time.monotonic()
+    controller.record(started, 1000, rejected=1000)
+    controller.record(started, 1000, rejected=1000)
+    controller.record(started, 1000, took=10)
+
+    assert 500 == controller.chunk_size
+    assert 3 == controller.requests
+
+
+def test_chunk_size_is_bounded() -> None:
+    controller = AdaptiveChunkController(
+        initial_chunk_size=20, min_chunk_size=10, max_chunk_size=30
+    )
+    for _ in range(3):
+        controller.record(time.monotonic(), 1, rejected=1)
+    assert 10 == controller.chunk_size
+
+    for _ in range(3):
+        controller.record(time.monotonic(), 1, took=10)
+    assert 30 == controller.chunk_size
+
+
+def test_tolerates_rejected_ratio() -> None:
+    controller = AdaptiveChunkController(
+        initial_chunk_size=100, chunk_size_step=10, max_rejected_ratio=0.1
+    )
+    controller.record(time.monotonic(), 100, rejected=10)
+    assert 110 == controller.chunk_size
+
+    controller.record(time.monotonic(), 100, rejected=11)
+    assert 55 == controller.chunk_size
+
+
+def test_record_response_counts_rejected_items() -> None:
+    controller = AdaptiveChunkController(initial_chunk_size=100)
+    controller.record_response(
+        time.monotonic(),
+        3,
+        {
+            "took": 5,
+            "errors": True,
+            "items": [
+                {"index": {"status": 201}},
+                {"index": {"status": 429}},
+                {"delete": {"status": 429}},
+            ],
+        },
+    )
+
+    assert 2 == controller.rejected
+    assert 50 == controller.chunk_size
+
+
+def test_acquire_blocks_above_concurrency() -> None:
+    controller = AdaptiveChunkController(initial_concurrency=1)
+    controller.acquire()
+    acquired = threading.Event()
+
+    def acquire() -> None:
+        controller.acquire()
+        acquired.set()
+
+    t = threading.Thread(target=acquire)
+    t.start()
+    assert not acquired.wait(0.1)
+
+    controller.release()
+    assert acquired.wait(1)
+    t.join()
+
+
+def test_invalid_decrease_factor() -> None:
+    with pytest.raises(ValueError):
+        AdaptiveChunkController(decrease_factor=1)
+
+
+def test_chunker_follows_the_controller() -> None:
+    controller = AdaptiveChunkController(initial_chunk_size=10, min_chunk_size=2)
+    chunker = _ActionChunker(10, 10000, JSONSerializer(), controller)
+    for i in range(2):
+        assert chunker.feed({"index": {}}, {"i": i}) is None
+
+    controller.chunk_size = 2
+    bulk_data, _ = chunker.feed({"index": {}}, {"i": 2})
+    assert 2 == len(bulk_data)
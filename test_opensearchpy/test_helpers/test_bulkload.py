@@ -0,0 +1,129 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import os
+import shutil
+import tempfile
+from typing import Any
+
+import mock
+import pytest
+
+from opensearchpy import OpenSearch, helpers
+from opensearchpy.helpers.bulkload import _file_chunks, main
+
+from ..test_cases import TestCase
+
+ACTIONS = (
+    b'{"index": {"_index": "movies", "_id": "1"}}\n'
+    b'{"title": "Moneyball"}\n'
+    b'{"delete": {"_index": "movies", "_id": "2"}}\n'
+    b'{"update": {"_index": "movies", "_id": "3"}}\n'
+    b'{"doc": {"year": 2011}}\n'
+    b"\n"
+)
+
+
+def bulk_response(items: int, failed: Any = ()) -> Any:
+    return {
+        "errors": bool(failed),
+        "items": [
+            (
+                {
+                    "index": {
+                        "status": 400,
+                        "error": {"type": "mapper_parsing_exception"},
+                    }
+                }
+                if i in failed
+                else {"index": {"status": 201}}
+            )
+            for i in range(items)
+        ],
+    }
+
+
+class TestBulkLoad(TestCase):
+    def setup_method(self, _: Any) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "actions.ndjson")
+        with open(self.path, "wb") as f:
+            f.write(ACTIONS)
+
+    def teardown_method(self, _: Any) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_chunks_hold_whole_actions(self) -> None:
+        chunks = [
+            (start, end, [(data.offset, len(data)) for data in bulk_data])
+            for start, end, bulk_data in _file_chunks(ACTIONS, 0, 2, 1000)
+        ]
+        self.assertEqual([(0, 111, [(0, 2), (67, 1)]), (112, 180, [(112, 2)])], chunks)
+
+        # at least an action per chunk, however large
+        chunks = list(_file_chunks(ACTIONS, 0, 500, 10))
+        self.assertEqual(3, len(chunks))
+
+    def test_invalid_action_line(self) -> None:
+        with pytest.raises(ValueError) as e:
+            list(_file_chunks(b'{"title": "Moneyball"}\n', 0, 500, 1000))
+        self.assertEqual("Line at offset 0 is not a bulk action", str(e.value))
+
+    @mock.patch("opensearchpy.OpenSearch.bulk")
+    def test_file_is_sent_as_is(self, bulk: Any) -> None:
+        bulk.side_effect = lambda body: bulk_response(body.count(b'": {"_index"'))
+        checkpoints: Any = []
+
+        results = list(
+            helpers.bulk_load(
+                OpenSearch(),
+                self.path,
+                chunk_size=2,
+                checkpoint=checkpoints.append,
+            )
+        )
+        self.assertEqual([True] * 3, [ok for ok, _ in results])
+        self.assertEqual(
+            [ACTIONS[:112], ACTIONS[112:181]], sorted(c[1][0] for c in bulk.mock_calls)
+        )
+        self.assertEqual([112, 181], checkpoints)
+
+        # resuming from a checkpoint
+        bulk.reset_mock()
+        list(helpers.bulk_load(OpenSearch(), self.path, offset=112))
+        self.assertEqual([ACTIONS[112:181]], sorted(c[1][0] for c in bulk.mock_calls))
+
+    @mock.patch("opensearchpy.OpenSearch.bulk")
+    def test_failures_are_reported_with_their_offset(self, bulk: Any) -> None:
+        bulk.side_effect = lambda *_: bulk_response(3, failed=(2,))
+
+        results = list(helpers.bulk_load(OpenSearch(), self.path, raise_on_error=False))
+        self.assertEqual([True, True, False], [ok for ok, _ in results])
+        failure = results[2][1]["index"]
+        self.assertEqual(112, failure["offset"])
+        self.assertEqual({"doc": {"year": 2011}}, failure["data"])
+
+        with pytest.raises(helpers.BulkIndexError) as e:
+            list(helpers.bulk_load(OpenSearch(), self.path))
+        self.assertEqual(112, e.value.errors[0]["index"]["offset"])
+
+    @mock.patch("opensearchpy.OpenSearch.bulk")
+    def test_command_line_resumes_from_the_checkpoint(self, bulk: Any) -> None:
+        bulk.side_effect = lambda *_: bulk_response(1)
+        checkpoint = os.path.join(self.directory, "checkpoint")
+        with open(checkpoint, "w") as f:
+            f.write("112\n")
+
+        self.assertEqual(0, main([self.path, "--checkpoint", checkpoint]))
+        self.assertEqual([ACTIONS[112:181]], sorted(c[1][0] for c in bulk.mock_calls))
+        with open(checkpoint) as f:
+            self.assertEqual("181", f.read().strip())
+
+        bulk.side_effect = lambda *_: bulk_response(3, failed=(0,))
+        self.assertEqual(1, main([self.path]))
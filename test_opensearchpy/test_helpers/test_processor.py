@@ -0,0 +1,144 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import json
+import threading
+import time
+from typing import Any
+
+import mock
+import pytest
+
+from opensearchpy import OpenSearch, TransportError, helpers
+
+from ..test_cases import TestCase
+
+
+def bulk_response(body: Any, status: Any = lambda doc: 201) -> Any:
+    docs = [json.loads(line) for line in body.splitlines()[1::2]]
+    return {
+        "errors": any(status(doc) != 201 for doc in docs),
+        "items": [{"index": {"status": status(doc)}} for doc in docs],
+    }
+
+
+def sent(bulk: Any) -> Any:
+    """documents of every bulk request, in the order they were sent"""
+    return sorted(
+        [json.loads(line)["x"] for line in c[1][0].splitlines()[1::2]]
+        for c in bulk.mock_calls
+    )
+
+
+class TestBulkProcessor(TestCase):
+    @mock.patch("opensearchpy.OpenSearch.bulk")
+    def test_flushes_on_count_and_bytes(self, bulk: Any) -> None:
+        bulk.side_effect = lambda body, **_: bulk_response(body)
+        succeeded: Any = []
+
+        with helpers.BulkProcessor(
+            OpenSearch(), chunk_size=2, flush_interval=None, on_success=succeeded.append
+        ) as processor:
+            for x in range(5):
+                processor.add({"x": x})
+            processor.flush()
+            self.assertEqual([[0, 1], [2, 3], [4]], sent(bulk))
+        self.assertEqual(5, len(succeeded))
+        self.assertEqual((5, 0), (processor.succeeded, processor.failed))
+
+        # an action line and its document take 33 bytes
+        bulk.reset_mock()
+        with helpers.BulkProcessor(
+            OpenSearch(), max_chunk_bytes=32, flush_interval=None
+        ) as processor:
+            for x in range(3):
+                processor.add({"_index": "i", "x": x})
+        self.assertEqual([[0], [1], [2]], sent(bulk))
+
+    @mock.patch("opensearchpy.OpenSearch.bulk")
+    def test_flushes_on_interval(self, bulk: Any) -> None:
+        bulk.side_effect = lambda body, **_: bulk_response(body)
+
+        with helpers.BulkProcessor(OpenSearch(), flush_interval=0.05) as processor:
+            processor.add({"x": 0})
+            processor.add({"x": 1})
+            deadline = time.monotonic() + 5
+            while not bulk.called and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual([[0, 1]], sent(bulk))
+
+    @mock.patch("opensearchpy.OpenSearch.bulk")
+    def test_failures_are_reported(self, bulk: Any) -> None:
+        # rejects the odd documents the first time
+        rejected: Any = set()
+
+        def status(doc: Any) -> int:
+            if doc["x"] == 0:
+                return 400
+            if doc["x"] % 2 and doc["x"] not in rejected:
+                rejected.add(doc["x"])
+                return 429
+            return 201
+
+        bulk.side_effect = lambda body, **_: bulk_response(body, status)
+        failed: Any = []
+
+        with helpers.BulkProcessor(
+            OpenSearch(),
+            flush_interval=None,
+            on_failure=failed.append,
+            max_retries=1,
+            initial_backoff=0,
+            refresh=True,
+        ) as processor:
+            for x in range(4):
+                processor.add({"x": x})
+        self.assertEqual([[0, 1, 2, 3], [1, 3]], sent(bulk))
+        self.assertEqual({"refresh": True}, bulk.mock_calls[0][2])
+        self.assertEqual([{"index": {"status": 400, "data": {"x": 0}}}], failed)
+        self.assertEqual((3, 1), (processor.succeeded, processor.failed))
+
+        bulk.side_effect = TransportError(500, "Error")
+        failed = []
+        with helpers.BulkProcessor(
+            OpenSearch(), flush_interval=None, on_failure=failed.append
+        ) as processor:
+            processor.add({"x": 0})
+        self.assertEqual(1, len(failed))
+        self.assertIsInstance(failed[0]["index"]["exception"], TransportError)
+
+    @mock.patch("opensearchpy.OpenSearch.bulk")
+    def test_add_blocks_while_requests_are_in_flight(self, bulk: Any) -> None:
+        release = threading.Event()
+
+        def blocking_bulk(body: Any, **_: Any) -> Any:
+            release.wait()
+            return bulk_response(body)
+
+        bulk.side_effect = blocking_bulk
+
+        processor = helpers.BulkProcessor(
+            OpenSearch(), chunk_size=1, flush_interval=None, max_concurrency=1
+        )
+        processor.add({"x": 0})
+        # sends the first chunk
+        processor.add({"x": 1})
+        # waits for the first chunk to send the second one
+        adding = threading.Thread(target=processor.add, args=({"x": 2},))
+        adding.start()
+        adding.join(0.1)
+        self.assertTrue(adding.is_alive())
+
+        release.set()
+        adding.join()
+        processor.close()
+        self.assertEqual([[0], [1], [2]], sent(bulk))
+
+        with pytest.raises(RuntimeError):
+            processor.add({"x": 3})
@@ -551,6 +551,42 @@ def test_delete_by_query(mock_client: Any) -> None:
     )
 
 
+def test_iterate(mock_client: Any) -> None:
+    mock_client.create_pit.return_value = {"pit_id": "pit"}
+    s = search.Search(using="mock", index="i").query("match", lang="java")
+    hits = list(s.sort("name").iterate(prefetch=0))
+
+    assert ["opensearch", "42", "47", "53"] == [hit.meta.id for hit in hits]
+    mock_client.create_pit.assert_called_once_with(index=["i"], keep_alive="5m")
+    mock_client.search.assert_called_once_with(
+        body={
+            "query": {"match": {"lang": "java"}},
+            "sort": ["name", {"_id": "asc"}],
+            "pit": {"id": "pit", "keep_alive": "5m"},
+        },
+        size=1000,
+        request_timeout=None,
+    )
+    mock_client.delete_pit.assert_called_once_with(
+        body={"pit_id": ["pit"]}, ignore=(404,)
+    )
+
+
+def test_scan_prefetch(mock_client: Any) -> None:
+    mock_client.search.return_value = {
+        "_scroll_id": "scroll",
+        "hits": {"hits": [{"_id": "1", "_source": {}}]},
+    }
+    mock_client.scroll.return_value = {"_scroll_id": "scroll", "hits": {"hits": []}}
+    s = search.Search(using="mock", index="i").params(size=10)
+    hits = list(s.scan(prefetch=2))
+
+    assert ["1"] == [hit.meta.id for hit in hits]
+    mock_client.clear_scroll.assert_called_once_with(
+        body={"scroll_id": ["scroll"]}, ignore=(404,)
+    )
+
+
 def test_update_from_dict() -> None:
     s = search.Search()
     s.update_from_dict({"indices_boost": [{"important-documents": 2}]})
@@ -7,6 +7,7 @@
 # Modifications Copyright OpenSearch Contributors. See
 # GitHub history for details.
 
+import gzip
 import json
 import threading
 from http.server import BaseHTTPRequestHandler, HTTPServer
@@ -42,6 +43,38 @@ class TestHTTPRequestHandler(BaseHTTPRequestHandler):
         data = {"method": "GET", "headers": capitalized_headers}
         self.wfile.write(json.dumps(data).encode("utf-8"))
 
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """
+        writes back the headers and the body of the request, reading chunked
+        bodies and decompressing gzip encoded ones
+        """
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            body = b""
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                chunk = self.rfile.read(size + 2)[:size]
+                if not size:
+                    break
+                body += chunk
+        else:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+
+        self.send_response(200)
+        self.send_header("Content-type", "application/json")
+        self.end_headers()
+
+        data = {
+            "method": "POST",
+            "headers": {
+                "-".join([word.title() for word in header.split("-")]): value
+                for header, value in self.headers.items()
+            },
+            "body": body.decode("utf-8"),
+        }
+        self.wfile.write(json.dumps(data).encode("utf-8"))
+
 
 class TestHTTPServer(HTTPServer):
     __test__ = False
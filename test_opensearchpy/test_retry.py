@@ -0,0 +1,45 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+from opensearchpy.retry import RetryPolicy
+
+from .test_cases import TestCase
+
+
+class TestRetryPolicy(TestCase):
+    def test_backoff_is_jittered_and_capped(self) -> None:
+        policy = RetryPolicy(backoff=0.1, max_backoff=1.0)
+        for retry, limit in ((0, 0.1), (1, 0.2), (3, 0.8), (4, 1.0), (1000, 1.0)):
+            times = [policy.backoff_time(retry) for _ in range(50)]
+            self.assertTrue(all(0 <= t <= limit for t in times))
+            self.assertGreater(len(set(times)), 1)
+
+    def test_retries_are_limited_by_the_budget(self) -> None:
+        policy = RetryPolicy(budget=0.5)
+        policy.tokens = 0
+        policy.request_started()
+        self.assertFalse(policy.acquire())
+        policy.request_started()
+        self.assertTrue(policy.acquire())
+        self.assertEqual((2, 1, 1), (policy.requests, policy.retries, policy.throttled))
+
+    def test_tokens_are_capped(self) -> None:
+        policy = RetryPolicy(budget=1)
+        for _ in range(100):
+            policy.request_started()
+        self.assertEqual(policy.max_tokens, policy.tokens)
+
+    def test_retries_are_not_limited_without_budget(self) -> None:
+        policy = RetryPolicy(budget=None)
+        self.assertTrue(all(policy.acquire() for _ in range(100)))
+        self.assertEqual(0, policy.throttled)
+
+    def test_invalid_arguments(self) -> None:
+        self.assertRaises(ValueError, RetryPolicy, backoff=-1)
+        self.assertRaises(ValueError, RetryPolicy, budget=-0.1)
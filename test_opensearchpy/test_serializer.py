@@ -29,6 +29,7 @@ import sys
 import uuid
 from datetime import datetime
 from decimal import Decimal
+from enum import Enum
 from typing import Any
 
 try:
@@ -37,12 +38,23 @@ try:
 except ImportError:
     np = pd = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from opensearchpy.exceptions import ImproperlyConfigured, SerializationError
 from opensearchpy.serializer import (
     DEFAULT_SERIALIZERS,
+    JSON_BACKENDS,
     Deserializer,
+    JSONBackend,
     JSONSerializer,
+    OrjsonBackend,
+    StdlibJSONBackend,
     TextSerializer,
+    get_json_backend,
+    register_json_backend,
 )
 
 from .test_cases import SkipTest, TestCase
@@ -53,6 +65,11 @@ def requires_numpy_and_pandas() -> None:
         raise SkipTest("Test requires numpy or pandas to be available")
 
 
+def requires_orjson() -> None:
+    if orjson is None:
+        raise SkipTest("Test requires orjson to be available")
+
+
 class TestJSONSerializer(TestCase):
     def test_datetime_serialization(self) -> None:
         self.assertEqual(
@@ -200,6 +217,130 @@ class TestJSONSerializer(TestCase):
     def test_strings_are_left_untouched(self) -> None:
         self.assertEqual("你好", JSONSerializer().dumps("你好"))
 
+    def test_dumps_bytes(self) -> None:
+        self.assertEqual(
+            '{"d":"你好"}'.encode("utf-8"), JSONSerializer().dumps_bytes({"d": "你好"})
+        )
+        self.assertEqual(b"raw", JSONSerializer().dumps_bytes(b"raw"))
+        self.assertRaises(SerializationError, JSONSerializer().dumps_bytes, object())
+
+    def test_dumps_bytes_respects_custom_dumps(self) -> None:
+        class UpperSerializer(JSONSerializer):
+            def dumps(self, data: Any) -> Any:
+                return JSONSerializer.dumps(self, data).upper()
+
+        self.assertEqual(b'{"A":1}', UpperSerializer().dumps_bytes({"a": 1}))
+
+    def test_loads_bytes(self) -> None:
+        self.assertEqual(
+            {"d": "你好\uda6a"},
+            JSONSerializer().loads_bytes(
+                b'{"d": "\xe4\xbd\xa0\xe5\xa5\xbd\xed\xa9\xaa"}'
+            ),
+        )
+        self.assertRaises(SerializationError, JSONSerializer().loads_bytes, b"{{")
+
+    def test_loads_bytes_respects_custom_loads(self) -> None:
+        class StrSerializer(JSONSerializer):
+            def loads(self, s: Any) -> Any:
+                assert isinstance(s, str)
+                return JSONSerializer.loads(self, s)
+
+        self.assertEqual({"a": 1}, StrSerializer().loads_bytes(b'{"a": 1}'))
+
+
+class TestJSONBackends(TestCase):
+    def test_default_backend_is_stdlib(self) -> None:
+        self.assertIsInstance(JSONSerializer().backend, StdlibJSONBackend)
+
+    def test_unknown_backend_raises_improperly_configured(self) -> None:
+        self.assertRaises(ImproperlyConfigured, JSONSerializer, backend="nope")
+
+    def test_backend_instance_is_used_as_is(self) -> None:
+        backend = StdlibJSONBackend()
+        self.assertIs(backend, JSONSerializer(backend=backend).backend)
+
+    def test_auto_skips_unavailable_backends(self) -> None:
+        class MissingBackend(JSONBackend):
+            def __init__(self) -> None:
+                raise ImportError()
+
+        register_json_backend("missing", MissingBackend, preferred=True)
+        try:
+            self.assertEqual("missing", list(JSON_BACKENDS)[0])
+            self.assertNotIsInstance(get_json_backend("auto"), MissingBackend)
+            self.assertRaises(ImproperlyConfigured, get_json_backend, "missing")
+        finally:
+            del JSON_BACKENDS["missing"]
+
+    def test_orjson_output_matches_stdlib(self) -> None:
+        requires_orjson()
+
+        data = {
+            "d": datetime(2010, 10, 1, 2, 30, 0, 123),
+            "u": uuid.UUID("00000000-0000-0000-0000-000000000003"),
+            "dec": Decimal("3.8"),
+            "s": "你好",
+            "n": [1, 2.5, None, True],
+            1: "int key",
+        }
+        self.assertEqual(
+            JSONSerializer().dumps(data), JSONSerializer(backend="orjson").dumps(data)
+        )
+
+    def test_orjson_output_differences(self) -> None:
+        requires_orjson()
+
+        class Color(Enum):
+            RED = "red"
+
+        ser = JSONSerializer(backend="orjson")
+        # exponents are formatted differently but parse to the same floats
+        self.assertEqual('{"f":[1e16,1e-7]}', ser.dumps({"f": [1e16, 1e-7]}))
+        self.assertEqual(
+            JSONSerializer().loads(JSONSerializer().dumps({"f": [1e16, 1e-7]})),
+            ser.loads(ser.dumps({"f": [1e16, 1e-7]})),
+        )
+        self.assertEqual('{"c":"red"}', ser.dumps({"c": Color.RED}))
+        self.assertRaises(SerializationError, JSONSerializer().dumps, {"c": Color.RED})
+
+    def test_orjson_uses_serializer_default(self) -> None:
+        requires_orjson()
+
+        class SetSerializer(JSONSerializer):
+            def default(self, data: Any) -> Any:
+                if isinstance(data, set):
+                    return sorted(data)
+                return JSONSerializer.default(self, data)
+
+        self.assertEqual(
+            '{"s":[1,2]}', SetSerializer(backend="orjson").dumps({"s": {2, 1}})
+        )
+
+    def test_orjson_falls_back_to_stdlib(self) -> None:
+        requires_orjson()
+
+        ser = JSONSerializer(backend="orjson")
+        self.assertEqual('{"i":%d}' % 2**70, ser.dumps({"i": 2**70}))
+        self.assertEqual({"s": "\ud800"}, ser.loads('{"s":"\\ud800"}'))
+        self.assertRaises(SerializationError, ser.dumps, object())
+        self.assertRaises(SerializationError, ser.loads, "{{")
+
+    def test_orjson_loads_bytes(self) -> None:
+        requires_orjson()
+
+        self.assertEqual(
+            {"some": "datá"},
+            OrjsonBackend().loads('{"some":"datá"}'.encode("utf-8")),
+        )
+
+    def test_orjson_dumps_bytes(self) -> None:
+        requires_orjson()
+
+        ser = JSONSerializer(backend="orjson")
+        self.assertEqual(b'{"n":[1,null]}', ser.dumps_bytes({"n": [1, None]}))
+        self.assertEqual(b'{"s":"\xed\xa0\x80"}', ser.dumps_bytes({"s": "\ud800"}))
+
 
 class TestTextSerializer(TestCase):
     def test_strings_are_left_untouched(self) -> None:
@@ -216,6 +357,13 @@ class TestDeserializer(TestCase):
     def test_deserializes_json_by_default(self) -> None:
         self.assertEqual({"some": "data"}, self.de.loads('{"some":"data"}'))
 
+    def test_deserializes_bytes(self) -> None:
+        self.assertEqual({"some": "data"}, self.de.loads(b'{"some":"data"}'))
+        self.assertEqual(
+            "你好\uda6a",
+            self.de.loads(b"\xe4\xbd\xa0\xe5\xa5\xbd\xed\xa9\xaa", "text/plain"),
+        )
+
     def test_deserializes_text_with_correct_ct(self) -> None:
         self.assertEqual(
             '{"some":"data"}', self.de.loads('{"some":"data"}', "text/plain")
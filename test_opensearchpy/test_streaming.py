@@ -0,0 +1,127 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# The OpenSearch Contributors require contributions made to
+# this file be licensed under the Apache-2.0 license or a
+# compatible open source license.
+#
+# Modifications Copyright OpenSearch Contributors. See
+# GitHub history for details.
+
+import json
+from typing import Any
+
+from opensearchpy.exceptions import SerializationError
+from opensearchpy.streaming import HitsParser, StreamingResponse
+
+from .test_cases import TestCase
+
+RESPONSE = {
+    "_scroll_id": "scroll",
+    "took": 12,
+    "timed_out": False,
+    "_shards": {"total": 2, "successful": 2, "skipped": 0, "failed": 0},
+    "hits": {
+        "total": {"value": 20, "relation": "eq"},
+        "max_score": 1.0,
+        "hits": [
+            {"_id": str(i), "_source": {"title": "你好 %d" % i, "score": i * 1.5}}
+            for i in range(20)
+        ],
+    },
+    "aggregations": {"max_score": {"value": 28.5}},
+}
+
+
+def chunked(data: Any, size: int) -> Any:
+    raw = json.dumps(data, ensure_ascii=False, indent=1).encode("utf-8")
+    return [raw[i : i + size] for i in range(0, len(raw), size)]
+
+
+class TestHitsParser(TestCase):
+    def test_events(self) -> None:
+        parser = HitsParser()
+        parser.feed(b'{"took": 1, "hits": {"total": 1, "hits": [{"_id": "1"}]}}')
+        parser.feed_eof()
+
+        events = []
+        while True:
+            event = parser.next_event()
+            events.append(event)
+            if event == ("end",):
+                break
+
+        self.assertEqual(
+            [
+                ("field", "took", 1),
+                ("hits_field", "total", 1),
+                ("hits_start",),
+                ("hit", {"_id": "1"}),
+                ("hits_end",),
+                ("end",),
+            ],
+            events,
+        )
+
+    def test_waits_for_numbers_split_across_chunks(self) -> None:
+        parser = HitsParser()
+        parser.feed(b'{"took": 12')
+        self.assertIsNone(parser.next_event())
+
+        parser.feed(b'34, "max_score": 1.')
+        self.assertEqual(("field", "took", 1234), parser.next_event())
+        self.assertIsNone(parser.next_event())
+
+        parser.feed(b"5}")
+        self.assertEqual(("field", "max_score", 1.5), parser.next_event())
+
+    def test_invalid_bodies(self) -> None:
+        for body in (
+            b'{"took": 1',
+            b'{"took": 1}}',
+            b"[1]",
+            b'{"took" 1}',
+            b'{"hits": {"hits": [1 2]}}',
+        ):
+            response = StreamingResponse([body])
+            self.assertRaises(SerializationError, response.read)
+
+
+class TestStreamingResponse(TestCase):
+    def test_hits_are_parsed_one_at_a_time(self) -> None:
+        for size in (1, 3, 64, 100000):
+            response = StreamingResponse(chunked(RESPONSE, size))
+            self.assertEqual("scroll", response["_scroll_id"])
+            self.assertEqual(RESPONSE["hits"]["hits"], list(response.hits()))
+            self.assertEqual(RESPONSE["aggregations"], response["aggregations"])
+
+    def test_fields_after_hits_are_read_once_hits_are_consumed(self) -> None:
+        response = StreamingResponse(chunked(RESPONSE, 64))
+
+        self.assertNotIn("aggregations", response)
+        self.assertEqual({"value": 20, "relation": "eq"}, response["hits"]["total"])
+        self.assertEqual(20, len(list(response.hits())))
+        self.assertIn("aggregations", response)
+
+    def test_hits_can_only_be_read_once(self) -> None:
+        response = StreamingResponse(chunked(RESPONSE, 64))
+        list(response.hits())
+        with self.assertRaises(ValueError):
+            list(response.hits())
+
+    def test_read(self) -> None:
+        self.assertEqual(RESPONSE, StreamingResponse(chunked(RESPONSE, 7)).read())
+        self.assertEqual({}, StreamingResponse([b""]).read())
+
+    def test_close_releases_the_body(self) -> None:
+        closed = []
+
+        def chunks() -> Any:
+            try:
+                for chunk in chunked(RESPONSE, 16):
+                    yield chunk
+            finally:
+                closed.append(True)
+
+        with StreamingResponse(chunks()) as response:
+            next(response.hits())
+        self.assertEqual([True], closed)
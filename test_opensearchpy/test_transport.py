@@ -27,16 +27,28 @@
 
 from __future__ import unicode_literals
 
+import itertools
 import json
+import threading
 import time
+from io import BytesIO
 from typing import Any
 
 from mock import patch
 
+from opensearchpy.cache import SearchCache
 from opensearchpy.connection import Connection
-from opensearchpy.connection_pool import DummyConnectionPool
-from opensearchpy.exceptions import ConnectionError, TransportError
-from opensearchpy.transport import Transport, get_host_info
+from opensearchpy.connection_pool import ConnectionSelector, DummyConnectionPool
+from opensearchpy.exceptions import ConnectionError, ConnectionTimeout, TransportError
+from opensearchpy.metrics import MetricsEvents
+from opensearchpy.retry import RetryPolicy
+from opensearchpy.streaming import StreamingResponse
+from opensearchpy.transport import (
+    Transport,
+    _Hedging,
+    _is_idempotent_read,
+    get_host_info,
+)
 
 from .test_cases import TestCase
 
@@ -46,15 +58,21 @@ class DummyConnection(Connection):
         self.exception = kwargs.pop("exception", None)
         self.status, self.data = kwargs.pop("status", 200), kwargs.pop("data", "{}")
         self.headers = kwargs.pop("headers", {})
+        self.delay = kwargs.pop("delay", 0)
         self.calls: Any = []
         super(DummyConnection, self).__init__(**kwargs)
 
     def perform_request(self, *args: Any, **kwargs: Any) -> Any:
+        if self.delay:
+            time.sleep(self.delay)
         self.calls.append((args, kwargs))
         if self.exception:
             raise self.exception
         return self.status, self.headers, self.data
 
+    def close(self) -> None:
+        pass
+
 
 CLUSTER_NODES = """{
   "_nodes" : {
@@ -235,6 +253,79 @@ class TestTransport(TestCase):
             t.get_connection().calls[0][0],
         )
 
+    def test_streamed_body_is_passed_untouched(self) -> None:
+        t: Any = Transport(
+            [{}], send_get_body_as="source", connection_class=DummyConnection
+        )
+
+        body = iter([b'{"index": "a"}\n', b"{}\n"])
+        t.perform_request("GET", "/_msearch", body=body)
+        self.assertEqual(
+            ("POST", "/_msearch", None, body), t.get_connection().calls[0][0]
+        )
+
+    def test_streamed_body_is_only_retried_if_it_can_be_rewound(self) -> None:
+        bodies = []
+
+        class ReadingConnection(DummyConnection):
+            def perform_request(self, *args: Any, **kwargs: Any) -> Any:
+                bodies.append(args[3].read())
+                return super(ReadingConnection, self).perform_request(*args, **kwargs)
+
+        t: Any = Transport(
+            [{"exception": ConnectionError(None, "abandon ship", Exception())}],
+            connection_class=ReadingConnection,
+            max_retries=2,
+        )
+        body = BytesIO(b"abc")
+        with self.assertRaises(ConnectionError):
+            t.perform_request("POST", "/_bulk", body=body)
+        self.assertEqual([b"abc"] * 3, bodies)
+
+        t = Transport(
+            [{"exception": ConnectionError(None, "abandon ship", Exception())}],
+            connection_class=DummyConnection,
+            max_retries=2,
+        )
+        with self.assertRaises(ConnectionError):
+            t.perform_request("POST", "/_bulk", body=iter([b"abc"]))
+        self.assertEqual(1, len(t.get_connection().calls))
+
+    def test_stream_returns_streaming_response(self) -> None:
+        t: Any = Transport(
+            [{"data": [b'{"hits": {"hits": [{"_id"', b': "1"}]}}']}],
+            connection_class=DummyConnection,
+        )
+
+        resp = t.perform_request("GET", "/_search", params={"stream": True})
+        self.assertIsInstance(resp, StreamingResponse)
+        self.assertEqual([{"_id": "1"}], list(resp.hits()))
+        self.assertEqual(
+            {"timeout": None, "ignore": (), "headers": None, "stream": True},
+            t.get_connection().calls[0][1],
+        )
+        self.assertEqual({}, t.get_connection().calls[0][0][2])
+
+    def test_stream_of_non_json_response_is_deserialized(self) -> None:
+        t: Any = Transport(
+            [{"data": [b"green ", b"open"], "headers": {"content-type": "text/plain"}}],
+            connection_class=DummyConnection,
+        )
+
+        self.assertEqual(
+            "green open", t.perform_request("GET", "/", params={"stream": True})
+        )
+
+    def test_bytes_body_is_deserialized(self) -> None:
+        t: Any = Transport(
+            [{"data": '{"answer": "你好"}'.encode("utf-8")}],
+            connection_class=DummyConnection,
+        )
+        self.assertEqual({"answer": "你好"}, t.perform_request("GET", "/"))
+
+        t = Transport([{"data": b""}], connection_class=DummyConnection)
+        self.assertEqual("", t.perform_request("GET", "/"))
+
     def test_kwargs_passed_on_to_connections(self) -> None:
         t: Any = Transport([{"host": "google.com"}], port=123)
         self.assertEqual(1, len(t.connection_pool.connections))
@@ -398,10 +489,49 @@ class TestTransport(TestCase):
         self.assertIsInstance(t.get_connection(), DummyConnection)
         t.last_sniff = time.time() - 5.1
 
+        # requests don't sniff, the background thread does
         t.perform_request("GET", "/")
+        self.assertIsInstance(t.get_connection(), DummyConnection)
+        t._sniffer_wakeup.set()
+        for _ in range(100):
+            if t.get_connection().host == "http://1.1.1.1:123":
+                break
+            time.sleep(0.01)
+
         self.assertEqual(1, len(t.connection_pool.connections))
         self.assertEqual("http://1.1.1.1:123", t.get_connection().host)
         self.assertTrue(time.time() - 1 < t.last_sniff < time.time() + 0.01)
+        t.close()
+
+    def test_sniffer_failure_is_retried_after_sniffer_timeout(self) -> None:
+        t: Any = Transport(
+            [{"exception": ConnectionError("N/A", "abandon ship", Exception())}],
+            connection_class=DummyConnection,
+            sniffer_timeout=5,
+        )
+        t.last_sniff = time.time() - 5.1
+        t._sniffer_wakeup.set()
+        for _ in range(100):
+            if t.last_sniff > time.time() - 1:
+                break
+            time.sleep(0.01)
+
+        self.assertTrue(time.time() - 1 < t.last_sniff < time.time() + 0.01)
+        self.assertTrue(t._sniffer.is_alive())
+        t.close()
+
+    def test_close_stops_the_sniffer(self) -> None:
+        t: Any = Transport(
+            [{"data": CLUSTER_NODES}],
+            connection_class=DummyConnection,
+            sniffer_timeout=5,
+        )
+        sniffer = t._sniffer
+        self.assertTrue(sniffer.is_alive())
+
+        t.close()
+        sniffer.join(1)
+        self.assertFalse(sniffer.is_alive())
 
     def test_sniff_7x_publish_host(self) -> None:
         # Test the response shaped when a 7.x node has publish_host set
@@ -417,3 +547,451 @@ class TestTransport(TestCase):
             t.connection_pool.connection_opts[0][1],
             {"host": "somehost.tld", "port": 123},
         )
+
+
+class TestRetryPolicy(TestCase):
+    def failing_transport(self, policy: Any) -> Any:
+        return Transport(
+            [{"exception": ConnectionError("N/A", "abandon ship", Exception())}],
+            connection_class=DummyConnection,
+            connection_pool_class=DummyConnectionPool,
+            max_retries=3,
+            retry_policy=policy,
+        )
+
+    @patch("opensearchpy.transport.time.sleep")
+    def test_retries_are_delayed_by_the_backoff(self, sleep: Any) -> None:
+        t = self.failing_transport(RetryPolicy(backoff=1, max_backoff=2, budget=None))
+
+        self.assertRaises(ConnectionError, t.perform_request, "GET", "/")
+        self.assertEqual(4, len(t.get_connection().calls))
+        delays = [call[0][0] for call in sleep.call_args_list]
+        self.assertEqual(3, len(delays))
+        self.assertTrue(all(0 <= d <= limit for d, limit in zip(delays, (1, 2, 2))))
+
+    @patch("opensearchpy.transport.time.sleep")
+    def test_failures_are_raised_once_the_budget_is_spent(self, sleep: Any) -> None:
+        policy = RetryPolicy(budget=0.1)
+        policy.tokens = 1.5
+        t = self.failing_transport(policy)
+
+        self.assertRaises(ConnectionError, t.perform_request, "GET", "/")
+        self.assertEqual(2, len(t.get_connection().calls))
+        self.assertEqual((1, 1, 1), (policy.requests, policy.retries, policy.throttled))
+
+    def test_successful_requests_are_not_retried(self) -> None:
+        policy = RetryPolicy()
+        t: Any = Transport([{}], connection_class=DummyConnection, retry_policy=policy)
+
+        t.perform_request("GET", "/")
+        self.assertEqual((1, 0), (policy.requests, policy.retries))
+
+
+class TestDeadline(TestCase):
+    def test_attempts_are_sent_with_the_time_left(self) -> None:
+        t: Any = Transport([{}], connection_class=DummyConnection, deadline=5)
+
+        t.perform_request("GET", "/", params={"request_timeout": 2})
+        t.perform_request("GET", "/", params={"deadline": 1})
+        t.perform_request("GET", "/")
+        timeouts = [kwargs["timeout"] for _, kwargs in t.get_connection().calls]
+        self.assertEqual(2, timeouts[0])
+        self.assertTrue(0.9 < timeouts[1] <= 1)
+        # the default timeout of the connection is longer than the deadline
+        self.assertTrue(4.9 < timeouts[2] <= 5)
+
+    def test_failures_are_not_retried_past_the_deadline(self) -> None:
+        t: Any = Transport(
+            [
+                {
+                    "exception": ConnectionError("N/A", "abandon ship", Exception()),
+                    "delay": 0.05,
+                }
+            ],
+            connection_class=DummyConnection,
+            connection_pool_class=DummyConnectionPool,
+            max_retries=100,
+        )
+
+        start = time.monotonic()
+        self.assertRaises(
+            ConnectionError, t.perform_request, "GET", "/", params={"deadline": 0.12}
+        )
+        self.assertTrue(time.monotonic() - start < 0.2)
+        self.assertEqual(3, len(t.get_connection().calls))
+
+    @patch("opensearchpy.transport.time.sleep")
+    def test_no_retry_if_the_backoff_ends_past_the_deadline(self, sleep: Any) -> None:
+        policy = RetryPolicy(budget=None)
+        policy.backoff_time = lambda retry: 2.0  # type: ignore
+        t: Any = Transport(
+            [{"exception": ConnectionError("N/A", "abandon ship", Exception())}],
+            connection_class=DummyConnection,
+            connection_pool_class=DummyConnectionPool,
+            retry_policy=policy,
+            deadline=1,
+        )
+
+        self.assertRaises(ConnectionError, t.perform_request, "GET", "/")
+        self.assertEqual(1, len(t.get_connection().calls))
+        sleep.assert_not_called()
+
+    def test_sniffing_stops_at_the_deadline(self) -> None:
+        t: Any = Transport(
+            [{"exception": ConnectionError("N/A", "abandon ship", Exception())}],
+            connection_class=DummyConnection,
+        )
+
+        self.assertRaises(TransportError, t.sniff_hosts, deadline=time.monotonic() - 1)
+        self.assertEqual([], t.get_connection().calls)
+
+
+class TestHedging(TestCase):
+    def test_idempotent_reads(self) -> None:
+        for method, url in (
+            ("GET", "/_search"),
+            ("POST", "/logs/_search"),
+            ("POST", "/logs/_msearch"),
+            ("GET", "/_mget"),
+            ("POST", "/logs/_count/"),
+            ("GET", "/logs/_doc/1"),
+            ("GET", "/logs/_source/1"),
+        ):
+            self.assertTrue(_is_idempotent_read(method, url), url)
+        for method, url in (
+            ("PUT", "/logs/_doc/1"),
+            ("DELETE", "/logs/_doc/1"),
+            ("POST", "/_search/scroll"),
+            ("POST", "/logs/_delete_by_query"),
+            ("GET", "/_cluster/health"),
+        ):
+            self.assertFalse(_is_idempotent_read(method, url), url)
+
+    def test_slow_read_is_hedged_on_another_connection(self) -> None:
+        t: Any = Transport(
+            [{"delay": 0.5, "data": '{"node": 1}'}, {"data": '{"node": 2}'}],
+            connection_class=DummyConnection,
+            randomize_hosts=False,
+            hedge_after=0.01,
+        )
+        slow, fast = t.connection_pool.connections
+
+        start = time.monotonic()
+        self.assertEqual({"node": 2}, t.perform_request("GET", "/_search"))
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(1, len(fast.calls))
+        t.close()
+
+    def test_read_is_sent_on_the_calling_thread_when_no_thread_is_free(
+        self,
+    ) -> None:
+        threads = []
+
+        class ThreadConnection(DummyConnection):
+            def perform_request(self, *args: Any, **kwargs: Any) -> Any:
+                threads.append(threading.current_thread())
+                return super(ThreadConnection, self).perform_request(*args, **kwargs)
+
+        t: Any = Transport(
+            [{"delay": 0.1, "data": '{"node": 1}'}, {"data": '{"node": 2}'}],
+            connection_class=ThreadConnection,
+            randomize_hosts=False,
+            hedge_after=0.01,
+        )
+        # every thread of the executor is busy
+        t._hedge_slots = threading.BoundedSemaphore(1)
+        t._hedge_slots.acquire()
+
+        self.assertEqual({"node": 1}, t.perform_request("GET", "/_search"))
+        self.assertEqual([threading.current_thread()], threads)
+
+        # a thread is free again, the read is sent from the executor
+        t._hedge_slots.release()
+        t.perform_request("GET", "/_search")
+        t.close()
+        self.assertNotEqual(threading.current_thread(), threads[1])
+
+    def test_slot_is_released_when_the_executor_is_shut_down(self) -> None:
+        t: Any = Transport(
+            [{"data": '{"node": 1}'}, {"data": '{"node": 2}'}],
+            connection_class=DummyConnection,
+            randomize_hosts=False,
+            hedge_after=0.01,
+        )
+        t._hedge_slots = threading.BoundedSemaphore(1)
+        t._hedge_executor.shutdown()
+
+        for _ in range(2):
+            self.assertIn(
+                t.perform_request("GET", "/_search"), ({"node": 1}, {"node": 2})
+            )
+        self.assertTrue(t._hedge_slots.acquire(blocking=False))
+
+    def test_writes_are_not_hedged(self) -> None:
+        t: Any = Transport(
+            [{"delay": 0.1, "data": '{"node": 1}'}, {"data": '{"node": 2}'}],
+            connection_class=DummyConnection,
+            randomize_hosts=False,
+            hedge_after=0.01,
+        )
+        slow, fast = t.connection_pool.connections
+
+        self.assertEqual({"node": 1}, t.perform_request("PUT", "/logs/_doc/1"))
+        self.assertEqual(0, len(fast.calls))
+        t.close()
+
+    def test_hedged_requests_are_capped_by_the_budget(self) -> None:
+        t: Any = Transport(
+            [{"delay": 0.05, "data": '{"node": 1}'}],
+            connection_class=DummyConnection,
+            connection_pool_class=DummyConnectionPool,
+            hedge_after=0.01,
+            hedge_budget=0.5,
+        )
+        t._get_hedge_connection = lambda connection: DummyConnection(data="{}")
+        t._hedging.tokens = 0
+
+        self.assertEqual({"node": 1}, t.perform_request("GET", "/_search"))
+        self.assertEqual({}, t.perform_request("GET", "/_search"))
+        self.assertEqual(0, t._hedging.tokens)
+        t.close()
+
+    def test_error_of_the_first_connection_is_raised_if_both_fail(self) -> None:
+        t: Any = Transport(
+            [
+                {"delay": 0.05, "exception": TransportError(400, "first")},
+                {"exception": TransportError(400, "second")},
+            ],
+            connection_class=DummyConnection,
+            randomize_hosts=False,
+            hedge_after=0.01,
+            hedge_budget=1,
+        )
+
+        with self.assertRaises(TransportError) as e:
+            t.perform_request("GET", "/_search")
+        self.assertEqual("first", e.exception.error)
+        t.close()
+
+    def test_percentile_delay(self) -> None:
+        hedging = _Hedging("p95", 0.1)
+        self.assertIsNone(hedging.start())
+
+        for i in range(100):
+            hedging.record(i / 100)
+        self.assertEqual(0.95, hedging.start())
+
+    def test_invalid_hedge_after(self) -> None:
+        for after in ("95", "p100", "pxx"):
+            self.assertRaises(ValueError, _Hedging, after, 0.1)
+
+
+class TestCoalescing(TestCase):
+    def perform_concurrently(self, t: Any, *requests: Any) -> Any:
+        results: Any = [None] * len(requests)
+
+        def perform(i: int) -> None:
+            results[i] = t.perform_request(*requests[i])
+
+        threads = [
+            threading.Thread(target=perform, args=(i,)) for i in range(len(requests))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_identical_reads_share_one_request(self) -> None:
+        metrics = MetricsEvents()
+        t: Any = Transport(
+            [{"delay": 0.2, "data": '{"hits": {"hits": []}}'}],
+            connection_class=DummyConnection,
+            coalesce_requests=True,
+            metrics=metrics,
+        )
+        request = ("POST", "/logs/_search", None, {"query": {"match_all": {}}})
+
+        results = self.perform_concurrently(t, *[request] * 5)
+
+        self.assertEqual(1, len(t.get_connection().calls))
+        self.assertEqual(4, metrics.coalesced_requests)
+        self.assertEqual([{"hits": {"hits": []}}] * 5, results)
+        # every caller gets its own copy
+        results[0]["hits"]["hits"].append("changed")
+        self.assertEqual([], results[1]["hits"]["hits"])
+        self.assertEqual({}, t._in_flight)
+
+    def test_different_reads_are_not_coalesced(self) -> None:
+        t: Any = Transport(
+            [{"delay": 0.1}],
+            connection_class=DummyConnection,
+            coalesce_requests=True,
+        )
+
+        self.perform_concurrently(
+            t,
+            ("POST", "/logs/_search", None, {"size": 1}),
+            ("POST", "/logs/_search", None, {"size": 2}),
+            ("POST", "/logs/_search", {"routing": "a"}, {"size": 1}),
+            ("GET", "/logs/_doc/1"),
+            ("GET", "/logs/_doc/2"),
+        )
+        self.assertEqual(5, len(t.get_connection().calls))
+
+    def test_writes_are_not_coalesced(self) -> None:
+        t: Any = Transport(
+            [{"delay": 0.1}],
+            connection_class=DummyConnection,
+            coalesce_requests=True,
+        )
+
+        self.perform_concurrently(t, *[("PUT", "/logs/_doc/1", None, {})] * 3)
+        self.assertEqual(3, len(t.get_connection().calls))
+
+    def test_error_is_raised_to_every_caller(self) -> None:
+        t: Any = Transport(
+            [{"delay": 0.1, "exception": TransportError(400, "bad request")}],
+            connection_class=DummyConnection,
+            coalesce_requests=True,
+        )
+        errors = []
+
+        def perform() -> None:
+            try:
+                t.perform_request("GET", "/_search")
+            except TransportError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=perform) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(3, len(errors))
+        self.assertEqual(1, len(t.get_connection().calls))
+
+    def test_waiting_for_a_read_stops_at_the_deadline(self) -> None:
+        t: Any = Transport(
+            [{"delay": 0.5}],
+            connection_class=DummyConnection,
+            coalesce_requests=True,
+        )
+        leader = threading.Thread(target=t.perform_request, args=("GET", "/_search"))
+        leader.start()
+        time.sleep(0.05)
+
+        start = time.monotonic()
+        self.assertRaises(
+            ConnectionTimeout,
+            t.perform_request,
+            "GET",
+            "/_search",
+            params={"deadline": 0.1},
+        )
+        self.assertLess(time.monotonic() - start, 0.3)
+        leader.join()
+        self.assertEqual(1, len(t.get_connection().calls))
+
+    def test_only_the_connection_that_failed_is_marked_dead(self) -> None:
+        class SequentialSelector(ConnectionSelector):
+            """the next connection for every caller, whatever its thread"""
+
+            def __init__(self, opts: Any) -> None:
+                super(SequentialSelector, self).__init__(opts)
+                self.count = itertools.count()
+
+            def select(self, connections: Any) -> Any:
+                return connections[next(self.count) % len(connections)]
+
+        t: Any = Transport(
+            [{"delay": 0.2, "exception": ConnectionError("N/A", "down")}, {}, {}, {}],
+            connection_class=DummyConnection,
+            selector_class=SequentialSelector,
+            randomize_hosts=False,
+            coalesce_requests=True,
+            max_retries=0,
+        )
+        failing = t.connection_pool.connections[0]
+        errors = []
+
+        def perform() -> None:
+            try:
+                t.perform_request("GET", "/_search")
+            except ConnectionError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=perform) for _ in range(4)]
+        # the first caller sends the read on the failing connection, the
+        # others wait for it with a connection of their own
+        threads[0].start()
+        time.sleep(0.05)
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(4, len(errors))
+        self.assertEqual(1, len(failing.calls))
+        self.assertEqual(3, len(t.connection_pool.connections))
+        self.assertNotIn(failing, t.connection_pool.connections)
+
+
+class TestSearchCache(TestCase):
+    def test_identical_searches_are_answered_from_the_cache(self) -> None:
+        cache = SearchCache()
+        t: Any = Transport(
+            [{"data": '{"hits": {"hits": []}}'}],
+            connection_class=DummyConnection,
+            search_cache=cache,
+        )
+        first = t.perform_request("POST", "/logs/_search", body={"size": 1})
+        second = t.perform_request("POST", "/logs/_search", body={"size": 1})
+
+        self.assertEqual(1, len(t.get_connection().calls))
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_writes_invalidate_the_cache(self) -> None:
+        t: Any = Transport(
+            [{"data": "{}"}],
+            connection_class=DummyConnection,
+            search_cache=SearchCache(),
+        )
+        t.perform_request("GET", "/logs/_search")
+        t.perform_request("PUT", "/logs/_doc/1", body={})
+        t.perform_request("GET", "/logs/_search")
+
+        self.assertEqual(3, len(t.get_connection().calls))
+
+    def test_failed_writes_invalidate_the_cache(self) -> None:
+        t: Any = Transport(
+            [{"data": "{}"}],
+            connection_class=DummyConnection,
+            search_cache=SearchCache(),
+            max_retries=0,
+        )
+        connection = t.get_connection()
+        t.perform_request("GET", "/logs/_search")
+        # the write may have been applied even though it timed out
+        connection.exception = ConnectionTimeout("TIMEOUT", "timed out", None)
+        self.assertRaises(
+            ConnectionTimeout, t.perform_request, "PUT", "/logs/_doc/1", body={}
+        )
+        connection.exception = None
+        t.perform_request("GET", "/logs/_search")
+
+        self.assertEqual(3, len(connection.calls))
+
+    def test_errors_are_not_cached(self) -> None:
+        t: Any = Transport(
+            [{"status": 404, "data": "{}"}],
+            connection_class=DummyConnection,
+            search_cache=SearchCache(),
+        )
+        for _ in range(2):
+            t.perform_request("GET", "/logs/_search", params={"ignore": 404})
+
+        self.assertEqual(2, len(t.get_connection().calls))